@@ -1,18 +1,28 @@
+import os
+import sys
+
+# `cd backend && python app.py`(또는 flask --app app)로 실행해도 모든 모듈이 backend.* 경로 하나로 임포트되도록 프로젝트 루트 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from flask import Flask
 from flask_cors import CORS
-from database import init_db, db
-from routes import workflow, application, engine
-from routes.decision_tree import decision_tree_bp
-from routes.scorecard import scorecard_bp
-from routes.deployment import deployment_bp
-from routes.dynamic_api import dynamic_api_bp
-from routes.process_instance import process_instance_bp
-from routes.human_task import human_task_bp
-import config
+from backend.database import init_db, db
+from backend.routes import workflow, application, engine
+from backend.routes.decision_tree import decision_tree_bp
+from backend.routes.scorecard import scorecard_bp
+from backend.routes.deployment import deployment_bp
+from backend.routes.dynamic_api import dynamic_api_bp
+from backend.routes.process_instance import process_instance_bp
+from backend.routes.human_task import human_task_bp
+from backend.routes.simulation import simulation_bp
+from backend.routes.rule_replay import rule_replay_bp
+from backend.services.rule_cache_service import rule_artifact_cache
+from backend.commands import register_commands
+from backend import config
 
-def create_app():
+def create_app(config_object=config.Config):
     app = Flask(__name__)
-    app.config.from_object(config.Config)
+    app.config.from_object(config_object)
     
     CORS(app, resources={
         r"/api/*": {
@@ -24,6 +34,11 @@ def create_app():
     
     init_db(app)
     
+    rule_artifact_cache.configure(
+        max_entries=app.config['RULE_CACHE_MAX_ENTRIES'],
+        max_bytes=app.config['RULE_CACHE_MAX_BYTES']
+    )
+    
     with app.app_context():
         db.create_all()
     
@@ -36,6 +51,10 @@ def create_app():
     app.register_blueprint(dynamic_api_bp, url_prefix='/api')
     app.register_blueprint(process_instance_bp, url_prefix='/api')
     app.register_blueprint(human_task_bp, url_prefix='/api')
+    app.register_blueprint(simulation_bp, url_prefix='/api')
+    app.register_blueprint(rule_replay_bp, url_prefix='/api')
+    
+    register_commands(app)
     
     @app.route('/api/health')
     def health_check():
@@ -0,0 +1,3 @@
+from .harness import run_benchmarks, compare_results, create_benchmark_app
+
+__all__ = ['run_benchmarks', 'compare_results', 'create_benchmark_app']
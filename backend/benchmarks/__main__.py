@@ -0,0 +1,89 @@
+from backend.benchmarks.harness import (
+    DEFAULT_PARAMETERS, BENCHMARK_NAMES, create_benchmark_app, run_benchmarks, compare_results
+)
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m backend.benchmarks',
+        description='룰 엔진 및 워크플로우 실행기 지연 시간 벤치마크 (합성 데이터, SQLite)'
+    )
+    parser.add_argument('--database', default=None, help='벤치마크용 SQLite 파일 경로 (기본: 임시 파일)')
+    parser.add_argument('--output', default=None, help='결과 JSON 저장 경로 (기본: 표준 출력)')
+    parser.add_argument('--only', default=None, help=f'실행할 벤치마크 (쉼표 구분): {", ".join(BENCHMARK_NAMES)}')
+    parser.add_argument('--baseline', default=None, help='비교할 이전 결과 JSON 경로')
+    parser.add_argument('--max-regression', type=float, default=0.2, help='허용 지연 증가율 (기본 0.2 = 20%%)')
+    
+    for key, default in DEFAULT_PARAMETERS.items():
+        option = '--' + key.replace('_', '-')
+        parser.add_argument(option, dest=key, type=type(default), default=default, help=f'기본값 {default}')
+    
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    parameters = {key: getattr(args, key) for key in DEFAULT_PARAMETERS}
+    only = set(args.only.split(',')) if args.only else None
+    
+    unknown = only - set(BENCHMARK_NAMES) if only else set()
+    if unknown:
+        print(f'알 수 없는 벤치마크: {", ".join(sorted(unknown))}', file=sys.stderr)
+        return 2
+    
+    temporary = None
+    database_path = args.database
+    if database_path is None:
+        handle, temporary = tempfile.mkstemp(prefix='benchmark-', suffix='.db')
+        os.close(handle)
+        database_path = temporary
+    
+    def report(result):
+        print(
+            f'{result["name"]:<40} p50 {result["p50_ms"]:>9.3f}ms  p99 {result["p99_ms"]:>9.3f}ms  '
+            f'{result["throughput_per_sec"]:>10.1f}/s  errors {result["errors"]}',
+            file=sys.stderr
+        )
+    
+    try:
+        # keep stdout clean for the JSON payload
+        with contextlib.redirect_stdout(sys.stderr):
+            app = create_benchmark_app(database_path, parameters['sqlite_profile'])
+            results = run_benchmarks(app, parameters, only, progress=report)
+    finally:
+        if temporary:
+            os.remove(temporary)
+    
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            comparisons = compare_results(json.load(f), results, args.max_regression)
+        results['comparison'] = {'baseline': args.baseline, 'max_regression': args.max_regression, 'results': comparisons}
+        
+        for comparison in comparisons:
+            if comparison['regressed']:
+                exit_code = 1
+                print(
+                    f'회귀 감지: {comparison["name"]} {comparison["metric"]} '
+                    f'{comparison["baseline"]}ms -> {comparison["current"]}ms (x{comparison["ratio"]})',
+                    file=sys.stderr
+                )
+    
+    payload = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(payload)
+    else:
+        print(payload)
+    
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,250 @@
+from backend.models.decision_tree import DecisionTree, DecisionTreeNode
+from backend.models.scorecard import Scorecard, ScorecardCharacteristic, ScorecardAttribute
+from backend.models.decision_table import DecisionTable, DecisionTableRule
+from backend.models.rule_set import RuleSet, Rule
+from backend.models.workflow import Workflow, WorkflowNode, WorkflowEdge
+import numpy as np
+import json
+
+
+DECISION_LABELS = ('APPROVED', 'REJECTED', 'MANUAL_REVIEW')
+FEATURE_RANGE = 100.0
+
+
+def feature_name(index):
+    return f'f{index}'
+
+
+def category_name(index):
+    return f'c{index}'
+
+
+def generate_inputs(count, num_features, num_categories, rng):
+    numeric = rng.uniform(0, FEATURE_RANGE, size=(count, num_features)).round(2)
+    categories = rng.integers(0, num_categories, size=(count, num_features))
+    
+    return [
+        {
+            **{feature_name(j): float(numeric[i, j]) for j in range(num_features)},
+            **{category_name(j): f'v{categories[i, j]}' for j in range(num_features)}
+        }
+        for i in range(count)
+    ]
+
+
+def generate_decision_tree(db, depth, num_features, rng):
+    tree = DecisionTree(
+        name=f'benchmark-tree-d{depth}',
+        target_variable='decision',
+        max_depth=depth,
+        status='active'
+    )
+    db.session.add(tree)
+    db.session.flush()
+    
+    nodes = []
+    level = [('0', None)]
+    
+    for current_depth in range(depth + 1):
+        next_level = []
+        for node_id, parent_id in level:
+            if current_depth == depth:
+                nodes.append(DecisionTreeNode(
+                    tree_id=tree.id,
+                    node_id=node_id,
+                    parent_id=parent_id,
+                    is_leaf=True,
+                    class_label=DECISION_LABELS[int(rng.integers(len(DECISION_LABELS)))]
+                ))
+                continue
+            
+            nodes.append(DecisionTreeNode(
+                tree_id=tree.id,
+                node_id=node_id,
+                parent_id=parent_id,
+                feature=feature_name(int(rng.integers(num_features))),
+                threshold=round(float(rng.uniform(0, FEATURE_RANGE)), 2),
+                operator='<=',
+                is_leaf=False
+            ))
+            next_level.append((f'{node_id}-L', node_id))
+            next_level.append((f'{node_id}-R', node_id))
+        level = next_level
+    
+    db.session.add_all(nodes)
+    db.session.commit()
+    
+    return tree
+
+
+def generate_scorecard(db, num_characteristics, num_attributes, num_features, rng):
+    scorecard = Scorecard(name=f'benchmark-scorecard-{num_characteristics}x{num_attributes}', status='active')
+    db.session.add(scorecard)
+    db.session.flush()
+    
+    edges = np.linspace(0, FEATURE_RANGE, num_attributes + 1)
+    edges[-1] = np.inf
+    
+    for index in range(num_characteristics):
+        # every third characteristic is categorical so both matching paths are exercised
+        categorical = index % 3 == 2
+        name = category_name(index % num_features) if categorical else feature_name(index % num_features)
+        
+        characteristic = ScorecardCharacteristic(
+            scorecard_id=scorecard.id,
+            name=name,
+            weight=1.0,
+            order=index
+        )
+        db.session.add(characteristic)
+        db.session.flush()
+        
+        points = rng.integers(-20, 40, size=num_attributes)
+        
+        for position in range(num_attributes):
+            if categorical:
+                attribute = ScorecardAttribute(
+                    characteristic_id=characteristic.id,
+                    attribute=f'v{position}',
+                    category=f'v{position}',
+                    points=float(points[position])
+                )
+            else:
+                attribute = ScorecardAttribute(
+                    characteristic_id=characteristic.id,
+                    attribute=f'{edges[position]:g}-{edges[position + 1]:g}',
+                    min_value=float(edges[position]),
+                    max_value=float(edges[position + 1]) if np.isfinite(edges[position + 1]) else 1e12,
+                    points=float(points[position])
+                )
+            db.session.add(attribute)
+    
+    db.session.commit()
+    
+    return scorecard
+
+
+def generate_decision_table(db, num_rules, num_conditions, rng, hit_policy='FIRST'):
+    conditions = [{'name': feature_name(j), 'type': 'number'} for j in range(num_conditions)]
+    
+    table = DecisionTable(
+        name=f'benchmark-table-{num_rules}',
+        hit_policy=hit_policy,
+        conditions=json.dumps(conditions),
+        actions=json.dumps([{'name': 'decision'}, {'name': 'limit'}]),
+        status='active'
+    )
+    db.session.add(table)
+    db.session.flush()
+    
+    rules = []
+    for number in range(num_rules):
+        rule_conditions = {}
+        
+        # the last rule is a catch-all so every input produces an output
+        if number < num_rules - 1:
+            for column in conditions:
+                draw = rng.random()
+                if draw < 0.4:
+                    continue
+                low, high = sorted(rng.uniform(0, FEATURE_RANGE, size=2).round(2).tolist())
+                if draw < 0.7:
+                    rule_conditions[column['name']] = {'operator': 'BETWEEN', 'value': [low, high]}
+                else:
+                    rule_conditions[column['name']] = {'operator': '>=' if draw < 0.85 else '<', 'value': low}
+        
+        rules.append(DecisionTableRule(
+            table_id=table.id,
+            rule_number=number + 1,
+            priority=num_rules - number,
+            conditions=json.dumps(rule_conditions),
+            actions=json.dumps({
+                'decision': DECISION_LABELS[number % len(DECISION_LABELS)],
+                'limit': int(rng.integers(1, 100)) * 100000
+            }),
+            enabled=True
+        ))
+    
+    db.session.add_all(rules)
+    db.session.commit()
+    
+    return table
+
+
+def generate_rule_set(db, num_rules, num_features, rng):
+    rule_set = RuleSet(name=f'benchmark-rule-set-{num_rules}', rule_type='RULE_SET', status='active')
+    db.session.add(rule_set)
+    db.session.flush()
+    
+    rules = []
+    for index in range(num_rules):
+        feature = feature_name(index % num_features)
+        threshold = round(float(rng.uniform(0, FEATURE_RANGE)), 2)
+        
+        rules.append(Rule(
+            rule_set_id=rule_set.id,
+            name=f'rule-{index}',
+            condition=f'{feature} > {threshold} and {category_name(index % num_features)} != "v0"',
+            action=f'flag_{index} = True\nrisk_points = {int(rng.integers(1, 10))}',
+            priority=num_rules - index,
+            enabled=True
+        ))
+    
+    db.session.add_all(rules)
+    db.session.commit()
+    
+    return rule_set
+
+
+def generate_workflow(db, rule_nodes, service_tasks=0, parallel_branches=0):
+    workflow = Workflow(
+        name=f'benchmark-workflow-{len(rule_nodes)}r-{service_tasks}s-{parallel_branches}p',
+        status='active'
+    )
+    db.session.add(workflow)
+    db.session.flush()
+    
+    nodes = [('start', 'start', {})]
+    edges = []
+    
+    def chain(node_id, node_type, config):
+        edges.append((nodes[-1][0], node_id))
+        nodes.append((node_id, node_type, config))
+    
+    for index, (rule_type, rule_id) in enumerate(rule_nodes):
+        chain(f'rule-{index}', 'businessRule', {'rule_type': rule_type, 'rule_id': rule_id})
+    
+    for index in range(service_tasks):
+        chain(f'service-{index}', 'serviceTask', {'service': f'benchmark-service-{index}'})
+    
+    if parallel_branches > 1:
+        chain('fork', 'parallelGateway', {})
+        for index in range(parallel_branches):
+            nodes.append((f'branch-{index}', 'serviceTask', {'service': f'benchmark-branch-{index}'}))
+            edges.append(('fork', f'branch-{index}'))
+            edges.append((f'branch-{index}', 'join'))
+        nodes.append(('join', 'serviceTask', {'service': 'benchmark-join'}))
+    
+    chain('decision', 'gateway', {'condition': f'{feature_name(0)} >= {FEATURE_RANGE / 2:g}'})
+    chain('end', 'end', {})
+    
+    for node_id, node_type, config in nodes:
+        db.session.add(WorkflowNode(
+            workflow_id=workflow.id,
+            node_id=node_id,
+            node_type=node_type,
+            label=node_id,
+            config=json.dumps(config)
+        ))
+    
+    for index, (source, target) in enumerate(edges):
+        db.session.add(WorkflowEdge(
+            workflow_id=workflow.id,
+            edge_id=f'e{index}',
+            source_node_id=source,
+            target_node_id=target
+        ))
+    
+    db.session.commit()
+    
+    return workflow
@@ -0,0 +1,308 @@
+from backend.database import db, init_db, get_sqlite_pragmas
+from backend.benchmarks import generators
+from backend.services.rule_engine_service import RuleEngineService
+from backend.services.decision_table_service import DecisionTableService
+from backend.services.scorecard_service import ScorecardService
+from backend.services.process_instance_service import ProcessInstanceService
+from backend.services.node_instance_recorder import PERSISTENCE_BATCH
+from backend.services.rule_cache_service import rule_artifact_cache
+from backend.services.execution_plan_service import ExecutionPlanService
+from backend.models.deployed_api import DeployedAPI
+from backend.routes.dynamic_api import dynamic_api_bp
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask
+from datetime import datetime
+import numpy as np
+import platform
+import sqlalchemy
+import time
+
+
+DEFAULT_PARAMETERS = {
+    'seed': 42,
+    'iterations': 2000,
+    'warmup': 200,
+    'inputs': 1000,
+    'features': 16,
+    'tree_depth': 8,
+    'characteristics': 20,
+    'attributes': 8,
+    'table_rules': 200,
+    'table_conditions': 6,
+    'rule_set_rules': 50,
+    'workflow_service_tasks': 4,
+    'workflow_parallel_branches': 4,
+    'persistence': PERSISTENCE_BATCH,
+    'sqlite_profile': 'production',
+    'concurrency': 8,
+    'concurrent_requests': 2000
+}
+
+BENCHMARK_NAMES = (
+    'rule_engine.decision_tree',
+    'rule_engine.scorecard',
+    'rule_engine.decision_table',
+    'rule_engine.rule_set',
+    'decision_table.execute_table',
+    'scorecard.calculate_score',
+    'process.execute_workflow_as_process',
+    'api.execute_concurrent'
+)
+
+BENCHMARK_API_NAME = 'benchmark'
+
+LATENCY_PERCENTILES = (50, 90, 99)
+
+
+def create_benchmark_app(database_path, sqlite_profile=DEFAULT_PARAMETERS['sqlite_profile']):
+    app = Flask('benchmarks')
+    app.config.update(
+        DATABASE_PATH=database_path,
+        SQLALCHEMY_DATABASE_URI=f'sqlite:///{database_path}',
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        SQLITE_PROFILE=sqlite_profile
+    )
+    init_db(app)
+    app.register_blueprint(dynamic_api_bp, url_prefix='/api')
+    return app
+
+
+def measure(name, target, func, inputs, iterations, warmup):
+    for i in range(warmup):
+        func(inputs[i % len(inputs)])
+    
+    latencies = np.empty(iterations, dtype=np.int64)
+    errors = 0
+    
+    started = time.perf_counter_ns()
+    for i in range(iterations):
+        call_started = time.perf_counter_ns()
+        result = func(inputs[i % len(inputs)])
+        latencies[i] = time.perf_counter_ns() - call_started
+        
+        if isinstance(result, dict) and result.get('success') is False:
+            errors += 1
+    elapsed = time.perf_counter_ns() - started
+    
+    result = {
+        'name': name,
+        'target': target,
+        'iterations': iterations,
+        'warmup': warmup,
+        'errors': errors
+    }
+    result.update(summarize_latencies(latencies, iterations, elapsed))
+    
+    return result
+
+
+def measure_concurrent(name, target, app, path, inputs, requests, concurrency, warmup):
+    def run_client(worker, count):
+        client = app.test_client()
+        latencies = np.empty(count, dtype=np.int64)
+        errors = 0
+        
+        for i in range(count):
+            call_started = time.perf_counter_ns()
+            response = client.post(path, json=inputs[(worker + i * concurrency) % len(inputs)])
+            latencies[i] = time.perf_counter_ns() - call_started
+            
+            if response.status_code != 200:
+                errors += 1
+        
+        return latencies, errors
+    
+    run_client(0, warmup)
+    
+    counts = [requests // concurrency + (1 if worker < requests % concurrency else 0) for worker in range(concurrency)]
+    
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='benchmark-client') as executor:
+        started = time.perf_counter_ns()
+        outcomes = list(executor.map(run_client, range(concurrency), counts))
+        elapsed = time.perf_counter_ns() - started
+    
+    result = {
+        'name': name,
+        'target': target,
+        'iterations': requests,
+        'warmup': warmup,
+        'concurrency': concurrency,
+        'errors': sum(errors for _, errors in outcomes)
+    }
+    result.update(summarize_latencies(np.concatenate([latencies for latencies, _ in outcomes]), requests, elapsed))
+    
+    return result
+
+
+def summarize_latencies(latencies, count, elapsed):
+    latencies_ms = latencies / 1e6
+    percentiles = np.percentile(latencies_ms, LATENCY_PERCENTILES)
+    
+    summary = {
+        'mean_ms': round(float(latencies_ms.mean()), 4),
+        'min_ms': round(float(latencies_ms.min()), 4),
+        'max_ms': round(float(latencies_ms.max()), 4),
+        'throughput_per_sec': round(count / (elapsed / 1e9), 2) if elapsed else None
+    }
+    for p, value in zip(LATENCY_PERCENTILES, percentiles):
+        summary[f'p{p}_ms'] = round(float(value), 4)
+    
+    return summary
+
+
+def build_fixtures(parameters, rng):
+    features = parameters['features']
+    
+    tree = generators.generate_decision_tree(db, parameters['tree_depth'], features, rng)
+    scorecard = generators.generate_scorecard(
+        db, parameters['characteristics'], parameters['attributes'], features, rng
+    )
+    table = generators.generate_decision_table(
+        db, parameters['table_rules'], min(parameters['table_conditions'], features), rng
+    )
+    rule_set = generators.generate_rule_set(db, parameters['rule_set_rules'], features, rng)
+    
+    workflow = generators.generate_workflow(
+        db,
+        [('SCORECARD', scorecard.id), ('DECISION_TABLE', table.id), ('DECISION_TREE', tree.id)],
+        service_tasks=parameters['workflow_service_tasks'],
+        parallel_branches=parameters['workflow_parallel_branches']
+    )
+    
+    deployed_api = DeployedAPI(
+        workflow_id=workflow.id,
+        api_name=BENCHMARK_API_NAME,
+        api_path=f'/api/execute/{BENCHMARK_API_NAME}',
+        status='active'
+    )
+    db.session.add(deployed_api)
+    db.session.commit()
+    
+    return {
+        'tree': tree,
+        'scorecard': scorecard,
+        'table': table,
+        'rule_set': rule_set,
+        'workflow': workflow,
+        'inputs': generators.generate_inputs(parameters['inputs'], features, parameters['attributes'], rng)
+    }
+
+
+def build_benchmarks(fixtures, parameters):
+    tree_id = fixtures['tree'].id
+    scorecard_id = fixtures['scorecard'].id
+    table_id = fixtures['table'].id
+    rule_set_id = fixtures['rule_set'].id
+    workflow_id = fixtures['workflow'].id
+    scorecard = fixtures['scorecard']
+    table = fixtures['table']
+    persistence = parameters['persistence']
+    
+    return {
+        'rule_engine.decision_tree': (
+            'RuleEngineService.execute_rule',
+            lambda data: RuleEngineService.execute_rule('DECISION_TREE', tree_id, data, db)
+        ),
+        'rule_engine.scorecard': (
+            'RuleEngineService.execute_rule',
+            lambda data: RuleEngineService.execute_rule('SCORECARD', scorecard_id, data, db)
+        ),
+        'rule_engine.decision_table': (
+            'RuleEngineService.execute_rule',
+            lambda data: RuleEngineService.execute_rule('DECISION_TABLE', table_id, data, db)
+        ),
+        'rule_engine.rule_set': (
+            'RuleEngineService.execute_rule',
+            lambda data: RuleEngineService.execute_rule('RULE_SET', rule_set_id, data, db)
+        ),
+        'decision_table.execute_table': (
+            'DecisionTableService.execute_table',
+            lambda data: DecisionTableService.execute_table(table, data)
+        ),
+        'scorecard.calculate_score': (
+            'ScorecardService.calculate_score',
+            lambda data: ScorecardService.calculate_score(scorecard, data)
+        ),
+        'process.execute_workflow_as_process': (
+            'ProcessInstanceService.execute_workflow_as_process',
+            lambda data: ProcessInstanceService.execute_workflow_as_process(
+                workflow_id, data, db, persistence=persistence
+            )
+        )
+    }
+
+
+def run_benchmarks(app, parameters=None, only=None, progress=None):
+    parameters = dict(DEFAULT_PARAMETERS, **(parameters or {}))
+    rng = np.random.default_rng(parameters['seed'])
+    
+    with app.app_context():
+        db.create_all()
+        
+        # start from cold caches so fixtures from an earlier run in this process cannot leak in
+        rule_artifact_cache.invalidate()
+        ExecutionPlanService.invalidate()
+        
+        fixtures = build_fixtures(parameters, rng)
+        benchmarks = build_benchmarks(fixtures, parameters)
+        
+        results = []
+        for name in BENCHMARK_NAMES:
+            if only and name not in only:
+                continue
+            
+            if name == 'api.execute_concurrent':
+                result = measure_concurrent(
+                    name, 'POST /api/execute/<api_name>', app, f'/api/execute/{BENCHMARK_API_NAME}',
+                    fixtures['inputs'], parameters['concurrent_requests'], parameters['concurrency'],
+                    parameters['warmup']
+                )
+            else:
+                target, func = benchmarks[name]
+                result = measure(
+                    name, target, func, fixtures['inputs'], parameters['iterations'], parameters['warmup']
+                )
+            results.append(result)
+            
+            if progress:
+                progress(result)
+        
+        return {
+            'meta': {
+                'timestamp': datetime.utcnow().isoformat(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'numpy': np.__version__,
+                'sqlalchemy': sqlalchemy.__version__,
+                'database': app.config['SQLALCHEMY_DATABASE_URI'],
+                'sqlite_pragmas': dict(get_sqlite_pragmas(app.config)),
+                'parameters': parameters
+            },
+            'benchmarks': results
+        }
+
+
+def compare_results(baseline, current, max_regression=0.2, metrics=('p50_ms', 'p99_ms')):
+    baseline_by_name = {result['name']: result for result in baseline.get('benchmarks', [])}
+    comparisons = []
+    
+    for result in current.get('benchmarks', []):
+        previous = baseline_by_name.get(result['name'])
+        if not previous:
+            continue
+        
+        for metric in metrics:
+            if not previous.get(metric):
+                continue
+            
+            ratio = result[metric] / previous[metric]
+            comparisons.append({
+                'name': result['name'],
+                'metric': metric,
+                'baseline': previous[metric],
+                'current': result[metric],
+                'ratio': round(ratio, 4),
+                'regressed': ratio > 1 + max_regression
+            })
+    
+    return comparisons
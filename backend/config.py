@@ -12,14 +12,81 @@ class Config:
     HOST = os.environ.get('FLASK_HOST', '0.0.0.0')
     PORT = int(os.environ.get('FLASK_PORT', 5000))
     
-    # 데이터베이스 설정
+    # 데이터베이스 설정 (DATABASE_URL이 있으면 PostgreSQL 등 서버 DB, 없으면 SQLite 파일)
     DATABASE_PATH = os.environ.get(
         'DATABASE_PATH',
         str(BASE_DIR / 'database' / 'meritz.db')
     )
-    SQLALCHEMY_DATABASE_URI = f'sqlite:///{DATABASE_PATH}'
+    DATABASE_URL = os.environ.get('DATABASE_URL')
+    SQLALCHEMY_DATABASE_URI = DATABASE_URL or f'sqlite:///{DATABASE_PATH}'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # SQLite 저장소 프로필 (production: WAL, synchronous=NORMAL, mmap/캐시/잠금 대기 설정, default: SQLite 기본값)
+    SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'production')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 64 * 1024))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    
+    # 데이터베이스 연결 풀 설정 (서버 DB는 pre-ping 및 재연결 주기(초) 추가 적용)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'True') == 'True'
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    
+    # SQLite -> 서버 DB 이전(flask migrate-database) 청크당 행 수
+    MIGRATION_CHUNK_SIZE = int(os.environ.get('MIGRATION_CHUNK_SIZE', 5000))
+    
+    # 프로세스 실행 설정
+    # immediate: 노드마다 커밋, batch: 실행 종료 시 일괄 커밋, async: 백그라운드 쓰기 큐
+    NODE_PERSISTENCE_MODE = os.environ.get('NODE_PERSISTENCE_MODE', 'batch')
+    
+    # 룰 컴파일 캐시 설정 (LRU, 항목 수 및 메모리 상한)
+    RULE_CACHE_MAX_ENTRIES = int(os.environ.get('RULE_CACHE_MAX_ENTRIES', 512))
+    RULE_CACHE_MAX_BYTES = int(os.environ.get('RULE_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+    
+    # 병렬 게이트웨이 분기 실행 스레드 풀 크기
+    PARALLEL_BRANCH_WORKERS = int(os.environ.get('PARALLEL_BRANCH_WORKERS', 8))
+    
+    # 비동기 실행(/api/execute?mode=async) 작업 큐 설정
+    EXECUTION_JOB_WORKERS = int(os.environ.get('EXECUTION_JOB_WORKERS', 4))
+    EXECUTION_JOB_MAX_PENDING = int(os.environ.get('EXECUTION_JOB_MAX_PENDING', 1000))
+    EXECUTION_CALLBACK_TIMEOUT = int(os.environ.get('EXECUTION_CALLBACK_TIMEOUT', 10))
+    EXECUTION_CALLBACK_RETRIES = int(os.environ.get('EXECUTION_CALLBACK_RETRIES', 3))
+    
+    # 콜백 전송 전용 스레드 풀 설정 (재시도/백오프가 작업 실행 워커를 점유하지 않도록 분리)
+    EXECUTION_CALLBACK_WORKERS = int(os.environ.get('EXECUTION_CALLBACK_WORKERS', 2))
+    EXECUTION_CALLBACK_MAX_PENDING = int(os.environ.get('EXECUTION_CALLBACK_MAX_PENDING', 1000))
+    
+    # 콜백 허용 호스트 (쉼표 구분, 하위 도메인 포함). 비어 있으면 사설/루프백/링크로컬 주소만 차단
+    EXECUTION_CALLBACK_ALLOWED_HOSTS = os.environ.get('EXECUTION_CALLBACK_ALLOWED_HOSTS', '')
+    EXECUTION_CALLBACK_ALLOW_PRIVATE = os.environ.get('EXECUTION_CALLBACK_ALLOW_PRIVATE', 'False') == 'True'
+    
+    # 신청서 일괄 실행 설정 (청크 크기, 워커 프로세스 수)
+    BULK_EXECUTION_CHUNK_SIZE = int(os.environ.get('BULK_EXECUTION_CHUNK_SIZE', 500))
+    BULK_EXECUTION_WORKERS = int(os.environ.get('BULK_EXECUTION_WORKERS', os.cpu_count() or 1))
+    # 이 시간(초) 동안 체크포인트 저장이 없으면 실행 중인 일괄 실행도 중단된 것으로 보고 재개 허용
+    BULK_EXECUTION_LEASE_TIMEOUT = int(os.environ.get('BULK_EXECUTION_LEASE_TIMEOUT', 600))
+    
+    # 프로세스 시뮬레이션 실행 설정 (샤드당 인스턴스 수, 워커 프로세스 수, 최대 인스턴스 수)
+    SIMULATION_SHARD_SIZE = int(os.environ.get('SIMULATION_SHARD_SIZE', 100000))
+    SIMULATION_WORKERS = int(os.environ.get('SIMULATION_WORKERS', os.cpu_count() or 1))
+    SIMULATION_MAX_INSTANCES = int(os.environ.get('SIMULATION_MAX_INSTANCES', 50000000))
+    
+    # 배포 API 테스트 케이스 일괄 실행 설정 (워커 스레드 수, 케이스별 제한 시간(초))
+    TEST_SUITE_WORKERS = int(os.environ.get('TEST_SUITE_WORKERS', 8))
+    TEST_CASE_TIMEOUT = int(os.environ.get('TEST_CASE_TIMEOUT', 30))
+    
+    # 룰 변경 재현(골든 마스터 비교) 설정 (청크당 레코드 수)
+    REPLAY_CHUNK_SIZE = int(os.environ.get('REPLAY_CHUNK_SIZE', 20000))
+    
+    # 의사결정나무 학습 데이터 설정 (서버 측 파일 경로 허용 디렉터리, 스트리밍 청크 행 수)
+    TRAINING_DATA_DIR = os.environ.get(
+        'TRAINING_DATA_DIR',
+        str(BASE_DIR / 'database' / 'training_data')
+    )
+    TRAINING_CHUNK_SIZE = int(os.environ.get('TRAINING_CHUNK_SIZE', 50000))
+    
     # API 설정
     JSON_SORT_KEYS = False
     JSON_AS_ASCII = False
@@ -43,4 +110,6 @@ class TestingConfig(Config):
     DEBUG = True
     TESTING = True
     DATABASE_PATH = ':memory:'
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # TEST_DATABASE_URL로 로컬 PostgreSQL 등에서도 같은 방식으로 테스트 가능
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL', 'sqlite:///:memory:')
+    SQLITE_PROFILE = 'default'
@@ -1,22 +1,270 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, insert, inspect, text
+from sqlalchemy.schema import CreateTable, CreateIndex
+from sqlalchemy.types import Integer
 import os
 
 db = SQLAlchemy()
 
+SQLITE_PROFILE_DEFAULT = 'default'
+SQLITE_PROFILE_PRODUCTION = 'production'
+
+# process_instance_id가 예전에는 process_instance.id 정수 FK로 선언되었던 테이블 (현재는 instance_id 문자열)
+INSTANCE_REFERENCE_TABLES = ('human_task', 'node_instance')
+
+def get_sqlite_pragmas(config):
+    """저장소 프로필에 따라 연결마다 적용할 SQLite PRAGMA 목록"""
+    if config.get('SQLITE_PROFILE', SQLITE_PROFILE_DEFAULT) != SQLITE_PROFILE_PRODUCTION:
+        return []
+    
+    # WAL에서는 읽기가 쓰기를 막지 않고, synchronous=NORMAL은 커밋마다 fsync하지 않음 (체크포인트 시에만)
+    return [
+        ('journal_mode', 'WAL'),
+        ('synchronous', 'NORMAL'),
+        ('busy_timeout', int(config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))),
+        ('cache_size', -int(config.get('SQLITE_CACHE_SIZE_KB', 64 * 1024))),
+        ('mmap_size', int(config.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))),
+        ('temp_store', 'MEMORY')
+    ]
+
+def normalize_database_url(url):
+    """DATABASE_URL 정규화 (Heroku 등에서 쓰는 postgres:// 스킴을 SQLAlchemy 스킴으로 변환)"""
+    if url and url.startswith('postgres://'):
+        return 'postgresql://' + url[len('postgres://'):]
+    return url
+
+def is_sqlite_uri(uri):
+    """SQLite 연결 문자열 여부"""
+    return (uri or '').startswith('sqlite')
+
+def configure_engine_options(app):
+    """연결 풀 크기 및 드라이버 연결 옵션 설정 (db.init_app 이전에 호출)"""
+    uri = normalize_database_url(app.config.get('SQLALCHEMY_DATABASE_URI', ''))
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    
+    # 메모리 DB는 단일 연결 풀을 사용하므로 풀 크기를 지정하지 않음
+    if is_sqlite_uri(uri) and (':memory:' in uri or uri.rstrip('/') == 'sqlite:'):
+        return
+    
+    options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+    options.setdefault('pool_size', app.config.get('DB_POOL_SIZE', 10))
+    options.setdefault('max_overflow', app.config.get('DB_MAX_OVERFLOW', 20))
+    options.setdefault('pool_timeout', app.config.get('DB_POOL_TIMEOUT', 30))
+    
+    # 서버 DB는 끊어진 연결을 풀에서 꺼내기 전에 확인하고, 서버/프록시 유휴 제한 전에 재연결
+    if not is_sqlite_uri(uri):
+        options.setdefault('pool_pre_ping', app.config.get('DB_POOL_PRE_PING', True))
+        options.setdefault('pool_recycle', app.config.get('DB_POOL_RECYCLE', 1800))
+        return
+    
+    connect_args = options.setdefault('connect_args', {})
+    connect_args.setdefault('timeout', app.config.get('SQLITE_BUSY_TIMEOUT_MS', 5000) / 1000)
+    connect_args.setdefault('check_same_thread', False)
+
+def register_sqlite_pragmas(engine, pragmas):
+    """새 연결이 생성될 때마다 PRAGMA 적용"""
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+    
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+def bulk_insert(session, model, rows, returning=False):
+    """여러 행을 INSERT 한 번으로 저장 (커밋은 호출자가 수행)
+    
+    returning=True이면 입력 순서대로 생성된 기본 키 목록을 반환합니다.
+    PostgreSQL과 SQLite 3.35 이상에서는 INSERT ... RETURNING 한 번으로 처리하고,
+    지원하지 않는 드라이버에서는 행마다 flush하여 키를 얻습니다.
+    """
+    if not rows:
+        return []
+    
+    if not returning:
+        session.execute(insert(model), rows)
+        return []
+    
+    if session.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+        return list(session.scalars(statement, rows))
+    
+    instances = [model(**row) for row in rows]
+    session.add_all(instances)
+    session.flush()
+    return [instance.id for instance in instances]
+
+def create_missing_indexes():
+    """모델에 선언된 인덱스 중 기존 테이블에 없는 것만 생성 (create_all은 이미 있는 테이블에 인덱스를 추가하지 않음)"""
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+    
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        
+        existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(db.engine)
+                created.append(index.name)
+    
+    return created
+
+def add_missing_columns():
+    """모델에 새로 추가된 컬럼 중 기존 테이블에 없는 것을 NULL 허용 컬럼으로 추가 (create_all은 기존 테이블을 변경하지 않음)"""
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    preparer = db.engine.dialect.identifier_preparer
+    added = []
+    
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns or column.primary_key:
+                    continue
+                
+                # 기존 행은 NULL로 남고, 모델 기본값은 이후 INSERT부터 적용됨
+                ddl = f'{preparer.format_column(column)} {column.type.compile(dialect=db.engine.dialect)}'
+                for foreign_key in column.foreign_keys:
+                    ddl += f' REFERENCES {preparer.quote(foreign_key.column.table.name)}({preparer.quote(foreign_key.column.name)})'
+                
+                connection.execute(text(f'ALTER TABLE {preparer.format_table(table)} ADD COLUMN {ddl}'))
+                added.append(f'{table.name}.{column.name}')
+    
+    return added
+
+def _convert_instance_references_sqlite(table, source_columns):
+    """SQLite는 컬럼 타입/FK를 변경할 수 없어 테이블을 재생성하며 정수 값을 instance_id로 변환"""
+    preparer = db.engine.dialect.identifier_preparer
+    name = preparer.format_table(table)
+    old_name = preparer.quote(f'{table.name}__old')
+    inspector = inspect(db.engine)
+    
+    columns = [column.name for column in table.columns if column.name in source_columns]
+    selected = [
+        "COALESCE((SELECT p.instance_id FROM process_instance p WHERE p.id = o.process_instance_id "
+        "AND typeof(o.process_instance_id) = 'integer'), CAST(o.process_instance_id AS TEXT))"
+        if column == 'process_instance_id' else f'o.{preparer.quote(column)}'
+        for column in columns
+    ]
+    column_list = ', '.join(preparer.quote(column) for column in columns)
+    
+    raw = db.engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        foreign_keys = cursor.execute('PRAGMA foreign_keys').fetchone()[0]
+        
+        # 트랜잭션 밖에서만 변경 가능. legacy_alter_table은 다른 테이블의 FK가 __old 테이블로 바뀌지 않도록 함
+        cursor.execute('PRAGMA foreign_keys=OFF')
+        cursor.execute('PRAGMA legacy_alter_table=ON')
+        try:
+            cursor.execute('BEGIN')
+            for index in inspector.get_indexes(table.name):
+                cursor.execute(f'DROP INDEX {preparer.quote(index["name"])}')
+            cursor.execute(f'ALTER TABLE {name} RENAME TO {old_name}')
+            cursor.execute(str(CreateTable(table).compile(dialect=db.engine.dialect)))
+            for index in table.indexes:
+                cursor.execute(str(CreateIndex(index).compile(dialect=db.engine.dialect)))
+            cursor.execute(f'INSERT INTO {name} ({column_list}) SELECT {", ".join(selected)} FROM {old_name} o')
+            cursor.execute(f'DROP TABLE {old_name}')
+            raw.commit()
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            cursor.execute('PRAGMA legacy_alter_table=OFF')
+            cursor.execute(f'PRAGMA foreign_keys={"ON" if foreign_keys else "OFF"}')
+    finally:
+        raw.close()
+
+def _convert_instance_references_postgresql(table, foreign_keys):
+    """FK 제거 후 문자열 타입으로 변경하고 process_instance.id 값을 instance_id로 치환"""
+    preparer = db.engine.dialect.identifier_preparer
+    name = preparer.format_table(table)
+    column_type = table.c.process_instance_id.type.compile(dialect=db.engine.dialect)
+    
+    with db.engine.begin() as connection:
+        for foreign_key in foreign_keys:
+            connection.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT {preparer.quote(foreign_key["name"])}'))
+        
+        connection.execute(text(
+            f'ALTER TABLE {name} ALTER COLUMN process_instance_id TYPE {column_type} USING process_instance_id::text'
+        ))
+        connection.execute(text(
+            f'UPDATE {name} SET process_instance_id = p.instance_id FROM process_instance p '
+            f'WHERE {name}.process_instance_id = p.id::text'
+        ))
+
+def convert_instance_references():
+    """process_instance_id가 정수 FK로 남아 있는 기존 테이블을 instance_id 문자열 컬럼으로 변환"""
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    converted = []
+    
+    for table_name in INSTANCE_REFERENCE_TABLES:
+        if table_name not in existing_tables:
+            continue
+        
+        source_columns = {column['name']: column for column in inspector.get_columns(table_name)}
+        column = source_columns.get('process_instance_id')
+        if column is None or not isinstance(column['type'], Integer):
+            continue
+        
+        table = db.metadata.tables[table_name]
+        if db.engine.dialect.name == 'sqlite':
+            _convert_instance_references_sqlite(table, source_columns)
+        elif db.engine.dialect.name == 'postgresql':
+            foreign_keys = [
+                foreign_key for foreign_key in inspector.get_foreign_keys(table_name)
+                if foreign_key['constrained_columns'] == ['process_instance_id']
+            ]
+            _convert_instance_references_postgresql(table, foreign_keys)
+        else:
+            continue
+        
+        converted.append(table_name)
+    
+    return converted
+
 def init_db(app):
     """데이터베이스 초기화"""
+    configure_engine_options(app)
     db.init_app(app)
     
     with app.app_context():
-        # 데이터베이스 파일 디렉토리 생성
+        register_sqlite_pragmas(db.engine, get_sqlite_pragmas(app.config))
+        
+        # 데이터베이스 파일 디렉토리 생성 (SQLite 파일 DB인 경우)
         db_path = app.config['DATABASE_PATH']
-        if db_path != ':memory:':
-            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        if is_sqlite_uri(app.config['SQLALCHEMY_DATABASE_URI']):
+            if db_path != ':memory:':
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        else:
+            db_path = db.engine.url.render_as_string(hide_password=True)
         
-        # 테이블 생성
+        # 테이블 생성, 예전 타입 컬럼 변환, 누락된 컬럼 및 인덱스 생성
         db.create_all()
+        converted_tables = convert_instance_references()
+        added_columns = add_missing_columns()
+        created_indexes = create_missing_indexes()
         
         print(f"Database initialized at: {db_path}")
+        if converted_tables:
+            print(f"Converted process instance references: {', '.join(converted_tables)}")
+        if added_columns:
+            print(f"Added columns: {', '.join(added_columns)}")
+        if created_indexes:
+            print(f"Created indexes: {', '.join(created_indexes)}")
 
 def get_db():
     """데이터베이스 인스턴스 반환"""
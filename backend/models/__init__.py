@@ -1,5 +1,5 @@
 from .workflow import Workflow, WorkflowNode, WorkflowEdge
-from .application import Application, ApplicationLog
+from .application import Application, ApplicationLog, ApplicationTrace
 from .rule import Rule
 from .decision_tree import DecisionTree, DecisionTreeNode
 from .scorecard import Scorecard, ScorecardCharacteristic, ScorecardAttribute
@@ -11,9 +11,13 @@ from .process_definition import ProcessDefinition
 from .process_instance import ProcessInstance
 from .human_task import HumanTask
 from .task_assignment import TaskAssignment
+from .task_candidate import TaskCandidate
 from .node_instance import NodeInstance
 from .process_variable import ProcessVariable
 from .audit_log import AuditLog
+from .execution_job import ExecutionJob
+from .bulk_execution import BulkExecutionRun
+from .simulation_run import SimulationRun
 
 __all__ = [
     'Workflow',
@@ -21,6 +25,7 @@ __all__ = [
     'WorkflowEdge',
     'Application',
     'ApplicationLog',
+    'ApplicationTrace',
     'Rule',
     'DecisionTree',
     'DecisionTreeNode',
@@ -37,7 +42,11 @@ __all__ = [
     'ProcessInstance',
     'HumanTask',
     'TaskAssignment',
+    'TaskCandidate',
     'NodeInstance',
     'ProcessVariable',
-    'AuditLog'
+    'AuditLog',
+    'ExecutionJob',
+    'BulkExecutionRun',
+    'SimulationRun'
 ]
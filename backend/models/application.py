@@ -1,10 +1,15 @@
-from database import db
+from backend.database import db
+from backend.utils.trace_codec import decode_payload, apply_delta, ENCODING_ZLIB_JSON
 from datetime import datetime
 import json
 
 class Application(db.Model):
     """신청서 모델"""
     __tablename__ = 'applications'
+    __table_args__ = (
+        db.Index('idx_applications_status_created', 'status', 'created_at'),  # 상태별 목록 (최신순 페이지네이션)
+        db.Index('idx_applications_created_at', 'created_at'),  # 전체 목록 (최신순 페이지네이션)
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     workflow_id = db.Column(db.Integer, db.ForeignKey('workflows.id'), nullable=False)
@@ -20,6 +25,7 @@ class Application(db.Model):
     
     # 관계
     logs = db.relationship('ApplicationLog', backref='application', lazy=True, cascade='all, delete-orphan')
+    traces = db.relationship('ApplicationTrace', backref='application', lazy=True, cascade='all, delete-orphan')
     
     def to_dict(self):
         return {
@@ -36,33 +42,77 @@ class Application(db.Model):
             'completed_at': self.completed_at.isoformat() if self.completed_at else None
         }
 
+class ApplicationTrace(db.Model):
+    """신청서 실행 트레이스 모델 (실행 1회당 입력 스냅샷을 한 번만 압축 저장)"""
+    __tablename__ = 'application_traces'
+    
+    id = db.Column(db.String(32), primary_key=True)  # 실행 시 생성하는 UUID (일괄 저장 시에도 미리 알 수 있도록)
+    application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=False, index=True)
+    encoding = db.Column(db.String(20), default=ENCODING_ZLIB_JSON)
+    input_snapshot = db.deferred(db.Column(db.LargeBinary))  # 압축된 입력 스냅샷
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def get_snapshot(self):
+        return decode_payload(self.input_snapshot, self.encoding)
+
 class ApplicationLog(db.Model):
-    """신청서 실행 로그 모델"""
+    """신청서 실행 로그 모델
+    
+    신규 로그는 노드별 출력과 입력 변경분만 압축(payload)해 저장하고,
+    입력 원본은 트레이스 스냅샷을 참조합니다. input_data/output_data는 이전 로그 호환용입니다.
+    """
     __tablename__ = 'application_logs'
+    __table_args__ = (
+        db.Index('idx_application_logs_application_created', 'application_id', 'created_at'),  # 신청서별 로그 (시간순)
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=False)
+    trace_id = db.Column(db.String(32), db.ForeignKey('application_traces.id'))
     node_id = db.Column(db.String(100))
     node_type = db.Column(db.String(50))
     action = db.Column(db.String(100))
-    input_data = db.Column(db.Text)  # JSON 형태
-    output_data = db.Column(db.Text)  # JSON 형태
+    input_data = db.deferred(db.Column(db.Text))  # JSON 형태 (이전 형식)
+    output_data = db.deferred(db.Column(db.Text))  # JSON 형태 (이전 형식)
+    payload = db.deferred(db.Column(db.LargeBinary))  # 압축된 {output, input_delta}
+    encoding = db.Column(db.String(20))
     status = db.Column(db.String(50))  # success, error, skipped
     error_message = db.Column(db.Text)
     execution_time = db.Column(db.Float)  # 실행 시간 (초)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    def to_dict(self):
-        return {
+    def to_dict(self, include_payload=True, snapshot=None):
+        """로그 직렬화 (include_payload=False면 압축 페이로드를 읽지 않음)"""
+        data = {
             'id': self.id,
             'application_id': self.application_id,
+            'trace_id': self.trace_id,
             'node_id': self.node_id,
             'node_type': self.node_type,
             'action': self.action,
-            'input_data': json.loads(self.input_data) if self.input_data else {},
-            'output_data': json.loads(self.output_data) if self.output_data else {},
             'status': self.status,
             'error_message': self.error_message,
             'execution_time': self.execution_time,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+        
+        if include_payload:
+            data['input_data'], data['output_data'] = self.get_payload(snapshot)
+        
+        return data
+    
+    def get_payload(self, snapshot=None):
+        """입력/출력 데이터 복원 (트레이스 스냅샷 + 변경분)"""
+        if self.payload is None:
+            return (
+                json.loads(self.input_data) if self.input_data else {},
+                json.loads(self.output_data) if self.output_data else {}
+            )
+        
+        payload = decode_payload(self.payload, self.encoding or ENCODING_ZLIB_JSON)
+        
+        if snapshot is None and self.trace_id:
+            trace = ApplicationTrace.query.get(self.trace_id)
+            snapshot = trace.get_snapshot() if trace else {}
+        
+        return apply_delta(snapshot or {}, payload.get('input_delta')), payload.get('output', {})
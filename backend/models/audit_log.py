@@ -5,6 +5,10 @@ import json
 
 class AuditLog(db.Model):
     __tablename__ = 'audit_log'
+    __table_args__ = (
+        db.Index('idx_audit_log_process_timestamp', 'process_instance_id', 'timestamp'),
+        db.Index('idx_audit_log_task_timestamp', 'task_id', 'timestamp'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     process_instance_id = db.Column(db.String(255))
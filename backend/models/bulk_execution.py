@@ -0,0 +1,45 @@
+from backend.database import db
+from datetime import datetime
+import json
+
+class BulkExecutionRun(db.Model):
+    """신청서 일괄 실행 이력 모델 (진행 상황 및 재개 체크포인트)"""
+    __tablename__ = 'bulk_execution_runs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.String(50), default='running')  # running, completed, failed
+    filters = db.Column(db.Text)  # JSON 형태의 대상 신청서 필터
+    chunk_size = db.Column(db.Integer)
+    workers = db.Column(db.Integer)
+    total = db.Column(db.Integer, default=0)
+    processed = db.Column(db.Integer, default=0)
+    succeeded = db.Column(db.Integer, default=0)
+    failed = db.Column(db.Integer, default=0)
+    last_application_id = db.Column(db.Integer, default=0)  # 마지막으로 저장된 신청서 ID (재개 지점)
+    lease_owner = db.Column(db.String(255))  # 실행 중인 프로세스 식별자 (중복 실행 방지)
+    heartbeat_at = db.Column(db.DateTime)  # 실행 중인 프로세스가 마지막으로 청크를 저장한 시각
+    error_message = db.Column(db.Text)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'filters': json.loads(self.filters) if self.filters else {},
+            'chunk_size': self.chunk_size,
+            'workers': self.workers,
+            'total': self.total,
+            'processed': self.processed,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'progress': round(self.processed / self.total * 100, 2) if self.total else 100.0,
+            'last_application_id': self.last_application_id,
+            'lease_owner': self.lease_owner,
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            'error_message': self.error_message,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+        }
@@ -44,6 +44,7 @@ class DecisionTableRule(db.Model):
     priority = db.Column(db.Integer, default=0)
     enabled = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def to_dict(self):
         return {
@@ -54,5 +55,6 @@ class DecisionTableRule(db.Model):
             'actions': json.loads(self.actions) if self.actions else {},
             'priority': self.priority,
             'enabled': self.enabled,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -16,6 +16,7 @@ class DecisionTree(db.Model):
     min_samples_leaf = db.Column(db.Integer, default=1)
     status = db.Column(db.String(50), default='draft')
     training_accuracy = db.Column(db.Float)
+    feature_encodings = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -33,10 +34,14 @@ class DecisionTree(db.Model):
             'min_samples_leaf': self.min_samples_leaf,
             'status': self.status,
             'training_accuracy': self.training_accuracy,
+            'feature_encodings': self.get_feature_encodings(),
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'nodes': [node.to_dict() for node in self.nodes]
         }
+    
+    def get_feature_encodings(self):
+        return json.loads(self.feature_encodings) if self.feature_encodings else None
 
 
 class DecisionTreeNode(db.Model):
@@ -5,9 +5,12 @@ import json
 
 class DeployedAPI(db.Model):
     __tablename__ = 'deployed_api'
+    __table_args__ = (
+        db.Index('idx_deployed_api_path_status', 'api_path', 'status'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    workflow_id = db.Column(db.Integer, db.ForeignKey('workflow.id'), nullable=False)
+    workflow_id = db.Column(db.Integer, db.ForeignKey('workflows.id'), nullable=False)
     api_name = db.Column(db.String(255), nullable=False, unique=True)
     api_path = db.Column(db.String(255), nullable=False, unique=True)
     version = db.Column(db.String(50), default='1.0.0')
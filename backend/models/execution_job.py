@@ -0,0 +1,44 @@
+from datetime import datetime
+from backend.database import db
+import json
+
+
+class ExecutionJob(db.Model):
+    __tablename__ = 'execution_job'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    instance_id = db.Column(db.String(255), nullable=False, unique=True)
+    deployed_api_id = db.Column(db.Integer, db.ForeignKey('deployed_api.id'), nullable=False)
+    workflow_id = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(50), default='PENDING')
+    input_data = db.Column(db.Text)
+    result = db.Column(db.Text)
+    error_message = db.Column(db.Text)
+    callback_url = db.Column(db.String(1024))
+    callback_status = db.Column(db.String(50))
+    callback_attempts = db.Column(db.Integer, default=0)
+    submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+    duration_ms = db.Column(db.Integer)
+    
+    deployed_api = db.relationship('DeployedAPI', lazy=True)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'instance_id': self.instance_id,
+            'deployed_api_id': self.deployed_api_id,
+            'workflow_id': self.workflow_id,
+            'status': self.status,
+            'input': json.loads(self.input_data) if self.input_data else {},
+            'result': json.loads(self.result) if self.result else None,
+            'error_message': self.error_message,
+            'callback_url': self.callback_url,
+            'callback_status': self.callback_status,
+            'callback_attempts': self.callback_attempts,
+            'submitted_at': self.submitted_at.isoformat() if self.submitted_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'duration_ms': self.duration_ms
+        }
@@ -5,9 +5,13 @@ import json
 
 class HumanTask(db.Model):
     __tablename__ = 'human_task'
+    __table_args__ = (
+        db.Index('idx_human_task_status_assignee', 'status', 'assignee'),
+        db.Index('idx_human_task_process_created', 'process_instance_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    process_instance_id = db.Column(db.Integer, db.ForeignKey('process_instance.id'), nullable=False)
+    process_instance_id = db.Column(db.String(255), nullable=False)
     task_id = db.Column(db.String(255), nullable=False, unique=True)
     name = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text)
@@ -26,6 +30,7 @@ class HumanTask(db.Model):
     completed_at = db.Column(db.DateTime)
     
     assignments = db.relationship('TaskAssignment', backref='task', lazy=True, cascade='all, delete-orphan')
+    candidates = db.relationship('TaskCandidate', backref='task', lazy=True, cascade='all, delete-orphan')
     
     def to_dict(self):
         return {
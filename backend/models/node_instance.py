@@ -5,9 +5,12 @@ import json
 
 class NodeInstance(db.Model):
     __tablename__ = 'node_instance'
+    __table_args__ = (
+        db.Index('idx_node_instance_process_trigger', 'process_instance_id', 'trigger_time'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    process_instance_id = db.Column(db.Integer, db.ForeignKey('process_instance.id'), nullable=False)
+    process_instance_id = db.Column(db.String(255), nullable=False)
     node_id = db.Column(db.String(255), nullable=False)
     node_name = db.Column(db.String(255))
     node_type = db.Column(db.String(50), nullable=False)
@@ -20,8 +20,20 @@ class ProcessInstance(db.Model):
     super_process_instance_id = db.Column(db.String(255))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    node_instances = db.relationship('NodeInstance', backref='process_instance', lazy=True, cascade='all, delete-orphan')
-    tasks = db.relationship('HumanTask', backref='process_instance', lazy=True)
+    # keyed by instance_id: direct workflow executions record nodes and tasks without a process_instance row
+    node_instances = db.relationship(
+        'NodeInstance',
+        primaryjoin='ProcessInstance.instance_id == foreign(NodeInstance.process_instance_id)',
+        backref='process_instance',
+        lazy=True,
+        cascade='all, delete-orphan'
+    )
+    tasks = db.relationship(
+        'HumanTask',
+        primaryjoin='ProcessInstance.instance_id == foreign(HumanTask.process_instance_id)',
+        backref='process_instance',
+        lazy=True
+    )
     
     def to_dict(self):
         return {
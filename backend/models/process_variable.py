@@ -5,6 +5,9 @@ import json
 
 class ProcessVariable(db.Model):
     __tablename__ = 'process_variable'
+    __table_args__ = (
+        db.Index('idx_process_variable_process_name', 'process_instance_id', 'name'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     process_instance_id = db.Column(db.String(255), nullable=False)
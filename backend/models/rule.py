@@ -1,4 +1,4 @@
-from database import db
+from backend.database import db
 from datetime import datetime
 import json
 
@@ -14,7 +14,7 @@ class RuleSet(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    rules = db.relationship('Rule', backref='rule_set', lazy=True, cascade='all, delete-orphan')
+    rules = db.relationship('backend.models.rule_set.Rule', backref='rule_set', lazy=True, cascade='all, delete-orphan')
     
     def to_dict(self):
         return {
@@ -40,7 +40,8 @@ class Rule(db.Model):
     action = db.Column(db.Text, nullable=False)
     priority = db.Column(db.Integer, default=0)
     enabled = db.Column(db.Boolean, default=True)
-    metadata = db.Column(db.Text)
+    # 'metadata' is reserved by the declarative base, so the column keeps its name under another attribute
+    rule_metadata = db.Column('metadata', db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -54,7 +55,7 @@ class Rule(db.Model):
             'action': self.action,
             'priority': self.priority,
             'enabled': self.enabled,
-            'metadata': json.loads(self.metadata) if self.metadata else {},
+            'metadata': json.loads(self.rule_metadata) if self.rule_metadata else {},
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -0,0 +1,49 @@
+from datetime import datetime
+from backend.database import db
+import json
+
+
+class SimulationRun(db.Model):
+    __tablename__ = 'simulation_run'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    workflow_id = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(50), default='PENDING')
+    config = db.Column(db.Text)
+    seed = db.Column(db.String(64))
+    num_instances = db.Column(db.Integer, nullable=False)
+    shard_size = db.Column(db.Integer)
+    num_shards = db.Column(db.Integer, default=0)
+    completed_shards = db.Column(db.Integer, default=0)
+    workers = db.Column(db.Integer)
+    result = db.Column(db.Text)
+    error_message = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+    duration_ms = db.Column(db.Integer)
+    
+    def to_dict(self, include_result=True):
+        data = {
+            'id': self.id,
+            'workflow_id': self.workflow_id,
+            'status': self.status,
+            'config': json.loads(self.config) if self.config else {},
+            'seed': self.seed,
+            'num_instances': self.num_instances,
+            'shard_size': self.shard_size,
+            'num_shards': self.num_shards,
+            'completed_shards': self.completed_shards,
+            'workers': self.workers,
+            'progress': round(self.completed_shards / self.num_shards * 100, 2) if self.num_shards else 0.0,
+            'error_message': self.error_message,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'duration_ms': self.duration_ms
+        }
+        
+        if include_result:
+            data['result'] = json.loads(self.result) if self.result else None
+        
+        return data
@@ -0,0 +1,35 @@
+from datetime import datetime
+from backend.database import db
+
+
+CANDIDATE_ASSIGNEE = 'ASSIGNEE'
+CANDIDATE_USER = 'USER'
+CANDIDATE_GROUP = 'GROUP'
+
+
+class TaskCandidate(db.Model):
+    __tablename__ = 'task_candidate'
+    __table_args__ = (
+        db.Index('idx_task_candidate_inbox', 'candidate_type', 'candidate_id', 'status', 'priority', 'created_at'),
+        db.Index('idx_task_candidate_task', 'task_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, db.ForeignKey('human_task.id'), nullable=False)
+    candidate_type = db.Column(db.String(20), nullable=False)
+    candidate_id = db.Column(db.String(100), nullable=False)
+    # copied from the task so the inbox can filter and order inside the index
+    status = db.Column(db.String(50))
+    priority = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'task_id': self.task_id,
+            'candidate_type': self.candidate_type,
+            'candidate_id': self.candidate_id,
+            'status': self.status,
+            'priority': self.priority,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
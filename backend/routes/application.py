@@ -1,12 +1,15 @@
 from flask import Blueprint, request, jsonify
-from models.application import Application, ApplicationLog
-from services.workflow_service import WorkflowService
-from services.engine_service import EngineService
-from database import db
+from backend.models.application import Application, ApplicationLog, ApplicationTrace
+from sqlalchemy.orm import undefer
+from backend.services.workflow_service import WorkflowService
+from backend.services.engine_service import EngineService
+from backend.services.bulk_execution_service import BulkExecutionService
+from backend.database import db
 
 bp = Blueprint('application', __name__)
 workflow_service = WorkflowService()
 engine_service = EngineService()
+bulk_execution_service = BulkExecutionService()
 
 @bp.route('/', methods=['GET'])
 def get_applications():
@@ -107,18 +110,149 @@ def execute_application(application_id):
             'error': str(e)
         }), 400
 
+@bp.route('/bulk-execute', methods=['POST'])
+def bulk_execute_applications():
+    """신청서 일괄 실행 시작 (백그라운드)"""
+    try:
+        data = request.json or {}
+        
+        run = bulk_execution_service.create_run(
+            status=data.get('status', 'pending'),
+            workflow_id=data.get('workflow_id'),
+            chunk_size=data.get('chunk_size'),
+            workers=data.get('workers')
+        )
+        bulk_execution_service.start_background(run.id)
+        
+        return jsonify({
+            'success': True,
+            'data': run.to_dict()
+        }), 202
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@bp.route('/bulk-execute/<int:run_id>', methods=['GET'])
+def get_bulk_execution(run_id):
+    """일괄 실행 진행 상황 조회"""
+    run = bulk_execution_service.get_run(run_id)
+    if not run:
+        return jsonify({
+            'success': False,
+            'error': '일괄 실행 이력을 찾을 수 없습니다.'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'data': run.to_dict()
+    }), 200
+
+@bp.route('/bulk-execute/<int:run_id>/resume', methods=['POST'])
+def resume_bulk_execution(run_id):
+    """중단된 일괄 실행 재개"""
+    run = bulk_execution_service.get_run(run_id)
+    if not run:
+        return jsonify({
+            'success': False,
+            'error': '일괄 실행 이력을 찾을 수 없습니다.'
+        }), 404
+    
+    if run.status == 'completed':
+        return jsonify({
+            'success': False,
+            'error': '이미 완료된 일괄 실행입니다.'
+        }), 400
+    
+    # 실행 권한을 먼저 획득해 동시에 들어온 재개 요청이나 아직 실행 중인 프로세스와 중복 실행하지 않음
+    owner = bulk_execution_service.new_lease_owner()
+    if not bulk_execution_service.claim_run(run.id, owner):
+        return jsonify({
+            'success': False,
+            'error': '이미 실행 중인 일괄 실행입니다.'
+        }), 409
+    
+    bulk_execution_service.start_background(run.id, owner)
+    
+    return jsonify({
+        'success': True,
+        'data': run.to_dict()
+    }), 202
+
 @bp.route('/<int:application_id>/logs', methods=['GET'])
 def get_application_logs(application_id):
-    """신청서 실행 로그 조회"""
+    """신청서 실행 로그 조회
+    
+    기본적으로 메타데이터만 반환하며, include_payload=true일 때만 압축된 입력/출력을 복원합니다.
+    page 파라미터가 있으면 페이지 단위로 조회합니다.
+    """
     try:
-        logs = ApplicationLog.query.filter_by(application_id=application_id)\
-            .order_by(ApplicationLog.created_at.asc()).all()
-        return jsonify({
+        include_payload = request.args.get('include_payload', 'false').lower() == 'true'
+        page = request.args.get('page', None, type=int)
+        per_page = request.args.get('per_page', 100, type=int)
+        
+        query = ApplicationLog.query.filter_by(application_id=application_id)\
+            .order_by(ApplicationLog.created_at.asc(), ApplicationLog.id.asc())
+        
+        if include_payload:
+            query = query.options(
+                undefer(ApplicationLog.payload),
+                undefer(ApplicationLog.input_data),
+                undefer(ApplicationLog.output_data)
+            )
+        
+        pagination = None
+        if page:
+            pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+            logs = pagination.items
+        else:
+            logs = query.all()
+        
+        # 트레이스 스냅샷은 트레이스당 한 번만 복원
+        snapshots = {}
+        if include_payload:
+            trace_ids = set(log.trace_id for log in logs if log.trace_id)
+            if trace_ids:
+                traces = ApplicationTrace.query.options(undefer(ApplicationTrace.input_snapshot))\
+                    .filter(ApplicationTrace.id.in_(trace_ids)).all()
+                snapshots = {trace.id: trace.get_snapshot() for trace in traces}
+        
+        response = {
             'success': True,
-            'data': [log.to_dict() for log in logs]
-        }), 200
+            'data': [
+                log.to_dict(include_payload, snapshots.get(log.trace_id, {}))
+                for log in logs
+            ]
+        }
+        
+        if pagination:
+            response['pagination'] = {
+                'page': page,
+                'per_page': per_page,
+                'total': pagination.total,
+                'pages': pagination.pages
+            }
+        
+        return jsonify(response), 200
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
+
+@bp.route('/<int:application_id>/logs/<int:log_id>', methods=['GET'])
+def get_application_log(application_id, log_id):
+    """실행 로그 단건 조회 (입력/출력 페이로드 포함)"""
+    log = ApplicationLog.query.filter_by(id=log_id, application_id=application_id).first()
+    if not log:
+        return jsonify({
+            'success': False,
+            'error': '실행 로그를 찾을 수 없습니다.'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'data': log.to_dict()
+    }), 200
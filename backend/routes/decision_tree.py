@@ -1,9 +1,12 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from backend.database import db
 from backend.models.decision_tree import DecisionTree, DecisionTreeNode
 from backend.services.decision_tree_service import DecisionTreeService
+from backend.services.training_data_service import (
+    TrainingDataService, TrainingDataError, DEFAULT_CHUNK_SIZE, FORMAT_PARQUET, MISSING_MEDIAN
+)
+from datetime import datetime
 import json
-import numpy as np
 
 decision_tree_bp = Blueprint('decision_tree', __name__)
 
@@ -79,24 +82,97 @@ def delete_tree(tree_id):
     db.session.delete(tree)
     db.session.commit()
     
+    DecisionTreeService.invalidate_compiled_tree(tree_id)
+    
     return jsonify({'message': 'Decision tree deleted successfully'})
 
 
+def load_training_data(tree):
+    # multipart upload (file + form options), server-side file (source) or inline JSON rows
+    uploaded = request.files.get('file')
+    options = request.form if uploaded else (request.get_json(silent=True) or {})
+    
+    features = TrainingDataService.parse_feature_list(options.get('features'))
+    if not features:
+        raise TrainingDataError('Training data and features are required')
+    
+    columns = features + [tree.target_variable]
+    chunk_size = current_app.config.get('TRAINING_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+    source = options.get('source')
+    
+    if uploaded:
+        data_file = uploaded.stream
+        fmt = TrainingDataService.detect_format(uploaded.filename, options.get('format'))
+    elif source:
+        if not isinstance(source, dict):
+            raise TrainingDataError("source must be an object with 'path' and optional 'format'")
+        data_file = TrainingDataService.resolve_path(source.get('path', ''), current_app.config.get('TRAINING_DATA_DIR'))
+        fmt = TrainingDataService.detect_format(data_file, source.get('format'))
+    else:
+        training_data = options.get('training_data', [])
+        if not training_data:
+            raise TrainingDataError('Training data and features are required')
+        data_file = fmt = None
+    
+    def open_chunks(chunk_columns):
+        if fmt is None:
+            return TrainingDataService.iter_record_chunks(training_data, chunk_columns, chunk_size)
+        if uploaded:
+            data_file.seek(0)
+        if fmt == FORMAT_PARQUET:
+            return TrainingDataService.iter_parquet_chunks(data_file, chunk_columns, chunk_size)
+        return TrainingDataService.iter_csv_chunks(data_file, chunk_columns, chunk_size)
+    
+    # feature types are decided over the whole file, so a category first seen in a late chunk is not read as an invalid number
+    categorical_features = set(TrainingDataService.parse_feature_list(options.get('categorical_features')))
+    undecided = [f for f in features if f not in categorical_features]
+    
+    if undecided and fmt == FORMAT_PARQUET:
+        if uploaded:
+            data_file.seek(0)
+        numeric = TrainingDataService.parquet_numeric_columns(data_file, undecided)
+        undecided = [f for f in undecided if f not in numeric]
+    
+    if undecided:
+        scan = open_chunks(undecided)
+        try:
+            categorical_features |= TrainingDataService.scan_categorical_features(scan, undecided)
+        finally:
+            if hasattr(scan, 'close'):
+                scan.close()
+    
+    chunks = open_chunks(columns)
+    
+    sample_size = options.get('sample_size')
+    seed = options.get('seed')
+    
+    try:
+        return TrainingDataService.load(
+            chunks, features, tree.target_variable,
+            categorical_features=categorical_features,
+            missing=options.get('missing', MISSING_MEDIAN),
+            sample_size=int(sample_size) if sample_size else None,
+            seed=int(seed) if seed not in (None, '') else None
+        )
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
 @decision_tree_bp.route('/decision-tree/<int:tree_id>/train', methods=['POST'])
 def train_tree(tree_id):
     tree = DecisionTree.query.get(tree_id)
     if not tree:
         return jsonify({'error': 'Decision tree not found'}), 404
     
-    data = request.json
-    training_data = data.get('training_data', [])
-    features = data.get('features', [])
-    
-    if not training_data or not features:
-        return jsonify({'error': 'Training data and features are required'}), 400
+    try:
+        training = load_training_data(tree)
+    except TrainingDataError as e:
+        return jsonify({'error': str(e)}), 400
+    except (ValueError, json.JSONDecodeError) as e:
+        return jsonify({'error': f'Invalid training options: {str(e)}'}), 400
     
-    X = np.array([[row[f] for f in features] for row in training_data])
-    y = np.array([row[tree.target_variable] for row in training_data])
+    X, y, features = training.X, training.y, training.features
     
     tree_dict = DecisionTreeService.build_tree(
         X, y, features,
@@ -107,6 +183,7 @@ def train_tree(tree_id):
     )
     
     DecisionTreeNode.query.filter_by(tree_id=tree_id).delete()
+    DecisionTreeService.invalidate_compiled_tree(tree_id)
     
     def save_nodes(node_dict, parent_id=None, position_x=0, position_y=0):
         node = DecisionTreeNode(
@@ -136,13 +213,16 @@ def train_tree(tree_id):
     
     accuracy = DecisionTreeService.calculate_accuracy(tree_dict, X, y, features)
     tree.training_accuracy = accuracy
+    tree.feature_encodings = json.dumps(training.encodings) if training.encodings else None
     tree.status = 'trained'
+    tree.updated_at = datetime.utcnow()
     
     db.session.commit()
     
     return jsonify({
         'message': 'Tree trained successfully',
         'accuracy': accuracy,
+        'data_summary': training.stats,
         'tree': tree.to_dict()
     })
 
@@ -159,9 +239,9 @@ def predict(tree_id):
     data = request.json
     input_data = data.get('input', {})
     
-    tree_dict = build_tree_dict(tree.nodes)
+    compiled = DecisionTreeService.get_compiled_tree(tree)
     
-    prediction = DecisionTreeService.predict(tree_dict, input_data)
+    prediction = DecisionTreeService.predict_compiled(compiled, input_data)
     
     return jsonify({
         'prediction': prediction,
@@ -169,37 +249,25 @@ def predict(tree_id):
     })
 
 
-def build_tree_dict(nodes):
-    if not nodes:
-        return None
+@decision_tree_bp.route('/decision-tree/<int:tree_id>/predict-batch', methods=['POST'])
+def predict_batch(tree_id):
+    tree = DecisionTree.query.get(tree_id)
+    if not tree:
+        return jsonify({'error': 'Decision tree not found'}), 404
+    
+    if tree.status != 'trained':
+        return jsonify({'error': 'Tree must be trained before prediction'}), 400
     
-    root_node = next((n for n in nodes if n.parent_id is None or n.node_id == '0'), nodes[0])
+    data = request.json
+    inputs = data.get('inputs', [])
     
-    def build_node(node):
-        node_dict = {
-            'node_id': node.node_id,
-            'is_leaf': node.is_leaf,
-            'samples': node.samples,
-            'gini': node.gini,
-            'entropy': node.entropy,
-            'value': json.loads(node.value) if node.value else {}
-        }
-        
-        if node.is_leaf:
-            node_dict['class_label'] = node.class_label
-        else:
-            node_dict['feature'] = node.feature
-            node_dict['threshold'] = node.threshold
-            node_dict['operator'] = node.operator
-            
-            left_child = next((n for n in nodes if n.node_id == f"{node.node_id}-L"), None)
-            right_child = next((n for n in nodes if n.node_id == f"{node.node_id}-R"), None)
-            
-            if left_child:
-                node_dict['left'] = build_node(left_child)
-            if right_child:
-                node_dict['right'] = build_node(right_child)
-        
-        return node_dict
+    if not isinstance(inputs, list):
+        return jsonify({'error': 'inputs must be a list of objects'}), 400
     
-    return build_node(root_node)
+    compiled = DecisionTreeService.get_compiled_tree(tree)
+    predictions = DecisionTreeService.predict_batch(compiled, inputs)
+    
+    return jsonify({
+        'count': len(predictions),
+        'predictions': predictions
+    })
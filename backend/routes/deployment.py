@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from backend.database import db
 from backend.models.deployed_api import DeployedAPI
 from backend.models.workflow import Workflow
@@ -118,3 +118,43 @@ def execute_test_case(deployment_id, test_case_id):
         return jsonify(result), 400
     
     return jsonify(result)
+
+
+@deployment_bp.route('/deployment/<int:deployment_id>/test-case/execute-all', methods=['POST'])
+def execute_all_test_cases(deployment_id):
+    data = request.json or {}
+    
+    try:
+        workers = int(data['workers']) if data.get('workers') else None
+        timeout = float(data['timeout']) if data.get('timeout') else None
+    except (TypeError, ValueError):
+        return jsonify({'error': 'workers and timeout must be numbers'}), 400
+    
+    if (workers is not None and workers < 1) or (timeout is not None and timeout <= 0):
+        return jsonify({'error': 'workers and timeout must be positive'}), 400
+    
+    fail_fast = bool(data.get('fail_fast', False))
+    persistence = current_app.config.get('NODE_PERSISTENCE_MODE', 'batch')
+    
+    def execute_workflow(workflow_id, input_data):
+        return ProcessInstanceService.execute_workflow_as_process(workflow_id, input_data, db, persistence=persistence)
+    
+    options = {'workers': workers, 'timeout': timeout, 'fail_fast': fail_fast}
+    
+    stream = data.get('stream', request.args.get('stream', 'false').lower() == 'true')
+    if not stream:
+        result = TestingService.execute_all_test_cases(deployment_id, execute_workflow, db, **options)
+        if not result.get('success'):
+            return jsonify(result), 404
+        return jsonify(result)
+    
+    if not DeployedAPI.query.get(deployment_id):
+        return jsonify({'error': 'Deployment not found'}), 404
+    
+    events = TestingService.iter_test_suite(deployment_id, execute_workflow, db, **options)
+    
+    def generate():
+        for event in events:
+            yield json.dumps(event, ensure_ascii=False) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
@@ -1,7 +1,8 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from backend.database import db
 from backend.services.deployment_service import DeploymentService
 from backend.services.process_instance_service import ProcessInstanceService
+from backend.services.execution_job_service import ExecutionJobService
 
 dynamic_api_bp = Blueprint('dynamic_api', __name__)
 
@@ -31,10 +32,33 @@ def execute_dynamic_api(api_name):
     
     input_data = request.json or {}
     
+    if is_async_request():
+        callback_url = request.args.get('callback_url') or request.headers.get('X-Callback-Url')
+        
+        submission = ExecutionJobService.submit_job(deployed_api, input_data, callback_url, db)
+        
+        if not submission.get('success'):
+            status_code = 503 if submission.get('job') else 400
+            return jsonify(submission), status_code
+        
+        job = submission['job']
+        status_url = f"{api_path}/instances/{job['instance_id']}"
+        
+        response = jsonify({
+            'instance_id': job['instance_id'],
+            'status': job['status'],
+            'status_url': status_url,
+            'callback_url': job['callback_url']
+        })
+        response.status_code = 202
+        response.headers['Location'] = status_url
+        return response
+    
     result = ProcessInstanceService.execute_workflow_as_process(
         deployed_api.workflow_id,
         input_data,
-        db
+        db,
+        persistence=current_app.config.get('NODE_PERSISTENCE_MODE', 'batch')
     )
     
     DeploymentService.update_execution_stats(deployed_api.id, db)
@@ -43,3 +67,19 @@ def execute_dynamic_api(api_name):
         return jsonify(result), 500
     
     return jsonify(result)
+
+
+@dynamic_api_bp.route('/execute/<path:api_name>/instances/<instance_id>', methods=['GET'])
+def get_execution_instance(api_name, instance_id):
+    job = ExecutionJobService.get_job(instance_id, db)
+    
+    if not job or job.deployed_api.api_path != f'/api/execute/{api_name}':
+        return jsonify({'error': f'Execution instance not found: {instance_id}'}), 404
+    
+    return jsonify(job.to_dict())
+
+
+def is_async_request():
+    if request.args.get('mode') == 'async':
+        return True
+    return 'respond-async' in request.headers.get('Prefer', '')
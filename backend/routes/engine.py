@@ -1,8 +1,8 @@
 from flask import Blueprint, request, jsonify
-from models.rule import Rule
-from services.engine_service import EngineService
-from services.scoring_service import ScoringService
-from database import db
+from backend.models.rule import Rule
+from backend.services.engine_service import EngineService
+from backend.services.scoring_service import ScoringService
+from backend.database import db
 
 bp = Blueprint('engine', __name__)
 engine_service = EngineService()
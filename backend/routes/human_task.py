@@ -9,8 +9,9 @@ human_task_bp = Blueprint('human_task', __name__)
 def get_my_tasks():
     user_id = request.args.get('user_id', 'user1')
     status = request.args.get('status')
+    groups = [group.strip() for group in request.args.get('groups', '').split(',') if group.strip()]
     
-    tasks = HumanTaskService.get_tasks_for_user(user_id, status, db)
+    tasks = HumanTaskService.get_tasks_for_user(user_id, status, db, groups=groups)
     return jsonify(tasks)
 
 
@@ -32,7 +33,7 @@ def claim_task(task_id):
     if not user_id:
         return jsonify({'error': 'user_id is required'}), 400
     
-    result = HumanTaskService.claim_task(task_id, user_id, db)
+    result = HumanTaskService.claim_task(task_id, user_id, db, groups=data.get('groups'))
     
     if not result.get('success'):
         return jsonify(result), 400
@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from backend.database import db
 from backend.models.process_instance import ProcessInstance
 from backend.services.process_instance_service import ProcessInstanceService
@@ -48,7 +48,12 @@ def execute_process():
     if not workflow_id:
         return jsonify({'error': 'workflow_id is required'}), 400
     
-    result = ProcessInstanceService.execute_workflow_as_process(workflow_id, input_data, db)
+    result = ProcessInstanceService.execute_workflow_as_process(
+        workflow_id,
+        input_data,
+        db,
+        persistence=current_app.config.get('NODE_PERSISTENCE_MODE', 'batch')
+    )
     
     if not result.get('success'):
         return jsonify(result), 500
@@ -0,0 +1,59 @@
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from backend.database import db
+from backend.services.rule_replay_service import RuleReplayService, SOURCE_APPLICATIONS
+import json
+
+rule_replay_bp = Blueprint('rule_replay', __name__)
+
+FILTER_KEYS = ('workflow_id', 'status', 'deployed_api_id', 'min_id', 'max_id', 'limit', 'inputs')
+OPTION_KEYS = ('cutoff', 'decision_field', 'score_field', 'sample_size', 'shift_edges', 'chunk_size')
+
+
+@rule_replay_bp.route('/rules/replay', methods=['POST'])
+def replay_rules():
+    data = request.json or {}
+    
+    rule_type = data.get('rule_type')
+    baseline_id = data.get('baseline_id')
+    candidate_id = data.get('candidate_id')
+    
+    if not rule_type or not baseline_id or not candidate_id:
+        return jsonify({'error': 'rule_type, baseline_id and candidate_id are required'}), 400
+    
+    source = data.get('source', SOURCE_APPLICATIONS)
+    filters = {key: data[key] for key in FILTER_KEYS if data.get(key) is not None}
+    options = {key: data[key] for key in OPTION_KEYS if data.get(key) is not None}
+    
+    try:
+        if 'cutoff' in options:
+            options['cutoff'] = float(options['cutoff'])
+        if 'shift_edges' in options:
+            options['shift_edges'] = [float(edge) for edge in options['shift_edges']]
+        sizes = [int(value) for value in (options.get('sample_size'), options.get('chunk_size'), filters.get('limit')) if value is not None]
+    except (TypeError, ValueError):
+        return jsonify({'error': 'cutoff, shift_edges, sample_size, chunk_size and limit must be numbers'}), 400
+    
+    if any(size < 1 for size in sizes):
+        return jsonify({'error': 'sample_size, chunk_size and limit must be positive'}), 400
+    
+    if data.get('stream'):
+        events = RuleReplayService.iter_replay(rule_type, baseline_id, candidate_id, db, source, filters, options)
+        
+        first = next(events)
+        if first['event'] == 'error':
+            status_code = 404 if 'not found' in first['error'] else 400
+            return jsonify({'error': first['error']}), status_code
+        
+        def generate():
+            yield json.dumps(first, ensure_ascii=False) + '\n'
+            for event in events:
+                yield json.dumps(event, ensure_ascii=False) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
+    result = RuleReplayService.replay(rule_type, baseline_id, candidate_id, db, source, filters, options)
+    if not result['success']:
+        status_code = 404 if 'not found' in result['error'] else 400
+        return jsonify({'error': result['error']}), status_code
+    
+    return jsonify(result)
@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
 from backend.database import db
 from backend.models.scorecard import Scorecard, ScorecardCharacteristic, ScorecardAttribute
-from backend.services.scorecard_service import ScorecardService
+from backend.services.scorecard_service import ScorecardService, BINNING_METHODS, SUPERVISED_BINNING_METHODS
+from datetime import datetime
+import csv
+import io
 import json
 
 scorecard_bp = Blueprint('scorecard', __name__)
@@ -57,8 +60,11 @@ def add_characteristic(scorecard_id):
     )
     
     db.session.add(characteristic)
+    scorecard.updated_at = datetime.utcnow()
     db.session.commit()
     
+    ScorecardService.invalidate_compiled_scorecard(scorecard_id)
+    
     return jsonify(characteristic.to_dict()), 201
 
 
@@ -101,8 +107,11 @@ def add_attribute(char_id):
     )
     
     db.session.add(attribute)
+    scorecard.updated_at = datetime.utcnow()
     db.session.commit()
     
+    ScorecardService.invalidate_compiled_scorecard(scorecard.id)
+    
     return jsonify(attribute.to_dict()), 201
 
 
@@ -115,7 +124,8 @@ def calculate_score(scorecard_id):
     data = request.json
     input_data = data.get('input', {})
     
-    result = ScorecardService.calculate_score(scorecard, input_data)
+    compiled = ScorecardService.get_compiled_scorecard(scorecard)
+    result = ScorecardService.calculate_score_compiled(compiled, input_data)
     
     probability = ScorecardService.calculate_probability(
         result['total_score'],
@@ -132,3 +142,172 @@ def calculate_score(scorecard_id):
         'breakdown': result['breakdown'],
         'input': input_data
     })
+
+
+@scorecard_bp.route('/scorecard/<int:scorecard_id>/calculate-batch', methods=['POST'])
+def calculate_score_batch(scorecard_id):
+    scorecard = Scorecard.query.get(scorecard_id)
+    if not scorecard:
+        return jsonify({'error': 'Scorecard not found'}), 404
+    
+    include_breakdown = request.args.get('include_breakdown', 'true').lower() != 'false'
+    
+    if 'file' in request.files:
+        rows = parse_csv_rows(request.files['file'].read())
+    elif request.mimetype == 'text/csv':
+        rows = parse_csv_rows(request.get_data())
+    else:
+        data = request.json
+        rows = data.get('rows', []) if isinstance(data, dict) else data
+    
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        return jsonify({'error': 'Rows must be a JSON array of objects or a CSV file'}), 400
+    
+    compiled = ScorecardService.get_compiled_scorecard(scorecard)
+    results = ScorecardService.calculate_score_batch(compiled, rows, include_breakdown)
+    
+    return jsonify({
+        'scorecard_id': scorecard_id,
+        'scorecard_name': scorecard.name,
+        'count': len(results),
+        'results': results
+    })
+
+
+@scorecard_bp.route('/scorecard/binning', methods=['POST'])
+def auto_binning():
+    rows, options = read_binning_request()
+    
+    target = options.get('target')
+    if not target:
+        return jsonify({'error': 'Target column is required'}), 400
+    
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        return jsonify({'error': 'Rows must be a JSON array of objects or a CSV file'}), 400
+    
+    features = options.get('features', [])
+    if isinstance(features, str):
+        features = [f.strip() for f in features.split(',') if f.strip()]
+    if not features and rows:
+        features = [column for column in rows[0] if column != target]
+    
+    try:
+        method, max_bins, binning_options = parse_binning_options(options)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    results = ScorecardService.auto_binning_woe_batch(rows, features, target, max_bins, method, **binning_options)
+    
+    return jsonify({
+        'target': target,
+        'count': len(results),
+        'results': sorted(
+            [{'feature': feature, **result} for feature, result in results.items()],
+            key=lambda r: r['iv'],
+            reverse=True
+        )
+    })
+
+
+@scorecard_bp.route('/scorecard/characteristic/<int:char_id>/auto-bin', methods=['POST'])
+def auto_bin_characteristic(char_id):
+    characteristic = ScorecardCharacteristic.query.get(char_id)
+    if not characteristic:
+        return jsonify({'error': 'Characteristic not found'}), 404
+    
+    rows, options = read_binning_request()
+    
+    target = options.get('target')
+    if not target:
+        return jsonify({'error': 'Target column is required'}), 400
+    
+    if not isinstance(rows, list) or not rows or not all(isinstance(row, dict) for row in rows):
+        return jsonify({'error': 'Rows must be a non-empty JSON array of objects or a CSV file'}), 400
+    
+    options = dict(options)
+    options.setdefault('method', 'chi_merge')
+    
+    try:
+        method, max_bins, binning_options = parse_binning_options(options)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    column = options.get('column') or characteristic.name
+    result = ScorecardService.auto_binning_woe_batch(
+        rows, [column], target, max_bins, method, **binning_options
+    )[column]
+    
+    if not result['bins']:
+        return jsonify({'error': f'No numeric values found for column {column}'}), 400
+    
+    scorecard = Scorecard.query.get(characteristic.scorecard_id)
+    
+    ScorecardAttribute.query.filter_by(characteristic_id=char_id).delete()
+    
+    for bin_info in result['bins']:
+        db.session.add(ScorecardAttribute(
+            characteristic_id=char_id,
+            attribute=bin_info['attribute'],
+            min_value=bin_info['min_value'],
+            max_value=bin_info['max_value'],
+            good_count=bin_info['good_count'],
+            bad_count=bin_info['bad_count'],
+            woe=bin_info['woe'],
+            iv=bin_info['iv'],
+            points=ScorecardService.calculate_scorecard_points(
+                bin_info['woe'],
+                characteristic.weight,
+                scorecard.base_score,
+                scorecard.pdo,
+                scorecard.base_odds
+            )
+        ))
+    
+    scorecard.updated_at = datetime.utcnow()
+    db.session.commit()
+    db.session.refresh(characteristic)
+    
+    ScorecardService.invalidate_compiled_scorecard(scorecard.id)
+    
+    return jsonify({
+        'method': method,
+        'iv': result['iv'],
+        'characteristic': characteristic.to_dict()
+    })
+
+
+def read_binning_request():
+    if 'file' in request.files:
+        return parse_csv_rows(request.files['file'].read()), request.form
+    
+    options = request.json or {}
+    return options.get('rows', []), options
+
+
+def parse_binning_options(options):
+    method = options.get('method', 'equal_frequency')
+    if method not in BINNING_METHODS:
+        raise ValueError(f"method must be one of: {', '.join(BINNING_METHODS)}")
+    
+    try:
+        max_bins = int(options.get('max_bins', 10))
+        binning_options = {}
+        
+        if method in SUPERVISED_BINNING_METHODS:
+            binning_options['initial_bins'] = int(options.get('initial_bins', 50))
+            binning_options['min_bin_pct'] = float(options.get('min_bin_pct', 0.05))
+            monotonic = options.get('monotonic', True)
+            binning_options['monotonic'] = monotonic if isinstance(monotonic, bool) else str(monotonic).lower() != 'false'
+    except (TypeError, ValueError):
+        raise ValueError('max_bins, initial_bins and min_bin_pct must be numeric')
+    
+    return method, max_bins, binning_options
+
+
+def parse_csv_rows(raw):
+    text = raw.decode('utf-8-sig') if isinstance(raw, bytes) else raw
+    reader = csv.DictReader(io.StringIO(text))
+    return [
+        {key: (value if value != '' else None) for key, value in row.items()}
+        for row in reader
+    ]
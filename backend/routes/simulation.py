@@ -0,0 +1,53 @@
+from flask import Blueprint, request, jsonify
+from backend.database import db
+from backend.services.simulation_run_service import SimulationRunService
+
+simulation_bp = Blueprint('simulation', __name__)
+
+
+@simulation_bp.route('/simulation/run', methods=['POST'])
+def start_simulation():
+    data = request.json or {}
+    
+    workflow_id = data.get('workflow_id')
+    if not workflow_id:
+        return jsonify({'error': 'workflow_id is required'}), 400
+    
+    created = SimulationRunService.create_run(workflow_id, data, db)
+    if not created['success']:
+        status_code = 404 if created['error'] == 'Workflow not found' else 400
+        return jsonify({'error': created['error']}), status_code
+    
+    run = created['run']
+    SimulationRunService.start_background(run.id, db)
+    
+    status_url = f"/api/simulation/run/{run.id}"
+    
+    response = jsonify({
+        'run': run.to_dict(include_result=False),
+        'status_url': status_url
+    })
+    response.status_code = 202
+    response.headers['Location'] = status_url
+    return response
+
+
+@simulation_bp.route('/simulation/run/<int:run_id>', methods=['GET'])
+def get_simulation(run_id):
+    run = SimulationRunService.get_run(run_id, db)
+    if not run:
+        return jsonify({'error': 'Simulation run not found'}), 404
+    
+    include_result = request.args.get('include_result', 'true').lower() != 'false'
+    
+    return jsonify(run.to_dict(include_result=include_result))
+
+
+@simulation_bp.route('/simulation/run/<int:run_id>/cancel', methods=['POST'])
+def cancel_simulation(run_id):
+    cancelled = SimulationRunService.cancel_run(run_id, db)
+    if not cancelled['success']:
+        status_code = 404 if 'run' not in cancelled else 409
+        return jsonify({'error': cancelled['error']}), status_code
+    
+    return jsonify(cancelled['run'].to_dict(include_result=False))
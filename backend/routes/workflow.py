@@ -1,7 +1,7 @@
 from flask import Blueprint, request, jsonify
-from models.workflow import Workflow, WorkflowNode, WorkflowEdge
-from services.workflow_service import WorkflowService
-from database import db
+from backend.models.workflow import Workflow, WorkflowNode, WorkflowEdge
+from backend.services.workflow_service import WorkflowService
+from backend.database import db
 
 bp = Blueprint('workflow', __name__)
 workflow_service = WorkflowService()
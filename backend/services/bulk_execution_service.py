@@ -0,0 +1,319 @@
+from backend.models.application import Application, ApplicationLog, ApplicationTrace
+from backend.models.workflow import Workflow
+from backend.models.bulk_execution import BulkExecutionRun
+from backend.services.engine_service import EngineService
+from backend.services.execution_plan_service import ExecutionPlanService
+from backend.database import db, bulk_insert
+from flask import current_app
+from sqlalchemy import or_
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import json
+import multiprocessing
+import os
+import socket
+import threading
+import uuid
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_LEASE_TIMEOUT = 600
+
+
+class BulkExecutionLeaseError(Exception):
+    """다른 프로세스가 일괄 실행의 실행 권한(lease)을 가져간 경우"""
+
+# 워커 프로세스별 실행 계획 캐시 (워크플로우 버전 단위)
+_worker_plans = {}
+
+
+def _get_worker_plan(spec):
+    """직렬화된 워크플로우 정의로 실행 계획 컴파일 (워커 프로세스 내부)"""
+    if spec is None:
+        return None
+    
+    key = (spec['id'], spec['version'], spec['updated_at'])
+    plan = _worker_plans.get(key)
+    
+    if plan is None:
+        workflow = SimpleNamespace(
+            id=spec['id'],
+            version=spec['version'],
+            updated_at=spec['updated_at'],
+            nodes=[SimpleNamespace(**node) for node in spec['nodes']],
+            edges=[SimpleNamespace(**edge) for edge in spec['edges']]
+        )
+        plan = ExecutionPlanService.compile_plan(workflow)
+        _worker_plans[key] = plan
+    
+    return plan
+
+
+def _evaluate_chunk(specs, rows):
+    """신청서 묶음 평가 (DB 접근 없이 결과와 로그만 반환)"""
+    engine = EngineService()
+    
+    return [
+        engine.evaluate_application(
+            _get_worker_plan(specs.get(row['workflow_id'])),
+            row['id'],
+            row['application_data']
+        )
+        for row in rows
+    ]
+
+
+class BulkExecutionService:
+    """신청서 일괄 실행 파이프라인
+    
+    대상 신청서를 ID 순으로 청크 단위로 읽어 프로세스 풀에서 평가하고,
+    청크마다 상태/로그/체크포인트를 한 번의 커밋으로 저장합니다.
+    중단된 실행은 마지막으로 저장된 신청서 ID 이후부터 재개할 수 있습니다.
+    """
+    
+    def create_run(self, status='pending', workflow_id=None, chunk_size=None, workers=None):
+        """일괄 실행 이력 생성"""
+        filters = {'status': status, 'workflow_id': workflow_id}
+        
+        run = BulkExecutionRun(
+            status='running',
+            filters=json.dumps(filters),
+            chunk_size=chunk_size or current_app.config.get('BULK_EXECUTION_CHUNK_SIZE', DEFAULT_CHUNK_SIZE),
+            workers=workers or current_app.config.get('BULK_EXECUTION_WORKERS') or os.cpu_count() or 1,
+            total=self._build_query(filters).count()
+        )
+        db.session.add(run)
+        db.session.commit()
+        
+        return run
+    
+    def get_run(self, run_id):
+        """일괄 실행 이력 조회"""
+        return BulkExecutionRun.query.get(run_id)
+    
+    def new_lease_owner(self):
+        """실행 권한 소유자 식별자 (호스트:프로세스:임의값)"""
+        return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+    
+    def claim_run(self, run_id, owner):
+        """조건부 UPDATE로 실행 권한 획득
+        
+        완료되지 않았고, 실행 중이 아니거나 소유자가 없거나(신규) 같은 소유자이거나
+        하트비트가 만료된(중단된) 실행만 가져올 수 있어 같은 실행이 동시에 두 번 돌지 않습니다.
+        """
+        now = datetime.utcnow()
+        expired = now - timedelta(
+            seconds=current_app.config.get('BULK_EXECUTION_LEASE_TIMEOUT', DEFAULT_LEASE_TIMEOUT)
+        )
+        
+        claimed = BulkExecutionRun.query.filter(
+            BulkExecutionRun.id == run_id,
+            BulkExecutionRun.status != 'completed',
+            or_(
+                BulkExecutionRun.status != 'running',
+                BulkExecutionRun.lease_owner.is_(None),
+                BulkExecutionRun.lease_owner == owner,
+                BulkExecutionRun.heartbeat_at.is_(None),
+                BulkExecutionRun.heartbeat_at < expired
+            )
+        ).update(
+            {'status': 'running', 'lease_owner': owner, 'heartbeat_at': now, 'error_message': None},
+            synchronize_session=False
+        )
+        db.session.commit()
+        
+        return claimed == 1
+    
+    def start_background(self, run_id, owner=None):
+        """백그라운드 스레드에서 일괄 실행 시작"""
+        app = current_app._get_current_object()
+        
+        def run():
+            with app.app_context():
+                try:
+                    self.execute(run_id, owner=owner)
+                except Exception as e:
+                    app.logger.error(f'Bulk execution run {run_id} failed: {str(e)}')
+        
+        thread = threading.Thread(target=run, name=f'bulk-execution-{run_id}', daemon=True)
+        thread.start()
+        
+        return thread
+    
+    def execute(self, run_id, progress=None, owner=None):
+        """체크포인트 이후의 신청서를 청크 단위로 실행 (재개 시에도 동일하게 호출)"""
+        run = BulkExecutionRun.query.get(run_id)
+        if not run:
+            raise Exception('일괄 실행 이력을 찾을 수 없습니다.')
+        
+        if run.status == 'completed':
+            return run.to_dict()
+        
+        owner = owner or self.new_lease_owner()
+        if not self.claim_run(run_id, owner):
+            raise BulkExecutionLeaseError('이미 다른 프로세스에서 실행 중인 일괄 실행입니다.')
+        
+        filters = json.loads(run.filters) if run.filters else {}
+        
+        # 웹 요청 스레드에서 fork하면 다른 스레드가 잡고 있던 락과 DB 연결이 자식에 복제되므로
+        # spawn으로 새 인터프리터를 띄움 (워커는 DB에 접근하지 않으며 엔진도 물려받지 않음)
+        executor = ProcessPoolExecutor(
+            max_workers=run.workers,
+            mp_context=multiprocessing.get_context('spawn')
+        ) if run.workers > 1 else None
+        max_in_flight = run.workers * 2 if executor else 0
+        
+        specs = {}
+        pending = deque()
+        last_id = run.last_application_id or 0
+        
+        try:
+            while True:
+                rows = self._fetch_chunk(filters, last_id, run.chunk_size)
+                
+                if rows:
+                    last_id = rows[-1]['id']
+                    chunk_specs = self._get_specs(rows, specs)
+                    
+                    if executor:
+                        pending.append((last_id, executor.submit(_evaluate_chunk, chunk_specs, rows)))
+                    else:
+                        pending.append((last_id, _evaluate_chunk(chunk_specs, rows)))
+                
+                # 진행 중인 청크가 상한을 넘거나 더 읽을 신청서가 없으면 오래된 청크부터 순서대로 저장
+                while pending and (not rows or len(pending) > max_in_flight):
+                    chunk_last_id, item = pending.popleft()
+                    results = item.result() if executor else item
+                    
+                    self._save_chunk(run, results, chunk_last_id, owner)
+                    
+                    if progress:
+                        progress(run)
+                
+                if not rows:
+                    break
+            
+            run.status = 'completed'
+            run.completed_at = datetime.utcnow()
+            run.lease_owner = None
+            db.session.commit()
+        
+        except BulkExecutionLeaseError:
+            # 실행 권한을 가져간 프로세스의 진행 상태를 덮어쓰지 않음
+            db.session.rollback()
+            raise
+        
+        except Exception as e:
+            db.session.rollback()
+            run.status = 'failed'
+            run.error_message = str(e)
+            run.lease_owner = None
+            db.session.commit()
+            
+            raise e
+        
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+        
+        return run.to_dict()
+    
+    def _build_query(self, filters):
+        """필터 조건으로 대상 신청서 쿼리 생성"""
+        query = db.session.query(Application.id, Application.workflow_id, Application.application_data)
+        
+        if filters.get('status'):
+            query = query.filter(Application.status == filters['status'])
+        if filters.get('workflow_id'):
+            query = query.filter(Application.workflow_id == filters['workflow_id'])
+        
+        return query
+    
+    def _fetch_chunk(self, filters, last_id, chunk_size):
+        """마지막 ID 이후의 신청서 한 청크 조회 (키셋 페이지네이션)"""
+        rows = self._build_query(filters)\
+            .filter(Application.id > last_id)\
+            .order_by(Application.id.asc())\
+            .limit(chunk_size)\
+            .all()
+        
+        return [
+            {'id': row.id, 'workflow_id': row.workflow_id, 'application_data': row.application_data}
+            for row in rows
+        ]
+    
+    def _get_specs(self, rows, cache):
+        """청크에 필요한 워크플로우 정의를 직렬화 가능한 dict로 변환"""
+        specs = {}
+        
+        for workflow_id in set(row['workflow_id'] for row in rows):
+            if workflow_id not in cache:
+                workflow = Workflow.query.get(workflow_id)
+                cache[workflow_id] = self._serialize_workflow(workflow) if workflow else None
+            specs[workflow_id] = cache[workflow_id]
+        
+        return specs
+    
+    def _serialize_workflow(self, workflow):
+        """워크플로우를 워커 프로세스로 전달할 수 있는 형태로 변환"""
+        return {
+            'id': workflow.id,
+            'version': workflow.version,
+            'updated_at': workflow.updated_at,
+            'nodes': [
+                {
+                    'node_id': node.node_id,
+                    'node_type': node.node_type,
+                    'label': node.label,
+                    'config': node.config
+                }
+                for node in workflow.nodes
+            ],
+            'edges': [
+                {
+                    'id': edge.id,
+                    'edge_id': edge.edge_id,
+                    'source_node_id': edge.source_node_id,
+                    'target_node_id': edge.target_node_id,
+                    'label': edge.label,
+                    'condition': edge.condition
+                }
+                for edge in workflow.edges
+            ]
+        }
+    
+    def _save_chunk(self, run, results, chunk_last_id, owner):
+        """청크 결과(신청서 상태, 실행 로그, 체크포인트)를 한 번에 저장"""
+        now = datetime.utcnow()
+        
+        # 하트비트 갱신과 소유권 확인을 같은 트랜잭션에서 수행 (권한을 잃었으면 저장하지 않음)
+        owned = BulkExecutionRun.query.filter_by(id=run.id, lease_owner=owner).update(
+            {'heartbeat_at': now}, synchronize_session=False
+        )
+        if not owned:
+            raise BulkExecutionLeaseError('일괄 실행 권한을 다른 프로세스가 가져갔습니다.')
+        
+        updates = []
+        traces = []
+        logs = []
+        
+        for result in results:
+            if 'trace' in result:
+                traces.append(result.pop('trace'))
+            logs.extend(result.pop('logs', []))
+            result['updated_at'] = now
+            updates.append(result)
+        
+        db.session.bulk_update_mappings(Application, updates)
+        bulk_insert(db.session, ApplicationTrace, traces)
+        bulk_insert(db.session, ApplicationLog, logs)
+        
+        succeeded = sum(1 for result in results if result['status'] == 'completed')
+        
+        run.processed = (run.processed or 0) + len(results)
+        run.succeeded = (run.succeeded or 0) + succeeded
+        run.failed = (run.failed or 0) + len(results) - succeeded
+        run.last_application_id = chunk_last_id
+        
+        db.session.commit()
@@ -1,6 +1,301 @@
+from backend.database import db
+from backend.models.decision_table import DecisionTableRule
+from backend.services.rule_cache_service import rule_artifact_cache
+from sqlalchemy import func
+import bisect
+import json
+import math
 import re
 
 
+NUMERIC_OPERATORS = ('>', '>=', '<', '<=')
+
+
+def _load_json(value, default):
+    if value is None:
+        return default
+    if isinstance(value, (list, dict)):
+        return value
+    try:
+        return json.loads(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _to_float(value):
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        return None
+    if math.isnan(number):
+        return None
+    return number
+
+
+def _iter_bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _is_hashable(value):
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
+
+
+class _SortedMaskIndex:
+    
+    def __init__(self, entries):
+        entries = sorted(entries, key=lambda e: e[0])
+        self.keys = [key for key, _ in entries]
+        
+        self.prefix = [0]
+        for _, mask in entries:
+            self.prefix.append(self.prefix[-1] | mask)
+        
+        self.suffix = [0] * (len(entries) + 1)
+        for i in range(len(entries) - 1, -1, -1):
+            self.suffix[i] = self.suffix[i + 1] | entries[i][1]
+    
+    def below(self, x, inclusive):
+        pos = bisect.bisect_right(self.keys, x) if inclusive else bisect.bisect_left(self.keys, x)
+        return self.prefix[pos]
+    
+    def above(self, x, inclusive):
+        pos = bisect.bisect_left(self.keys, x) if inclusive else bisect.bisect_right(self.keys, x)
+        return self.suffix[pos]
+
+
+class _ColumnIndex:
+    
+    def __init__(self, name):
+        self.name = name
+        self.always = 0
+        self.equals = {}
+        self.in_raw = {}
+        self.in_str = {}
+        self.greater = []
+        self.greater_equal = []
+        self.less = []
+        self.less_equal = []
+        self.between = []
+        self.generic = {}
+    
+    def add(self, bit, operator, value):
+        mask = 1 << bit
+        
+        if operator == '==':
+            key = str(value)
+            self.equals[key] = self.equals.get(key, 0) | mask
+        elif operator in NUMERIC_OPERATORS:
+            threshold = _to_float(value)
+            if threshold is None:
+                return
+            target = {
+                '>': self.greater,
+                '>=': self.greater_equal,
+                '<': self.less,
+                '<=': self.less_equal
+            }[operator]
+            target.append((threshold, mask))
+        elif operator == 'BETWEEN':
+            if not isinstance(value, list) or len(value) != 2:
+                return
+            low, high = _to_float(value[0]), _to_float(value[1])
+            if low is None or high is None:
+                return
+            self.between.append((low, high, mask))
+        elif operator == 'IN' and isinstance(value, list) and all(_is_hashable(v) for v in value):
+            for item in value:
+                self.in_raw[item] = self.in_raw.get(item, 0) | mask
+        elif operator == 'IN' and not isinstance(value, list):
+            for item in str(value).split(','):
+                self.in_str[item] = self.in_str.get(item, 0) | mask
+        elif operator == 'REGEX':
+            try:
+                pattern = re.compile(str(value))
+            except re.error:
+                return
+            self.generic[bit] = lambda x, p=pattern: bool(p.match(str(x)))
+        else:
+            self.generic[bit] = lambda x, v=value, op=operator: DecisionTableService.evaluate_condition(v, op, x)
+    
+    def finalize(self):
+        self.greater = _SortedMaskIndex(self.greater)
+        self.greater_equal = _SortedMaskIndex(self.greater_equal)
+        self.less = _SortedMaskIndex(self.less)
+        self.less_equal = _SortedMaskIndex(self.less_equal)
+        
+        between = self.between
+        self.between_low = _SortedMaskIndex([(low, mask) for low, _, mask in between])
+        self.between_high = _SortedMaskIndex([(high, mask) for _, high, mask in between])
+        self.generic_mask = 0
+        for bit in self.generic:
+            self.generic_mask |= 1 << bit
+    
+    def match(self, input_value):
+        if input_value is None:
+            return self.always, 0
+        
+        mask = self.always
+        mask |= self.equals.get(str(input_value), 0)
+        mask |= self.in_str.get(str(input_value), 0)
+        
+        if self.in_raw and _is_hashable(input_value):
+            mask |= self.in_raw.get(input_value, 0)
+        
+        x = _to_float(input_value)
+        if x is not None:
+            # a rule condition 'x > t' holds exactly when t < x
+            mask |= self.greater.below(x, inclusive=False)
+            mask |= self.greater_equal.below(x, inclusive=True)
+            mask |= self.less.above(x, inclusive=False)
+            mask |= self.less_equal.above(x, inclusive=True)
+            mask |= self.between_low.below(x, inclusive=True) & self.between_high.above(x, inclusive=True)
+        
+        return mask, self.generic_mask
+
+
+class CompiledDecisionTable:
+    
+    def __init__(self, decision_table):
+        self.table_id = decision_table.id
+        self.name = decision_table.name
+        self.hit_policy = decision_table.hit_policy or 'FIRST'
+        self.condition_columns = _load_json(decision_table.conditions, [])
+        self.action_columns = _load_json(decision_table.actions, [])
+        
+        self.rules = []
+        self.enabled_mask = 0
+        
+        sorted_rules = sorted(decision_table.rules, key=lambda r: r.priority or 0, reverse=True)
+        
+        for bit, rule in enumerate(sorted_rules):
+            self.rules.append({
+                'id': rule.id,
+                'rule_number': rule.rule_number,
+                'actions': _load_json(rule.actions, {})
+            })
+            if rule.enabled:
+                self.enabled_mask |= 1 << bit
+        
+        self.columns = []
+        for column in self.condition_columns:
+            index = _ColumnIndex(column['name'])
+            
+            for bit, rule in enumerate(sorted_rules):
+                rule_conditions = _load_json(rule.conditions, {})
+                
+                if index.name not in rule_conditions:
+                    index.always |= 1 << bit
+                    continue
+                
+                condition_spec = rule_conditions[index.name]
+                
+                if isinstance(condition_spec, dict):
+                    operator = condition_spec.get('operator', '==')
+                    value = condition_spec.get('value')
+                else:
+                    operator = '=='
+                    value = condition_spec
+                
+                if operator == '-' or operator == 'ANY':
+                    index.always |= 1 << bit
+                else:
+                    index.add(bit, operator, value)
+            
+            index.finalize()
+            self.columns.append(index)
+    
+    def match_mask(self, input_data, first_only=False):
+        candidates = self.enabled_mask
+        pending = []
+        
+        for column in self.columns:
+            input_value = input_data.get(column.name)
+            indexed, generic = column.match(input_value)
+            candidates &= indexed | generic
+            
+            if not candidates:
+                return 0
+            
+            if generic & candidates:
+                pending.append((column, input_value))
+        
+        if not pending:
+            if first_only:
+                return candidates & -candidates
+            return candidates
+        
+        matched = 0
+        for bit in _iter_bits(candidates):
+            rule_mask = 1 << bit
+            passed = True
+            
+            for column, input_value in pending:
+                check = column.generic.get(bit)
+                if check is not None and not check(input_value):
+                    passed = False
+                    break
+            
+            if passed:
+                matched |= rule_mask
+                if first_only:
+                    break
+        
+        return matched
+    
+    def execute(self, input_data):
+        hit_policy = self.hit_policy
+        matched_mask = self.match_mask(input_data, first_only=(hit_policy == 'FIRST'))
+        matched_rules = [self.rules[bit] for bit in _iter_bits(matched_mask)]
+        
+        if not matched_rules:
+            return {
+                'matched': False,
+                'rules': [],
+                'output': {},
+                'message': 'No matching rules found'
+            }
+        
+        output = {}
+        
+        if hit_policy == 'FIRST' or hit_policy == 'PRIORITY':
+            first_actions = matched_rules[0]['actions']
+            for action_col in self.action_columns:
+                action_name = action_col['name']
+                if action_name in first_actions:
+                    output[action_name] = first_actions[action_name]
+        
+        elif hit_policy == 'COLLECT':
+            for action_col in self.action_columns:
+                action_name = action_col['name']
+                output[action_name] = [
+                    rule['actions'].get(action_name)
+                    for rule in matched_rules
+                    if action_name in rule['actions']
+                ]
+        
+        elif hit_policy == 'ANY':
+            for action_col in self.action_columns:
+                action_name = action_col['name']
+                for rule in matched_rules:
+                    if action_name in rule['actions']:
+                        output[action_name] = rule['actions'][action_name]
+                        break
+        
+        return {
+            'matched': True,
+            'rules': [{'rule_number': rule['rule_number'], 'id': rule['id']} for rule in matched_rules],
+            'output': output,
+            'hit_policy': hit_policy
+        }
+
+
 class DecisionTableService:
     
     @staticmethod
@@ -88,70 +383,33 @@ class DecisionTableService:
     
     @staticmethod
     def execute_table(decision_table, input_data):
-        conditions = decision_table.conditions if isinstance(decision_table.conditions, list) else []
-        actions = decision_table.actions if isinstance(decision_table.actions, list) else []
-        hit_policy = decision_table.hit_policy or 'FIRST'
-        
-        matched_rules = []
-        
-        sorted_rules = sorted(decision_table.rules, key=lambda r: r.priority, reverse=True)
-        
-        for rule in sorted_rules:
-            if not rule.enabled:
-                continue
-            
-            if DecisionTableService.match_rule(rule, input_data, conditions):
-                matched_rules.append(rule)
-                
-                if hit_policy == 'FIRST':
-                    break
-        
-        if not matched_rules:
-            return {
-                'matched': False,
-                'rules': [],
-                'output': {},
-                'message': 'No matching rules found'
-            }
-        
-        output = {}
-        
-        if hit_policy == 'FIRST':
-            for action_col in actions:
-                action_name = action_col['name']
-                if action_name in matched_rules[0].actions:
-                    output[action_name] = matched_rules[0].actions[action_name]
-        
-        elif hit_policy == 'COLLECT':
-            for action_col in actions:
-                action_name = action_col['name']
-                output[action_name] = [
-                    rule.actions.get(action_name) 
-                    for rule in matched_rules 
-                    if action_name in rule.actions
-                ]
-        
-        elif hit_policy == 'PRIORITY':
-            highest_priority_rule = matched_rules[0]
-            for action_col in actions:
-                action_name = action_col['name']
-                if action_name in highest_priority_rule.actions:
-                    output[action_name] = highest_priority_rule.actions[action_name]
+        compiled = DecisionTableService.get_compiled_table(decision_table)
+        return compiled.execute(input_data)
+    
+    @staticmethod
+    def get_compiled_table(decision_table):
+        if decision_table.id is None:
+            return CompiledDecisionTable(decision_table)
         
-        elif hit_policy == 'ANY':
-            for action_col in actions:
-                action_name = action_col['name']
-                for rule in matched_rules:
-                    if action_name in rule.actions:
-                        output[action_name] = rule.actions[action_name]
-                        break
+        return rule_artifact_cache.get_or_compile(
+            'DECISION_TABLE',
+            decision_table.id,
+            DecisionTableService.cache_version(decision_table.id, decision_table.updated_at, decision_table.hit_policy, db.session),
+            lambda: CompiledDecisionTable(decision_table)
+        )
+    
+    @staticmethod
+    def cache_version(table_id, updated_at, hit_policy, session):
+        # editing a rule row does not touch the parent table's updated_at
+        rules_version = session.query(
+            func.max(DecisionTableRule.updated_at), func.max(DecisionTableRule.id), func.count(DecisionTableRule.id)
+        ).filter(DecisionTableRule.table_id == table_id).first()
         
-        return {
-            'matched': True,
-            'rules': [{'rule_number': rule.rule_number, 'id': rule.id} for rule in matched_rules],
-            'output': output,
-            'hit_policy': hit_policy
-        }
+        return (updated_at, hit_policy, tuple(rules_version))
+    
+    @staticmethod
+    def invalidate(table_id=None):
+        rule_artifact_cache.invalidate('DECISION_TABLE', table_id)
     
     @staticmethod
     def validate_table(decision_table):
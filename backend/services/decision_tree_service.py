@@ -1,6 +1,10 @@
 import numpy as np
 from collections import Counter
 import json
+from backend.services.rule_cache_service import rule_artifact_cache
+
+
+UNKNOWN_LABEL = 'UNKNOWN'
 
 
 class DecisionTreeService:
@@ -46,31 +50,62 @@ class DecisionTreeService:
         
         return gain
     
+    @staticmethod
+    def impurity_from_counts(counts, totals, algorithm='gini'):
+        totals = totals.astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            probs = counts / totals[:, None]
+            if algorithm == 'gini':
+                impurity = 1.0 - np.sum(probs ** 2, axis=1)
+            else:
+                log_probs = np.where(probs > 0, np.log2(np.where(probs > 0, probs, 1.0)), 0.0)
+                impurity = -np.sum(probs * log_probs, axis=1)
+        return np.where(totals > 0, impurity, 0.0)
+    
     @staticmethod
     def find_best_split(X, y, feature_idx, algorithm='gini'):
-        best_gain = -1
-        best_threshold = None
+        column = X[:, feature_idx]
+        n_samples = len(column)
         
-        values = sorted(set(X[:, feature_idx]))
+        if n_samples < 2:
+            return None, -1
         
-        for i in range(len(values) - 1):
-            threshold = (values[i] + values[i + 1]) / 2
-            
-            left_mask = X[:, feature_idx] <= threshold
-            right_mask = ~left_mask
-            
-            if np.sum(left_mask) == 0 or np.sum(right_mask) == 0:
-                continue
-            
-            gain = DecisionTreeService.calculate_information_gain(
-                y, y[left_mask], y[right_mask], algorithm
-            )
-            
-            if gain > best_gain:
-                best_gain = gain
-                best_threshold = threshold
+        order = np.argsort(column, kind='mergesort')
+        sorted_values = column[order]
+        
+        # split after position i is only possible where the value changes
+        boundaries = np.flatnonzero(sorted_values[:-1] != sorted_values[1:])
+        if len(boundaries) == 0:
+            return None, -1
+        
+        classes, y_encoded = np.unique(y, return_inverse=True)
+        one_hot = np.zeros((n_samples, len(classes)), dtype=np.int64)
+        one_hot[np.arange(n_samples), y_encoded[order]] = 1
+        cumulative = np.cumsum(one_hot, axis=0)
+        
+        total_counts = cumulative[-1]
+        left_counts = cumulative[boundaries]
+        right_counts = total_counts - left_counts
+        left_n = boundaries + 1
+        right_n = n_samples - left_n
         
-        return best_threshold, best_gain
+        parent_impurity = DecisionTreeService.impurity_from_counts(
+            total_counts[None, :], np.array([n_samples]), algorithm
+        )[0]
+        left_impurity = DecisionTreeService.impurity_from_counts(left_counts, left_n, algorithm)
+        right_impurity = DecisionTreeService.impurity_from_counts(right_counts, right_n, algorithm)
+        
+        gains = parent_impurity - (
+            (left_n / n_samples) * left_impurity +
+            (right_n / n_samples) * right_impurity
+        )
+        
+        # ties (within float noise) resolve to the lowest threshold
+        best = int(np.flatnonzero(gains >= gains.max() - 1e-12)[0])
+        position = boundaries[best]
+        best_threshold = (sorted_values[position] + sorted_values[position + 1]) / 2
+        
+        return best_threshold, float(gains[best])
     
     @staticmethod
     def build_tree(X, y, features, depth=0, max_depth=5, min_samples_split=2, 
@@ -168,6 +203,191 @@ class DecisionTreeService:
         else:
             return DecisionTreeService.predict(tree_dict['right'], sample)
     
+    @staticmethod
+    def compile_tree(nodes, encodings=None):
+        if not nodes:
+            return None
+        
+        by_node_id = {node.node_id: node for node in nodes}
+        root = next((n for n in nodes if n.parent_id is None or n.node_id == '0'), nodes[0])
+        
+        features = []
+        feature_index = {}
+        labels = []
+        label_index = {}
+        
+        feature = []
+        threshold = []
+        left = []
+        right = []
+        leaf_label = []
+        
+        def add_node(node):
+            position = len(feature)
+            feature.append(-1)
+            threshold.append(np.nan)
+            left.append(-1)
+            right.append(-1)
+            leaf_label.append(-1)
+            
+            if node.is_leaf:
+                if node.class_label not in label_index:
+                    label_index[node.class_label] = len(labels)
+                    labels.append(node.class_label)
+                leaf_label[position] = label_index[node.class_label]
+                return position
+            
+            if node.feature not in feature_index:
+                feature_index[node.feature] = len(features)
+                features.append(node.feature)
+            feature[position] = feature_index[node.feature]
+            threshold[position] = node.threshold
+            return position
+        
+        root_position = add_node(root)
+        stack = [(root, root_position)]
+        
+        while stack:
+            node, position = stack.pop()
+            if node.is_leaf:
+                continue
+            
+            left_child = by_node_id.get(f"{node.node_id}-L")
+            right_child = by_node_id.get(f"{node.node_id}-R")
+            
+            if left_child:
+                left[position] = add_node(left_child)
+                stack.append((left_child, left[position]))
+            if right_child:
+                right[position] = add_node(right_child)
+                stack.append((right_child, right[position]))
+        
+        encoders = {
+            feature_index[name]: {category: code for code, category in enumerate(categories)}
+            for name, categories in (encodings or {}).items()
+            if name in feature_index
+        }
+        
+        return {
+            'features': features,
+            'encoders': encoders,
+            'labels': labels,
+            'nodes': list(zip(feature, threshold, left, right, leaf_label)),
+            'feature': np.array(feature, dtype=np.int64),
+            'threshold': np.array(threshold, dtype=np.float64),
+            'left': np.array(left, dtype=np.int64),
+            'right': np.array(right, dtype=np.int64),
+            'leaf_label': np.array(leaf_label, dtype=np.int64)
+        }
+    
+    @staticmethod
+    def get_compiled_tree(tree):
+        return rule_artifact_cache.get_or_compile(
+            'DECISION_TREE',
+            tree.id,
+            tree.updated_at,
+            lambda: DecisionTreeService.compile_tree(tree.nodes, tree.get_feature_encodings())
+        )
+    
+    @staticmethod
+    def invalidate_compiled_tree(tree_id=None):
+        rule_artifact_cache.invalidate('DECISION_TREE', tree_id)
+    
+    @staticmethod
+    def predict_compiled(compiled, sample):
+        if compiled is None:
+            return None
+        
+        nodes = compiled['nodes']
+        features = compiled['features']
+        encoders = compiled.get('encoders', {})
+        feature, threshold, left, right, leaf_label = nodes[0]
+        
+        while feature >= 0:
+            feature_value = sample.get(features[feature])
+            
+            if feature_value is not None and feature in encoders:
+                feature_value = encoders[feature].get(str(feature_value).strip())
+            
+            if feature_value is None:
+                return UNKNOWN_LABEL
+            
+            # same conversion as samples_to_matrix, so numeric strings match predict_batch
+            try:
+                feature_value = float(feature_value)
+            except (ValueError, TypeError):
+                return UNKNOWN_LABEL
+            if feature_value != feature_value:
+                return UNKNOWN_LABEL
+            
+            position = left if feature_value <= threshold else right
+            
+            if position < 0:
+                return UNKNOWN_LABEL
+            
+            feature, threshold, left, right, leaf_label = nodes[position]
+        
+        return compiled['labels'][leaf_label]
+    
+    @staticmethod
+    def samples_to_matrix(compiled, samples):
+        features = compiled['features']
+        encoders = compiled.get('encoders', {})
+        matrix = np.full((len(samples), len(features)), np.nan, dtype=np.float64)
+        
+        for j, name in enumerate(features):
+            encoder = encoders.get(j)
+            for i, sample in enumerate(samples):
+                value = sample.get(name)
+                if value is None:
+                    continue
+                if encoder is not None:
+                    matrix[i, j] = encoder.get(str(value).strip(), np.nan)
+                    continue
+                try:
+                    matrix[i, j] = float(value)
+                except (ValueError, TypeError):
+                    pass
+        
+        return matrix
+    
+    @staticmethod
+    def predict_batch(compiled, X):
+        if compiled is None:
+            return []
+        
+        if not isinstance(X, np.ndarray):
+            X = DecisionTreeService.samples_to_matrix(compiled, X)
+        
+        n_samples = X.shape[0]
+        rows = np.arange(n_samples)
+        position = np.zeros(n_samples, dtype=np.int64)
+        active = compiled['feature'][position] >= 0
+        unknown = np.zeros(n_samples, dtype=bool)
+        
+        while active.any():
+            idx = rows[active]
+            node = position[idx]
+            values = X[idx, compiled['feature'][node]]
+            
+            missing = np.isnan(values)
+            go_left = values <= compiled['threshold'][node]
+            next_position = np.where(go_left, compiled['left'][node], compiled['right'][node])
+            
+            dead_end = missing | (next_position < 0)
+            unknown[idx[dead_end]] = True
+            position[idx[~dead_end]] = next_position[~dead_end]
+            
+            active[idx[dead_end]] = False
+            still_active = idx[~dead_end]
+            active[still_active] = compiled['feature'][position[still_active]] >= 0
+        
+        labels = np.array(compiled['labels'] + [UNKNOWN_LABEL], dtype=object)
+        label_idx = compiled['leaf_label'][position]
+        label_idx = np.where(unknown | (label_idx < 0), len(labels) - 1, label_idx)
+        
+        return labels[label_idx].tolist()
+    
     @staticmethod
     def calculate_accuracy(tree_dict, X_test, y_test, features):
         predictions = []
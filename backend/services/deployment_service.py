@@ -1,6 +1,8 @@
 from backend.models.deployed_api import DeployedAPI
 from backend.models.workflow import Workflow
 from backend.services.api_generation_service import APIGenerationService
+from backend.services.execution_plan_service import ExecutionPlanService
+from backend.services.rule_cache_service import rule_artifact_cache
 import json
 from datetime import datetime
 
@@ -90,6 +92,9 @@ class DeploymentService:
         
         db.session.commit()
         
+        ExecutionPlanService.invalidate(workflow.id)
+        rule_artifact_cache.invalidate()
+        
         return {
             'success': True,
             'deployment': deployed_api.to_dict(),
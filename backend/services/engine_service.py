@@ -1,9 +1,47 @@
-from models.application import Application, ApplicationLog
-from models.workflow import Workflow, WorkflowNode, WorkflowEdge
-from database import db
+from backend.models.application import Application, ApplicationLog, ApplicationTrace
+from backend.models.workflow import Workflow, WorkflowNode, WorkflowEdge
+from backend.services.expression_service import ExpressionService
+from backend.services.execution_plan_service import ExecutionPlanService
+from backend.services.parallel_branch_service import ParallelBranchService
+from backend.utils.trace_codec import encode_payload, diff_snapshot, ENCODING_ZLIB_JSON
+from backend.database import db
 from datetime import datetime
 import json
 import time
+import uuid
+
+class ExecutionTrace:
+    """실행 1회의 로그 기록 단위
+    
+    입력 스냅샷은 트레이스에 한 번만 압축 저장하고, 노드 로그에는 출력과
+    스냅샷 대비 입력 변경분만 압축해 저장합니다.
+    logs 목록이 주어지면 DB에 쓰지 않고 모아 두었다가 호출자가 일괄 저장합니다.
+    """
+    
+    def __init__(self, application_id, snapshot, logs=None):
+        self.application_id = application_id
+        self.trace_id = uuid.uuid4().hex
+        self.snapshot = snapshot
+        self.logs = logs
+        self.created_at = datetime.utcnow()
+    
+    def to_mapping(self):
+        return {
+            'id': self.trace_id,
+            'application_id': self.application_id,
+            'encoding': ENCODING_ZLIB_JSON,
+            'input_snapshot': encode_payload(self.snapshot),
+            'created_at': self.created_at
+        }
+    
+    def build_payload(self, input_data, output):
+        payload = {'output': output}
+        
+        delta = diff_snapshot(self.snapshot, input_data)
+        if delta:
+            payload['input_delta'] = delta
+        
+        return encode_payload(payload)
 
 class EngineService:
     """워크플로우 실행 엔진"""
@@ -18,11 +56,9 @@ class EngineService:
         db.session.commit()
         
         try:
-            # 시작 노드 찾기
-            start_node = next(
-                (node for node in workflow.nodes if node.node_type == 'start'),
-                None
-            )
+            # 실행 계획 조회 (컴파일 결과 캐시) 및 시작 노드 찾기
+            plan = ExecutionPlanService.get_plan(workflow.id, db)
+            start_node = plan.start_node if plan else None
             
             if not start_node:
                 raise Exception('시작 노드를 찾을 수 없습니다.')
@@ -34,7 +70,12 @@ class EngineService:
                 'results': {}
             }
             
-            self._execute_node(application, workflow, start_node, context)
+            # 실행 트레이스 생성 (입력 스냅샷은 실행당 한 번만 저장)
+            trace = ExecutionTrace(application.id, context['application_data'])
+            db.session.add(ApplicationTrace(**trace.to_mapping()))
+            db.session.commit()
+            
+            self._execute_node(trace, plan, start_node, context)
             
             # 결과 저장
             application.status = 'completed'
@@ -65,68 +106,183 @@ class EngineService:
             
             raise e
     
-    def _execute_node(self, application, workflow, node, context):
-        """노드 실행"""
+    def evaluate_application(self, plan, application_id, application_data):
+        """DB에 쓰지 않고 신청서 한 건 평가 (일괄 실행용)
+        
+        상태/점수/결과와 실행 로그를 dict로 반환하며, 저장은 호출자가 묶어서 처리합니다.
+        """
+        logs = []
+        trace = None
+        
+        try:
+            start_node = plan.start_node if plan else None
+            
+            if not start_node:
+                raise Exception('시작 노드를 찾을 수 없습니다.')
+            
+            context = {
+                'application_data': json.loads(application_data),
+                'score': 0,
+                'results': {}
+            }
+            
+            trace = ExecutionTrace(application_id, context['application_data'], logs)
+            
+            self._execute_node(trace, plan, start_node, context)
+            
+            return {
+                'id': application_id,
+                'status': 'completed',
+                'score': context.get('score'),
+                'result': json.dumps(context.get('results')),
+                'completed_at': datetime.utcnow(),
+                'trace': trace.to_mapping(),
+                'logs': logs
+            }
+            
+        except Exception as e:
+            logs.append({
+                'application_id': application_id,
+                'trace_id': trace.trace_id if trace else None,
+                'action': 'workflow_execution',
+                'status': 'error',
+                'error_message': str(e),
+                'created_at': datetime.utcnow()
+            })
+            
+            result = {
+                'id': application_id,
+                'status': 'error',
+                'logs': logs
+            }
+            if trace:
+                result['trace'] = trace.to_mapping()
+            return result
+    
+    def _write_log(self, trace, **log_data):
+        """실행 로그 기록 (트레이스에 logs 목록이 있으면 메모리에 모아 두고 호출자가 일괄 저장)"""
+        log_data['application_id'] = trace.application_id
+        log_data['trace_id'] = trace.trace_id
+        
+        if trace.logs is not None:
+            log_data.setdefault('created_at', datetime.utcnow())
+            trace.logs.append(log_data)
+            return
+        
+        db.session.add(ApplicationLog(**log_data))
+        db.session.commit()
+    
+    def _execute_node(self, trace, plan, node, context, in_branch=False):
+        """노드 실행
+        
+        병렬 분기 내부(in_branch)에서는 합류 노드에 도달하면 실행하지 않고
+        해당 노드를 반환하며, 합류 노드는 분기 결과를 병합한 뒤 한 번만 실행됩니다.
+        """
         start_time = time.time()
         
         try:
             # 노드 타입별 처리
-            if node.node_type == 'start':
+            if node.type == 'start':
                 output = {'message': '워크플로우 시작'}
-            elif node.node_type == 'end':
+            elif node.type == 'end':
                 output = {'message': '워크플로우 종료'}
-            elif node.node_type == 'score':
+            elif node.type == 'score':
                 output = self._execute_score_node(node, context)
-            elif node.node_type == 'decision':
+            elif node.type == 'decision':
                 output = self._execute_decision_node(node, context)
-            elif node.node_type == 'api':
+            elif node.type == 'api':
                 output = self._execute_api_node(node, context)
             else:
-                output = {'message': f'알 수 없는 노드 타입: {node.node_type}'}
+                output = {'message': f'알 수 없는 노드 타입: {node.type}'}
             
             execution_time = time.time() - start_time
             
-            # 로그 생성
-            log = ApplicationLog(
-                application_id=application.id,
+            # 로그 생성 (출력과 입력 변경분만 압축 저장)
+            self._write_log(
+                trace,
                 node_id=node.node_id,
-                node_type=node.node_type,
+                node_type=node.type,
                 action='execute',
-                input_data=json.dumps(context.get('application_data', {})),
-                output_data=json.dumps(output),
+                payload=trace.build_payload(context.get('application_data', {}), output),
+                encoding=ENCODING_ZLIB_JSON,
                 status='success',
                 execution_time=execution_time
             )
-            db.session.add(log)
-            db.session.commit()
-            
-            # 다음 노드로 이동
-            if node.node_type != 'end':
-                next_nodes = self._get_next_nodes(workflow, node, context)
-                for next_node in next_nodes:
-                    self._execute_node(application, workflow, next_node, context)
             
         except Exception as e:
             execution_time = time.time() - start_time
             
             # 에러 로그 생성
-            log = ApplicationLog(
-                application_id=application.id,
+            self._write_log(
+                trace,
                 node_id=node.node_id,
-                node_type=node.node_type,
+                node_type=node.type,
                 action='execute',
                 status='error',
                 error_message=str(e),
                 execution_time=execution_time
             )
-            db.session.add(log)
-            db.session.commit()
             
             raise e
+        
+        if node.type == 'end':
+            return []
+        
+        # 다음 노드로 이동 (다음 노드가 여러 개면 병렬 분기 실행)
+        next_nodes = self._get_next_nodes(plan, node, context)
+        
+        if in_branch and len(next_nodes) == 1 and next_nodes[0].is_join:
+            return next_nodes
+        
+        stop_at_join = True
+        while len(next_nodes) > 1:
+            next_nodes = self._execute_branches(trace, plan, next_nodes, context, stop_at_join)
+            stop_at_join = False
+        
+        if next_nodes:
+            return self._execute_node(trace, plan, next_nodes[0], context, in_branch)
+        
+        return []
+    
+    def _execute_branches(self, trace, plan, nodes, context, stop_at_join=True):
+        """병렬 분기 실행
+        
+        각 분기는 컨텍스트 사본으로 스레드 풀에서 동시에 실행되고,
+        종료 후 변경된 값을 간선 순서대로 병합합니다 (score는 증가분을 합산).
+        반환값은 분기들이 도달한 합류 노드 목록입니다.
+        """
+        snapshot = dict(context)
+        
+        def make_branch(node):
+            branch_context = dict(snapshot)
+            
+            def run():
+                if stop_at_join and node.is_join:
+                    return branch_context, [node]
+                joins = self._execute_node(trace, plan, node, branch_context, in_branch=True)
+                return branch_context, joins
+            return run
+        
+        results = ParallelBranchService.run_branches([make_branch(node) for node in nodes])
+        
+        ParallelBranchService.merge_contexts(
+            context,
+            snapshot,
+            [branch_context for branch_context, _ in results],
+            additive_keys=('score',)
+        )
+        
+        joins = []
+        for _, branch_joins in results:
+            for join in branch_joins:
+                if all(j.node_id != join.node_id for j in joins):
+                    joins.append(join)
+        
+        return joins
     
     def _execute_score_node(self, node, context):
         """점수 계산 노드 실행"""
-        config = json.loads(node.config) if node.config else {}
+        config = node.config
         score_value = config.get('score', 0)
         
         context['score'] = context.get('score', 0) + score_value
@@ -138,7 +294,7 @@ class EngineService:
     
     def _execute_decision_node(self, node, context):
         """의사결정 노드 실행"""
-        config = json.loads(node.config) if node.config else {}
+        config = node.config
         condition = config.get('condition', '')
         
         # 간단한 조건 평가 (실제로는 더 복잡한 평가 엔진 필요)
@@ -151,7 +307,7 @@ class EngineService:
     
     def _execute_api_node(self, node, context):
         """API 호출 노드 실행"""
-        config = json.loads(node.config) if node.config else {}
+        config = node.config
         
         # 실제 API 호출은 여기서 구현
         return {
@@ -159,39 +315,14 @@ class EngineService:
             'config': config
         }
     
-    def _get_next_nodes(self, workflow, current_node, context):
-        """다음 노드 찾기"""
-        next_edges = [
-            edge for edge in workflow.edges
-            if edge.source_node_id == current_node.node_id
-        ]
-        
-        next_nodes = []
-        for edge in next_edges:
-            # 조건 확인
-            if edge.condition:
-                if self._evaluate_condition(edge.condition, context):
-                    next_node = next(
-                        (node for node in workflow.nodes if node.node_id == edge.target_node_id),
-                        None
-                    )
-                    if next_node:
-                        next_nodes.append(next_node)
-            else:
-                next_node = next(
-                    (node for node in workflow.nodes if node.node_id == edge.target_node_id),
-                    None
-                )
-                if next_node:
-                    next_nodes.append(next_node)
-        
-        return next_nodes
+    def _get_next_nodes(self, plan, current_node, context):
+        """다음 노드 찾기 (조건이 있는 간선은 조건을 만족하는 경우만)"""
+        return plan.active_next_nodes(current_node.node_id, context)
     
     def _evaluate_condition(self, condition, context):
         """조건 평가"""
-        # 간단한 조건 평가
-        # 실제로는 더 안전하고 복잡한 평가 엔진 필요
+        # 제한된 표현식 언어로 평가 (컴파일 결과는 표현식 문자열 단위로 캐시)
         try:
-            return eval(condition, {"__builtins__": {}}, context)
-        except:
+            return ExpressionService.evaluate(condition, context)
+        except Exception:
             return False
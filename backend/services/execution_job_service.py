@@ -0,0 +1,282 @@
+from backend.models.execution_job import ExecutionJob
+from backend.services.deployment_service import DeploymentService
+from backend.services.process_instance_service import ProcessInstanceService
+from backend.services.node_instance_recorder import PERSISTENCE_BATCH
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from urllib.parse import urlparse
+from datetime import datetime
+import ipaddress
+import json
+import socket
+import threading
+import time
+import urllib.request
+
+
+JOB_PENDING = 'PENDING'
+JOB_RUNNING = 'RUNNING'
+JOB_COMPLETED = 'COMPLETED'
+JOB_FAILED = 'FAILED'
+JOB_REJECTED = 'REJECTED'
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_PENDING = 1000
+DEFAULT_CALLBACK_TIMEOUT = 10
+DEFAULT_CALLBACK_RETRIES = 3
+DEFAULT_CALLBACK_WORKERS = 2
+
+CALLBACK_PENDING = 'PENDING'
+CALLBACK_DELIVERED = 'DELIVERED'
+CALLBACK_FAILED = 'FAILED'
+CALLBACK_REJECTED = 'REJECTED'
+
+
+class ExecutionJobPool:
+    
+    def __init__(self, workers_key='EXECUTION_JOB_WORKERS', max_pending_key='EXECUTION_JOB_MAX_PENDING',
+                 default_workers=DEFAULT_MAX_WORKERS, thread_name_prefix='execution-job'):
+        self.workers_key = workers_key
+        self.max_pending_key = max_pending_key
+        self.default_workers = default_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+    
+    def submit(self, app, func, *args):
+        with self._lock:
+            if self._pending >= app.config.get(self.max_pending_key, DEFAULT_MAX_PENDING):
+                return False
+            
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=app.config.get(self.workers_key, self.default_workers),
+                    thread_name_prefix=self.thread_name_prefix
+                )
+            
+            self._pending += 1
+        
+        self._executor.submit(self._run, func, *args)
+        return True
+    
+    def pending(self):
+        with self._lock:
+            return self._pending
+    
+    def _run(self, func, *args):
+        try:
+            func(*args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+
+execution_job_pool = ExecutionJobPool()
+
+# retries and backoff sleeps of slow callback receivers must not hold the workers that run jobs
+callback_pool = ExecutionJobPool(
+    'EXECUTION_CALLBACK_WORKERS', 'EXECUTION_CALLBACK_MAX_PENDING',
+    DEFAULT_CALLBACK_WORKERS, 'execution-callback'
+)
+
+
+class _NoRedirectHandler(urllib.request.HTTPRedirectHandler):
+    # a public receiver must not be able to bounce the callback to an internal address
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+_callback_opener = urllib.request.build_opener(_NoRedirectHandler)
+
+
+class ExecutionJobService:
+    
+    @staticmethod
+    def resolve_host(host, port):
+        try:
+            return {info[4][0] for info in socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)}
+        except (socket.gaierror, UnicodeError):
+            return set()
+    
+    @staticmethod
+    def is_public_address(address):
+        ip = ipaddress.ip_address(address.split('%', 1)[0])
+        if ip.version == 6 and ip.ipv4_mapped:
+            ip = ip.ipv4_mapped
+        
+        # is_global excludes private, loopback, link-local (169.254.169.254 metadata), shared and reserved ranges
+        return ip.is_global and not ip.is_multicast
+    
+    @staticmethod
+    def validate_callback_url(callback_url, allowed_hosts=None, allow_private=False):
+        if not callback_url:
+            return None
+        
+        parsed = urlparse(callback_url)
+        try:
+            port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        except ValueError:
+            return 'callback_url has an invalid port'
+        
+        if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+            return 'callback_url must be an absolute http(s) URL'
+        
+        host = parsed.hostname.lower()
+        
+        if allowed_hosts:
+            if any(host == allowed or host.endswith(f'.{allowed}') for allowed in allowed_hosts):
+                return None
+            return f'callback_url host is not allowed: {host}'
+        
+        if allow_private:
+            return None
+        
+        addresses = ExecutionJobService.resolve_host(host, port)
+        if not addresses:
+            return f'callback_url host could not be resolved: {host}'
+        
+        if not all(ExecutionJobService.is_public_address(address) for address in addresses):
+            return f'callback_url must not point to a private, loopback or link-local address: {host}'
+        
+        return None
+    
+    @staticmethod
+    def check_callback_url(callback_url, app):
+        allowed_hosts = [
+            host.strip().lower()
+            for host in app.config.get('EXECUTION_CALLBACK_ALLOWED_HOSTS', '').split(',')
+            if host.strip()
+        ]
+        return ExecutionJobService.validate_callback_url(
+            callback_url,
+            allowed_hosts=allowed_hosts,
+            allow_private=app.config.get('EXECUTION_CALLBACK_ALLOW_PRIVATE', False)
+        )
+    
+    @staticmethod
+    def submit_job(deployed_api, input_data, callback_url, db):
+        app = current_app._get_current_object()
+        
+        error = ExecutionJobService.check_callback_url(callback_url, app)
+        if error:
+            return {'success': False, 'error': error}
+        
+        job = ExecutionJob(
+            instance_id=ProcessInstanceService.generate_instance_id(),
+            deployed_api_id=deployed_api.id,
+            workflow_id=deployed_api.workflow_id,
+            status=JOB_PENDING,
+            input_data=json.dumps(input_data),
+            callback_url=callback_url
+        )
+        
+        db.session.add(job)
+        db.session.commit()
+        
+        if not execution_job_pool.submit(app, ExecutionJobService.run_job, app, job.id, db):
+            job.status = JOB_REJECTED
+            job.error_message = 'Execution queue is full'
+            job.completed_at = datetime.utcnow()
+            db.session.commit()
+            
+            return {'success': False, 'error': job.error_message, 'job': job.to_dict()}
+        
+        return {'success': True, 'job': job.to_dict()}
+    
+    @staticmethod
+    def run_job(app, job_id, db):
+        with app.app_context():
+            job = db.session.query(ExecutionJob).get(job_id)
+            if not job:
+                return
+            
+            job.status = JOB_RUNNING
+            job.started_at = datetime.utcnow()
+            db.session.commit()
+            
+            try:
+                result = ProcessInstanceService.execute_workflow_as_process(
+                    job.workflow_id,
+                    json.loads(job.input_data) if job.input_data else {},
+                    db,
+                    persistence=app.config.get('NODE_PERSISTENCE_MODE', PERSISTENCE_BATCH),
+                    instance_id=job.instance_id
+                )
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f'Execution job {job.instance_id} failed: {str(e)}')
+                result = {'success': False, 'error': str(e), 'instance_id': job.instance_id}
+            
+            job.status = JOB_COMPLETED if result.get('success') else JOB_FAILED
+            job.result = json.dumps(result, default=str)
+            job.error_message = result.get('error')
+            job.completed_at = datetime.utcnow()
+            job.duration_ms = int((job.completed_at - job.started_at).total_seconds() * 1000)
+            db.session.commit()
+            
+            DeploymentService.update_execution_stats(job.deployed_api_id, db)
+            
+            if job.callback_url:
+                job.callback_status = CALLBACK_PENDING
+                db.session.commit()
+                
+                if not callback_pool.submit(app, ExecutionJobService.deliver_callback, app, job.id, db):
+                    job.callback_status = CALLBACK_REJECTED
+                    db.session.commit()
+                    app.logger.warning(f'Callback queue is full, dropping callback for {job.instance_id}')
+    
+    @staticmethod
+    def deliver_callback(app, job_id, db):
+        with app.app_context():
+            job = db.session.query(ExecutionJob).get(job_id)
+            if not job:
+                return
+            
+            ExecutionJobService.send_callback(job, app, db)
+    
+    @staticmethod
+    def post_callback(url, payload, timeout):
+        request = urllib.request.Request(
+            url,
+            data=payload,
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        
+        with _callback_opener.open(request, timeout=timeout) as response:
+            return response.status
+    
+    @staticmethod
+    def send_callback(job, app, db):
+        payload = json.dumps(job.to_dict(), default=str).encode('utf-8')
+        timeout = app.config.get('EXECUTION_CALLBACK_TIMEOUT', DEFAULT_CALLBACK_TIMEOUT)
+        retries = max(1, app.config.get('EXECUTION_CALLBACK_RETRIES', DEFAULT_CALLBACK_RETRIES))
+        
+        for attempt in range(1, retries + 1):
+            # the host is resolved again right before sending, since its DNS may have changed since submission
+            error = ExecutionJobService.check_callback_url(job.callback_url, app)
+            if error:
+                job.callback_status = CALLBACK_REJECTED
+                app.logger.warning(f'Callback for {job.instance_id} rejected: {error}')
+                break
+            
+            job.callback_attempts = attempt
+            
+            try:
+                ExecutionJobService.post_callback(job.callback_url, payload, timeout)
+                job.callback_status = CALLBACK_DELIVERED
+                break
+            except Exception as e:
+                job.callback_status = CALLBACK_FAILED
+                app.logger.warning(
+                    f'Callback for {job.instance_id} failed (attempt {attempt}/{retries}): {str(e)}'
+                )
+                if attempt < retries:
+                    time.sleep(2 ** (attempt - 1))
+        
+        db.session.commit()
+    
+    @staticmethod
+    def get_job(instance_id, db):
+        return db.session.query(ExecutionJob).filter_by(instance_id=instance_id).first()
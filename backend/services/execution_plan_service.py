@@ -0,0 +1,215 @@
+from backend.models.workflow import Workflow
+from backend.services.expression_service import ExpressionService, ExpressionError
+import json
+import threading
+
+
+PARALLEL_GATEWAY_TYPES = ('parallelGateway',)
+
+# outgoing edges of an exclusive gateway labelled like this follow gateway_result instead of a condition
+TRUE_EDGE_LABELS = ('yes', 'y', 'true', '예')
+FALSE_EDGE_LABELS = ('no', 'n', 'false', '아니오')
+
+
+class PlanNode:
+    __slots__ = ('node_id', 'type', 'label', 'config', 'condition', 'outgoing', 'incoming')
+    
+    def __init__(self, node_id, node_type, label, config, condition):
+        self.node_id = node_id
+        self.type = node_type
+        self.label = label
+        self.config = config
+        self.condition = condition
+        self.outgoing = []
+        self.incoming = 0
+    
+    @property
+    def is_join(self):
+        return self.incoming > 1
+    
+    @property
+    def is_parallel_split(self):
+        if self.type in PARALLEL_GATEWAY_TYPES:
+            return True
+        return self.type == 'gateway' and self.config.get('gateway_type') == 'parallel'
+
+
+class PlanEdge:
+    __slots__ = ('edge_id', 'source', 'target', 'label', 'condition_text', 'condition')
+    
+    def __init__(self, edge_id, source, target, label, condition_text, condition):
+        self.edge_id = edge_id
+        self.source = source
+        self.target = target
+        self.label = label
+        self.condition_text = condition_text
+        self.condition = condition
+
+
+class ExecutionPlan:
+    
+    def __init__(self, workflow_id, version_key, nodes, start_node_id):
+        self.workflow_id = workflow_id
+        self.version_key = version_key
+        self.nodes = nodes
+        self.start_node_id = start_node_id
+    
+    @property
+    def start_node(self):
+        if self.start_node_id is None:
+            return None
+        return self.nodes[self.start_node_id]
+    
+    def get_node(self, node_id):
+        return self.nodes.get(node_id)
+    
+    def next_edges(self, node_id):
+        node = self.nodes.get(node_id)
+        return node.outgoing if node else []
+    
+    def exclusive_next_node(self, node_id, context, gateway_result=None):
+        # first edge (in edge order) whose condition holds or whose yes/no label matches gateway_result;
+        # the first edge with neither is the default flow
+        default = None
+        
+        for edge in self.next_edges(node_id):
+            if edge.condition_text:
+                if edge.condition is None:
+                    continue
+                try:
+                    if edge.condition(context):
+                        return self.nodes.get(edge.target)
+                except Exception:
+                    pass
+                continue
+            
+            label = (edge.label or '').strip().lower()
+            if label in TRUE_EDGE_LABELS or label in FALSE_EDGE_LABELS:
+                if gateway_result is not None and bool(gateway_result) == (label in TRUE_EDGE_LABELS):
+                    return self.nodes.get(edge.target)
+                continue
+            
+            if default is None:
+                default = edge
+        
+        return self.nodes.get(default.target) if default else None
+    
+    def active_next_nodes(self, node_id, context):
+        targets = []
+        seen = set()
+        
+        for edge in self.next_edges(node_id):
+            if edge.condition_text:
+                if edge.condition is None:
+                    continue
+                try:
+                    if not edge.condition(context):
+                        continue
+                except Exception:
+                    continue
+            
+            target = self.nodes.get(edge.target)
+            if target and target.node_id not in seen:
+                seen.add(target.node_id)
+                targets.append(target)
+        
+        return targets
+
+
+_plan_cache = {}
+_plan_cache_lock = threading.Lock()
+
+
+class ExecutionPlanService:
+    
+    @staticmethod
+    def get_version_key(workflow):
+        updated_at = workflow.updated_at.isoformat() if workflow.updated_at else None
+        return (workflow.version, updated_at)
+    
+    @staticmethod
+    def get_plan(workflow_id, db):
+        workflow = db.session.query(Workflow).get(workflow_id)
+        if not workflow:
+            return None
+        
+        version_key = ExecutionPlanService.get_version_key(workflow)
+        
+        with _plan_cache_lock:
+            plan = _plan_cache.get(workflow_id)
+        
+        if plan is not None and plan.version_key == version_key:
+            return plan
+        
+        plan = ExecutionPlanService.compile_plan(workflow)
+        
+        with _plan_cache_lock:
+            _plan_cache[workflow_id] = plan
+        
+        return plan
+    
+    @staticmethod
+    def compile_plan(workflow):
+        nodes = {}
+        start_node_id = None
+        
+        for node in workflow.nodes:
+            config = json.loads(node.config) if node.config else {}
+            condition = None
+            if node.node_type == 'gateway' and config.get('condition'):
+                condition = ExecutionPlanService.compile_condition(config['condition'])
+            
+            nodes[node.node_id] = PlanNode(
+                node.node_id,
+                node.node_type,
+                node.label,
+                config,
+                condition
+            )
+            
+            if node.node_type == 'start' and start_node_id is None:
+                start_node_id = node.node_id
+        
+        for edge in sorted(workflow.edges, key=lambda e: e.id or 0):
+            source = nodes.get(edge.source_node_id)
+            if not source:
+                continue
+            
+            target = nodes.get(edge.target_node_id)
+            if target:
+                target.incoming += 1
+            
+            condition = None
+            if edge.condition:
+                condition = ExecutionPlanService.compile_condition(edge.condition)
+            
+            source.outgoing.append(PlanEdge(
+                edge.edge_id,
+                edge.source_node_id,
+                edge.target_node_id,
+                edge.label,
+                edge.condition,
+                condition
+            ))
+        
+        return ExecutionPlan(
+            workflow.id,
+            ExecutionPlanService.get_version_key(workflow),
+            nodes,
+            start_node_id
+        )
+    
+    @staticmethod
+    def compile_condition(expression):
+        try:
+            return ExpressionService.compile(expression)
+        except ExpressionError:
+            return None
+    
+    @staticmethod
+    def invalidate(workflow_id=None):
+        with _plan_cache_lock:
+            if workflow_id is None:
+                _plan_cache.clear()
+            else:
+                _plan_cache.pop(workflow_id, None)
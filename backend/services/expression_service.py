@@ -0,0 +1,467 @@
+import ast
+import operator
+from functools import lru_cache, reduce
+import numpy as np
+
+
+class ExpressionError(Exception):
+    pass
+
+
+MAX_POWER_EXPONENT = 100
+MAX_INTEGER_BITS = 4096
+MAX_SEQUENCE_LENGTH = 100000
+
+SEQUENCE_TYPES = (str, list, tuple)
+CONTAINER_TYPES = (list, tuple, set, frozenset, dict)
+
+
+def _element_count(value, limit=MAX_SEQUENCE_LENGTH):
+    # counts nested items and characters, so a shared row like [[1] * n] * m is measured in full
+    count = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            count += len(item)
+        elif isinstance(item, CONTAINER_TYPES):
+            count += len(item)
+            if count > limit:
+                return count
+            stack.extend(item.items() if isinstance(item, dict) else item)
+        if count > limit:
+            return count
+    return count
+
+
+def _safe_power(base, exponent):
+    if isinstance(exponent, (int, float)) and abs(exponent) > MAX_POWER_EXPONENT:
+        raise ExpressionError(f'Exponent too large: {exponent}')
+    
+    # a small exponent still explodes on a huge base, e.g. ((10 ** 99) ** 99) ** 99
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0:
+        if base.bit_length() * exponent > MAX_INTEGER_BITS:
+            raise ExpressionError('Result too large')
+    return base ** exponent
+
+
+def _safe_multiply(left, right):
+    if isinstance(left, int) and isinstance(right, int):
+        if left.bit_length() + right.bit_length() > MAX_INTEGER_BITS:
+            raise ExpressionError('Result too large')
+    elif isinstance(left, SEQUENCE_TYPES) and isinstance(right, int):
+        if _element_count(left) * right > MAX_SEQUENCE_LENGTH:
+            raise ExpressionError(f'Result longer than {MAX_SEQUENCE_LENGTH} items')
+    elif isinstance(right, SEQUENCE_TYPES) and isinstance(left, int):
+        if _element_count(right) * left > MAX_SEQUENCE_LENGTH:
+            raise ExpressionError(f'Result longer than {MAX_SEQUENCE_LENGTH} items')
+    return left * right
+
+
+def _safe_add(left, right):
+    # repeated 'x += x' in an action doubles a string each statement
+    if isinstance(left, SEQUENCE_TYPES) and isinstance(right, SEQUENCE_TYPES):
+        if _element_count(left) + _element_count(right) > MAX_SEQUENCE_LENGTH:
+            raise ExpressionError(f'Result longer than {MAX_SEQUENCE_LENGTH} items')
+    return left + right
+
+
+def _safe_sum(values, start=0):
+    # sum(rows, []) concatenates natively and never reaches _safe_add
+    if isinstance(start, SEQUENCE_TYPES):
+        raise ExpressionError('sum() only supports numbers')
+    return sum(values, start)
+
+
+def _safe_str(value):
+    # str() of a nested list renders every shared item, e.g. str([[1] * 100000] * 300)
+    if isinstance(value, CONTAINER_TYPES) and _element_count(value) > MAX_SEQUENCE_LENGTH:
+        raise ExpressionError(f'Value longer than {MAX_SEQUENCE_LENGTH} items')
+    return str(value)
+
+
+def _safe_modulo(left, right):
+    # '%0999999999d' % 1 would allocate the padded string
+    if isinstance(left, str):
+        raise ExpressionError('String formatting is not supported')
+    return left % right
+
+
+BINARY_OPERATORS = {
+    ast.Add: _safe_add,
+    ast.Sub: operator.sub,
+    ast.Mult: _safe_multiply,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: _safe_modulo,
+}
+
+UNARY_OPERATORS = {
+    ast.Not: operator.not_,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+COMPARE_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+}
+
+SAFE_FUNCTIONS = {
+    'abs': abs,
+    'min': min,
+    'max': max,
+    'round': round,
+    'len': len,
+    'sum': _safe_sum,
+    'int': int,
+    'float': float,
+    'str': _safe_str,
+    'bool': bool,
+}
+
+
+class _Compiler:
+    
+    def compile(self, node):
+        method = getattr(self, f'compile_{type(node).__name__}', None)
+        if method is None:
+            raise ExpressionError(f'Unsupported syntax: {type(node).__name__}')
+        return method(node)
+    
+    def compile_Expression(self, node):
+        return self.compile(node.body)
+    
+    def compile_Constant(self, node):
+        value = node.value
+        return lambda ctx: value
+    
+    def compile_Name(self, node):
+        name = node.id
+        
+        if name in SAFE_FUNCTIONS:
+            func = SAFE_FUNCTIONS[name]
+            
+            def load_builtin(ctx):
+                return ctx[name] if name in ctx else func
+            return load_builtin
+        
+        def load(ctx):
+            try:
+                return ctx[name]
+            except KeyError:
+                raise ExpressionError(f"name '{name}' is not defined")
+        return load
+    
+    def compile_BoolOp(self, node):
+        values = [self.compile(v) for v in node.values]
+        
+        if isinstance(node.op, ast.And):
+            def evaluate_and(ctx):
+                result = True
+                for value in values:
+                    result = value(ctx)
+                    if not result:
+                        return result
+                return result
+            return evaluate_and
+        
+        def evaluate_or(ctx):
+            result = False
+            for value in values:
+                result = value(ctx)
+                if result:
+                    return result
+            return result
+        return evaluate_or
+    
+    def compile_UnaryOp(self, node):
+        op = UNARY_OPERATORS.get(type(node.op))
+        if op is None:
+            raise ExpressionError(f'Unsupported operator: {type(node.op).__name__}')
+        operand = self.compile(node.operand)
+        return lambda ctx: op(operand(ctx))
+    
+    def compile_BinOp(self, node):
+        if isinstance(node.op, ast.Pow):
+            op = _safe_power
+        else:
+            op = BINARY_OPERATORS.get(type(node.op))
+            if op is None:
+                raise ExpressionError(f'Unsupported operator: {type(node.op).__name__}')
+        left = self.compile(node.left)
+        right = self.compile(node.right)
+        return lambda ctx: op(left(ctx), right(ctx))
+    
+    def compile_Compare(self, node):
+        left = self.compile(node.left)
+        ops = []
+        for op_node in node.ops:
+            op = COMPARE_OPERATORS.get(type(op_node))
+            if op is None:
+                raise ExpressionError(f'Unsupported comparison: {type(op_node).__name__}')
+            ops.append(op)
+        comparators = [self.compile(c) for c in node.comparators]
+        
+        if len(ops) == 1:
+            op = ops[0]
+            right = comparators[0]
+            return lambda ctx: op(left(ctx), right(ctx))
+        
+        pairs = list(zip(ops, comparators))
+        
+        def evaluate_chain(ctx):
+            current = left(ctx)
+            for op, comparator in pairs:
+                value = comparator(ctx)
+                if not op(current, value):
+                    return False
+                current = value
+            return True
+        return evaluate_chain
+    
+    def compile_IfExp(self, node):
+        test = self.compile(node.test)
+        body = self.compile(node.body)
+        orelse = self.compile(node.orelse)
+        return lambda ctx: body(ctx) if test(ctx) else orelse(ctx)
+    
+    def compile_List(self, node):
+        items = [self.compile(e) for e in node.elts]
+        return lambda ctx: [item(ctx) for item in items]
+    
+    def compile_Tuple(self, node):
+        items = [self.compile(e) for e in node.elts]
+        return lambda ctx: tuple(item(ctx) for item in items)
+    
+    def compile_Set(self, node):
+        items = [self.compile(e) for e in node.elts]
+        return lambda ctx: {item(ctx) for item in items}
+    
+    def compile_Dict(self, node):
+        if any(k is None for k in node.keys):
+            raise ExpressionError('Dict unpacking is not supported')
+        keys = [self.compile(k) for k in node.keys]
+        values = [self.compile(v) for v in node.values]
+        pairs = list(zip(keys, values))
+        return lambda ctx: {key(ctx): value(ctx) for key, value in pairs}
+    
+    def compile_Subscript(self, node):
+        if isinstance(node.slice, ast.Slice):
+            raise ExpressionError('Slicing is not supported')
+        target = self.compile(node.value)
+        index = self.compile(node.slice)
+        
+        def subscript(ctx):
+            try:
+                return target(ctx)[index(ctx)]
+            except (KeyError, IndexError, TypeError) as e:
+                raise ExpressionError(f'Invalid subscript: {str(e)}')
+        return subscript
+    
+    def compile_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in SAFE_FUNCTIONS:
+            raise ExpressionError('Only built-in helper functions can be called')
+        if node.keywords:
+            raise ExpressionError('Keyword arguments are not supported')
+        func = SAFE_FUNCTIONS[node.func.id]
+        args = [self.compile(a) for a in node.args]
+        return lambda ctx: func(*[arg(ctx) for arg in args])
+
+
+VECTOR_FUNCTIONS = {
+    'abs': np.abs,
+    'min': lambda *args: reduce(np.minimum, args),
+    'max': lambda *args: reduce(np.maximum, args),
+    'round': lambda value, digits=0: np.round(value, digits),
+    'float': lambda value: np.asarray(value, dtype=np.float64),
+    'int': lambda value: np.asarray(value).astype(np.int64),
+    'bool': lambda value: np.asarray(value, dtype=bool),
+}
+
+
+class _VectorCompiler(_Compiler):
+    # evaluates an expression over columns (one NumPy array per variable) instead of a single row
+    
+    def compile_BoolOp(self, node):
+        values = [self.compile(v) for v in node.values]
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        return lambda ctx: reduce(combine, [value(ctx) for value in values])
+    
+    def compile_UnaryOp(self, node):
+        if isinstance(node.op, ast.Not):
+            operand = self.compile(node.operand)
+            return lambda ctx: np.logical_not(operand(ctx))
+        return super().compile_UnaryOp(node)
+    
+    def compile_Compare(self, node):
+        operands = [self.compile(node.left)] + [self.compile(c) for c in node.comparators]
+        ops = []
+        for op_node in node.ops:
+            if isinstance(op_node, ast.In):
+                ops.append(lambda a, b: np.isin(a, list(b)))
+            elif isinstance(op_node, ast.NotIn):
+                ops.append(lambda a, b: ~np.isin(a, list(b)))
+            elif isinstance(op_node, (ast.Is, ast.IsNot)):
+                raise ExpressionError(f'Unsupported vectorized comparison: {type(op_node).__name__}')
+            else:
+                ops.append(COMPARE_OPERATORS[type(op_node)])
+        
+        def evaluate_chain(ctx):
+            values = [operand(ctx) for operand in operands]
+            return reduce(np.logical_and, [
+                op(values[i], values[i + 1]) for i, op in enumerate(ops)
+            ])
+        return evaluate_chain
+    
+    def compile_IfExp(self, node):
+        test = self.compile(node.test)
+        body = self.compile(node.body)
+        orelse = self.compile(node.orelse)
+        return lambda ctx: np.where(test(ctx), body(ctx), orelse(ctx))
+    
+    def compile_Name(self, node):
+        if node.id in VECTOR_FUNCTIONS:
+            func = VECTOR_FUNCTIONS[node.id]
+            name = node.id
+            return lambda ctx: ctx[name] if name in ctx else func
+        return super().compile_Name(node)
+    
+    def compile_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in VECTOR_FUNCTIONS:
+            raise ExpressionError('Only vectorizable helper functions can be called')
+        if node.keywords:
+            raise ExpressionError('Keyword arguments are not supported')
+        func = VECTOR_FUNCTIONS[node.func.id]
+        args = [self.compile(a) for a in node.args]
+        return lambda ctx: func(*[arg(ctx) for arg in args])
+    
+    def compile_Set(self, node):
+        raise ExpressionError('Set literals are not supported in vectorized expressions')
+    
+    def compile_Dict(self, node):
+        raise ExpressionError('Dict literals are not supported in vectorized expressions')
+    
+    def compile_Subscript(self, node):
+        raise ExpressionError('Subscripts are not supported in vectorized expressions')
+
+class _LayeredContext:
+    __slots__ = ('assigned', 'context')
+    
+    def __init__(self, assigned, context):
+        self.assigned = assigned
+        self.context = context
+    
+    def __getitem__(self, name):
+        if name in self.assigned:
+            return self.assigned[name]
+        return self.context[name]
+    
+    def __contains__(self, name):
+        return name in self.assigned or name in self.context
+
+
+class ExpressionService:
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def compile(expression):
+        if not isinstance(expression, str) or not expression.strip():
+            raise ExpressionError('Expression must be a non-empty string')
+        
+        try:
+            tree = ast.parse(expression.strip(), mode='eval')
+        except SyntaxError as e:
+            raise ExpressionError(f'Invalid expression: {e.msg}')
+        
+        return _Compiler().compile(tree)
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def compile_action(action):
+        if not isinstance(action, str) or not action.strip():
+            raise ExpressionError('Action must be a non-empty string')
+        
+        try:
+            tree = ast.parse(action.strip(), mode='exec')
+        except SyntaxError as e:
+            raise ExpressionError(f'Invalid action: {e.msg}')
+        
+        compiler = _Compiler()
+        statements = []
+        
+        for stmt in tree.body:
+            if isinstance(stmt, ast.Assign):
+                names = []
+                for target in stmt.targets:
+                    if not isinstance(target, ast.Name):
+                        raise ExpressionError('Only simple variable assignment is supported')
+                    names.append(target.id)
+                statements.append((names, None, compiler.compile(stmt.value)))
+            elif isinstance(stmt, ast.AugAssign):
+                if not isinstance(stmt.target, ast.Name):
+                    raise ExpressionError('Only simple variable assignment is supported')
+                op = _safe_power if isinstance(stmt.op, ast.Pow) else BINARY_OPERATORS.get(type(stmt.op))
+                if op is None:
+                    raise ExpressionError(f'Unsupported operator: {type(stmt.op).__name__}')
+                statements.append(([stmt.target.id], op, compiler.compile(stmt.value)))
+            else:
+                raise ExpressionError(f'Unsupported statement: {type(stmt).__name__}')
+        
+        def run(context):
+            assigned = {}
+            scope = _LayeredContext(assigned, context)
+            for names, op, value in statements:
+                result = value(scope)
+                if op is not None:
+                    try:
+                        current = scope[names[0]]
+                    except KeyError:
+                        raise ExpressionError(f"name '{names[0]}' is not defined")
+                    result = op(current, result)
+                for name in names:
+                    assigned[name] = result
+            return assigned
+        
+        return run
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def compile_vectorized(expression):
+        if not isinstance(expression, str) or not expression.strip():
+            raise ExpressionError('Expression must be a non-empty string')
+        
+        try:
+            tree = ast.parse(expression.strip(), mode='eval')
+        except SyntaxError as e:
+            raise ExpressionError(f'Invalid expression: {e.msg}')
+        
+        return _VectorCompiler().compile(tree)
+    
+    @staticmethod
+    def evaluate_vectorized(expression, columns):
+        return ExpressionService.compile_vectorized(expression)(columns)
+    
+    @staticmethod
+    def evaluate(expression, context):
+        return ExpressionService.compile(expression)(context)
+    
+    @staticmethod
+    def execute(action, context):
+        return ExpressionService.compile_action(action)(context)
+    
+    @staticmethod
+    def validate(expression):
+        try:
+            ExpressionService.compile(expression)
+            return {'valid': True, 'errors': []}
+        except ExpressionError as e:
+            return {'valid': False, 'errors': [str(e)]}
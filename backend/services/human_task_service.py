@@ -1,32 +1,100 @@
 from backend.models.human_task import HumanTask
 from backend.models.task_assignment import TaskAssignment
 from backend.models.audit_log import AuditLog
+from backend.models.task_candidate import TaskCandidate, CANDIDATE_ASSIGNEE, CANDIDATE_USER, CANDIDATE_GROUP
+from backend.database import bulk_insert
+from sqlalchemy import and_, or_
 from datetime import datetime
 import json
 
 
+INBOX_STATUSES = ('READY', 'RESERVED')
+
+
 class HumanTaskService:
     
     @staticmethod
-    def get_tasks_for_user(user_id, status=None, db=None):
-        query = db.session.query(HumanTask)
-        
-        if status:
-            query = query.filter(HumanTask.status == status)
-        else:
-            query = query.filter(HumanTask.status.in_(['READY', 'RESERVED']))
-        
-        query = query.filter(
-            (HumanTask.assignee == user_id) |
-            (HumanTask.candidate_users.contains(f'"{user_id}"'))
-        )
-        
-        tasks = query.order_by(HumanTask.priority.desc(), HumanTask.created_at).all()
-        
+    def parse_candidates(value):
+        candidates = json.loads(value) if value else []
+        return [candidate.strip() for candidate in candidates if candidate and candidate.strip()]
+    
+    @staticmethod
+    def candidate_rows(task):
+        entries = [(CANDIDATE_USER, user) for user in set(HumanTaskService.parse_candidates(task.candidate_users))]
+        entries += [(CANDIDATE_GROUP, group) for group in set(HumanTaskService.parse_candidates(task.candidate_groups))]
+        if task.assignee:
+            entries.append((CANDIDATE_ASSIGNEE, task.assignee))
+        
+        return [
+            {
+                'task_id': task.id,
+                'candidate_type': candidate_type,
+                'candidate_id': candidate_id,
+                'status': task.status,
+                'priority': task.priority or 0,
+                'created_at': task.created_at
+            }
+            for candidate_type, candidate_id in entries
+        ]
+    
+    @staticmethod
+    def sync_candidates(task, db):
+        # rebuilt on every state change; a task has a handful of candidate rows
+        db.session.query(TaskCandidate).filter_by(task_id=task.id).delete(synchronize_session=False)
+        bulk_insert(db.session, TaskCandidate, HumanTaskService.candidate_rows(task))
+    
+    @staticmethod
+    def rebuild_candidates(db, batch_size=1000):
+        last_id = 0
+        rebuilt = 0
+        
+        while True:
+            tasks = db.session.query(HumanTask)\
+                .filter(HumanTask.id > last_id)\
+                .order_by(HumanTask.id)\
+                .limit(batch_size)\
+                .all()
+            if not tasks:
+                break
+            
+            db.session.query(TaskCandidate)\
+                .filter(TaskCandidate.task_id.in_([task.id for task in tasks]))\
+                .delete(synchronize_session=False)
+            bulk_insert(db.session, TaskCandidate, [row for task in tasks for row in HumanTaskService.candidate_rows(task)])
+            
+            last_id = tasks[-1].id
+            rebuilt += len(tasks)
+            
+            db.session.commit()
+            db.session.expunge_all()
+        
+        return {'success': True, 'tasks': rebuilt}
+    
+    @staticmethod
+    def build_inbox_query(user_id, status, groups, db):
+        statuses = [status] if status else list(INBOX_STATUSES)
+        
+        matches = [
+            and_(TaskCandidate.candidate_type == CANDIDATE_ASSIGNEE, TaskCandidate.candidate_id == user_id),
+            and_(TaskCandidate.candidate_type == CANDIDATE_USER, TaskCandidate.candidate_id == user_id)
+        ]
+        if groups:
+            matches.append(and_(TaskCandidate.candidate_type == CANDIDATE_GROUP, TaskCandidate.candidate_id.in_(groups)))
+        
+        task_ids = db.session.query(TaskCandidate.task_id)\
+            .filter(or_(*matches), TaskCandidate.status.in_(statuses))
+        
+        return db.session.query(HumanTask)\
+            .filter(HumanTask.id.in_(task_ids))\
+            .order_by(HumanTask.priority.desc(), HumanTask.created_at)
+    
+    @staticmethod
+    def get_tasks_for_user(user_id, status=None, db=None, groups=None):
+        tasks = HumanTaskService.build_inbox_query(user_id, status, groups, db).all()
         return [task.to_dict() for task in tasks]
     
     @staticmethod
-    def claim_task(task_id, user_id, db):
+    def claim_task(task_id, user_id, db, groups=None):
         task = db.session.query(HumanTask).filter_by(task_id=task_id).first()
         if not task:
             return {'success': False, 'error': 'Task not found'}
@@ -34,12 +102,13 @@ class HumanTaskService:
         if task.status != 'READY':
             return {'success': False, 'error': f'Task cannot be claimed, current status: {task.status}'}
         
-        candidate_users = json.loads(task.candidate_users) if task.candidate_users else []
+        candidate_users = HumanTaskService.parse_candidates(task.candidate_users)
+        candidate_groups = HumanTaskService.parse_candidates(task.candidate_groups)
         
         if task.assignee and task.assignee != user_id:
             return {'success': False, 'error': 'Task already assigned to another user'}
         
-        if candidate_users and user_id not in candidate_users:
+        if candidate_users and user_id not in candidate_users and not set(groups or []) & set(candidate_groups):
             return {'success': False, 'error': 'User not in candidate list'}
         
         task.assignee = user_id
@@ -55,7 +124,7 @@ class HumanTaskService:
         )
         
         db.session.add(assignment)
-        db.session.commit()
+        HumanTaskService.sync_candidates(task, db)
         
         audit_log = AuditLog(
             task_id=task_id,
@@ -88,7 +157,7 @@ class HumanTaskService:
             current_form_data.update(output_data)
             task.form_data = json.dumps(current_form_data)
         
-        db.session.commit()
+        HumanTaskService.sync_candidates(task, db)
         
         audit_log = AuditLog(
             task_id=task_id,
@@ -115,7 +184,7 @@ class HumanTaskService:
         task.status = 'READY'
         task.claimed_at = None
         
-        db.session.commit()
+        HumanTaskService.sync_candidates(task, db)
         
         audit_log = AuditLog(
             task_id=task_id,
@@ -150,7 +219,7 @@ class HumanTaskService:
         )
         
         db.session.add(assignment)
-        db.session.commit()
+        HumanTaskService.sync_candidates(task, db)
         
         audit_log = AuditLog(
             task_id=task_id,
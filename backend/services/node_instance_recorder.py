@@ -0,0 +1,154 @@
+from backend.models.node_instance import NodeInstance
+from backend.database import bulk_insert
+from flask import current_app, has_app_context
+from sqlalchemy import update
+from datetime import datetime
+import atexit
+import json
+import queue
+import threading
+
+
+PERSISTENCE_IMMEDIATE = 'immediate'
+PERSISTENCE_BATCH = 'batch'
+PERSISTENCE_ASYNC = 'async'
+
+PERSISTENCE_MODES = (PERSISTENCE_IMMEDIATE, PERSISTENCE_BATCH, PERSISTENCE_ASYNC)
+
+
+class NodeInstanceWriteBehindQueue:
+    
+    def __init__(self, maxsize=10000):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._worker = None
+        self._lock = threading.Lock()
+        self.failed_batches = 0
+    
+    def submit(self, app, db, rows):
+        self._ensure_worker()
+        self._queue.put((app, db, rows))
+    
+    def drain(self, timeout=None):
+        if self._worker is None:
+            return True
+        
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+    
+    def pending(self):
+        return self._queue.qsize()
+    
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            
+            self._worker = threading.Thread(
+                target=self._run,
+                name='node-instance-writer',
+                daemon=True
+            )
+            self._worker.start()
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            
+            app, db, rows = item
+            
+            with app.app_context():
+                try:
+                    bulk_insert(db.session, NodeInstance, rows)
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    self.failed_batches += 1
+                    app.logger.error(f'Failed to persist {len(rows)} node instances: {str(e)}')
+                finally:
+                    db.session.remove()
+
+
+write_behind_queue = NodeInstanceWriteBehindQueue()
+atexit.register(write_behind_queue.drain, 5)
+
+
+class NodeInstanceRecorder:
+    
+    def __init__(self, process_instance_id, db, mode=PERSISTENCE_BATCH):
+        if mode not in PERSISTENCE_MODES:
+            raise ValueError(f'Unknown persistence mode: {mode}')
+        
+        if mode == PERSISTENCE_ASYNC and not has_app_context():
+            mode = PERSISTENCE_BATCH
+        
+        self.process_instance_id = process_instance_id
+        self.db = db
+        self.mode = mode
+        self.rows = []
+        self.flushed = False
+    
+    def start(self, node, context):
+        trigger_time = datetime.utcnow()
+        row = {
+            'process_instance_id': self.process_instance_id,
+            'node_id': node.node_id,
+            'node_name': node.label or node.type,
+            'node_type': node.type,
+            'status': 'ACTIVE',
+            'trigger_time': trigger_time,
+            'variables': json.dumps(context)
+        }
+        
+        if self.mode == PERSISTENCE_IMMEDIATE:
+            # INSERT ... RETURNING hands back the key so finish() can update without reloading the row
+            row['id'] = bulk_insert(self.db.session, NodeInstance, [row], returning=True)[0]
+            self.db.session.commit()
+            return row
+        
+        self.rows.append(row)
+        return row
+    
+    def finish(self, record, status, error_message=None):
+        completion_time = datetime.utcnow()
+        
+        record['completion_time'] = completion_time
+        record['duration_ms'] = int((completion_time - record['trigger_time']).total_seconds() * 1000)
+        record['status'] = status
+        record['error_message'] = error_message
+        
+        if self.mode == PERSISTENCE_IMMEDIATE:
+            self.db.session.execute(
+                update(NodeInstance)
+                .where(NodeInstance.id == record['id'])
+                .values(
+                    completion_time=completion_time,
+                    duration_ms=record['duration_ms'],
+                    status=status,
+                    error_message=error_message
+                )
+            )
+            self.db.session.commit()
+    
+    def flush(self):
+        if self.flushed or self.mode == PERSISTENCE_IMMEDIATE:
+            return
+        
+        self.flushed = True
+        
+        if not self.rows:
+            return
+        
+        if self.mode == PERSISTENCE_ASYNC:
+            write_behind_queue.submit(current_app._get_current_object(), self.db, self.rows)
+            return
+        
+        bulk_insert(self.db.session, NodeInstance, self.rows)
+        self.db.session.commit()
@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from flask import current_app, has_app_context
+import numbers
+import threading
+
+
+DEFAULT_MAX_WORKERS = 8
+
+_executor = None
+_executor_lock = threading.Lock()
+_branch_state = threading.local()
+
+
+def _changed(old, new):
+    if old is new:
+        return False
+    try:
+        return bool(old != new)
+    except Exception:
+        return True
+
+
+class ParallelBranchService:
+    
+    @staticmethod
+    def get_executor(app=None):
+        global _executor
+        
+        if _executor is not None:
+            return _executor
+        
+        with _executor_lock:
+            if _executor is None:
+                max_workers = DEFAULT_MAX_WORKERS
+                if app is not None:
+                    max_workers = app.config.get('PARALLEL_BRANCH_WORKERS', DEFAULT_MAX_WORKERS)
+                
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, int(max_workers)),
+                    thread_name_prefix='process-branch'
+                )
+        
+        return _executor
+    
+    @staticmethod
+    def in_branch():
+        return getattr(_branch_state, 'active', False)
+    
+    @staticmethod
+    def run_branches(tasks):
+        if len(tasks) < 2 or not has_app_context() or ParallelBranchService.in_branch():
+            return [task() for task in tasks]
+        
+        app = current_app._get_current_object()
+        executor = ParallelBranchService.get_executor(app)
+        
+        futures = [
+            executor.submit(ParallelBranchService._run_in_branch, app, task)
+            for task in tasks
+        ]
+        wait(futures)
+        
+        return [future.result() for future in futures]
+    
+    @staticmethod
+    def _run_in_branch(app, task):
+        with app.app_context():
+            _branch_state.active = True
+            try:
+                return task()
+            finally:
+                _branch_state.active = False
+    
+    @staticmethod
+    def merge_contexts(context, snapshot, branch_contexts, additive_keys=()):
+        for branch_context in branch_contexts:
+            for key, value in branch_context.items():
+                if key in snapshot and not _changed(snapshot[key], value):
+                    continue
+                
+                if (
+                    key in additive_keys
+                    and isinstance(value, numbers.Number)
+                    and isinstance(context.get(key), numbers.Number)
+                ):
+                    context[key] = context[key] + (value - snapshot.get(key, 0))
+                else:
+                    context[key] = value
+        
+        return context
@@ -3,8 +3,12 @@ from backend.models.process_definition import ProcessDefinition
 from backend.models.node_instance import NodeInstance
 from backend.models.human_task import HumanTask
 from backend.models.audit_log import AuditLog
-from backend.models.workflow import Workflow
 from backend.services.rule_engine_service import RuleEngineService
+from backend.services.execution_plan_service import ExecutionPlanService
+from backend.services.expression_service import ExpressionService
+from backend.services.node_instance_recorder import NodeInstanceRecorder, PERSISTENCE_BATCH
+from backend.services.parallel_branch_service import ParallelBranchService
+from backend.services.human_task_service import HumanTaskService
 import json
 import uuid
 from datetime import datetime
@@ -12,13 +16,17 @@ from datetime import datetime
 
 class ProcessInstanceService:
     
+    @staticmethod
+    def generate_instance_id():
+        return f"PI-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    
     @staticmethod
     def start_process(process_definition_id, business_key, variables, started_by, db):
         process_def = db.session.query(ProcessDefinition).get(process_definition_id)
         if not process_def:
             return {'success': False, 'error': 'Process definition not found'}
         
-        instance_id = f"PI-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        instance_id = ProcessInstanceService.generate_instance_id()
         
         process_instance = ProcessInstance(
             process_definition_id=process_definition_id,
@@ -30,7 +38,6 @@ class ProcessInstanceService:
         )
         
         db.session.add(process_instance)
-        db.session.commit()
         
         audit_log = AuditLog(
             process_instance_id=instance_id,
@@ -48,12 +55,12 @@ class ProcessInstanceService:
         }
     
     @staticmethod
-    def execute_workflow_as_process(workflow_id, input_data, db):
-        workflow = db.session.query(Workflow).get(workflow_id)
-        if not workflow:
+    def execute_workflow_as_process(workflow_id, input_data, db, persistence=PERSISTENCE_BATCH, instance_id=None):
+        plan = ExecutionPlanService.get_plan(workflow_id, db)
+        if not plan:
             return {'success': False, 'error': 'Workflow not found'}
         
-        instance_id = f"PI-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        instance_id = instance_id or ProcessInstanceService.generate_instance_id()
         
         context = input_data.copy()
         context['workflow_id'] = workflow_id
@@ -61,80 +68,129 @@ class ProcessInstanceService:
         
         start_time = datetime.utcnow()
         
-        start_node = next((n for n in workflow.nodes if n.type == 'start'), None)
+        start_node = plan.start_node
         if not start_node:
             return {'success': False, 'error': 'No start node found'}
         
-        current_node = start_node
-        visited_nodes = set()
+        recorder = NodeInstanceRecorder(instance_id, db, persistence)
+        
+        try:
+            result = ProcessInstanceService.execute_path(plan, start_node, context, db, recorder, set())
+        finally:
+            recorder.flush()
         
+        if not result.get('success'):
+            return {
+                'success': False,
+                'error': result.get('error'),
+                'instance_id': instance_id,
+                'context': context
+            }
+        
+        end_time = datetime.utcnow()
+        duration_ms = int((end_time - start_time).total_seconds() * 1000)
+        
+        return {
+            'success': True,
+            'instance_id': instance_id,
+            'status': 'COMPLETED',
+            'duration_ms': duration_ms,
+            'result': context
+        }
+    
+    @staticmethod
+    def execute_path(plan, current_node, context, db, recorder, visited, in_branch=False, arrived_by_edge=False):
         while current_node:
-            if current_node.node_id in visited_nodes:
-                break
+            if in_branch and arrived_by_edge and current_node.is_join:
+                return {'success': True, 'join': current_node}
             
-            visited_nodes.add(current_node.node_id)
+            if current_node.node_id in visited:
+                break
             
-            node_start = datetime.utcnow()
+            visited.add(current_node.node_id)
             
-            node_instance = NodeInstance(
-                process_instance_id=instance_id,
-                node_id=current_node.node_id,
-                node_name=current_node.label or current_node.type,
-                node_type=current_node.type,
-                status='ACTIVE',
-                variables=json.dumps(context)
-            )
-            db.session.add(node_instance)
-            db.session.commit()
+            node_instance = recorder.start(current_node, context)
             
             result = ProcessInstanceService.execute_node(current_node, context, db)
             
-            node_end = datetime.utcnow()
-            node_instance.completion_time = node_end
-            node_instance.duration_ms = int((node_end - node_start).total_seconds() * 1000)
-            node_instance.status = 'COMPLETED'
-            
             if not result.get('success'):
-                node_instance.status = 'FAILED'
-                node_instance.error_message = result.get('error')
-                db.session.commit()
-                
-                return {
-                    'success': False,
-                    'error': result.get('error'),
-                    'instance_id': instance_id,
-                    'context': context
-                }
+                recorder.finish(node_instance, 'FAILED', result.get('error'))
+                return {'success': False, 'error': result.get('error')}
             
             if result.get('output'):
                 context.update(result['output'])
             
-            db.session.commit()
+            recorder.finish(node_instance, 'COMPLETED')
             
             if current_node.type == 'end':
                 break
             
-            next_edge = next((e for e in workflow.edges if e.source == current_node.node_id), None)
-            if not next_edge:
-                break
+            if not current_node.is_parallel_split:
+                next_node = plan.exclusive_next_node(
+                    current_node.node_id, context, (result.get('output') or {}).get('gateway_result')
+                )
+                if next_node is None and current_node.type == 'gateway' and plan.next_edges(current_node.node_id):
+                    return {'success': False, 'error': f'No outgoing flow matched at gateway {current_node.node_id}'}
+                
+                current_node = next_node
+                arrived_by_edge = True
+                continue
+            
+            next_nodes = plan.active_next_nodes(current_node.node_id, context)
+            arrived_by_edge = True
+            
+            while len(next_nodes) > 1:
+                fork = ProcessInstanceService.execute_branches(
+                    plan, next_nodes, context, db, recorder, visited, arrived_by_edge
+                )
+                if not fork.get('success'):
+                    return fork
+                
+                next_nodes = fork['joins']
+                arrived_by_edge = False
             
-            current_node = next((n for n in workflow.nodes if n.node_id == next_edge.target), None)
+            current_node = next_nodes[0] if next_nodes else None
         
-        end_time = datetime.utcnow()
-        duration_ms = int((end_time - start_time).total_seconds() * 1000)
+        return {'success': True, 'join': None}
+    
+    @staticmethod
+    def execute_branches(plan, nodes, context, db, recorder, visited, arrived_by_edge):
+        snapshot = dict(context)
         
-        return {
-            'success': True,
-            'instance_id': instance_id,
-            'status': 'COMPLETED',
-            'duration_ms': duration_ms,
-            'result': context
-        }
+        def make_branch(node):
+            branch_context = dict(snapshot)
+            branch_visited = set(visited)
+            
+            def run():
+                result = ProcessInstanceService.execute_path(
+                    plan, node, branch_context, db, recorder, branch_visited, True, arrived_by_edge
+                )
+                result['context'] = branch_context
+                result['visited'] = branch_visited
+                return result
+            return run
+        
+        results = ParallelBranchService.run_branches([make_branch(node) for node in nodes])
+        
+        failed = next((r for r in results if not r.get('success')), None)
+        if failed:
+            return {'success': False, 'error': failed.get('error')}
+        
+        ParallelBranchService.merge_contexts(context, snapshot, [r['context'] for r in results])
+        
+        joins = []
+        for result in results:
+            visited.update(result['visited'])
+            join = result['join']
+            if join is not None and all(j.node_id != join.node_id for j in joins):
+                joins.append(join)
+        
+        return {'success': True, 'joins': joins}
     
     @staticmethod
     def execute_node(node, context, db):
         node_type = node.type
-        config = json.loads(node.config) if node.config else {}
+        config = node.config
         
         if node_type == 'start':
             return {'success': True, 'output': {}}
@@ -172,7 +228,8 @@ class ProcessInstanceService:
                 return {'success': True, 'output': {}}
             
             try:
-                result = eval(condition, {"__builtins__": {}}, context)
+                evaluator = node.condition or ExpressionService.compile(condition)
+                result = evaluator(context)
                 return {'success': True, 'output': {'gateway_result': result}}
             except Exception as e:
                 return {'success': False, 'error': f'Gateway evaluation failed: {str(e)}'}
@@ -192,6 +249,8 @@ class ProcessInstanceService:
                 candidate_groups=json.dumps(config.get('candidate_groups', []))
             )
             db.session.add(task)
+            db.session.flush()
+            HumanTaskService.sync_candidates(task, db)
             db.session.commit()
             
             return {'success': True, 'output': {'task_id': task_id, 'task_status': 'CREATED'}}
@@ -233,8 +292,6 @@ class ProcessInstanceService:
         if instance.start_time:
             instance.duration_ms = int((instance.end_time - instance.start_time).total_seconds() * 1000)
         
-        db.session.commit()
-        
         audit_log = AuditLog(
             process_instance_id=instance_id,
             event_type='PROCESS_ABORTED',
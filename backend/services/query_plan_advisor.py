@@ -0,0 +1,125 @@
+from backend.models.human_task import HumanTask
+from backend.models.audit_log import AuditLog
+from backend.models.node_instance import NodeInstance
+from backend.models.process_variable import ProcessVariable
+from backend.models.deployed_api import DeployedAPI
+from backend.services.human_task_service import HumanTaskService
+from backend.models.application import Application, ApplicationLog
+from sqlalchemy import text
+import json
+
+
+SAMPLE_INSTANCE_ID = 'PI-ADVISOR'
+SAMPLE_TASK_ID = 'TASK-ADVISOR'
+SAMPLE_USER_ID = 'advisor'
+SAMPLE_GROUPS = ['underwriting', 'risk']
+SAMPLE_PAGE_SIZE = 20
+
+
+class QueryPlanAdvisor:
+    
+    @staticmethod
+    def hot_queries(db):
+        # mirrors the filters and ordering used by the services and routes named here
+        session = db.session
+        
+        return [
+            ('HumanTaskService.get_tasks_for_user', HumanTaskService.build_inbox_query(
+                SAMPLE_USER_ID, None, SAMPLE_GROUPS, db
+            )),
+            ('HumanTaskService.get_tasks_by_process', session.query(HumanTask)
+                .filter_by(process_instance_id=SAMPLE_INSTANCE_ID)
+                .order_by(HumanTask.created_at)),
+            ('HumanTaskService.get_task_details', session.query(AuditLog)
+                .filter_by(task_id=SAMPLE_TASK_ID)
+                .order_by(AuditLog.timestamp.desc())),
+            ('AuditLog by process instance', session.query(AuditLog)
+                .filter_by(process_instance_id=SAMPLE_INSTANCE_ID)
+                .order_by(AuditLog.timestamp.desc())),
+            ('ProcessInstanceService.get_node_instances', session.query(NodeInstance)
+                .filter_by(process_instance_id=SAMPLE_INSTANCE_ID)
+                .order_by(NodeInstance.trigger_time)),
+            ('ProcessVariable by process instance', session.query(ProcessVariable)
+                .filter_by(process_instance_id=SAMPLE_INSTANCE_ID, name='amount')),
+            ('DeploymentService.get_deployment_by_path', session.query(DeployedAPI)
+                .filter_by(api_path='/api/execute/advisor', status='active')
+                .limit(1)),
+            ('GET /application/<id>/logs', session.query(ApplicationLog)
+                .filter_by(application_id=1)
+                .order_by(ApplicationLog.created_at.asc(), ApplicationLog.id.asc())),
+            ('GET /application?status=', session.query(Application)
+                .filter_by(status='pending')
+                .order_by(Application.created_at.desc())
+                .limit(SAMPLE_PAGE_SIZE)),
+            ('GET /application', session.query(Application)
+                .order_by(Application.created_at.desc())
+                .limit(SAMPLE_PAGE_SIZE))
+        ]
+    
+    @staticmethod
+    def explain(query, db):
+        dialect = db.session.get_bind().dialect
+        sql = str(query.statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+        
+        if dialect.name == 'sqlite':
+            rows = db.session.execute(text(f'EXPLAIN QUERY PLAN {sql}')).all()
+            steps = [row[-1] for row in rows]
+            
+            # "SCAN t USING INDEX ..." walks an index in order (cut short by LIMIT); a bare "SCAN t" reads every row
+            full_scans = [step for step in steps if step.startswith('SCAN ') and ' USING ' not in step]
+            sorts = [step for step in steps if 'TEMP B-TREE' in step]
+        
+        elif dialect.name == 'postgresql':
+            plan = db.session.execute(text(f'EXPLAIN (FORMAT JSON) {sql}')).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            
+            nodes = []
+            pending = [plan[0]['Plan']]
+            while pending:
+                node = pending.pop()
+                nodes.append(node)
+                pending.extend(node.get('Plans', []))
+            
+            steps = [
+                ' '.join(filter(None, [
+                    node['Node Type'],
+                    f'on {node["Relation Name"]}' if node.get('Relation Name') else None,
+                    f'using {node["Index Name"]}' if node.get('Index Name') else None
+                ]))
+                for node in nodes
+            ]
+            full_scans = [step for node, step in zip(nodes, steps) if node['Node Type'] == 'Seq Scan']
+            sorts = [step for node, step in zip(nodes, steps) if node['Node Type'] in ('Sort', 'Incremental Sort')]
+        
+        else:
+            return {'supported': False, 'sql': sql, 'error': f'EXPLAIN is not supported for {dialect.name}'}
+        
+        return {
+            'supported': True,
+            'sql': sql,
+            'plan': steps,
+            'full_scans': full_scans,
+            'sorts': sorts
+        }
+    
+    @staticmethod
+    def analyze(db):
+        reports = []
+        
+        for name, query in QueryPlanAdvisor.hot_queries(db):
+            try:
+                report = QueryPlanAdvisor.explain(query, db)
+            except Exception as e:
+                db.session.rollback()
+                report = {'supported': False, 'error': str(e)}
+            
+            report['name'] = name
+            reports.append(report)
+        
+        return {
+            'success': True,
+            'dialect': db.session.get_bind().dialect.name,
+            'queries': reports,
+            'full_scans': sum(len(report.get('full_scans', [])) for report in reports)
+        }
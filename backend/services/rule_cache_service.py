@@ -0,0 +1,138 @@
+from collections import OrderedDict
+import sys
+import threading
+import numpy as np
+
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def estimate_size(obj, seen=None):
+    if seen is None:
+        seen = set()
+    
+    obj_id = id(obj)
+    if obj_id in seen:
+        return 0
+    seen.add(obj_id)
+    
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + obj.nbytes
+    
+    size = sys.getsizeof(obj)
+    
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += estimate_size(key, seen) + estimate_size(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += estimate_size(item, seen)
+    elif hasattr(obj, '__dict__'):
+        size += estimate_size(vars(obj), seen)
+    elif hasattr(obj, '__slots__'):
+        for slot in obj.__slots__:
+            if hasattr(obj, slot):
+                size += estimate_size(getattr(obj, slot), seen)
+    
+    return size
+
+
+class RuleArtifactCache:
+    
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def configure(self, max_entries=None, max_bytes=None):
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+    
+    def get(self, rule_type, rule_id, version):
+        key = (rule_type, rule_id)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, rule_type, rule_id, version, artifact):
+        key = (rule_type, rule_id)
+        size = estimate_size(artifact)
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[2]
+            
+            if size > self.max_bytes:
+                return artifact
+            
+            self._entries[key] = (version, artifact, size)
+            self._total_bytes += size
+            self._evict()
+        
+        return artifact
+    
+    def get_or_compile(self, rule_type, rule_id, version, compile_func):
+        artifact = self.get(rule_type, rule_id, version)
+        if artifact is not None:
+            return artifact
+        
+        artifact = compile_func()
+        if artifact is None:
+            return None
+        
+        return self.put(rule_type, rule_id, version, artifact)
+    
+    def invalidate(self, rule_type=None, rule_id=None):
+        with self._lock:
+            if rule_type is None:
+                self._entries.clear()
+                self._total_bytes = 0
+                return
+            
+            keys = [
+                key for key in self._entries
+                if key[0] == rule_type and (rule_id is None or key[1] == rule_id)
+            ]
+            for key in keys:
+                self._total_bytes -= self._entries.pop(key)[2]
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+    
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+
+
+rule_artifact_cache = RuleArtifactCache()
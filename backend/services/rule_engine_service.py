@@ -1,13 +1,25 @@
 from backend.models.decision_tree import DecisionTree, DecisionTreeNode
 from backend.models.scorecard import Scorecard
 from backend.models.decision_table import DecisionTable
-from backend.models.rule_set import RuleSet
+from backend.models.rule_set import RuleSet, Rule
 from backend.services.decision_tree_service import DecisionTreeService
 from backend.services.scorecard_service import ScorecardService
-from backend.services.decision_table_service import DecisionTableService
+from backend.services.decision_table_service import DecisionTableService, CompiledDecisionTable
+from backend.services.expression_service import ExpressionService
+from backend.services.rule_cache_service import rule_artifact_cache
+from sqlalchemy import func
+import numpy as np
 import json
 
 
+RULE_TYPE_LABELS = {
+    'DECISION_TREE': 'Decision tree',
+    'SCORECARD': 'Scorecard',
+    'DECISION_TABLE': 'Decision table',
+    'RULE_SET': 'Rule set'
+}
+
+
 class RuleEngineService:
     
     @staticmethod
@@ -27,44 +39,147 @@ class RuleEngineService:
             }
     
     @staticmethod
-    def execute_decision_tree(tree_id, input_data, db):
+    def load_rule_header(model, rule_id, db, *columns):
+        return db.session.query(model.id, model.name, model.updated_at, *columns)\
+            .filter(model.id == rule_id)\
+            .first()
+    
+    @staticmethod
+    def compile_decision_tree(tree_id, db):
         tree = db.session.query(DecisionTree).get(tree_id)
-        if not tree:
-            return {'success': False, 'error': 'Decision tree not found'}
+        return DecisionTreeService.compile_tree(tree.nodes, tree.get_feature_encodings())
+    
+    @staticmethod
+    def load_compiled_rule(rule_type, rule_id, db):
+        if rule_type == 'DECISION_TREE':
+            header = RuleEngineService.load_rule_header(DecisionTree, rule_id, db)
+            if not header:
+                return None, None
+            
+            return header, rule_artifact_cache.get_or_compile(
+                'DECISION_TREE',
+                rule_id,
+                header.updated_at,
+                lambda: RuleEngineService.compile_decision_tree(rule_id, db)
+            )
+        
+        if rule_type == 'SCORECARD':
+            header = RuleEngineService.load_rule_header(Scorecard, rule_id, db)
+            if not header:
+                return None, None
+            
+            return header, rule_artifact_cache.get_or_compile(
+                'SCORECARD',
+                rule_id,
+                header.updated_at,
+                lambda: ScorecardService.compile_scorecard(db.session.query(Scorecard).get(rule_id))
+            )
+        
+        if rule_type == 'DECISION_TABLE':
+            header = RuleEngineService.load_rule_header(DecisionTable, rule_id, db, DecisionTable.hit_policy)
+            if not header:
+                return None, None
+            
+            return header, rule_artifact_cache.get_or_compile(
+                'DECISION_TABLE',
+                rule_id,
+                DecisionTableService.cache_version(rule_id, header.updated_at, header.hit_policy, db.session),
+                lambda: CompiledDecisionTable(db.session.query(DecisionTable).get(rule_id))
+            )
+        
+        if rule_type == 'RULE_SET':
+            header = RuleEngineService.load_rule_header(RuleSet, rule_id, db)
+            if not header:
+                return None, None
+            
+            rules_version = db.session.query(func.max(Rule.updated_at), func.count(Rule.id))\
+                .filter(Rule.rule_set_id == rule_id)\
+                .first()
+            
+            return header, rule_artifact_cache.get_or_compile(
+                'RULE_SET',
+                rule_id,
+                (header.updated_at, tuple(rules_version)),
+                lambda: RuleEngineService.compile_rule_set(db.session.query(RuleSet).get(rule_id))
+            )
+        
+        raise ValueError(f'Unknown rule type: {rule_type}')
+    
+    @staticmethod
+    def execute_rule_batch(rule_type, rule_id, rows, db):
+        if rule_type not in RULE_TYPE_LABELS:
+            return {'success': False, 'error': f'Unknown rule type: {rule_type}'}
+        
+        header, compiled = RuleEngineService.load_compiled_rule(rule_type, rule_id, db)
+        if not header:
+            return {'success': False, 'error': f'{RULE_TYPE_LABELS[rule_type]} not found'}
         
-        tree_dict = RuleEngineService.build_tree_dict_from_nodes(tree.nodes)
+        scores = None
+        
+        if rule_type == 'DECISION_TREE':
+            outputs = DecisionTreeService.predict_batch(compiled, rows) if compiled else [None] * len(rows)
+        elif rule_type == 'SCORECARD':
+            outputs = ScorecardService.calculate_score_batch(compiled, rows, include_breakdown=False)
+            scores = np.fromiter((output['score'] for output in outputs), dtype=np.float64, count=len(outputs))
+            for output in outputs:
+                del output['row']
+        elif rule_type == 'DECISION_TABLE':
+            outputs = [compiled.execute(row)['output'] for row in rows]
+        else:
+            outputs = []
+            for row in rows:
+                _, context = RuleEngineService.apply_rule_set(compiled, row)
+                outputs.append({
+                    key: value for key, value in context.items()
+                    if key not in row or row[key] != value
+                })
+        
+        return {
+            'success': True,
+            'rule_type': rule_type,
+            'rule_id': rule_id,
+            'rule_name': header.name,
+            'outputs': outputs,
+            'scores': scores
+        }
+    
+    @staticmethod
+    def execute_decision_tree(tree_id, input_data, db):
+        header, compiled = RuleEngineService.load_compiled_rule('DECISION_TREE', tree_id, db)
+        if not header:
+            return {'success': False, 'error': 'Decision tree not found'}
         
-        prediction = DecisionTreeService.predict(tree_dict, input_data)
+        prediction = DecisionTreeService.predict_compiled(compiled, input_data)
         
         return {
             'success': True,
             'rule_type': 'DECISION_TREE',
             'tree_id': tree_id,
-            'tree_name': tree.name,
+            'tree_name': header.name,
             'prediction': prediction,
             'input': input_data
         }
     
     @staticmethod
     def execute_scorecard(scorecard_id, input_data, db):
-        scorecard = db.session.query(Scorecard).get(scorecard_id)
-        if not scorecard:
+        header, compiled = RuleEngineService.load_compiled_rule('SCORECARD', scorecard_id, db)
+        if not header:
             return {'success': False, 'error': 'Scorecard not found'}
         
-        result = ScorecardService.calculate_score(scorecard, input_data)
+        result = ScorecardService.calculate_score_compiled(compiled, input_data)
         
         probability = ScorecardService.calculate_probability(
             result['total_score'],
-            scorecard.base_score,
-            scorecard.pdo,
-            scorecard.base_odds
+            compiled['base_score'],
+            compiled['pdo'],
+            compiled['base_odds']
         )
         
         return {
             'success': True,
             'rule_type': 'SCORECARD',
             'scorecard_id': scorecard_id,
-            'scorecard_name': scorecard.name,
+            'scorecard_name': header.name,
             'score': result['total_score'],
             'breakdown': result['breakdown'],
             'probability': round(probability, 4),
@@ -73,78 +188,91 @@ class RuleEngineService:
     
     @staticmethod
     def execute_decision_table(table_id, input_data, db):
-        table = db.session.query(DecisionTable).get(table_id)
-        if not table:
+        header, compiled = RuleEngineService.load_compiled_rule('DECISION_TABLE', table_id, db)
+        if not header:
             return {'success': False, 'error': 'Decision table not found'}
         
-        result = DecisionTableService.execute_table(table, input_data)
+        result = compiled.execute(input_data)
         
         return {
             'success': True,
             'rule_type': 'DECISION_TABLE',
             'table_id': table_id,
-            'table_name': table.name,
+            'table_name': header.name,
             'matched': result['matched'],
             'output': result['output'],
             'matched_rules': result.get('rules', []),
             'input': input_data
         }
     
+    @staticmethod
+    def compile_rule_set(rule_set):
+        sorted_rules = sorted(rule_set.rules, key=lambda r: r.priority or 0, reverse=True)
+        
+        return [
+            {
+                'id': rule.id,
+                'name': rule.name,
+                'condition': rule.condition,
+                'action': rule.action
+            }
+            for rule in sorted_rules
+            if rule.enabled
+        ]
+    
     @staticmethod
     def execute_rule_set(rule_set_id, input_data, db):
-        rule_set = db.session.query(RuleSet).get(rule_set_id)
-        if not rule_set:
+        header, compiled_rules = RuleEngineService.load_compiled_rule('RULE_SET', rule_set_id, db)
+        if not header:
             return {'success': False, 'error': 'Rule set not found'}
         
+        results, context = RuleEngineService.apply_rule_set(compiled_rules, input_data)
+        
+        return {
+            'success': True,
+            'rule_type': 'RULE_SET',
+            'rule_set_id': rule_set_id,
+            'rule_set_name': header.name,
+            'fired_rules': results,
+            'final_context': context,
+            'input': input_data
+        }
+    
+    @staticmethod
+    def apply_rule_set(compiled_rules, input_data):
         results = []
         context = input_data.copy()
         
-        sorted_rules = sorted(rule_set.rules, key=lambda r: r.priority, reverse=True)
-        
-        for rule in sorted_rules:
-            if not rule.enabled:
-                continue
-            
-            condition_result = RuleEngineService.evaluate_expression(rule.condition, context)
+        for rule in compiled_rules:
+            condition_result = RuleEngineService.evaluate_expression(rule['condition'], context)
             
             if condition_result:
-                action_result = RuleEngineService.execute_action(rule.action, context)
+                action_result = RuleEngineService.execute_action(rule['action'], context)
                 results.append({
-                    'rule_id': rule.id,
-                    'rule_name': rule.name,
-                    'condition': rule.condition,
-                    'action': rule.action,
+                    'rule_id': rule['id'],
+                    'rule_name': rule['name'],
+                    'condition': rule['condition'],
+                    'action': rule['action'],
                     'result': action_result
                 })
                 
                 if isinstance(action_result, dict):
                     context.update(action_result)
         
-        return {
-            'success': True,
-            'rule_type': 'RULE_SET',
-            'rule_set_id': rule_set_id,
-            'rule_set_name': rule_set.name,
-            'fired_rules': results,
-            'final_context': context,
-            'input': input_data
-        }
+        return results, context
     
     @staticmethod
     def evaluate_expression(expression, context):
         try:
-            safe_context = {k: v for k, v in context.items()}
-            result = eval(expression, {"__builtins__": {}}, safe_context)
-            return result
+            return ExpressionService.evaluate(expression, context)
         except Exception as e:
             return False
     
     @staticmethod
     def execute_action(action, context):
         try:
-            safe_context = {k: v for k, v in context.items()}
-            exec(action, {"__builtins__": {}}, safe_context)
-            return {k: v for k, v in safe_context.items() if k not in context or context[k] != v}
+            assigned = ExpressionService.execute(action, context)
+            return {k: v for k, v in assigned.items() if k not in context or context[k] != v}
         except Exception as e:
             return {'error': str(e)}
     
@@ -0,0 +1,363 @@
+from backend.models.application import Application
+from backend.models.test_case import TestCase
+from backend.services.rule_engine_service import RuleEngineService, RULE_TYPE_LABELS
+from flask import current_app
+from collections import Counter
+import numpy as np
+import json
+import time
+
+
+SOURCE_APPLICATIONS = 'applications'
+SOURCE_TEST_CASES = 'test_cases'
+SOURCE_INLINE = 'inline'
+
+REPLAY_SOURCES = (SOURCE_APPLICATIONS, SOURCE_TEST_CASES, SOURCE_INLINE)
+
+DEFAULT_CHUNK_SIZE = 20000
+DEFAULT_SAMPLE_SIZE = 20
+DEFAULT_SHIFT_EDGES = (-50.0, -20.0, -10.0, -5.0, -1.0, 1.0, 5.0, 10.0, 20.0, 50.0)
+MAX_TRANSITIONS = 50
+SHIFT_PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+
+def _load_record(value):
+    try:
+        record = json.loads(value) if value else {}
+    except (TypeError, ValueError):
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def _decision_key(value):
+    # dict/list outputs are compared and counted by their canonical JSON form
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, default=str)
+    return value
+
+
+def _to_float(value):
+    if value is None or isinstance(value, bool):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class ReplayAccumulator:
+    
+    def __init__(self, sample_size=DEFAULT_SAMPLE_SIZE, shift_edges=DEFAULT_SHIFT_EDGES):
+        self.sample_size = sample_size
+        self.shift_edges = np.asarray(sorted(shift_edges), dtype=np.float64)
+        self.evaluated = 0
+        self.skipped = 0
+        self.changed = 0
+        self.flipped = 0
+        self.baseline_decisions = Counter()
+        self.candidate_decisions = Counter()
+        self.transitions = Counter()
+        self.shift_counts = np.zeros(len(self.shift_edges) + 1, dtype=np.int64)
+        self.shifts = []
+        self.flipped_samples = []
+        self.changed_samples = []
+    
+    def add(self, record_ids, rows, baseline, candidate):
+        baseline_outputs = baseline['outputs']
+        candidate_outputs = candidate['outputs']
+        baseline_decisions = baseline['decisions']
+        candidate_decisions = candidate['decisions']
+        
+        self.evaluated += len(rows)
+        self.baseline_decisions.update(baseline_decisions)
+        self.candidate_decisions.update(candidate_decisions)
+        
+        changed = np.fromiter(
+            (b != c for b, c in zip(baseline_outputs, candidate_outputs)), dtype=bool, count=len(rows)
+        )
+        flipped = np.fromiter(
+            (b != c for b, c in zip(baseline_decisions, candidate_decisions)), dtype=bool, count=len(rows)
+        )
+        
+        self.changed += int(changed.sum())
+        self.flipped += int(flipped.sum())
+        self.transitions.update(
+            (baseline_decisions[i], candidate_decisions[i]) for i in np.flatnonzero(flipped)
+        )
+        
+        shifts = None
+        if baseline['scores'] is not None and candidate['scores'] is not None:
+            shifts = candidate['scores'] - baseline['scores']
+            valid = shifts[~np.isnan(shifts)]
+            self.shifts.append(valid)
+            self.shift_counts += np.bincount(
+                np.searchsorted(self.shift_edges, valid, side='right'),
+                minlength=len(self.shift_counts)
+            )
+        
+        for samples, mask in ((self.flipped_samples, flipped), (self.changed_samples, changed & ~flipped)):
+            for i in np.flatnonzero(mask)[:self.sample_size - len(samples)]:
+                samples.append({
+                    'record_id': record_ids[i],
+                    'input': rows[i],
+                    'flipped': bool(flipped[i]),
+                    'baseline': {'decision': baseline_decisions[i], 'output': baseline_outputs[i]},
+                    'candidate': {'decision': candidate_decisions[i], 'output': candidate_outputs[i]},
+                    'score_shift': round(float(shifts[i]), 4) if shifts is not None and not np.isnan(shifts[i]) else None
+                })
+    
+    def summary(self):
+        return {
+            'evaluated': self.evaluated,
+            'skipped': self.skipped,
+            'changed': self.changed,
+            'changed_rate': round(self.changed / self.evaluated, 6) if self.evaluated else 0.0,
+            'flipped': self.flipped,
+            'flip_rate': round(self.flipped / self.evaluated, 6) if self.evaluated else 0.0,
+            'decision_distribution': {
+                'baseline': [
+                    {'decision': decision, 'count': count}
+                    for decision, count in self.baseline_decisions.most_common()
+                ],
+                'candidate': [
+                    {'decision': decision, 'count': count}
+                    for decision, count in self.candidate_decisions.most_common()
+                ]
+            },
+            'transitions': [
+                {'from': source, 'to': target, 'count': count}
+                for (source, target), count in self.transitions.most_common(MAX_TRANSITIONS)
+            ],
+            'score_shift': self.shift_summary(),
+            'samples': (self.flipped_samples + self.changed_samples)[:self.sample_size]
+        }
+    
+    def shift_summary(self):
+        if not self.shifts:
+            return None
+        
+        shifts = np.concatenate(self.shifts)
+        if not len(shifts):
+            return None
+        
+        bounds = [-np.inf] + self.shift_edges.tolist() + [np.inf]
+        percentiles = np.percentile(shifts, SHIFT_PERCENTILES)
+        
+        return {
+            'count': int(len(shifts)),
+            'unchanged': int(np.count_nonzero(shifts == 0)),
+            'increased': int(np.count_nonzero(shifts > 0)),
+            'decreased': int(np.count_nonzero(shifts < 0)),
+            'mean': round(float(shifts.mean()), 4),
+            'std': round(float(shifts.std()), 4),
+            'min': round(float(shifts.min()), 4),
+            'max': round(float(shifts.max()), 4),
+            'percentiles': {
+                f'p{p}': round(float(value), 4) for p, value in zip(SHIFT_PERCENTILES, percentiles)
+            },
+            'histogram': [
+                {
+                    'min': bounds[i] if np.isfinite(bounds[i]) else None,
+                    'max': bounds[i + 1] if np.isfinite(bounds[i + 1]) else None,
+                    'count': int(count)
+                }
+                for i, count in enumerate(self.shift_counts)
+            ]
+        }
+
+
+class RuleReplayService:
+    
+    @staticmethod
+    def extract_decisions(rule_type, outputs, scores, options):
+        if rule_type == 'SCORECARD':
+            cutoff = options.get('cutoff')
+            if cutoff is None:
+                return [None] * len(outputs)
+            return np.where(scores >= float(cutoff), 'APPROVED', 'REJECTED').tolist()
+        
+        if rule_type == 'DECISION_TREE':
+            return list(outputs)
+        
+        decision_field = options.get('decision_field')
+        if decision_field:
+            return [_decision_key(output.get(decision_field)) for output in outputs]
+        
+        return [_decision_key(output) for output in outputs]
+    
+    @staticmethod
+    def extract_scores(rule_type, outputs, scores, options):
+        if rule_type == 'SCORECARD':
+            return scores
+        
+        score_field = options.get('score_field')
+        if not score_field or rule_type == 'DECISION_TREE':
+            return None
+        
+        return np.fromiter(
+            (_to_float(output.get(score_field)) for output in outputs), dtype=np.float64, count=len(outputs)
+        )
+    
+    @staticmethod
+    def evaluate_chunk(rule_type, rule_id, rows, options, db):
+        result = RuleEngineService.execute_rule_batch(rule_type, rule_id, rows, db)
+        if not result['success']:
+            return result
+        
+        outputs, scores = result['outputs'], result['scores']
+        result['decisions'] = RuleReplayService.extract_decisions(rule_type, outputs, scores, options)
+        result['scores'] = RuleReplayService.extract_scores(rule_type, outputs, scores, options)
+        return result
+    
+    @staticmethod
+    def build_source_query(source, filters, db):
+        if source == SOURCE_APPLICATIONS:
+            model, column = Application, Application.application_data
+            query = db.session.query(Application.id, column)
+            if filters.get('workflow_id'):
+                query = query.filter(Application.workflow_id == filters['workflow_id'])
+            if filters.get('status'):
+                query = query.filter(Application.status == filters['status'])
+        else:
+            model, column = TestCase, TestCase.input_data
+            query = db.session.query(TestCase.id, column)
+            if filters.get('deployed_api_id'):
+                query = query.filter(TestCase.deployed_api_id == filters['deployed_api_id'])
+        
+        if filters.get('min_id'):
+            query = query.filter(model.id >= filters['min_id'])
+        if filters.get('max_id'):
+            query = query.filter(model.id <= filters['max_id'])
+        
+        return model, query
+    
+    @staticmethod
+    def count_records(source, filters, db):
+        if source == SOURCE_INLINE:
+            return len(filters.get('inputs') or [])
+        
+        _, query = RuleReplayService.build_source_query(source, filters, db)
+        total = query.count()
+        
+        if filters.get('limit'):
+            total = min(total, int(filters['limit']))
+        return total
+    
+    @staticmethod
+    def iter_record_chunks(source, filters, db, chunk_size):
+        if source == SOURCE_INLINE:
+            inputs = filters.get('inputs') or []
+            for start in range(0, len(inputs), chunk_size):
+                chunk = inputs[start:start + chunk_size]
+                yield list(range(start, start + len(chunk))), chunk, 0
+            return
+        
+        model, query = RuleReplayService.build_source_query(source, filters, db)
+        remaining = int(filters['limit']) if filters.get('limit') else None
+        last_id = 0
+        
+        # keyset pagination keeps each page an index range scan no matter how deep the replay is
+        while remaining is None or remaining > 0:
+            page_size = chunk_size if remaining is None else min(chunk_size, remaining)
+            page = query.filter(model.id > last_id).order_by(model.id).limit(page_size).all()
+            if not page:
+                return
+            
+            last_id = page[-1][0]
+            if remaining is not None:
+                remaining -= len(page)
+            
+            record_ids = []
+            rows = []
+            for record_id, payload in page:
+                record = _load_record(payload)
+                if record is not None:
+                    record_ids.append(record_id)
+                    rows.append(record)
+            
+            yield record_ids, rows, len(page) - len(rows)
+    
+    @staticmethod
+    def iter_replay(rule_type, baseline_id, candidate_id, db, source=SOURCE_APPLICATIONS, filters=None, options=None):
+        filters = filters or {}
+        options = options or {}
+        
+        if rule_type not in RULE_TYPE_LABELS:
+            yield {'event': 'error', 'error': f'Unknown rule type: {rule_type}'}
+            return
+        
+        if source not in REPLAY_SOURCES:
+            yield {'event': 'error', 'error': f'Unknown replay source: {source}'}
+            return
+        
+        headers = {}
+        for role, rule_id in (('baseline', baseline_id), ('candidate', candidate_id)):
+            header, _ = RuleEngineService.load_compiled_rule(rule_type, rule_id, db)
+            if not header:
+                yield {'event': 'error', 'error': f'{RULE_TYPE_LABELS[rule_type]} not found: {rule_id}'}
+                return
+            headers[role] = {'id': rule_id, 'name': header.name}
+        
+        chunk_size = int(options.get('chunk_size') or current_app.config.get('REPLAY_CHUNK_SIZE', DEFAULT_CHUNK_SIZE))
+        accumulator = ReplayAccumulator(
+            sample_size=int(options.get('sample_size', DEFAULT_SAMPLE_SIZE)),
+            shift_edges=options.get('shift_edges') or DEFAULT_SHIFT_EDGES
+        )
+        
+        total = RuleReplayService.count_records(source, filters, db)
+        start_time = time.time()
+        
+        yield {
+            'event': 'start',
+            'rule_type': rule_type,
+            'source': source,
+            'total': total,
+            'baseline': headers['baseline'],
+            'candidate': headers['candidate']
+        }
+        
+        for record_ids, rows, skipped in RuleReplayService.iter_record_chunks(source, filters, db, chunk_size):
+            accumulator.skipped += skipped
+            
+            if rows:
+                baseline = RuleReplayService.evaluate_chunk(rule_type, baseline_id, rows, options, db)
+                candidate = RuleReplayService.evaluate_chunk(rule_type, candidate_id, rows, options, db)
+                
+                for result in (baseline, candidate):
+                    if not result['success']:
+                        yield {'event': 'error', 'error': result['error']}
+                        return
+                
+                accumulator.add(record_ids, rows, baseline, candidate)
+            
+            yield {
+                'event': 'progress',
+                'processed': accumulator.evaluated + accumulator.skipped,
+                'total': total,
+                'changed': accumulator.changed,
+                'flipped': accumulator.flipped
+            }
+        
+        summary = accumulator.summary()
+        summary.update(
+            event='summary',
+            success=True,
+            rule_type=rule_type,
+            source=source,
+            baseline=headers['baseline'],
+            candidate=headers['candidate'],
+            duration_ms=int((time.time() - start_time) * 1000)
+        )
+        yield summary
+    
+    @staticmethod
+    def replay(rule_type, baseline_id, candidate_id, db, source=SOURCE_APPLICATIONS, filters=None, options=None, progress=None):
+        for event in RuleReplayService.iter_replay(rule_type, baseline_id, candidate_id, db, source, filters, options):
+            if event['event'] == 'error':
+                return {'success': False, 'error': event['error']}
+            
+            if event['event'] == 'summary':
+                return {key: value for key, value in event.items() if key != 'event'}
+            
+            if progress:
+                progress(event)
@@ -1,7 +1,20 @@
+from backend.services.rule_cache_service import rule_artifact_cache
+import bisect
 import math
 import numpy as np
 
 
+BINNING_METHODS = ('equal_frequency', 'equal_width', 'chi_merge', 'iv_merge')
+SUPERVISED_BINNING_METHODS = ('chi_merge', 'iv_merge')
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+
 class ScorecardService:
     
     @staticmethod
@@ -71,6 +84,232 @@ class ScorecardService:
             'breakdown': breakdown
         }
     
+    @staticmethod
+    def compile_scorecard(scorecard):
+        characteristics = []
+        
+        for characteristic in scorecard.characteristics:
+            attributes = list(characteristic.attributes)
+            
+            category_index = {}
+            interval_order = []
+            interval_min = []
+            interval_max = []
+            
+            for idx, attribute in enumerate(attributes):
+                if attribute.category:
+                    category_index.setdefault(str(attribute.category), idx)
+                elif attribute.min_value is not None and attribute.max_value is not None:
+                    interval_order.append(idx)
+                    interval_min.append(attribute.min_value)
+                    interval_max.append(attribute.max_value)
+            
+            interval_order = np.array(interval_order, dtype=np.int64)
+            interval_min = np.array(interval_min, dtype=np.float64)
+            interval_max = np.array(interval_max, dtype=np.float64)
+            
+            sort_idx = np.argsort(interval_min, kind='stable')
+            sorted_min = interval_min[sort_idx]
+            sorted_max = interval_max[sort_idx]
+            non_overlapping = bool(np.all(sorted_max[:-1] <= sorted_min[1:])) if len(sorted_min) > 1 else True
+            
+            characteristics.append({
+                'name': characteristic.name,
+                'attributes': [
+                    {
+                        'attribute': a.attribute,
+                        'points': a.points,
+                        'woe': a.woe
+                    }
+                    for a in attributes
+                ],
+                'points': np.array([a.points or 0.0 for a in attributes], dtype=np.float64),
+                'category_index': category_index,
+                'interval_order': interval_order,
+                'interval_min': interval_min,
+                'interval_max': interval_max,
+                'sorted_order': interval_order[sort_idx],
+                'sorted_min': sorted_min,
+                'sorted_max': sorted_max,
+                'non_overlapping': non_overlapping,
+                'intervals': list(zip(interval_order.tolist(), interval_min.tolist(), interval_max.tolist())),
+                'sorted_min_list': sorted_min.tolist(),
+                'sorted_max_list': sorted_max.tolist(),
+                'sorted_order_list': interval_order[sort_idx].tolist()
+            })
+        
+        return {
+            'scorecard_id': scorecard.id,
+            'base_score': scorecard.base_score,
+            'pdo': scorecard.pdo,
+            'base_odds': scorecard.base_odds,
+            'characteristics': characteristics
+        }
+    
+    @staticmethod
+    def get_compiled_scorecard(scorecard):
+        return rule_artifact_cache.get_or_compile(
+            'SCORECARD',
+            scorecard.id,
+            scorecard.updated_at,
+            lambda: ScorecardService.compile_scorecard(scorecard)
+        )
+    
+    @staticmethod
+    def invalidate_compiled_scorecard(scorecard_id=None):
+        rule_artifact_cache.invalidate('SCORECARD', scorecard_id)
+    
+    @staticmethod
+    def match_attribute_compiled(compiled_char, value):
+        matched = compiled_char['category_index'].get(str(value), -1) if compiled_char['category_index'] else -1
+        
+        if not compiled_char['intervals']:
+            return matched
+        
+        numeric = _to_float(value)
+        interval_match = -1
+        
+        if compiled_char['non_overlapping']:
+            pos = bisect.bisect_right(compiled_char['sorted_min_list'], numeric) - 1 if numeric == numeric else -1
+            if pos >= 0 and numeric < compiled_char['sorted_max_list'][pos]:
+                interval_match = compiled_char['sorted_order_list'][pos]
+        else:
+            for order, lo, hi in compiled_char['intervals']:
+                if lo <= numeric < hi:
+                    interval_match = order
+                    break
+        
+        if interval_match < 0:
+            return matched
+        if matched < 0:
+            return interval_match
+        return min(matched, interval_match)
+    
+    @staticmethod
+    def calculate_score_compiled(compiled, input_data):
+        total_score = compiled['base_score']
+        breakdown = []
+        
+        for compiled_char in compiled['characteristics']:
+            char_name = compiled_char['name']
+            char_value = input_data.get(char_name)
+            
+            if char_value is None or not compiled_char['attributes']:
+                continue
+            
+            matched = ScorecardService.match_attribute_compiled(compiled_char, char_value)
+            if matched < 0:
+                continue
+            
+            attribute = compiled_char['attributes'][matched]
+            if attribute['points']:
+                total_score += attribute['points']
+                breakdown.append({
+                    'characteristic': char_name,
+                    'value': char_value,
+                    'attribute': attribute['attribute'],
+                    'points': attribute['points'],
+                    'woe': attribute['woe']
+                })
+        
+        return {
+            'total_score': round(total_score, 2),
+            'breakdown': breakdown
+        }
+    
+    @staticmethod
+    def match_attributes_batch(compiled_char, values):
+        n_rows = len(values)
+        no_match = np.iinfo(np.int64).max
+        matched = np.full(n_rows, no_match, dtype=np.int64)
+        
+        if compiled_char['category_index']:
+            category_index = compiled_char['category_index']
+            matched = np.fromiter(
+                (category_index.get(str(v), no_match) if v is not None else no_match for v in values),
+                dtype=np.int64,
+                count=n_rows
+            )
+        
+        if len(compiled_char['interval_order']):
+            numeric = np.fromiter(
+                (_to_float(v) if v is not None else np.nan for v in values),
+                dtype=np.float64,
+                count=n_rows
+            )
+            
+            if compiled_char['non_overlapping']:
+                sorted_min = compiled_char['sorted_min']
+                pos = np.searchsorted(sorted_min, numeric, side='right') - 1
+                valid = pos >= 0
+                pos_clipped = np.clip(pos, 0, len(sorted_min) - 1)
+                valid &= numeric < compiled_char['sorted_max'][pos_clipped]
+                interval_match = np.where(valid, compiled_char['sorted_order'][pos_clipped], no_match)
+            else:
+                interval_match = np.full(n_rows, no_match, dtype=np.int64)
+                for order, lo, hi in zip(
+                    compiled_char['interval_order'],
+                    compiled_char['interval_min'],
+                    compiled_char['interval_max']
+                ):
+                    hit = (interval_match == no_match) & (lo <= numeric) & (numeric < hi)
+                    interval_match[hit] = order
+            
+            matched = np.minimum(matched, interval_match)
+        
+        return np.where(matched == no_match, -1, matched)
+    
+    @staticmethod
+    def calculate_score_batch(compiled, rows, include_breakdown=True):
+        n_rows = len(rows)
+        total_scores = np.full(n_rows, compiled['base_score'], dtype=np.float64)
+        breakdowns = [[] for _ in range(n_rows)] if include_breakdown else None
+        
+        for compiled_char in compiled['characteristics']:
+            if not compiled_char['attributes']:
+                continue
+            
+            char_name = compiled_char['name']
+            values = [row.get(char_name) for row in rows]
+            
+            matched = ScorecardService.match_attributes_batch(compiled_char, values)
+            has_match = matched >= 0
+            points = np.where(has_match, compiled_char['points'][np.maximum(matched, 0)], 0.0)
+            scored = has_match & (points != 0)
+            
+            total_scores = np.where(scored, total_scores + points, total_scores)
+            
+            if include_breakdown:
+                attributes = compiled_char['attributes']
+                for row_idx in np.flatnonzero(scored):
+                    attribute = attributes[matched[row_idx]]
+                    breakdowns[row_idx].append({
+                        'characteristic': char_name,
+                        'value': values[row_idx],
+                        'attribute': attribute['attribute'],
+                        'points': attribute['points'],
+                        'woe': attribute['woe']
+                    })
+        
+        scores = [round(float(total), 2) for total in total_scores]
+        
+        factor = compiled['pdo'] / math.log(2)
+        odds = compiled['base_odds'] * np.exp((np.array(scores, dtype=np.float64) - compiled['base_score']) / factor)
+        probabilities = odds / (1 + odds)
+        
+        results = []
+        for row_idx in range(n_rows):
+            result = {
+                'row': row_idx,
+                'score': scores[row_idx],
+                'probability': round(float(probabilities[row_idx]), 4)
+            }
+            if include_breakdown:
+                result['breakdown'] = breakdowns[row_idx]
+            results.append(result)
+        
+        return results
+    
     @staticmethod
     def match_attribute(attribute, value):
         if attribute.category:
@@ -86,74 +325,219 @@ class ScorecardService:
         return False
     
     @staticmethod
-    def calculate_binning(data, column, n_bins=10, method='equal_width'):
-        values = [row[column] for row in data if row.get(column) is not None]
+    def column_to_array(data, column):
+        values = [row.get(column) for row in data]
+        try:
+            return np.array(values, dtype=np.float64)
+        except (ValueError, TypeError):
+            return np.fromiter((_to_float(v) for v in values), dtype=np.float64, count=len(values))
+    
+    @staticmethod
+    def calculate_bin_edges(values, n_bins=10, method='equal_width'):
+        values = values[~np.isnan(values)]
         
-        if not values:
-            return []
+        if len(values) == 0 or n_bins < 1:
+            return np.empty(0, dtype=np.float64)
         
         if method == 'equal_width':
-            min_val = min(values)
-            max_val = max(values)
-            bin_width = (max_val - min_val) / n_bins
-            
-            bins = []
-            for i in range(n_bins):
-                bins.append({
-                    'min_value': min_val + i * bin_width,
-                    'max_value': min_val + (i + 1) * bin_width,
-                    'attribute': f"Bin {i+1}"
-                })
-            return bins
-        
+            edges = np.linspace(values.min(), values.max(), n_bins + 1)
         elif method == 'equal_frequency':
-            sorted_values = sorted(values)
-            bin_size = len(sorted_values) // n_bins
-            
-            bins = []
-            for i in range(n_bins):
-                start_idx = i * bin_size
-                end_idx = (i + 1) * bin_size if i < n_bins - 1 else len(sorted_values)
-                
-                bins.append({
-                    'min_value': sorted_values[start_idx],
-                    'max_value': sorted_values[end_idx - 1],
-                    'attribute': f"Bin {i+1}"
-                })
-            return bins
+            edges = np.quantile(values, np.linspace(0, 1, n_bins + 1))
+        else:
+            return np.empty(0, dtype=np.float64)
+        
+        edges = np.unique(edges)
+        if len(edges) == 1:
+            edges = np.repeat(edges, 2)
+        
+        # bins are [min, max); nudge the top edge so the maximum value lands in the last bin
+        edges[-1] = np.nextafter(edges[-1], np.inf)
+        return edges
+    
+    @staticmethod
+    def assign_bins(values, edges):
+        bin_idx = np.searchsorted(edges, values, side='right') - 1
+        valid = (bin_idx >= 0) & (bin_idx < len(edges) - 1) & ~np.isnan(values)
+        return np.where(valid, bin_idx, -1)
+    
+    @staticmethod
+    def calculate_woe_iv(good_counts, bad_counts, total_good, total_bad):
+        good_rate = good_counts / total_good if total_good > 0 else np.full(len(good_counts), 0.0001)
+        bad_rate = bad_counts / total_bad if total_bad > 0 else np.full(len(bad_counts), 0.0001)
+        
+        good_rate = np.where(good_rate == 0, 0.0001, good_rate)
+        bad_rate = np.where(bad_rate == 0, 0.0001, bad_rate)
+        
+        woe = np.log(good_rate / bad_rate)
+        iv = (good_rate - bad_rate) * woe
+        return woe, iv
+    
+    @staticmethod
+    def calculate_binning(data, column, n_bins=10, method='equal_width'):
+        edges = ScorecardService.calculate_bin_edges(
+            ScorecardService.column_to_array(data, column), n_bins, method
+        )
+        
+        return [
+            {
+                'min_value': float(edges[i]),
+                'max_value': float(edges[i + 1]),
+                'attribute': f"Bin {i+1}"
+            }
+            for i in range(len(edges) - 1)
+        ]
+    
+    @staticmethod
+    def chi_square_pair(good_a, bad_a, good_b, bad_b):
+        total_a = good_a + bad_a
+        total_b = good_b + bad_b
+        total = total_a + total_b
+        good = good_a + good_b
+        bad = bad_a + bad_b
         
-        return []
+        chi_square = 0.0
+        for observed, row_total, col_total in (
+            (good_a, total_a, good), (bad_a, total_a, bad),
+            (good_b, total_b, good), (bad_b, total_b, bad)
+        ):
+            expected = row_total * col_total / total if total else 0
+            if expected > 0:
+                chi_square += (observed - expected) ** 2 / expected
+        return chi_square
+    
+    @staticmethod
+    def iv_loss_pair(good_a, bad_a, good_b, bad_b, total_good, total_bad):
+        return (
+            ScorecardService.calculate_iv(good_a, bad_a, total_good, total_bad) +
+            ScorecardService.calculate_iv(good_b, bad_b, total_good, total_bad) -
+            ScorecardService.calculate_iv(good_a + good_b, bad_a + bad_b, total_good, total_bad)
+        )
+    
+    @staticmethod
+    def supervised_binning(values, is_good, is_bad, total_good, total_bad, max_bins=10,
+                           method='chi_merge', initial_bins=50, monotonic=True, min_bin_pct=0.05):
+        edges = ScorecardService.calculate_bin_edges(values, initial_bins, 'equal_frequency')
+        n_bins = len(edges) - 1
+        
+        if n_bins < 1:
+            return edges, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        
+        bin_idx = ScorecardService.assign_bins(values, edges)
+        assigned = bin_idx >= 0
+        good = np.bincount(bin_idx[assigned & is_good], minlength=n_bins).tolist()
+        bad = np.bincount(bin_idx[assigned & is_bad], minlength=n_bins).tolist()
+        edges = edges.tolist()
+        
+        # merging only touches the two neighbouring pairs, so costs and WOE are updated in place
+        def pair_cost(i):
+            if method == 'iv_merge':
+                return ScorecardService.iv_loss_pair(good[i], bad[i], good[i + 1], bad[i + 1], total_good, total_bad)
+            return ScorecardService.chi_square_pair(good[i], bad[i], good[i + 1], bad[i + 1])
+        
+        def bin_woe(i):
+            return ScorecardService.calculate_woe(good[i], bad[i], total_good, total_bad)
+        
+        woe = [bin_woe(i) for i in range(len(good))]
+        cost = [pair_cost(i) for i in range(len(good) - 1)]
+        min_count = min_bin_pct * (sum(good) + sum(bad))
+        
+        direction = 0
+        if monotonic:
+            counts = np.array(good) + np.array(bad)
+            positions = np.arange(len(good))
+            center = np.average(positions, weights=counts) if counts.sum() else positions.mean()
+            direction = np.sign(np.sum(counts * (positions - center) * np.array(woe)))
+        
+        while len(good) > 1:
+            small = [i for i in range(len(good)) if good[i] + bad[i] < min_count]
+            if small:
+                candidates = set()
+                for i in small:
+                    if i > 0:
+                        candidates.add(i - 1)
+                    if i < len(good) - 1:
+                        candidates.add(i)
+            else:
+                candidates = [i for i in range(len(cost)) if direction * (woe[i + 1] - woe[i]) < 0]
+                if not candidates and len(good) > max_bins:
+                    candidates = range(len(cost))
+            
+            if not candidates:
+                break
+            
+            i = min(candidates, key=cost.__getitem__)
+            
+            good[i] += good.pop(i + 1)
+            bad[i] += bad.pop(i + 1)
+            del edges[i + 1]
+            del woe[i + 1]
+            del cost[i]
+            
+            woe[i] = bin_woe(i)
+            if i > 0:
+                cost[i - 1] = pair_cost(i - 1)
+            if i < len(cost):
+                cost[i] = pair_cost(i)
+        
+        return np.array(edges), np.array(good, dtype=np.int64), np.array(bad, dtype=np.int64)
+    
+    @staticmethod
+    def bin_feature(values, is_good, is_bad, total_good, total_bad, max_bins=10, method='equal_frequency', **options):
+        if method in SUPERVISED_BINNING_METHODS:
+            edges, good_counts, bad_counts = ScorecardService.supervised_binning(
+                values, is_good, is_bad, total_good, total_bad, max_bins, method, **options
+            )
+            n_bins = len(edges) - 1
+        else:
+            edges = ScorecardService.calculate_bin_edges(values, max_bins, method)
+            n_bins = len(edges) - 1
+            
+            if n_bins >= 1:
+                bin_idx = ScorecardService.assign_bins(values, edges)
+                assigned = bin_idx >= 0
+                good_counts = np.bincount(bin_idx[assigned & is_good], minlength=n_bins)
+                bad_counts = np.bincount(bin_idx[assigned & is_bad], minlength=n_bins)
+        
+        if n_bins < 1:
+            return {'bins': [], 'iv': 0.0}
+        
+        woe, iv = ScorecardService.calculate_woe_iv(good_counts, bad_counts, total_good, total_bad)
+        
+        bins = [
+            {
+                'min_value': float(edges[i]),
+                'max_value': float(edges[i + 1]),
+                'attribute': f"Bin {i+1}",
+                'good_count': int(good_counts[i]),
+                'bad_count': int(bad_counts[i]),
+                'woe': float(woe[i]),
+                'iv': float(iv[i])
+            }
+            for i in range(n_bins)
+        ]
+        
+        return {'bins': bins, 'iv': float(iv.sum())}
+    
+    @staticmethod
+    def auto_binning_woe_batch(data, feature_columns, target_column, max_bins=10, method='equal_frequency', **options):
+        target = ScorecardService.column_to_array(data, target_column)
+        is_good = target == 1
+        is_bad = target == 0
+        total_good = int(is_good.sum())
+        total_bad = int(is_bad.sum())
+        
+        return {
+            column: ScorecardService.bin_feature(
+                ScorecardService.column_to_array(data, column),
+                is_good, is_bad, total_good, total_bad, max_bins, method, **options
+            )
+            for column in feature_columns
+        }
     
     @staticmethod
     def auto_binning_woe(data, feature_column, target_column, max_bins=10):
-        bins = ScorecardService.calculate_binning(data, feature_column, max_bins, 'equal_frequency')
-        
-        total_good = sum(1 for row in data if row.get(target_column) == 1)
-        total_bad = sum(1 for row in data if row.get(target_column) == 0)
-        
-        for bin_info in bins:
-            good_count = 0
-            bad_count = 0
-            
-            for row in data:
-                value = row.get(feature_column)
-                target = row.get(target_column)
-                
-                if value is None or target is None:
-                    continue
-                
-                if bin_info['min_value'] <= value < bin_info['max_value']:
-                    if target == 1:
-                        good_count += 1
-                    else:
-                        bad_count += 1
-            
-            bin_info['good_count'] = good_count
-            bin_info['bad_count'] = bad_count
-            bin_info['woe'] = ScorecardService.calculate_woe(good_count, bad_count, total_good, total_bad)
-            bin_info['iv'] = ScorecardService.calculate_iv(good_count, bad_count, total_good, total_bad)
-        
-        return bins
+        results = ScorecardService.auto_binning_woe_batch(data, [feature_column], target_column, max_bins)
+        return results[feature_column]['bins']
     
     @staticmethod
     def calculate_odds(score, base_score, pdo, base_odds):
@@ -0,0 +1,288 @@
+from backend.models.simulation_run import SimulationRun
+from backend.models.workflow import Workflow
+from backend.services.simulation_service import (
+    SimulationService, SimulationAccumulator, DEFAULT_SAMPLE_SIZE, MODE_MONTE_CARLO, MODE_DISCRETE_EVENT
+)
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from flask import current_app
+from datetime import datetime
+from types import SimpleNamespace
+import numpy as np
+import json
+import multiprocessing
+import os
+import threading
+
+
+RUN_PENDING = 'PENDING'
+RUN_RUNNING = 'RUNNING'
+RUN_COMPLETED = 'COMPLETED'
+RUN_FAILED = 'FAILED'
+RUN_CANCELLED = 'CANCELLED'
+
+DEFAULT_SHARD_SIZE = 100000
+DEFAULT_MAX_INSTANCES = 50000000
+
+
+def _build_workflow(spec):
+    return SimpleNamespace(
+        nodes=[SimpleNamespace(**node) for node in spec['nodes']],
+        edges=[SimpleNamespace(**edge) for edge in spec['edges']]
+    )
+
+
+def _simulate_shard(spec, simulation_config, entropy, shard_index, shard_instances, sample_size):
+    # every shard derives its own independent stream from the run seed, so results do not depend on worker count
+    config = dict(
+        simulation_config,
+        num_instances=shard_instances,
+        sample_size=sample_size,
+        seed=np.random.SeedSequence(entropy, spawn_key=(shard_index,))
+    )
+    return shard_index, SimulationService.accumulate(_build_workflow(spec), config)
+
+
+class SimulationRunService:
+    
+    @staticmethod
+    def serialize_workflow(workflow):
+        return {
+            'nodes': [
+                {
+                    'node_id': node.node_id,
+                    'node_type': node.node_type,
+                    'config': node.config
+                }
+                for node in workflow.nodes
+            ],
+            'edges': [
+                {
+                    'source_node_id': edge.source_node_id,
+                    'target_node_id': edge.target_node_id,
+                    'condition': edge.condition
+                }
+                for edge in workflow.edges
+            ]
+        }
+    
+    @staticmethod
+    def create_run(workflow_id, simulation_config, db):
+        workflow = db.session.query(Workflow).get(workflow_id)
+        if not workflow:
+            return {'success': False, 'error': 'Workflow not found'}
+        
+        config = current_app.config
+        
+        try:
+            num_instances = int(simulation_config.get('num_instances', 100))
+            shard_size = int(simulation_config.get('shard_size') or config.get('SIMULATION_SHARD_SIZE', DEFAULT_SHARD_SIZE))
+            workers = int(simulation_config.get('workers') or config.get('SIMULATION_WORKERS') or os.cpu_count() or 1)
+            seed = int(simulation_config['seed']) if simulation_config.get('seed') is not None else None
+        except (TypeError, ValueError):
+            return {'success': False, 'error': 'num_instances, shard_size, workers and seed must be integers'}
+        
+        if num_instances < 1 or shard_size < 1 or workers < 1:
+            return {'success': False, 'error': 'num_instances, shard_size and workers must be positive'}
+        
+        mode = simulation_config.get('mode', MODE_MONTE_CARLO)
+        if mode not in (MODE_MONTE_CARLO, MODE_DISCRETE_EVENT):
+            return {'success': False, 'error': f'Unknown simulation mode: {mode}'}
+        
+        if mode == MODE_DISCRETE_EVENT:
+            # instances compete for the same resource pools, so the event queue cannot be sharded
+            try:
+                if float(simulation_config.get('arrival_rate', 1)) <= 0:
+                    raise ValueError()
+                if any(int(capacity) < 1 for capacity in simulation_config.get('resources', {}).values()):
+                    raise ValueError()
+            except (TypeError, ValueError, AttributeError):
+                return {'success': False, 'error': 'arrival_rate and resource capacities must be positive numbers'}
+            shard_size = num_instances
+            workers = 1
+        
+        max_instances = config.get('SIMULATION_MAX_INSTANCES', DEFAULT_MAX_INSTANCES)
+        if num_instances > max_instances:
+            return {'success': False, 'error': f'num_instances must not exceed {max_instances}'}
+        
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        
+        stored_config = {
+            key: value for key, value in simulation_config.items()
+            if key not in ('workflow_id', 'num_instances', 'shard_size', 'workers', 'seed')
+        }
+        
+        run = SimulationRun(
+            workflow_id=workflow_id,
+            status=RUN_PENDING,
+            config=json.dumps(stored_config),
+            seed=str(seed),
+            num_instances=num_instances,
+            shard_size=shard_size,
+            num_shards=-(-num_instances // shard_size),
+            completed_shards=0,
+            workers=workers
+        )
+        
+        db.session.add(run)
+        db.session.commit()
+        
+        return {'success': True, 'run': run}
+    
+    @staticmethod
+    def start_background(run_id, db):
+        app = current_app._get_current_object()
+        
+        def run():
+            with app.app_context():
+                try:
+                    SimulationRunService.execute(run_id, db)
+                except Exception as e:
+                    app.logger.error(f'Simulation run {run_id} failed: {str(e)}')
+        
+        thread = threading.Thread(target=run, name=f'simulation-run-{run_id}', daemon=True)
+        thread.start()
+        
+        return thread
+    
+    @staticmethod
+    def execute(run_id, db):
+        run = db.session.query(SimulationRun).get(run_id)
+        if not run or run.status != RUN_PENDING:
+            return
+        
+        workflow = db.session.query(Workflow).get(run.workflow_id)
+        if not workflow:
+            SimulationRunService._finish(run_id, RUN_FAILED, db, error_message='Workflow not found')
+            return
+        
+        spec = SimulationRunService.serialize_workflow(workflow)
+        simulation_config = json.loads(run.config) if run.config else {}
+        sample_size = simulation_config.get('sample_size', DEFAULT_SAMPLE_SIZE)
+        entropy = int(run.seed)
+        
+        shards = []
+        for shard_index in range(run.num_shards):
+            start = shard_index * run.shard_size
+            shard_instances = min(run.shard_size, run.num_instances - start)
+            shard_sample = min(max(sample_size - start, 0), shard_instances)
+            shards.append((spec, simulation_config, entropy, shard_index, shard_instances, shard_sample))
+        
+        run.status = RUN_RUNNING
+        run.started_at = datetime.utcnow()
+        db.session.commit()
+        
+        if simulation_config.get('mode') == MODE_DISCRETE_EVENT:
+            try:
+                result = SimulationService.simulate_discrete_events(
+                    _build_workflow(spec),
+                    dict(simulation_config, num_instances=run.num_instances, seed=np.random.SeedSequence(entropy))
+                )
+            except Exception as e:
+                db.session.rollback()
+                SimulationRunService._finish(run_id, RUN_FAILED, db, error_message=str(e))
+                raise e
+            
+            SimulationRunService._finish(run_id, RUN_COMPLETED, db, completed_shards=1, result=json.dumps(result))
+            return
+        
+        accumulator = SimulationAccumulator(sample_size)
+        samples = {}
+        
+        def collect(shard_index, shard_accumulator):
+            samples[shard_index] = shard_accumulator.instances
+            shard_accumulator.instances = []
+            accumulator.merge(shard_accumulator)
+            
+            run.completed_shards = len(samples)
+            run.result = json.dumps(SimulationRunService._summary(accumulator, samples))
+            db.session.commit()
+            
+            status = db.session.query(SimulationRun.status).filter(SimulationRun.id == run_id).scalar()
+            return status != RUN_CANCELLED
+        
+        executor = None
+        if run.workers > 1 and len(shards) > 1:
+            # fork from a threaded server can copy held locks and open DB connections into the children
+            executor = ProcessPoolExecutor(max_workers=run.workers, mp_context=multiprocessing.get_context('spawn'))
+        
+        try:
+            if executor is None:
+                for shard in shards:
+                    if not collect(*_simulate_shard(*shard)):
+                        return
+            else:
+                pending = set()
+                queued = iter(shards)
+                
+                # keep at most two shards per worker in flight so cancellation takes effect quickly
+                for shard in queued:
+                    pending.add(executor.submit(_simulate_shard, *shard))
+                    if len(pending) >= run.workers * 2:
+                        break
+                
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if not collect(*future.result()):
+                            return
+                        shard = next(queued, None)
+                        if shard is not None:
+                            pending.add(executor.submit(_simulate_shard, *shard))
+            
+            SimulationRunService._finish(
+                run_id, RUN_COMPLETED, db,
+                result=json.dumps(SimulationRunService._summary(accumulator, samples))
+            )
+        
+        except Exception as e:
+            db.session.rollback()
+            SimulationRunService._finish(run_id, RUN_FAILED, db, error_message=str(e))
+            raise e
+        
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+    
+    @staticmethod
+    def cancel_run(run_id, db):
+        run = db.session.query(SimulationRun).get(run_id)
+        if not run:
+            return {'success': False, 'error': 'Simulation run not found'}
+        
+        if run.status not in (RUN_PENDING, RUN_RUNNING):
+            return {'success': False, 'error': f'Simulation run is already {run.status}', 'run': run}
+        
+        run.status = RUN_CANCELLED
+        run.completed_at = datetime.utcnow()
+        db.session.commit()
+        
+        return {'success': True, 'run': run}
+    
+    @staticmethod
+    def get_run(run_id, db):
+        return db.session.query(SimulationRun).get(run_id)
+    
+    @staticmethod
+    def _summary(accumulator, samples):
+        summary = accumulator.summary()
+        summary['instances'] = [
+            instance for shard_index in sorted(samples) for instance in samples[shard_index]
+        ][:accumulator.sample_size]
+        summary['bottlenecks'] = SimulationService.analyze_bottlenecks(summary['node_statistics'])
+        return summary
+    
+    @staticmethod
+    def _finish(run_id, status, db, **values):
+        completed_at = datetime.utcnow()
+        run = db.session.query(SimulationRun).get(run_id)
+        
+        values.update(status=status, completed_at=completed_at)
+        if run and run.started_at:
+            values['duration_ms'] = int((completed_at - run.started_at).total_seconds() * 1000)
+        
+        # a cancellation that raced with the last shard wins over completion
+        db.session.query(SimulationRun)\
+            .filter(SimulationRun.id == run_id, SimulationRun.status.in_([RUN_PENDING, RUN_RUNNING]))\
+            .update(values, synchronize_session=False)
+        db.session.commit()
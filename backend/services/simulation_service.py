@@ -1,184 +1,634 @@
-import random
 import numpy as np
-from datetime import datetime, timedelta
+import heapq
 import json
+from collections import deque
+from backend.services.expression_service import ExpressionService, ExpressionError
+
+
+MODE_MONTE_CARLO = 'monte_carlo'
+MODE_DISCRETE_EVENT = 'discrete_event'
+
+DEFAULT_DURATION = {'min': 10, 'max': 100}
+DEFAULT_ARRIVAL_RATE = 1.0
+DEFAULT_SAMPLE_SIZE = 10
+MAX_STEPS = 100
+
+DECISION_OUTCOMES = np.array(['APPROVED', 'REJECTED', 'MANUAL_REVIEW'], dtype=object)
+
+
+def _node_type(node):
+    return getattr(node, 'type', None) or getattr(node, 'node_type', None)
+
+
+def _edge_endpoints(edge):
+    source = getattr(edge, 'source', None) or getattr(edge, 'source_node_id', None)
+    target = getattr(edge, 'target', None) or getattr(edge, 'target_node_id', None)
+    return source, target
+
+
+def _to_python(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class DurationHistogram:
+    # HDR-style log-linear buckets: exact below 256 ms, under 1% relative error above
+    SUB_BUCKET_BITS = 7
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    EXACT_LIMIT = SUB_BUCKETS * 2
+    
+    def __init__(self):
+        self.counts = np.zeros(0, dtype=np.int64)
+    
+    @classmethod
+    def bucket_index(cls, values):
+        values = np.maximum(np.asarray(values, dtype=np.int64), 0)
+        # shift is 0 for values below EXACT_LIMIT, so those map to their own bucket
+        shift = np.maximum(np.frexp(values)[1] - 1 - cls.SUB_BUCKET_BITS, 0)
+        return cls.SUB_BUCKETS * shift + (values >> shift)
+    
+    @classmethod
+    def bucket_value(cls, index):
+        if index < cls.EXACT_LIMIT:
+            return float(index)
+        exponent = index // cls.SUB_BUCKETS - 1
+        mantissa = index - cls.SUB_BUCKETS * exponent
+        return float((mantissa << exponent) + ((1 << exponent) - 1) / 2)
+    
+    def add(self, values):
+        if len(values):
+            self._add_counts(np.bincount(self.bucket_index(values)))
+    
+    def merge(self, other):
+        self._add_counts(other.counts)
+    
+    def _add_counts(self, counts):
+        if len(counts) > len(self.counts):
+            self.counts = np.pad(self.counts, (0, len(counts) - len(self.counts)))
+        self.counts[:len(counts)] += counts
+    
+    def percentiles(self, percents):
+        cumulative = np.cumsum(self.counts)
+        total = cumulative[-1] if len(cumulative) else 0
+        if total == 0:
+            return [0.0 for _ in percents]
+        
+        ranks = np.maximum(np.ceil(np.asarray(percents, dtype=np.float64) / 100 * total), 1)
+        return [self.bucket_value(int(i)) for i in np.searchsorted(cumulative, ranks, side='left')]
+
+
+class DurationAccumulator:
+    __slots__ = ('count', 'total', 'minimum', 'maximum', 'histogram')
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        self.histogram = DurationHistogram()
+    
+    def add(self, durations):
+        if len(durations) == 0:
+            return
+        
+        self.count += len(durations)
+        self.total += int(durations.sum())
+        low, high = int(durations.min()), int(durations.max())
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+        self.histogram.add(durations)
+    
+    def merge(self, other):
+        if other.count == 0:
+            return
+        
+        self.count += other.count
+        self.total += other.total
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        self.histogram.merge(other.histogram)
+    
+    def to_dict(self):
+        p50, p95, p99 = self.histogram.percentiles([50, 95, 99])
+        return {
+            'executions': self.count,
+            'total_duration_ms': self.total,
+            'min_duration_ms': self.minimum or 0,
+            'max_duration_ms': self.maximum or 0,
+            'avg_duration_ms': self.total / self.count if self.count else 0,
+            'p50_duration_ms': p50,
+            'p95_duration_ms': p95,
+            'p99_duration_ms': p99
+        }
+
+
+class SimulationAccumulator:
+    
+    def __init__(self, sample_size=DEFAULT_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self.total_instances = 0
+        self.failed = 0
+        self.durations = DurationAccumulator()
+        self.nodes = {}
+        self.edges = {}
+        self.instances = []
+    
+    def add_node(self, node_id, durations):
+        self.nodes.setdefault(node_id, DurationAccumulator()).add(durations)
+    
+    def add_edge(self, source_id, target_id, traversals):
+        key = f"{source_id}->{target_id}"
+        self.edges[key] = self.edges.get(key, 0) + traversals
+    
+    def merge(self, other):
+        self.total_instances += other.total_instances
+        self.failed += other.failed
+        self.durations.merge(other.durations)
+        
+        for node_id, stats in other.nodes.items():
+            self.nodes.setdefault(node_id, DurationAccumulator()).merge(stats)
+        for key, traversals in other.edges.items():
+            self.edges[key] = self.edges.get(key, 0) + traversals
+        
+        self.instances.extend(other.instances[:max(self.sample_size - len(self.instances), 0)])
+        return self
+    
+    def summary(self):
+        successful = self.total_instances - self.failed
+        durations = self.durations.to_dict()
+        
+        return {
+            'total_instances': self.total_instances,
+            'successful': successful,
+            'failed': self.failed,
+            'success_rate': successful / self.total_instances if self.total_instances > 0 else 0,
+            'avg_duration_ms': durations['avg_duration_ms'],
+            'min_duration_ms': durations['min_duration_ms'],
+            'max_duration_ms': durations['max_duration_ms'],
+            'p50_duration_ms': durations['p50_duration_ms'],
+            'p95_duration_ms': durations['p95_duration_ms'],
+            'p99_duration_ms': durations['p99_duration_ms'],
+            'node_statistics': {node_id: stats.to_dict() for node_id, stats in self.nodes.items()},
+            'edge_statistics': {key: {'traversals': count} for key, count in self.edges.items()},
+            'instances': self.instances
+        }
+
+
+class ResourcePool:
+    __slots__ = ('name', 'capacity', 'busy', 'queue', 'served', 'busy_time', 'queue_area',
+                 'max_queue', 'last_change')
+    
+    def __init__(self, name, capacity):
+        self.name = name
+        self.capacity = capacity
+        self.busy = 0
+        self.queue = deque()
+        self.served = 0
+        self.busy_time = 0.0
+        self.queue_area = 0.0
+        self.max_queue = 0
+        self.last_change = 0.0
+    
+    def track_queue(self, now):
+        self.queue_area += len(self.queue) * (now - self.last_change)
+        self.last_change = now
+    
+    def to_dict(self, makespan, waits):
+        wait_stats = DurationAccumulator()
+        wait_stats.add(np.rint(waits).astype(np.int64))
+        
+        return {
+            'capacity': self.capacity,
+            'served': self.served,
+            'utilization': self.busy_time / (self.capacity * makespan) if makespan > 0 else 0.0,
+            'busy_time_ms': self.busy_time,
+            'avg_queue_depth': self.queue_area / makespan if makespan > 0 else 0.0,
+            'max_queue_depth': self.max_queue,
+            'queued': int(np.count_nonzero(waits > 0)),
+            'wait': wait_stats.to_dict()
+        }
+
+
+class SimulationGraph:
+    
+    def __init__(self, workflow, node_durations):
+        self.nodes = list(workflow.nodes)
+        self.index = {node.node_id: k for k, node in enumerate(self.nodes)}
+        self.types = [_node_type(node) for node in self.nodes]
+        self.configs = [json.loads(node.config) if node.config else {} for node in self.nodes]
+        self.durations = [
+            SimulationService.get_duration_range(node.node_id, node_type, node_durations)
+            for node, node_type in zip(self.nodes, self.types)
+        ]
+        self.outgoing = [[] for _ in self.nodes]
+        
+        for edge in workflow.edges:
+            source, target = _edge_endpoints(edge)
+            if source in self.index and target in self.index:
+                self.outgoing[self.index[source]].append((self.index[target], getattr(edge, 'condition', None)))
+        
+        self.start = next((k for k, node_type in enumerate(self.types) if node_type == 'start'), None)
 
 
 class SimulationService:
     
     @staticmethod
     def simulate_process(workflow, simulation_config):
+        if simulation_config.get('mode') == MODE_DISCRETE_EVENT:
+            return SimulationService.simulate_discrete_events(workflow, simulation_config)
+        return SimulationService.accumulate(workflow, simulation_config).summary()
+    
+    @staticmethod
+    def accumulate(workflow, simulation_config):
         num_instances = simulation_config.get('num_instances', 100)
-        input_generator = simulation_config.get('input_generator', {})
+        sample_size = min(simulation_config.get('sample_size', DEFAULT_SAMPLE_SIZE), num_instances)
+        max_steps = simulation_config.get('max_steps', MAX_STEPS)
+        rng = np.random.default_rng(simulation_config.get('seed'))
         
-        results = []
-        node_statistics = {}
-        edge_statistics = {}
-        
-        for i in range(num_instances):
-            input_data = SimulationService.generate_input_data(input_generator)
-            
-            instance_result = SimulationService.simulate_instance(workflow, input_data, simulation_config)
-            results.append(instance_result)
-            
-            for node_stat in instance_result.get('node_stats', []):
-                node_id = node_stat['node_id']
-                if node_id not in node_statistics:
-                    node_statistics[node_id] = {
-                        'executions': 0,
-                        'total_duration_ms': 0,
-                        'min_duration_ms': float('inf'),
-                        'max_duration_ms': 0
-                    }
-                
-                stats = node_statistics[node_id]
-                stats['executions'] += 1
-                stats['total_duration_ms'] += node_stat['duration_ms']
-                stats['min_duration_ms'] = min(stats['min_duration_ms'], node_stat['duration_ms'])
-                stats['max_duration_ms'] = max(stats['max_duration_ms'], node_stat['duration_ms'])
+        accumulator = SimulationAccumulator(sample_size)
+        accumulator.total_instances = num_instances
+        
+        graph = SimulationGraph(workflow, simulation_config.get('node_durations', {}))
+        
+        if graph.start is None:
+            accumulator.failed = num_instances
+            accumulator.instances = [{'status': 'FAILED', 'error': 'No start node'} for _ in range(sample_size)]
+            return accumulator
+        
+        columns = SimulationService.generate_inputs(simulation_config.get('input_generator', {}), num_instances, rng)
+        assigned = {}
+        
+        total_duration = np.zeros(num_instances, dtype=np.int64)
+        samples = [[] for _ in range(sample_size)]
         
-        for node_id, stats in node_statistics.items():
-            if stats['executions'] > 0:
-                stats['avg_duration_ms'] = stats['total_duration_ms'] / stats['executions']
+        def on_node(k, idx):
+            node = graph.nodes[k]
+            low, high = graph.durations[k]
+            durations = rng.integers(low, high, size=len(idx), endpoint=True)
+            total_duration[idx] += durations
+            
+            accumulator.add_node(node.node_id, durations)
+            
+            for position in np.flatnonzero(idx < sample_size):
+                samples[idx[position]].append({
+                    'node_id': node.node_id,
+                    'node_type': graph.types[k],
+                    'duration_ms': int(durations[position])
+                })
+        
+        def on_route(k, target, branch_idx):
+            accumulator.add_edge(graph.nodes[k].node_id, graph.nodes[target].node_id, len(branch_idx))
+        
+        SimulationService.walk_cohorts(graph, columns, assigned, num_instances, max_steps, rng, on_node, on_route)
+        
+        accumulator.durations.add(total_duration)
+        accumulator.instances = [
+            {
+                'status': 'COMPLETED',
+                'duration_ms': int(total_duration[i]),
+                'node_stats': samples[i],
+                'output': {
+                    name: _to_python(column[i])
+                    for name, column in columns.items()
+                    if name not in assigned or assigned[name][i]
+                }
+            }
+            for i in range(sample_size)
+        ]
+        
+        return accumulator
+    
+    @staticmethod
+    def simulate_discrete_events(workflow, simulation_config):
+        num_instances = simulation_config.get('num_instances', 100)
+        max_steps = simulation_config.get('max_steps', MAX_STEPS)
+        arrival_rate = float(simulation_config.get('arrival_rate', DEFAULT_ARRIVAL_RATE))
+        rng = np.random.default_rng(simulation_config.get('seed'))
+        
+        graph = SimulationGraph(workflow, simulation_config.get('node_durations', {}))
+        if graph.start is None:
+            return {'mode': MODE_DISCRETE_EVENT, 'total_instances': num_instances, 'completed': 0, 'error': 'No start node'}
+        
+        # routing does not depend on timing, so every instance's path is resolved up front in cohorts
+        columns = SimulationService.generate_inputs(simulation_config.get('input_generator', {}), num_instances, rng)
+        n_nodes = len(graph.nodes)
+        next_node = np.full((num_instances, n_nodes), -1, dtype=np.int16 if n_nodes < 32767 else np.int32)
+        last_node = np.full(num_instances, -1, dtype=np.int32)
+        visits = np.zeros(n_nodes, dtype=np.int64)
+        
+        def on_node(k, idx):
+            previous = last_node[idx]
+            moved = previous >= 0
+            next_node[idx[moved], previous[moved]] = k
+            last_node[idx] = k
+            visits[k] += len(idx)
+        
+        SimulationService.walk_cohorts(graph, columns, {}, num_instances, max_steps, rng, on_node)
+        
+        service_times = [
+            rng.integers(low, high, size=visits[k], endpoint=True).astype(np.float64).tolist()
+            for k, (low, high) in enumerate(graph.durations)
+        ]
+        service_position = [0] * n_nodes
+        
+        pools = {}
+        node_pool = []
+        for k, node in enumerate(graph.nodes):
+            name, capacity = SimulationService.get_resource(node.node_id, graph.types[k], simulation_config.get('resources', {}))
+            if name is not None and name not in pools:
+                pools[name] = ResourcePool(name, capacity)
+            node_pool.append(pools.get(name))
+        
+        # an instance's route is converted to a list only while it is in the system
+        routes = {}
+        node_waits = [[] for _ in range(n_nodes)]
+        arrivals = np.cumsum(rng.exponential(1000.0 / arrival_rate, size=num_instances)).tolist()
+        cycle_times = np.zeros(num_instances, dtype=np.float64)
+        events = []
+        push = heapq.heappush
+        pop = heapq.heappop
         
-        successful = sum(1 for r in results if r.get('status') == 'COMPLETED')
-        failed = sum(1 for r in results if r.get('status') == 'FAILED')
+        def advance(i, k, now):
+            # nodes without a resource pool never queue, so they are stepped through without events
+            route = routes[i]
+            while k >= 0:
+                if node_pool[k] is not None:
+                    return now, k
+                now += service_times[k][service_position[k]]
+                service_position[k] += 1
+                k = route[k]
+            cycle_times[i] = now - arrivals[i]
+            del routes[i]
+            return now, -1
         
-        durations = [r['duration_ms'] for r in results if 'duration_ms' in r]
+        ARRIVE, COMPLETE = 0, 1
+        
+        # an instance has at most one pending event, so (time, instance) orders the heap without ties;
+        # arrivals are fed in lazily so the heap only holds instances that are in the system
+        processed = 0
+        next_arrival = 0
+        
+        while events or next_arrival < num_instances:
+            if next_arrival < num_instances and (not events or arrivals[next_arrival] <= events[0][0]):
+                i = next_arrival
+                next_arrival += 1
+                routes[i] = next_node[i].tolist()
+                now, k = advance(i, graph.start, arrivals[i])
+                if k >= 0:
+                    push(events, (now, i, ARRIVE, k, now))
+                continue
+            
+            now, i, kind, k, arrived = pop(events)
+            processed += 1
+            pool = node_pool[k]
+            
+            if kind == ARRIVE:
+                if pool.busy < pool.capacity:
+                    pool.busy += 1
+                    service = service_times[k][service_position[k]]
+                    service_position[k] += 1
+                    pool.busy_time += service
+                    node_waits[k].append(0.0)
+                    push(events, (now + service, i, COMPLETE, k, now))
+                else:
+                    pool.track_queue(now)
+                    pool.queue.append((i, k, now))
+                    if len(pool.queue) > pool.max_queue:
+                        pool.max_queue = len(pool.queue)
+                continue
+            
+            pool.served += 1
+            if pool.queue:
+                pool.track_queue(now)
+                waiting, waiting_node, queued_at = pool.queue.popleft()
+                service = service_times[waiting_node][service_position[waiting_node]]
+                service_position[waiting_node] += 1
+                pool.busy_time += service
+                node_waits[waiting_node].append(now - queued_at)
+                push(events, (now + service, waiting, COMPLETE, waiting_node, queued_at))
+            else:
+                pool.busy -= 1
+            
+            now, k = advance(i, routes[i][k], now)
+            if k >= 0:
+                push(events, (now, i, ARRIVE, k, now))
+        
+        makespan = float((np.array(arrivals) + cycle_times).max()) if num_instances else 0.0
+        
+        for pool in pools.values():
+            pool.track_queue(makespan)
+        
+        cycle_stats = DurationAccumulator()
+        cycle_stats.add(np.rint(cycle_times).astype(np.int64))
+        
+        node_statistics = {}
+        for k, node in enumerate(graph.nodes):
+            if visits[k] == 0:
+                continue
+            service_stats = DurationAccumulator()
+            service_stats.add(np.array(service_times[k], dtype=np.int64))
+            stats = service_stats.to_dict()
+            
+            if node_pool[k] is not None:
+                wait_stats = DurationAccumulator()
+                wait_stats.add(np.rint(np.array(node_waits[k])).astype(np.int64))
+                stats['resource'] = node_pool[k].name
+                stats['wait'] = wait_stats.to_dict()
+            node_statistics[node.node_id] = stats
+        
+        resources = {
+            name: pool.to_dict(makespan, np.array(
+                [wait for k in range(n_nodes) if node_pool[k] is pool for wait in node_waits[k]],
+                dtype=np.float64
+            ))
+            for name, pool in pools.items()
+        }
         
         return {
+            'mode': MODE_DISCRETE_EVENT,
             'total_instances': num_instances,
-            'successful': successful,
-            'failed': failed,
-            'success_rate': successful / num_instances if num_instances > 0 else 0,
-            'avg_duration_ms': np.mean(durations) if durations else 0,
-            'min_duration_ms': min(durations) if durations else 0,
-            'max_duration_ms': max(durations) if durations else 0,
-            'p50_duration_ms': np.percentile(durations, 50) if durations else 0,
-            'p95_duration_ms': np.percentile(durations, 95) if durations else 0,
-            'p99_duration_ms': np.percentile(durations, 99) if durations else 0,
+            'completed': num_instances,
+            'arrival_rate': arrival_rate,
+            'events_processed': processed,
+            'makespan_ms': makespan,
+            'throughput_per_hour': num_instances / makespan * 3600000 if makespan > 0 else 0.0,
+            'cycle_time': cycle_stats.to_dict(),
             'node_statistics': node_statistics,
-            'edge_statistics': edge_statistics,
-            'instances': results[:10]
+            'resources': resources,
+            'bottlenecks': SimulationService.analyze_queue_bottlenecks(resources)
         }
     
     @staticmethod
-    def simulate_instance(workflow, input_data, simulation_config):
-        context = input_data.copy()
-        node_stats = []
-        visited_nodes = set()
+    def walk_cohorts(graph, columns, assigned, num_instances, max_steps, rng, on_node, on_route=None):
+        visited = np.zeros((num_instances, len(graph.nodes)), dtype=bool)
         
-        start_time = datetime.utcnow()
+        # each cohort is the set of instances currently sitting on the same node
+        frontier = {graph.start: np.arange(num_instances)}
         
-        start_node = next((n for n in workflow.nodes if n.type == 'start'), None)
-        if not start_node:
-            return {'status': 'FAILED', 'error': 'No start node'}
-        
-        current_node = start_node
-        
-        while current_node and len(visited_nodes) < 100:
-            if current_node.node_id in visited_nodes:
+        for _ in range(max_steps):
+            if not frontier:
                 break
             
-            visited_nodes.add(current_node.node_id)
-            
-            node_duration = SimulationService.get_node_duration(
-                current_node,
-                simulation_config.get('node_durations', {})
-            )
-            
-            node_stats.append({
-                'node_id': current_node.node_id,
-                'node_type': current_node.type,
-                'duration_ms': node_duration
-            })
+            next_frontier = {}
             
-            if current_node.type == 'businessRule':
-                config = json.loads(current_node.config) if current_node.config else {}
-                rule_type = config.get('rule_type')
+            for k, idx in frontier.items():
+                idx = idx[~visited[idx, k]]
+                if len(idx) == 0:
+                    continue
+                
+                visited[idx, k] = True
+                node_type = graph.types[k]
+                
+                on_node(k, idx)
+                
+                SimulationService.apply_node_effects(
+                    node_type, graph.configs[k], idx, columns, assigned, num_instances, rng
+                )
                 
-                if rule_type == 'SCORECARD':
-                    context['credit_score'] = random.randint(300, 850)
-                elif rule_type == 'DECISION_TABLE':
-                    context['decision'] = random.choice(['APPROVED', 'REJECTED', 'MANUAL_REVIEW'])
-            
-            elif current_node.type == 'gateway':
-                config = json.loads(current_node.config) if current_node.config else {}
-                condition = config.get('condition')
+                if node_type == 'end' or not graph.outgoing[k]:
+                    continue
                 
-                try:
-                    result = eval(condition, {"__builtins__": {}}, context)
-                    context['gateway_result'] = result
-                except:
-                    context['gateway_result'] = random.choice([True, False])
+                for target, branch_idx in SimulationService.route_cohort(graph.outgoing[k], idx, columns, rng):
+                    if on_route:
+                        on_route(k, target, branch_idx)
+                    next_frontier.setdefault(target, []).append(branch_idx)
             
-            if current_node.type == 'end':
-                break
+            frontier = {
+                target: parts[0] if len(parts) == 1 else np.concatenate(parts)
+                for target, parts in next_frontier.items()
+            }
+    
+    @staticmethod
+    def apply_node_effects(node_type, config, idx, columns, assigned, num_instances, rng):
+        if node_type == 'businessRule':
+            rule_type = config.get('rule_type')
             
-            outgoing_edges = [e for e in workflow.edges if e.source == current_node.node_id]
+            if rule_type == 'SCORECARD':
+                SimulationService.assign_column(
+                    columns, assigned, 'credit_score', idx,
+                    rng.integers(300, 850, size=len(idx), endpoint=True), num_instances, np.int64
+                )
+            elif rule_type == 'DECISION_TABLE':
+                SimulationService.assign_column(
+                    columns, assigned, 'decision', idx,
+                    rng.choice(DECISION_OUTCOMES, size=len(idx)), num_instances, object
+                )
+        
+        elif node_type == 'gateway':
+            result = SimulationService.evaluate_mask(config.get('condition'), idx, columns, rng)
+            SimulationService.assign_column(columns, assigned, 'gateway_result', idx, result, num_instances, bool)
+    
+    @staticmethod
+    def assign_column(columns, assigned, name, idx, values, num_instances, dtype):
+        if name not in assigned:
+            columns[name] = np.zeros(num_instances, dtype=dtype)
+            assigned[name] = np.zeros(num_instances, dtype=bool)
+        
+        columns[name][idx] = values
+        assigned[name][idx] = True
+    
+    @staticmethod
+    def evaluate_mask(condition, idx, columns, rng, default_random=True):
+        try:
+            result = ExpressionService.evaluate_vectorized(condition, {name: column[idx] for name, column in columns.items()})
+            return np.broadcast_to(np.asarray(result, dtype=bool), idx.shape)
+        except (ExpressionError, TypeError, ValueError, KeyError):
+            if default_random:
+                return rng.random(len(idx)) < 0.5
+            return np.zeros(len(idx), dtype=bool)
+    
+    @staticmethod
+    def route_cohort(outgoing, idx, columns, rng):
+        if len(outgoing) == 1:
+            return [(outgoing[0][0], idx)]
+        
+        branches = []
+        remaining = idx
+        defaults = []
+        
+        for target, condition in outgoing:
+            if not condition:
+                defaults.append(target)
+                continue
             
-            if not outgoing_edges:
+            if len(remaining) == 0:
                 break
             
-            if len(outgoing_edges) == 1:
-                next_edge = outgoing_edges[0]
-            else:
-                next_edge = random.choice(outgoing_edges)
-            
-            current_node = next((n for n in workflow.nodes if n.node_id == next_edge.target), None)
+            mask = SimulationService.evaluate_mask(condition, remaining, columns, rng, default_random=False)
+            branches.append((target, remaining[mask]))
+            remaining = remaining[~mask]
         
-        end_time = datetime.utcnow()
-        total_duration = sum(ns['duration_ms'] for ns in node_stats)
+        # instances not claimed by a conditional edge are spread uniformly over the unconditional ones
+        if defaults and len(remaining):
+            choice = rng.integers(0, len(defaults), size=len(remaining))
+            for position, target in enumerate(defaults):
+                branches.append((target, remaining[choice == position]))
         
-        return {
-            'status': 'COMPLETED',
-            'duration_ms': total_duration,
-            'node_stats': node_stats,
-            'output': context
-        }
+        return [(target, branch_idx) for target, branch_idx in branches if len(branch_idx)]
     
     @staticmethod
-    def generate_input_data(input_generator):
-        input_data = {}
+    def generate_inputs(input_generator, num_instances, rng):
+        columns = {}
         
         for field_name, field_config in input_generator.items():
             field_type = field_config.get('type', 'number')
             
             if field_type == 'number':
-                min_val = field_config.get('min', 0)
-                max_val = field_config.get('max', 100)
-                input_data[field_name] = random.uniform(min_val, max_val)
+                columns[field_name] = rng.uniform(
+                    field_config.get('min', 0), field_config.get('max', 100), size=num_instances
+                )
             
             elif field_type == 'integer':
-                min_val = field_config.get('min', 0)
-                max_val = field_config.get('max', 100)
-                input_data[field_name] = random.randint(min_val, max_val)
+                columns[field_name] = rng.integers(
+                    field_config.get('min', 0), field_config.get('max', 100), size=num_instances, endpoint=True
+                )
             
             elif field_type == 'string':
-                options = field_config.get('options', ['value1', 'value2'])
-                input_data[field_name] = random.choice(options)
+                options = np.array(field_config.get('options', ['value1', 'value2']), dtype=object)
+                columns[field_name] = rng.choice(options, size=num_instances)
             
             elif field_type == 'boolean':
-                input_data[field_name] = random.choice([True, False])
+                columns[field_name] = rng.random(num_instances) < 0.5
         
-        return input_data
+        return columns
     
     @staticmethod
-    def get_node_duration(node, node_durations):
-        node_id = node.node_id
-        node_type = node.type
-        
+    def get_duration_range(node_id, node_type, node_durations):
         if node_id in node_durations:
             duration_config = node_durations[node_id]
         elif node_type in node_durations:
             duration_config = node_durations[node_type]
         else:
-            duration_config = {'min': 10, 'max': 100}
+            duration_config = DEFAULT_DURATION
         
-        min_duration = duration_config.get('min', 10)
-        max_duration = duration_config.get('max', 100)
+        return duration_config.get('min', 10), duration_config.get('max', 100)
+    
+    @staticmethod
+    def get_resource(node_id, node_type, resources):
+        if node_id in resources:
+            return node_id, int(resources[node_id])
+        if node_type in resources:
+            return node_type, int(resources[node_type])
+        return None, None
+    
+    @staticmethod
+    def analyze_queue_bottlenecks(resources):
+        ranked = sorted(
+            resources.items(),
+            key=lambda item: (item[1]['utilization'], item[1]['wait']['p95_duration_ms']),
+            reverse=True
+        )
         
-        return random.randint(min_duration, max_duration)
+        return [
+            {
+                'resource': name,
+                'capacity': stats['capacity'],
+                'utilization': stats['utilization'],
+                'avg_queue_depth': stats['avg_queue_depth'],
+                'max_queue_depth': stats['max_queue_depth'],
+                'p95_wait_ms': stats['wait']['p95_duration_ms']
+            }
+            for name, stats in ranked[:5]
+        ]
     
     @staticmethod
     def analyze_bottlenecks(node_statistics):
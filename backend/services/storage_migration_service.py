@@ -0,0 +1,163 @@
+from backend.database import normalize_database_url, is_sqlite_uri, INSTANCE_REFERENCE_TABLES
+from sqlalchemy import create_engine, inspect, select, delete, func, text
+import os
+import time
+
+
+DEFAULT_MIGRATION_CHUNK_SIZE = 5000
+
+
+class StorageMigrationService:
+    
+    @staticmethod
+    def resolve_url(location):
+        if '://' in location:
+            return normalize_database_url(location)
+        return f'sqlite:///{os.path.abspath(location)}'
+    
+    @staticmethod
+    def plan_tables(metadata, source_engine):
+        inspector = inspect(source_engine)
+        source_tables = set(inspector.get_table_names())
+        
+        plan = []
+        for table in metadata.sorted_tables:
+            if table.name not in source_tables:
+                continue
+            
+            # older database files may predate some columns; those take their model defaults
+            source_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            columns = [column for column in table.columns if column.name in source_columns]
+            plan.append((table, columns))
+        
+        skipped = sorted(source_tables - set(metadata.tables))
+        return plan, skipped
+    
+    @staticmethod
+    def count_rows(connection, table):
+        return connection.execute(select(func.count()).select_from(table)).scalar()
+    
+    @staticmethod
+    def iter_chunks(connection, table, columns, chunk_size):
+        query = select(*columns).order_by(*table.primary_key.columns)
+        result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+        
+        for partition in result.mappings().partitions(chunk_size):
+            yield [dict(row) for row in partition]
+    
+    @staticmethod
+    def load_instance_ids(connection, plan):
+        # older files stored process_instance.id in these columns; the target expects instance_id
+        if not any(table.name in INSTANCE_REFERENCE_TABLES for table, _ in plan):
+            return {}
+        if 'process_instance' not in inspect(connection).get_table_names():
+            return {}
+        
+        return dict(connection.execute(text('SELECT id, instance_id FROM process_instance')).all())
+    
+    @staticmethod
+    def convert_rows(table, rows, instance_ids):
+        if table.name not in INSTANCE_REFERENCE_TABLES:
+            return rows
+        
+        for row in rows:
+            value = row.get('process_instance_id')
+            if isinstance(value, int):
+                row['process_instance_id'] = instance_ids.get(value, str(value))
+        
+        return rows
+    
+    @staticmethod
+    def reset_sequence(connection, table):
+        column = table.autoincrement_column
+        if column is None:
+            return
+        
+        # rows were copied with explicit keys, so move the serial past the highest one
+        next_value = func.coalesce(select(func.max(column)).scalar_subquery(), 0) + 1
+        connection.execute(select(func.setval(func.pg_get_serial_sequence(table.name, column.name), next_value, False)))
+    
+    @staticmethod
+    def migrate(metadata, source, target, chunk_size=None, replace=False, progress=None):
+        started = time.time()
+        source_engine = create_engine(StorageMigrationService.resolve_url(source))
+        target_engine = create_engine(StorageMigrationService.resolve_url(target))
+        
+        try:
+            if source_engine.url == target_engine.url:
+                return {'success': False, 'error': 'Source and target are the same database'}
+            
+            if is_sqlite_uri(str(source_engine.url)) and not os.path.exists(source_engine.url.database or ''):
+                return {'success': False, 'error': f'Source database not found: {source_engine.url.database}'}
+            
+            plan, skipped = StorageMigrationService.plan_tables(metadata, source_engine)
+            metadata.create_all(target_engine)
+            
+            with target_engine.begin() as connection:
+                populated = [
+                    table.name for table, _ in plan
+                    if StorageMigrationService.count_rows(connection, table)
+                ]
+                
+                if populated and not replace:
+                    return {
+                        'success': False,
+                        'error': f'Target database already has data: {", ".join(populated)}'
+                    }
+                
+                for table, _ in reversed(plan):
+                    connection.execute(delete(table))
+            
+            chunk_size = chunk_size or DEFAULT_MIGRATION_CHUNK_SIZE
+            tables = []
+            
+            with source_engine.connect() as source_connection:
+                instance_ids = StorageMigrationService.load_instance_ids(source_connection, plan)
+                
+                for table, columns in plan:
+                    table_started = time.time()
+                    total = StorageMigrationService.count_rows(source_connection, table)
+                    copied = 0
+                    
+                    with target_engine.begin() as connection:
+                        for rows in StorageMigrationService.iter_chunks(source_connection, table, columns, chunk_size):
+                            rows = StorageMigrationService.convert_rows(table, rows, instance_ids)
+                            connection.execute(table.insert(), rows)
+                            copied += len(rows)
+                            
+                            if progress:
+                                progress({'event': 'progress', 'table': table.name, 'copied': copied, 'total': total})
+                        
+                        if target_engine.dialect.name == 'postgresql':
+                            StorageMigrationService.reset_sequence(connection, table)
+                        
+                        verified = StorageMigrationService.count_rows(connection, table)
+                    
+                    tables.append({
+                        'table': table.name,
+                        'rows': copied,
+                        'verified': verified == total,
+                        'duration_ms': int((time.time() - table_started) * 1000)
+                    })
+                    
+                    if progress:
+                        progress({'event': 'table', **tables[-1]})
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+        finally:
+            source_engine.dispose()
+            target_engine.dispose()
+        
+        mismatched = [table['table'] for table in tables if not table['verified']]
+        if mismatched:
+            return {'success': False, 'error': f'Row counts differ after copy: {", ".join(mismatched)}', 'tables': tables}
+        
+        return {
+            'success': True,
+            'source': source_engine.url.render_as_string(hide_password=True),
+            'target': target_engine.url.render_as_string(hide_password=True),
+            'tables': tables,
+            'skipped_tables': skipped,
+            'rows': sum(table['rows'] for table in tables),
+            'duration_ms': int((time.time() - started) * 1000)
+        }
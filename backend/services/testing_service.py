@@ -1,9 +1,22 @@
 from backend.models.test_case import TestCase, TestResult
 from backend.models.deployed_api import DeployedAPI
+from backend.services.execution_plan_service import ExecutionPlanService
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from flask import current_app
+from datetime import datetime
 import json
 import time
 
 
+TEST_PASS = 'PASS'
+TEST_FAIL = 'FAIL'
+TEST_ERROR = 'ERROR'
+TEST_TIMEOUT = 'TIMEOUT'
+
+DEFAULT_SUITE_WORKERS = 8
+DEFAULT_CASE_TIMEOUT = 30
+
+
 class TestingService:
     
     @staticmethod
@@ -89,42 +102,205 @@ class TestingService:
             }
     
     @staticmethod
-    def execute_all_test_cases(deployed_api_id, workflow_execution_func, db):
+    def execute_all_test_cases(deployed_api_id, workflow_execution_func, db, workers=None, timeout=None, fail_fast=False):
+        summary = None
+        results = []
+        
+        for event in TestingService.iter_test_suite(
+            deployed_api_id, workflow_execution_func, db,
+            workers=workers, timeout=timeout, fail_fast=fail_fast
+        ):
+            if event['event'] == 'error':
+                return {'success': False, 'error': event['error']}
+            if event['event'] == 'case':
+                results.append(event['result'])
+            elif event['event'] == 'summary':
+                summary = event
+        
+        summary = {key: value for key, value in summary.items() if key != 'event'}
+        summary['results'] = sorted(results, key=lambda result: result['test_case_id'])
+        return summary
+    
+    @staticmethod
+    def iter_test_suite(deployed_api_id, workflow_execution_func, db, workers=None, timeout=None, fail_fast=False):
         deployed_api = db.session.query(DeployedAPI).get(deployed_api_id)
         if not deployed_api:
-            return {'success': False, 'error': 'Deployed API not found'}
+            yield {'event': 'error', 'error': 'Deployed API not found'}
+            return
         
-        test_cases = db.session.query(TestCase).filter_by(deployed_api_id=deployed_api_id).all()
+        app = current_app._get_current_object()
+        workers = max(1, int(workers or app.config.get('TEST_SUITE_WORKERS', DEFAULT_SUITE_WORKERS)))
+        timeout = float(timeout or app.config.get('TEST_CASE_TIMEOUT', DEFAULT_CASE_TIMEOUT))
+        workflow_id = deployed_api.workflow_id
         
-        results = []
-        pass_count = 0
-        fail_count = 0
-        error_count = 0
+        cases = db.session.query(TestCase.id, TestCase.name, TestCase.input_data, TestCase.expected_output)\
+            .filter(TestCase.deployed_api_id == deployed_api_id)\
+            .order_by(TestCase.id)\
+            .all()
+        
+        # compile the plan once up front so every worker hits the cache
+        ExecutionPlanService.get_plan(workflow_id, db)
+        
+        counts = {TEST_PASS: 0, TEST_FAIL: 0, TEST_ERROR: 0, TEST_TIMEOUT: 0}
+        rows = []
+        started = {}
+        start_time = time.time()
+        
+        yield {'event': 'start', 'deployed_api_id': deployed_api_id, 'total': len(cases), 'workers': workers}
         
-        for test_case in test_cases:
-            result = TestingService.execute_test_case(test_case.id, workflow_execution_func, db)
-            results.append(result)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='test-suite')
+        
+        try:
+            queued = iter(cases)
+            pending = {}
+            stopped = False
             
-            if result.get('success'):
-                test_status = result['test_result']['status']
-                if test_status == 'PASS':
-                    pass_count += 1
-                elif test_status == 'FAIL':
-                    fail_count += 1
-                else:
-                    error_count += 1
-            else:
-                error_count += 1
+            def submit():
+                case = next(queued, None)
+                if case is not None:
+                    future = executor.submit(
+                        TestingService._run_case_in_context, app, case, workflow_id, workflow_execution_func, started
+                    )
+                    pending[future] = case
+            
+            for _ in range(workers * 2):
+                submit()
+            
+            while pending:
+                now = time.monotonic()
+                deadlines = [started[case.id] + timeout for case in pending.values() if case.id in started]
+                wait_timeout = max(min(deadlines) - now, 0) if deadlines else timeout
+                
+                done, _ = wait(list(pending), timeout=wait_timeout, return_when=FIRST_COMPLETED)
+                
+                finished = [(future, future.result()) for future in done]
+                
+                # a timed-out case keeps its thread busy until it returns, so it is abandoned rather than awaited
+                now = time.monotonic()
+                for future, case in list(pending.items()):
+                    if future not in done and case.id in started and now - started[case.id] >= timeout:
+                        finished.append((future, TestingService.build_result_row(
+                            case.id, TEST_TIMEOUT, None, f'Test case exceeded timeout of {timeout:g}s', int(timeout * 1000)
+                        )))
+                
+                for future, row in finished:
+                    case = pending.pop(future)
+                    rows.append(row)
+                    counts[row['status']] += 1
+                    
+                    yield {
+                        'event': 'case',
+                        'completed': len(rows),
+                        'total': len(cases),
+                        'passed': counts[TEST_PASS],
+                        'failed': counts[TEST_FAIL],
+                        'errors': counts[TEST_ERROR],
+                        'timeouts': counts[TEST_TIMEOUT],
+                        'result': {
+                            'success': row['status'] in (TEST_PASS, TEST_FAIL),
+                            'test_case_id': case.id,
+                            'name': case.name,
+                            'test_result': TestingService.result_row_to_dict(row)
+                        }
+                    }
+                    
+                    if fail_fast and row['status'] != TEST_PASS:
+                        stopped = True
+                    
+                    if not stopped:
+                        submit()
+                
+                if stopped:
+                    for future in pending:
+                        future.cancel()
+                    break
         
-        return {
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            TestingService.save_result_rows(rows, db)
+        
+        yield {
+            'event': 'summary',
             'success': True,
-            'total': len(test_cases),
-            'passed': pass_count,
-            'failed': fail_count,
-            'errors': error_count,
-            'results': results
+            'total': len(cases),
+            'executed': len(rows),
+            'passed': counts[TEST_PASS],
+            'failed': counts[TEST_FAIL],
+            'errors': counts[TEST_ERROR],
+            'timeouts': counts[TEST_TIMEOUT],
+            'skipped': len(cases) - len(rows),
+            'stopped_early': len(rows) < len(cases),
+            'duration_ms': int((time.time() - start_time) * 1000)
         }
     
+    @staticmethod
+    def _run_case_in_context(app, case, workflow_id, workflow_execution_func, started):
+        with app.app_context():
+            started[case.id] = time.monotonic()
+            return TestingService.run_case(case, workflow_id, workflow_execution_func)
+    
+    @staticmethod
+    def run_case(case, workflow_id, workflow_execution_func):
+        start_time = time.time()
+        
+        try:
+            input_data = json.loads(case.input_data)
+            expected_output = json.loads(case.expected_output) if case.expected_output else None
+            
+            result = workflow_execution_func(workflow_id, input_data)
+            execution_time_ms = int((time.time() - start_time) * 1000)
+            
+            status, error_message = TestingService.evaluate_result(result, expected_output)
+            return TestingService.build_result_row(case.id, status, json.dumps(result), error_message, execution_time_ms)
+        
+        except Exception as e:
+            execution_time_ms = int((time.time() - start_time) * 1000)
+            return TestingService.build_result_row(case.id, TEST_ERROR, None, str(e), execution_time_ms)
+    
+    @staticmethod
+    def evaluate_result(result, expected_output):
+        if not result.get('success'):
+            return TEST_FAIL, result.get('error', 'Execution failed')
+        
+        if expected_output and not TestingService.compare_outputs(result, expected_output):
+            return TEST_FAIL, 'Output does not match expected result'
+        
+        return TEST_PASS, None
+    
+    @staticmethod
+    def build_result_row(test_case_id, status, actual_output, error_message, execution_time_ms):
+        return {
+            'test_case_id': test_case_id,
+            'status': status,
+            'actual_output': actual_output,
+            'error_message': error_message,
+            'execution_time_ms': execution_time_ms,
+            'executed_at': datetime.utcnow()
+        }
+    
+    @staticmethod
+    def result_row_to_dict(row):
+        return {
+            'test_case_id': row['test_case_id'],
+            'status': row['status'],
+            'actual_output': json.loads(row['actual_output']) if row['actual_output'] else {},
+            'error_message': row['error_message'],
+            'execution_time_ms': row['execution_time_ms'],
+            'executed_at': row['executed_at'].isoformat()
+        }
+    
+    @staticmethod
+    def save_result_rows(rows, db):
+        if not rows:
+            return
+        
+        try:
+            db.session.bulk_insert_mappings(TestResult, rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    
     @staticmethod
     def compare_outputs(actual, expected):
         if isinstance(expected, dict):
@@ -0,0 +1,436 @@
+import csv
+import io
+import json
+import os
+import numpy as np
+
+
+DEFAULT_CHUNK_SIZE = 50000
+
+MISSING_MEDIAN = 'median'
+MISSING_MEAN = 'mean'
+MISSING_ZERO = 'zero'
+MISSING_DROP = 'drop'
+
+MISSING_STRATEGIES = (MISSING_MEDIAN, MISSING_MEAN, MISSING_ZERO, MISSING_DROP)
+
+MISSING_TOKENS = frozenset(['', 'na', 'n/a', 'nan', 'null', 'none'])
+
+FORMAT_CSV = 'csv'
+FORMAT_PARQUET = 'parquet'
+
+
+class TrainingDataError(Exception):
+    pass
+
+
+def _is_missing(value):
+    if value is None:
+        return True
+    if isinstance(value, float) and value != value:
+        return True
+    return isinstance(value, str) and value.strip().lower() in MISSING_TOKENS
+
+
+def _import_parquet():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise TrainingDataError('Parquet training data requires the pyarrow package (pip install pyarrow)')
+    return pyarrow
+
+
+def _parse_float(value):
+    if _is_missing(value):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TrainingData:
+    
+    def __init__(self, X, y, features, encodings, stats):
+        self.X = X
+        self.y = y
+        self.features = features
+        self.encodings = encodings
+        self.stats = stats
+
+
+class _ColumnEncoder:
+    __slots__ = ('name', 'categorical', 'categories', 'missing', 'invalid')
+    
+    def __init__(self, name, categorical):
+        self.name = name
+        self.categorical = categorical
+        self.categories = {}
+        self.missing = 0
+        self.invalid = 0
+    
+    def encode(self, values):
+        if self.categorical:
+            return self._encode_categorical(values)
+        return self._encode_numeric(values)
+    
+    def _encode_numeric(self, values):
+        if isinstance(values, np.ndarray) and values.dtype.kind in 'biuf':
+            column = values.astype(np.float64)
+        else:
+            try:
+                column = np.asarray(values, dtype=np.float64)
+            except (TypeError, ValueError):
+                column = np.empty(len(values), dtype=np.float64)
+                for i, value in enumerate(values):
+                    parsed = _parse_float(value)
+                    if parsed is None:
+                        self.invalid += 1
+                        parsed = np.nan
+                    column[i] = parsed
+        
+        self.missing += int(np.isnan(column).sum())
+        return column
+    
+    def _encode_categorical(self, values):
+        categories = self.categories
+        column = np.empty(len(values), dtype=np.float64)
+        
+        for i, value in enumerate(values):
+            if _is_missing(value):
+                column[i] = np.nan
+                self.missing += 1
+                continue
+            
+            key = str(value).strip()
+            code = categories.get(key)
+            if code is None:
+                code = len(categories)
+                categories[key] = code
+            column[i] = code
+        
+        return column
+    
+    def sorted_categories(self):
+        return sorted(self.categories, key=lambda c: (_parse_float(c) is None, _parse_float(c) or 0, c))
+    
+    def remap_sorted(self, column):
+        ordered = self.sorted_categories()
+        remap = np.empty(len(ordered), dtype=np.float64)
+        for new_code, category in enumerate(ordered):
+            remap[self.categories[category]] = new_code
+        
+        present = ~np.isnan(column)
+        column[present] = remap[column[present].astype(np.int64)]
+        return ordered
+
+
+class _Reservoir:
+    
+    def __init__(self, size, n_features, seed=None):
+        self.size = size
+        self.X = np.empty((size, n_features), dtype=np.float64)
+        self.y = np.empty(size, dtype=object)
+        self.filled = 0
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+    
+    def add(self, X, y):
+        n_rows = len(y)
+        take = min(self.size - self.filled, n_rows)
+        
+        if take:
+            self.X[self.filled:self.filled + take] = X[:take]
+            self.y[self.filled:self.filled + take] = y[:take]
+            self.filled += take
+        
+        if take < n_rows:
+            positions = self.seen + np.arange(take, n_rows)
+            slots = self.rng.integers(0, positions + 1)
+            keep = slots < self.size
+            self.X[slots[keep]] = X[take:][keep]
+            self.y[slots[keep]] = y[take:][keep]
+        
+        self.seen += n_rows
+    
+    def result(self):
+        return self.X[:self.filled], self.y[:self.filled]
+
+
+class TrainingDataService:
+    
+    @staticmethod
+    def parse_feature_list(value):
+        if value is None:
+            return []
+        if isinstance(value, list):
+            return [str(f).strip() for f in value if str(f).strip()]
+        
+        value = value.strip()
+        if value.startswith('['):
+            return TrainingDataService.parse_feature_list(json.loads(value))
+        return [f.strip() for f in value.split(',') if f.strip()]
+    
+    @staticmethod
+    def detect_format(filename, explicit=None):
+        if explicit:
+            fmt = explicit.lower()
+        else:
+            extension = os.path.splitext(filename or '')[1].lower()
+            fmt = FORMAT_PARQUET if extension in ('.parquet', '.pq') else FORMAT_CSV
+        
+        if fmt not in (FORMAT_CSV, FORMAT_PARQUET):
+            raise TrainingDataError(f'Unsupported training data format: {fmt}')
+        return fmt
+    
+    @staticmethod
+    def resolve_path(path, base_dir):
+        if not base_dir:
+            raise TrainingDataError('Server-side training data paths are not enabled')
+        
+        base = os.path.realpath(base_dir)
+        resolved = os.path.realpath(os.path.join(base, path))
+        
+        if os.path.commonpath([base, resolved]) != base:
+            raise TrainingDataError('Training data path must be inside the training data directory')
+        if not os.path.isfile(resolved):
+            raise TrainingDataError(f'Training data file not found: {path}')
+        
+        return resolved
+    
+    @staticmethod
+    def iter_record_chunks(records, columns, chunk_size=DEFAULT_CHUNK_SIZE):
+        for start in range(0, len(records), chunk_size):
+            rows = records[start:start + chunk_size]
+            yield {column: [row.get(column) for row in rows] for column in columns}
+    
+    @staticmethod
+    def iter_csv_chunks(source, columns, chunk_size=DEFAULT_CHUNK_SIZE):
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'r', encoding='utf-8-sig', newline='') as stream:
+                yield from TrainingDataService.iter_csv_chunks(stream, columns, chunk_size)
+            return
+        
+        if isinstance(source, io.TextIOBase):
+            yield from TrainingDataService._iter_csv_rows(source, columns, chunk_size)
+            return
+        
+        stream = io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+        try:
+            yield from TrainingDataService._iter_csv_rows(stream, columns, chunk_size)
+        finally:
+            # leave the caller's binary stream open so an upload can be read again
+            stream.detach()
+    
+    @staticmethod
+    def _iter_csv_rows(stream, columns, chunk_size):
+        reader = csv.reader(stream)
+        header = next(reader, None)
+        if header is None:
+            raise TrainingDataError('Training data file is empty')
+        
+        header = [h.strip() for h in header]
+        missing = [c for c in columns if c not in header]
+        if missing:
+            raise TrainingDataError(f'Columns not found in training data: {", ".join(missing)}')
+        
+        indexes = [header.index(c) for c in columns]
+        width = max(indexes) + 1
+        buffers = [[] for _ in columns]
+        
+        for row in reader:
+            if len(row) < width:
+                row = row + [''] * (width - len(row))
+            for buffer, index in zip(buffers, indexes):
+                buffer.append(row[index])
+            
+            if len(buffers[0]) >= chunk_size:
+                yield dict(zip(columns, buffers))
+                buffers = [[] for _ in columns]
+        
+        if buffers[0]:
+            yield dict(zip(columns, buffers))
+    
+    @staticmethod
+    def iter_parquet_chunks(source, columns, chunk_size=DEFAULT_CHUNK_SIZE):
+        pa = _import_parquet()
+        
+        parquet_file = pa.parquet.ParquetFile(source)
+        missing = [c for c in columns if c not in parquet_file.schema_arrow.names]
+        if missing:
+            raise TrainingDataError(f'Columns not found in training data: {", ".join(missing)}')
+        
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            chunk = {}
+            for column in columns:
+                array = batch.column(batch.schema.get_field_index(column))
+                values = array.to_numpy(zero_copy_only=False)
+                chunk[column] = values.tolist() if values.dtype.kind == 'O' else values
+            yield chunk
+    
+    @staticmethod
+    def parquet_numeric_columns(source, columns):
+        pa = _import_parquet()
+        
+        schema = pa.parquet.ParquetFile(source).schema_arrow
+        numeric = set()
+        for column in columns:
+            if column not in schema.names:
+                continue
+            
+            field_type = schema.field(column).type
+            if pa.types.is_integer(field_type) or pa.types.is_floating(field_type) \
+                    or pa.types.is_decimal(field_type) or pa.types.is_boolean(field_type):
+                numeric.add(column)
+        
+        return numeric
+    
+    @staticmethod
+    def scan_categorical_features(chunks, features):
+        # a column is categorical if any row in the file is non-numeric, not just rows of the first chunk
+        pending = set(features)
+        categorical = set()
+        
+        for chunk in chunks:
+            for feature in list(pending):
+                if TrainingDataService._infer_categorical(chunk[feature]):
+                    categorical.add(feature)
+                    pending.discard(feature)
+            
+            if not pending:
+                break
+        
+        return categorical
+    
+    @staticmethod
+    def load(chunks, features, target, categorical_features=None, missing=MISSING_MEDIAN,
+             sample_size=None, seed=None):
+        if not features:
+            raise TrainingDataError('At least one feature is required')
+        if missing not in MISSING_STRATEGIES:
+            raise TrainingDataError(f'Unknown missing value strategy: {missing}')
+        if sample_size is not None and sample_size <= 0:
+            raise TrainingDataError('sample_size must be a positive integer')
+        
+        categorical_features = set(categorical_features or [])
+        encoders = None
+        reservoir = None
+        X_chunks = []
+        y_chunks = []
+        rows_read = 0
+        missing_target = 0
+        
+        for chunk in chunks:
+            target_values = chunk[target]
+            if isinstance(target_values, np.ndarray):
+                # numpy scalars (e.g. Parquet int64 labels) are not JSON serialisable as class keys
+                target_values = target_values.tolist()
+            n_rows = len(target_values)
+            if n_rows == 0:
+                continue
+            
+            if encoders is None:
+                encoders = [
+                    _ColumnEncoder(f, f in categorical_features or TrainingDataService._infer_categorical(chunk[f]))
+                    for f in features
+                ]
+            
+            X = np.empty((n_rows, len(features)), dtype=np.float64)
+            for j, encoder in enumerate(encoders):
+                X[:, j] = encoder.encode(chunk[encoder.name])
+            
+            y = np.empty(n_rows, dtype=object)
+            y[:] = [None if _is_missing(v) else (v.strip() if isinstance(v, str) else v) for v in target_values]
+            
+            has_target = np.array([v is not None for v in y], dtype=bool)
+            if not has_target.all():
+                missing_target += int((~has_target).sum())
+                X = X[has_target]
+                y = y[has_target]
+            
+            rows_read += n_rows
+            
+            if sample_size:
+                if reservoir is None:
+                    reservoir = _Reservoir(sample_size, len(features), seed)
+                reservoir.add(X, y)
+            else:
+                X_chunks.append(X)
+                y_chunks.append(y)
+        
+        if encoders is None:
+            raise TrainingDataError('Training data contains no rows')
+        
+        if reservoir is not None:
+            X, y = reservoir.result()
+        else:
+            X = np.concatenate(X_chunks) if X_chunks else np.empty((0, len(features)))
+            y = np.concatenate(y_chunks) if y_chunks else np.empty(0, dtype=object)
+        
+        encodings = {}
+        for j, encoder in enumerate(encoders):
+            if encoder.categorical:
+                encodings[encoder.name] = encoder.remap_sorted(X[:, j])
+        
+        X, y, dropped = TrainingDataService.fill_missing(X, y, encoders, missing)
+        
+        if len(y) == 0:
+            raise TrainingDataError('No usable training rows after handling missing values')
+        
+        stats = {
+            'rows_read': rows_read,
+            'rows_used': int(len(y)),
+            'rows_dropped': dropped + missing_target,
+            'missing_target': missing_target,
+            'sampled': reservoir is not None,
+            'missing_values': {e.name: e.missing for e in encoders if e.missing},
+            'invalid_values': {e.name: e.invalid for e in encoders if e.invalid},
+            'categorical_features': [e.name for e in encoders if e.categorical]
+        }
+        
+        return TrainingData(X, y, list(features), encodings, stats)
+    
+    @staticmethod
+    def fill_missing(X, y, encoders, strategy):
+        nan_mask = np.isnan(X)
+        if not nan_mask.any():
+            return X, y, 0
+        
+        if strategy == MISSING_DROP:
+            keep = ~nan_mask.any(axis=1)
+            return X[keep], y[keep], int((~keep).sum())
+        
+        for j, encoder in enumerate(encoders):
+            column_mask = nan_mask[:, j]
+            if not column_mask.any():
+                continue
+            
+            present = X[~column_mask, j]
+            if len(present) == 0:
+                fill = 0.0
+            elif encoder.categorical:
+                values, counts = np.unique(present, return_counts=True)
+                fill = values[np.argmax(counts)]
+            elif strategy == MISSING_MEDIAN:
+                fill = np.median(present)
+            elif strategy == MISSING_MEAN:
+                fill = present.mean()
+            else:
+                fill = 0.0
+            
+            X[column_mask, j] = fill
+        
+        return X, y, 0
+    
+    @staticmethod
+    def _infer_categorical(values):
+        if isinstance(values, np.ndarray) and values.dtype.kind in 'biuf':
+            return False
+        
+        for value in values:
+            if _is_missing(value) or isinstance(value, bool):
+                continue
+            if _parse_float(value) is None:
+                return True
+        return False
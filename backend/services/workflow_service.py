@@ -1,5 +1,7 @@
-from models.workflow import Workflow, WorkflowNode, WorkflowEdge
-from database import db
+from backend.models.workflow import Workflow, WorkflowNode, WorkflowEdge
+from backend.services.execution_plan_service import ExecutionPlanService
+from backend.database import db
+from datetime import datetime
 import json
 
 class WorkflowService:
@@ -91,7 +93,11 @@ class WorkflowService:
                 )
                 db.session.add(edge)
         
+        # 노드/엣지만 바뀌어도 실행 계획 캐시 버전이 달라지도록 갱신
+        workflow.updated_at = datetime.utcnow()
         db.session.commit()
+        
+        ExecutionPlanService.invalidate(workflow_id)
         return workflow
     
     def delete_workflow(self, workflow_id):
@@ -99,6 +105,8 @@ class WorkflowService:
         workflow = Workflow.query.get_or_404(workflow_id)
         db.session.delete(workflow)
         db.session.commit()
+        
+        ExecutionPlanService.invalidate(workflow_id)
     
     def validate_workflow(self, workflow_id):
         """워크플로우 검증"""
@@ -0,0 +1,51 @@
+import pytest
+
+from backend.app import create_app
+from backend.config import TestingConfig
+from backend.database import db as _db
+from backend.services.execution_plan_service import ExecutionPlanService
+from backend.services.rule_cache_service import rule_artifact_cache
+from backend.services.workflow_service import WorkflowService
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    
+    with app.app_context():
+        yield app
+        _db.session.remove()
+        _db.drop_all()
+    
+    # ids restart in every in-memory database, so cached plans and rule artifacts must not outlive it
+    ExecutionPlanService.invalidate()
+    rule_artifact_cache.invalidate()
+
+
+@pytest.fixture
+def db(app):
+    return _db
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_workflow(app):
+    # nodes: (node_id, node_type, config), edges: (source, target) or (source, target, {'label': ..., 'condition': ...})
+    def make(nodes, edges, status='active'):
+        return WorkflowService().create_workflow({
+            'name': 'test-workflow',
+            'status': status,
+            'nodes': [
+                {'node_id': node_id, 'node_type': node_type, 'label': node_id, 'config': config}
+                for node_id, node_type, config in nodes
+            ],
+            'edges': [
+                {'edge_id': f'edge-{index}', 'source': edge[0], 'target': edge[1], **(edge[2] if len(edge) > 2 else {})}
+                for index, edge in enumerate(edges)
+            ]
+        })
+    return make
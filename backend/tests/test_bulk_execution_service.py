@@ -0,0 +1,113 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.models.application import Application, ApplicationLog
+from backend.models.bulk_execution import BulkExecutionRun
+from backend.services.bulk_execution_service import BulkExecutionService, BulkExecutionLeaseError
+
+
+@pytest.fixture
+def applications(db, make_workflow):
+    workflow = make_workflow([('start', 'start', {}), ('end', 'end', {})], [('start', 'end')])
+    
+    for index in range(7):
+        db.session.add(Application(
+            workflow_id=workflow.id,
+            applicant_name=f'applicant-{index}',
+            application_data=json.dumps({'income': 1000 * index}),
+            status='pending'
+        ))
+    db.session.commit()
+    
+    return [application.id for application in db.session.query(Application).order_by(Application.id)]
+
+
+def test_execute_processes_all_applications_and_releases_lease(db, applications):
+    service = BulkExecutionService()
+    run = service.create_run(chunk_size=3, workers=1)
+    
+    result = service.execute(run.id)
+    
+    assert result['status'] == 'completed'
+    assert (result['processed'], result['succeeded'], result['last_application_id']) == (7, 7, applications[-1])
+    assert result['lease_owner'] is None
+    assert db.session.query(Application).filter_by(status='completed').count() == 7
+
+
+def test_resume_continues_after_checkpoint(db, applications):
+    service = BulkExecutionService()
+    run = service.create_run(chunk_size=2, workers=1)
+    run.status = 'failed'
+    run.processed = 4
+    run.succeeded = 4
+    run.last_application_id = applications[3]
+    db.session.commit()
+    
+    result = service.execute(run.id)
+    
+    assert (result['status'], result['processed']) == ('completed', 7)
+    executed = {log.application_id for log in db.session.query(ApplicationLog)}
+    assert executed == set(applications[4:])
+
+
+def test_running_run_with_live_heartbeat_cannot_be_claimed(db, applications):
+    service = BulkExecutionService()
+    run = service.create_run(workers=1)
+    
+    assert service.claim_run(run.id, 'worker-a') is True
+    assert service.claim_run(run.id, 'worker-b') is False
+    assert service.claim_run(run.id, 'worker-a') is True
+    
+    with pytest.raises(BulkExecutionLeaseError):
+        service.execute(run.id, owner='worker-b')
+    assert db.session.get(BulkExecutionRun, run.id).status == 'running'
+
+
+def test_stale_lease_can_be_taken_over(app, db, applications):
+    service = BulkExecutionService()
+    run = service.create_run(workers=1)
+    service.claim_run(run.id, 'crashed-worker')
+    
+    run.heartbeat_at = datetime.utcnow() - timedelta(seconds=app.config['BULK_EXECUTION_LEASE_TIMEOUT'] + 1)
+    db.session.commit()
+    
+    assert service.claim_run(run.id, 'worker-b') is True
+    assert db.session.get(BulkExecutionRun, run.id).lease_owner == 'worker-b'
+
+
+def test_resume_endpoint_rejects_running_run(client, db, applications):
+    service = BulkExecutionService()
+    run = service.create_run(workers=1)
+    service.claim_run(run.id, 'worker-a')
+    
+    response = client.post(f'/api/application/bulk-execute/{run.id}/resume')
+    
+    assert response.status_code == 409
+    assert db.session.get(BulkExecutionRun, run.id).lease_owner == 'worker-a'
+
+
+def test_execution_stops_when_lease_is_taken_over(db, applications):
+    service = BulkExecutionService()
+    run = service.create_run(chunk_size=2, workers=1)
+    
+    def steal(progress_run):
+        db.session.query(BulkExecutionRun).filter_by(id=progress_run.id).update({'lease_owner': 'worker-b'})
+        db.session.commit()
+    
+    with pytest.raises(BulkExecutionLeaseError):
+        service.execute(run.id, progress=steal)
+    
+    db.session.expire_all()
+    run = db.session.get(BulkExecutionRun, run.id)
+    assert (run.status, run.lease_owner, run.processed) == ('running', 'worker-b', 2)
+
+
+def test_worker_processes_are_spawned(db, applications):
+    service = BulkExecutionService()
+    run = service.create_run(chunk_size=2, workers=2)
+    
+    result = service.execute(run.id)
+    
+    assert (result['status'], result['processed'], result['succeeded']) == ('completed', 7, 7)
@@ -0,0 +1,176 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlalchemy import inspect
+
+from backend.app import create_app
+from backend.config import TestingConfig
+from backend.database import db
+from backend.models.application import Application, ApplicationLog, ApplicationTrace
+from backend.models.decision_tree import DecisionTree
+from backend.utils.trace_codec import encode_payload, diff_snapshot, ENCODING_ZLIB_JSON
+
+
+DATABASE_DIR = Path(__file__).resolve().parents[2] / 'database'
+
+LEGACY_SCHEMA = '''
+CREATE TABLE workflows (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(255) NOT NULL,
+    description TEXT,
+    version VARCHAR(50) DEFAULT '1.0.0',
+    status VARCHAR(50) DEFAULT 'draft',
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP
+);
+CREATE TABLE applications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    workflow_id INTEGER NOT NULL,
+    applicant_name VARCHAR(255),
+    applicant_id VARCHAR(100),
+    application_data TEXT,
+    status VARCHAR(50) DEFAULT 'pending',
+    score REAL,
+    result TEXT,
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP,
+    completed_at TIMESTAMP
+);
+CREATE TABLE application_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    application_id INTEGER NOT NULL,
+    node_id VARCHAR(100),
+    node_type VARCHAR(50),
+    action VARCHAR(100),
+    input_data TEXT,
+    output_data TEXT,
+    status VARCHAR(50),
+    error_message TEXT,
+    execution_time REAL,
+    created_at TIMESTAMP
+);
+CREATE TABLE decision_tree (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(255) NOT NULL,
+    description TEXT,
+    target_variable VARCHAR(100) NOT NULL,
+    algorithm VARCHAR(50),
+    max_depth INTEGER,
+    min_samples_split INTEGER,
+    min_samples_leaf INTEGER,
+    status VARCHAR(50),
+    training_accuracy REAL,
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP
+);
+INSERT INTO workflows (id, name) VALUES (1, 'legacy');
+INSERT INTO decision_tree (id, name, target_variable, status) VALUES (1, 'legacy-tree', 'default', 'trained');
+INSERT INTO applications (id, workflow_id, status) VALUES (1, 1, 'completed');
+INSERT INTO application_logs (application_id, node_id, action, input_data, output_data, status)
+VALUES (1, 'score', 'execute', '{"income": 5000}', '{"score": 710}', 'success');
+'''
+
+
+@pytest.fixture
+def legacy_app(tmp_path):
+    path = tmp_path / 'legacy.db'
+    connection = sqlite3.connect(path)
+    connection.executescript(LEGACY_SCHEMA)
+    connection.close()
+    
+    class LegacyConfig(TestingConfig):
+        DATABASE_PATH = str(path)
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+    
+    app = create_app(LegacyConfig)
+    
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_startup_adds_trace_columns_to_legacy_logs(legacy_app):
+    columns = {column['name'] for column in inspect(db.engine).get_columns('application_logs')}
+    
+    assert {'trace_id', 'payload', 'encoding'} <= columns
+    assert 'application_traces' in inspect(db.engine).get_table_names()
+
+
+def test_legacy_logs_still_decode_after_upgrade(legacy_app):
+    log = db.session.query(ApplicationLog).one()
+    
+    assert log.trace_id is None
+    assert log.to_dict() | {'created_at': None} == {
+        'id': log.id,
+        'application_id': 1,
+        'trace_id': None,
+        'node_id': 'score',
+        'node_type': None,
+        'action': 'execute',
+        'status': 'success',
+        'error_message': None,
+        'execution_time': None,
+        'created_at': None,
+        'input_data': {'income': 5000},
+        'output_data': {'score': 710}
+    }
+
+
+def test_compressed_logs_are_stored_in_upgraded_table(legacy_app):
+    snapshot = {'income': 5000, 'debt_ratio': 0.3}
+    current = {'income': 5000, 'debt_ratio': 0.3, 'score': 710}
+    
+    db.session.add(ApplicationTrace(id='trace-1', application_id=1, input_snapshot=encode_payload(snapshot)))
+    db.session.add(ApplicationLog(
+        application_id=1,
+        trace_id='trace-1',
+        node_id='grade',
+        payload=encode_payload({'output': {'grade': 'A'}, 'input_delta': diff_snapshot(snapshot, current)}),
+        encoding=ENCODING_ZLIB_JSON,
+        status='success'
+    ))
+    db.session.commit()
+    db.session.expire_all()
+    
+    log = db.session.query(ApplicationLog).filter_by(node_id='grade').one()
+    assert log.get_payload() == (current, {'grade': 'A'})
+    assert len(db.session.get(Application, 1).logs) == 2
+
+
+def test_startup_adds_feature_encodings_to_legacy_trees(legacy_app):
+    tree = db.session.get(DecisionTree, 1)
+    
+    assert tree.to_dict()['feature_encodings'] is None
+    
+    tree.feature_encodings = '{"grade": ["A", "B"]}'
+    db.session.commit()
+    db.session.expire_all()
+    
+    assert db.session.get(DecisionTree, 1).get_feature_encodings() == {'grade': ['A', 'B']}
+
+
+def test_schema_script_runs_on_an_empty_database(tmp_path):
+    path = tmp_path / 'fresh.db'
+    connection = sqlite3.connect(path)
+    connection.executescript((DATABASE_DIR / 'schema.sql').read_text(encoding='utf-8'))
+    connection.close()
+    
+    class FreshConfig(TestingConfig):
+        DATABASE_PATH = str(path)
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+    
+    app = create_app(FreshConfig)
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    
+    # the BPM index script applies once the application has created its tables
+    connection = sqlite3.connect(path)
+    try:
+        connection.executescript((DATABASE_DIR / 'bpm_indexes.sql').read_text(encoding='utf-8'))
+        indexes = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    finally:
+        connection.close()
+    assert {'idx_task_candidate_inbox', 'idx_audit_log_process_timestamp'} <= indexes
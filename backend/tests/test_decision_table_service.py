@@ -0,0 +1,171 @@
+import json
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from backend.models.decision_table import DecisionTable, DecisionTableRule
+from backend.services.decision_table_service import DecisionTableService, CompiledDecisionTable
+
+
+HIT_POLICIES = ['FIRST', 'PRIORITY', 'COLLECT', 'ANY']
+CONDITION_COLUMNS = [{'name': 'age'}, {'name': 'grade'}, {'name': 'region'}]
+ACTION_COLUMNS = [{'name': 'decision'}, {'name': 'limit'}]
+
+
+def random_condition(rng):
+    operator = rng.choice([
+        '==', '!=', '>', '>=', '<', '<=', 'IN', 'NOT IN', 'CONTAINS', 'STARTS_WITH',
+        'ENDS_WITH', 'REGEX', 'BETWEEN', '-', 'ANY', 'plain'
+    ])
+    number = rng.choice([18, 25, 30.5, 40, '35', 'x'])
+    
+    if operator == 'plain':
+        return rng.choice(['A', 'B', 30, '30'])
+    if operator == 'BETWEEN':
+        return {'operator': operator, 'value': rng.choice([[20, 40], ['25', 60], [50, 10], [1]])}
+    if operator in ('IN', 'NOT IN'):
+        return {'operator': operator, 'value': rng.choice([['A', 'B'], [30, 'C'], 'A,C', 'seoul,busan'])}
+    if operator == 'REGEX':
+        return {'operator': operator, 'value': rng.choice(['^A', '[0-9]+', 'se.*'])}
+    if operator in ('CONTAINS', 'STARTS_WITH', 'ENDS_WITH'):
+        return {'operator': operator, 'value': rng.choice(['A', 'ou', '3'])}
+    if operator in ('==', '!='):
+        return {'operator': operator, 'value': rng.choice(['A', 30, 'seoul'])}
+    return {'operator': operator, 'value': number}
+
+
+def random_table(rng, hit_policy, rule_count):
+    rules = []
+    for number in range(1, rule_count + 1):
+        columns = rng.sample([column['name'] for column in CONDITION_COLUMNS], rng.randint(0, 3))
+        rules.append(SimpleNamespace(
+            id=number,
+            rule_number=number,
+            priority=rng.choice([0, 1, 2, 5]),
+            enabled=rng.random() > 0.1,
+            conditions={name: random_condition(rng) for name in columns},
+            actions={'decision': f'D{number}', 'limit': number * 100} if number % 4 else {'decision': f'D{number}'}
+        ))
+    
+    return SimpleNamespace(
+        id=None, name='random', hit_policy=hit_policy,
+        conditions=CONDITION_COLUMNS, actions=ACTION_COLUMNS, rules=rules
+    )
+
+
+def random_input(rng):
+    return {
+        'age': rng.choice([None, 17, 18, 25, 30, 30.5, 35, '35', 40, 61, 'unknown']),
+        'grade': rng.choice([None, 'A', 'B', 'C', 'AB', 30, '3']),
+        'region': rng.choice([None, 'seoul', 'busan', 'house', 'A'])
+    }
+
+
+def naive_execute(table, input_data):
+    # the original row-by-row evaluator, kept here as the reference semantics
+    matched = []
+    for rule in sorted(table.rules, key=lambda r: r.priority, reverse=True):
+        if rule.enabled and DecisionTableService.match_rule(rule, input_data, table.conditions):
+            matched.append(rule)
+            if table.hit_policy == 'FIRST':
+                break
+    
+    if not matched:
+        return {'matched': False, 'rules': [], 'output': {}, 'message': 'No matching rules found'}
+    
+    output = {}
+    for column in table.actions:
+        name = column['name']
+        if table.hit_policy in ('FIRST', 'PRIORITY'):
+            if name in matched[0].actions:
+                output[name] = matched[0].actions[name]
+        elif table.hit_policy == 'COLLECT':
+            output[name] = [rule.actions.get(name) for rule in matched if name in rule.actions]
+        elif table.hit_policy == 'ANY':
+            for rule in matched:
+                if name in rule.actions:
+                    output[name] = rule.actions[name]
+                    break
+    
+    return {
+        'matched': True,
+        'rules': [{'rule_number': rule.rule_number, 'id': rule.id} for rule in matched],
+        'output': output,
+        'hit_policy': table.hit_policy
+    }
+
+
+@pytest.mark.parametrize('hit_policy', HIT_POLICIES)
+@pytest.mark.parametrize('seed', range(5))
+def test_compiled_table_matches_naive_evaluator(hit_policy, seed):
+    rng = random.Random(seed)
+    table = random_table(rng, hit_policy, rule_count=rng.choice([5, 40, 130]))
+    compiled = CompiledDecisionTable(table)
+    
+    for _ in range(200):
+        input_data = random_input(rng)
+        assert compiled.execute(input_data) == naive_execute(table, input_data), input_data
+
+
+def test_first_hit_stops_at_highest_priority_rule():
+    table = SimpleNamespace(
+        id=None, name='first', hit_policy='FIRST', conditions=CONDITION_COLUMNS, actions=ACTION_COLUMNS,
+        rules=[
+            SimpleNamespace(id=1, rule_number=1, priority=0, enabled=True, conditions={}, actions={'decision': 'LOW'}),
+            SimpleNamespace(id=2, rule_number=2, priority=9, enabled=True,
+                            conditions={'age': {'operator': '>=', 'value': 30}}, actions={'decision': 'HIGH'}),
+            SimpleNamespace(id=3, rule_number=3, priority=99, enabled=False, conditions={}, actions={'decision': 'OFF'})
+        ]
+    )
+    
+    result = CompiledDecisionTable(table).execute({'age': 31})
+    
+    assert result['output'] == {'decision': 'HIGH'}
+    assert result['rules'] == [{'rule_number': 2, 'id': 2}]
+
+
+def test_compiled_table_is_cached_until_updated(db):
+    table = DecisionTable(
+        name='cached', hit_policy='COLLECT',
+        conditions=json.dumps(CONDITION_COLUMNS), actions=json.dumps(ACTION_COLUMNS)
+    )
+    table.rules = [DecisionTableRule(
+        rule_number=1, conditions=json.dumps({'grade': 'A'}), actions=json.dumps({'decision': 'OK'})
+    )]
+    db.session.add(table)
+    db.session.commit()
+    
+    compiled = DecisionTableService.get_compiled_table(table)
+    assert DecisionTableService.get_compiled_table(table) is compiled
+    assert DecisionTableService.execute_table(table, {'grade': 'A'})['output'] == {'decision': ['OK'], 'limit': []}
+    
+    table.hit_policy = 'FIRST'
+    db.session.commit()
+    
+    assert DecisionTableService.get_compiled_table(table) is not compiled
+    assert DecisionTableService.execute_table(table, {'grade': 'A'})['output'] == {'decision': 'OK'}
+
+
+def test_compiled_table_is_recompiled_when_a_rule_changes(db):
+    table = DecisionTable(
+        name='rules', hit_policy='FIRST',
+        conditions=json.dumps(CONDITION_COLUMNS), actions=json.dumps(ACTION_COLUMNS)
+    )
+    rule = DecisionTableRule(rule_number=1, conditions=json.dumps({'grade': 'A'}), actions=json.dumps({'decision': 'A'}))
+    table.rules = [rule]
+    db.session.add(table)
+    db.session.commit()
+    
+    assert DecisionTableService.execute_table(table, {'grade': 'A'})['output'] == {'decision': 'A'}
+    
+    rule.actions = json.dumps({'decision': 'B'})
+    db.session.commit()
+    
+    assert DecisionTableService.execute_table(table, {'grade': 'A'})['output'] == {'decision': 'B'}
+    
+    db.session.delete(rule)
+    table.rules.append(DecisionTableRule(rule_number=1, conditions=json.dumps({'grade': 'A'}), actions=json.dumps({'decision': 'C'})))
+    db.session.commit()
+    
+    assert DecisionTableService.execute_table(table, {'grade': 'A'})['output'] == {'decision': 'C'}
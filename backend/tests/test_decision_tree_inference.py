@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.services.decision_tree_service import DecisionTreeService, UNKNOWN_LABEL
+
+
+FEATURES = ['income', 'debt_ratio', 'age']
+
+
+def flatten(tree_dict, parent_id=None):
+    node = SimpleNamespace(
+        node_id=tree_dict['node_id'],
+        parent_id=parent_id,
+        is_leaf=tree_dict['is_leaf'],
+        class_label=tree_dict.get('class_label'),
+        feature=tree_dict.get('feature'),
+        threshold=tree_dict.get('threshold')
+    )
+    children = [tree_dict[side] for side in ('left', 'right') if side in tree_dict]
+    return [node] + [n for child in children for n in flatten(child, tree_dict['node_id'])]
+
+
+@pytest.fixture(scope='module')
+def trained():
+    rng = np.random.default_rng(3)
+    X = np.column_stack([
+        rng.uniform(1000, 9000, size=600),
+        rng.uniform(0, 1, size=600),
+        rng.integers(20, 70, size=600).astype(np.float64)
+    ])
+    y = np.where(X[:, 0] * (1 - X[:, 1]) > 3000, 'approve', np.where(X[:, 2] > 50, 'review', 'reject'))
+    
+    tree_dict = DecisionTreeService.build_tree(X, y, FEATURES, max_depth=6)
+    return tree_dict, DecisionTreeService.compile_tree(flatten(tree_dict)), X
+
+
+def test_compiled_tree_matches_recursive_predict(trained):
+    tree_dict, compiled, X = trained
+    samples = [dict(zip(FEATURES, row)) for row in X[:300]]
+    
+    expected = [DecisionTreeService.predict(tree_dict, sample) for sample in samples]
+    
+    assert [DecisionTreeService.predict_compiled(compiled, sample) for sample in samples] == expected
+    assert DecisionTreeService.predict_batch(compiled, samples) == expected
+    assert DecisionTreeService.predict_batch(compiled, X[:300][:, [FEATURES.index(f) for f in compiled['features']]]) == expected
+
+
+def test_missing_and_invalid_values_are_unknown(trained):
+    _, compiled, _ = trained
+    samples = [{}, {'income': None, 'debt_ratio': 0.1, 'age': 30}, {'income': 'n/a', 'debt_ratio': 0.1, 'age': 30}]
+    
+    assert DecisionTreeService.predict_batch(compiled, samples) == [UNKNOWN_LABEL] * 3
+    assert [DecisionTreeService.predict_compiled(compiled, sample) for sample in samples] == [UNKNOWN_LABEL] * 3
+    assert DecisionTreeService.predict_compiled(compiled, {'income': float('nan'), 'debt_ratio': 0.1, 'age': 30}) == UNKNOWN_LABEL
+
+
+def test_numeric_strings_match_batch_prediction(trained):
+    tree_dict, compiled, X = trained
+    samples = [{name: str(value) for name, value in zip(FEATURES, row)} for row in X[:100]]
+    
+    expected = [DecisionTreeService.predict(tree_dict, dict(zip(FEATURES, row))) for row in X[:100]]
+    
+    assert [DecisionTreeService.predict_compiled(compiled, sample) for sample in samples] == expected
+    assert DecisionTreeService.predict_batch(compiled, samples) == expected
+
+
+def test_categorical_encodings_are_applied():
+    nodes = [
+        SimpleNamespace(node_id='0', parent_id=None, is_leaf=False, class_label=None, feature='grade', threshold=0.5),
+        SimpleNamespace(node_id='0-L', parent_id='0', is_leaf=True, class_label='prime', feature=None, threshold=None),
+        SimpleNamespace(node_id='0-R', parent_id='0', is_leaf=True, class_label='subprime', feature=None, threshold=None)
+    ]
+    compiled = DecisionTreeService.compile_tree(nodes, {'grade': ['A', 'B', 'C']})
+    samples = [{'grade': 'A'}, {'grade': ' C '}, {'grade': 'Z'}]
+    
+    assert DecisionTreeService.predict_batch(compiled, samples) == ['prime', 'subprime', UNKNOWN_LABEL]
+    assert [DecisionTreeService.predict_compiled(compiled, s) for s in samples] == ['prime', 'subprime', UNKNOWN_LABEL]
+
+
+def test_train_and_predict_endpoints(client):
+    tree_id = client.post('/api/decision-tree', json={'name': 'credit', 'target_variable': 'label'}).json['id']
+    rows = [{'income': income, 'label': 'good' if income > 5000 else 'bad'} for income in range(1000, 9000, 250)]
+    
+    response = client.post(f'/api/decision-tree/{tree_id}/train', json={'training_data': rows, 'features': ['income']})
+    assert response.status_code == 200
+    assert response.json['accuracy'] == 1.0
+    
+    assert client.post(f'/api/decision-tree/{tree_id}/predict', json={'input': {'income': 7000}}).json['prediction'] == 'good'
+    response = client.post(f'/api/decision-tree/{tree_id}/predict-batch', json={'inputs': [{'income': 2000}, {'income': 8000}, {}]})
+    assert response.json['predictions'] == ['bad', 'good', UNKNOWN_LABEL]
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from backend.services.decision_tree_service import DecisionTreeService
+
+
+def naive_best_split(X, y, feature_idx, algorithm):
+    # the original scan: re-partition and re-count for every candidate threshold
+    best_gain, best_threshold = -1, None
+    values = sorted(set(X[:, feature_idx]))
+    
+    for i in range(len(values) - 1):
+        threshold = (values[i] + values[i + 1]) / 2
+        left_mask = X[:, feature_idx] <= threshold
+        gain = DecisionTreeService.calculate_information_gain(y, y[left_mask], y[~left_mask], algorithm)
+        if gain > best_gain:
+            best_gain, best_threshold = gain, threshold
+    
+    return best_threshold, best_gain
+
+
+def split_gain(X, y, feature_idx, threshold, algorithm):
+    left_mask = X[:, feature_idx] <= threshold
+    return DecisionTreeService.calculate_information_gain(y, y[left_mask], y[~left_mask], algorithm)
+
+
+@pytest.mark.parametrize('algorithm', ['gini', 'entropy'])
+@pytest.mark.parametrize('seed', range(10))
+def test_sorted_sweep_matches_naive_scan(algorithm, seed):
+    rng = np.random.default_rng(seed)
+    n_samples = int(rng.integers(2, 300))
+    # few distinct values forces ties and duplicate thresholds
+    X = np.column_stack([
+        rng.normal(size=n_samples),
+        rng.integers(0, 5, size=n_samples).astype(np.float64),
+        np.round(rng.uniform(0, 3, size=n_samples), 1)
+    ])
+    y = rng.choice(np.array(['good', 'bad', 'review']), size=n_samples, p=[0.5, 0.3, 0.2])
+    
+    for feature_idx in range(X.shape[1]):
+        threshold, gain = DecisionTreeService.find_best_split(X, y, feature_idx, algorithm)
+        expected_threshold, expected_gain = naive_best_split(X, y, feature_idx, algorithm)
+        
+        if expected_threshold is None:
+            assert threshold is None
+            continue
+        
+        assert gain == pytest.approx(expected_gain, abs=1e-9)
+        # equal-gain thresholds may differ only in float noise, so compare the gain they produce
+        assert split_gain(X, y, feature_idx, threshold, algorithm) == pytest.approx(expected_gain, abs=1e-9)
+
+
+def test_constant_feature_has_no_split():
+    X = np.ones((10, 1))
+    y = np.array(['a', 'b'] * 5)
+    
+    assert DecisionTreeService.find_best_split(X, y, 0) == (None, -1)
+    assert DecisionTreeService.find_best_split(X[:1], y[:1], 0) == (None, -1)
+
+
+def test_build_tree_separates_threshold_classes():
+    X = np.array([[1.0], [2.0], [3.0], [10.0], [11.0], [12.0]])
+    y = np.array(['low', 'low', 'low', 'high', 'high', 'high'])
+    
+    tree = DecisionTreeService.build_tree(X, y, ['amount'], max_depth=3)
+    
+    assert tree['feature'] == 'amount'
+    assert tree['threshold'] == 6.5
+    assert tree['left']['class_label'] == 'low' and tree['left']['is_leaf']
+    assert tree['right']['class_label'] == 'high' and tree['right']['is_leaf']
@@ -0,0 +1,116 @@
+import socket
+
+import pytest
+
+from backend.models.deployed_api import DeployedAPI
+from backend.models.execution_job import ExecutionJob
+from backend.services import execution_job_service
+from backend.services.execution_job_service import ExecutionJobService
+
+
+def fake_resolver(mapping):
+    def getaddrinfo(host, port, *args, **kwargs):
+        if host not in mapping:
+            raise socket.gaierror(f'unknown host {host}')
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (address, port)) for address in mapping[host]]
+    return getaddrinfo
+
+
+@pytest.mark.parametrize('url', [
+    'http://127.0.0.1/hook',
+    'http://169.254.169.254/latest/meta-data/',
+    'http://10.0.0.5/hook',
+    'http://192.168.1.10:8080/hook',
+    'http://[::1]/hook',
+    'http://[::ffff:127.0.0.1]/hook',
+    'http://0.0.0.0/hook',
+    'http://localhost/hook'
+])
+def test_rejects_internal_callback_targets(url):
+    assert ExecutionJobService.validate_callback_url(url) is not None
+
+
+@pytest.mark.parametrize('url', ['ftp://example.com/hook', '/relative/hook', 'http:///hook'])
+def test_rejects_non_http_callback_urls(url):
+    assert ExecutionJobService.validate_callback_url(url) == 'callback_url must be an absolute http(s) URL'
+
+
+def test_rejects_hosts_resolving_to_private_addresses(monkeypatch):
+    monkeypatch.setattr(socket, 'getaddrinfo', fake_resolver({
+        'hooks.example.com': ['93.184.216.34'],
+        'internal.example.com': ['93.184.216.34', '10.1.2.3']
+    }))
+    
+    assert ExecutionJobService.validate_callback_url('https://hooks.example.com/done') is None
+    assert ExecutionJobService.validate_callback_url('https://internal.example.com/done') is not None
+    assert ExecutionJobService.validate_callback_url('https://missing.example.com/done') is not None
+
+
+def test_allowlist_restricts_callback_hosts():
+    allowed = ['partner.example.com']
+    
+    assert ExecutionJobService.validate_callback_url('https://partner.example.com/hook', allowed) is None
+    assert ExecutionJobService.validate_callback_url('https://api.partner.example.com/hook', allowed) is None
+    assert ExecutionJobService.validate_callback_url('https://evilpartner.example.com/hook', allowed) is not None
+    assert ExecutionJobService.validate_callback_url('http://127.0.0.1/hook', allowed) is not None
+
+
+@pytest.fixture
+def queued_job(db, make_workflow):
+    workflow = make_workflow([('start', 'start', {}), ('end', 'end', {})], [('start', 'end')])
+    deployment = DeployedAPI(workflow_id=workflow.id, api_name='callback', api_path='/api/execute/callback', status='active')
+    db.session.add(deployment)
+    db.session.commit()
+    
+    job = ExecutionJob(
+        instance_id='PI-CALLBACK',
+        deployed_api_id=deployment.id,
+        workflow_id=workflow.id,
+        status='PENDING',
+        input_data='{}',
+        callback_url='https://hooks.example.com/done'
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def test_run_job_hands_callback_to_callback_pool(app, db, queued_job, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(execution_job_service.callback_pool, 'submit', lambda app, func, *args: submitted.append((func, args)) or True)
+    
+    ExecutionJobService.run_job(app, queued_job.id, db)
+    
+    db.session.expire_all()
+    job = db.session.get(ExecutionJob, queued_job.id)
+    assert job.status == 'COMPLETED'
+    assert job.callback_status == 'PENDING'
+    assert job.callback_attempts == 0
+    assert [func for func, _ in submitted] == [ExecutionJobService.deliver_callback]
+
+
+def test_callback_is_rejected_when_host_turns_private(app, db, queued_job, monkeypatch):
+    posted = []
+    monkeypatch.setattr(socket, 'getaddrinfo', fake_resolver({'hooks.example.com': ['127.0.0.1']}))
+    monkeypatch.setattr(ExecutionJobService, 'post_callback', lambda url, payload, timeout: posted.append(url))
+    
+    ExecutionJobService.deliver_callback(app, queued_job.id, db)
+    
+    db.session.expire_all()
+    job = db.session.get(ExecutionJob, queued_job.id)
+    assert posted == []
+    assert job.callback_status == 'REJECTED'
+
+
+def test_callback_delivery_to_public_host(app, db, queued_job, monkeypatch):
+    posted = []
+    monkeypatch.setattr(socket, 'getaddrinfo', fake_resolver({'hooks.example.com': ['93.184.216.34']}))
+    monkeypatch.setattr(ExecutionJobService, 'post_callback', lambda url, payload, timeout: posted.append(url) or 200)
+    
+    ExecutionJobService.deliver_callback(app, queued_job.id, db)
+    
+    db.session.expire_all()
+    job = db.session.get(ExecutionJob, queued_job.id)
+    assert posted == ['https://hooks.example.com/done']
+    assert job.callback_status == 'DELIVERED'
+    assert job.callback_attempts == 1
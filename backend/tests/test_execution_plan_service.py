@@ -0,0 +1,69 @@
+from backend.services import workflow_service, process_instance_service
+from backend.services.execution_plan_service import ExecutionPlanService
+from backend.services.process_instance_service import ProcessInstanceService
+from backend.services.workflow_service import WorkflowService
+
+
+LINEAR_NODES = [
+    ('start', 'start', {}),
+    ('review', 'serviceTask', {'service': 'review'}),
+    ('end', 'end', {})
+]
+LINEAR_EDGES = [('start', 'review'), ('review', 'end')]
+
+
+def test_services_share_one_plan_cache():
+    # a second import path would load the module twice with a cache that is never invalidated
+    assert workflow_service.ExecutionPlanService is process_instance_service.ExecutionPlanService
+
+
+def test_plan_is_compiled_once_per_version(db, make_workflow):
+    workflow = make_workflow(LINEAR_NODES, LINEAR_EDGES)
+    
+    plan = ExecutionPlanService.get_plan(workflow.id, db)
+    
+    assert ExecutionPlanService.get_plan(workflow.id, db) is plan
+    assert plan.start_node.node_id == 'start'
+    assert plan.get_node('review').config == {'service': 'review'}
+    assert [edge.target for edge in plan.next_edges('start')] == ['review']
+
+
+def test_update_invalidates_plan(db, make_workflow):
+    workflow = make_workflow(LINEAR_NODES, LINEAR_EDGES)
+    plan = ExecutionPlanService.get_plan(workflow.id, db)
+    
+    WorkflowService().update_workflow(workflow.id, {
+        'nodes': [{'node_id': 'start', 'node_type': 'start'}, {'node_id': 'end', 'node_type': 'end'}],
+        'edges': [{'edge_id': 'edge-0', 'source': 'start', 'target': 'end'}]
+    })
+    updated = ExecutionPlanService.get_plan(workflow.id, db)
+    
+    assert updated is not plan
+    assert updated.get_node('review') is None
+    assert [edge.target for edge in updated.next_edges('start')] == ['end']
+
+
+def test_conditions_are_precompiled(db, make_workflow):
+    workflow = make_workflow(
+        [('start', 'start', {}), ('check', 'gateway', {'condition': 'amount > 10'}), ('end', 'end', {})],
+        [('start', 'check'), ('check', 'end', {'condition': 'amount > 10'})]
+    )
+    plan = ExecutionPlanService.get_plan(workflow.id, db)
+    
+    assert plan.get_node('check').condition({'amount': 11}) is True
+    assert plan.next_edges('check')[0].condition({'amount': 5}) is False
+
+
+def test_execute_workflow_as_process_walks_plan(db, make_workflow):
+    workflow = make_workflow(LINEAR_NODES, LINEAR_EDGES)
+    
+    result = ProcessInstanceService.execute_workflow_as_process(workflow.id, {'amount': 5}, db)
+    
+    assert result['success'] is True
+    assert result['result']['service_executed'] == 'review'
+    assert result['result']['amount'] == 5
+
+
+def test_missing_workflow(db):
+    assert ExecutionPlanService.get_plan(999, db) is None
+    assert ProcessInstanceService.execute_workflow_as_process(999, {}, db)['success'] is False
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from backend.services.expression_service import ExpressionService, ExpressionError, MAX_SEQUENCE_LENGTH
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ('amount > 1000 and grade in ["A", "B"]', True),
+    ('1 < amount <= 5000', True),
+    ('max(amount, 9000) - min(1, 2)', 8999),
+    ('"high" if amount >= 5000 else "low"', 'low'),
+    ('grade * 3', 'AAA'),
+    ('2 ** 10', 1024),
+])
+def test_evaluate(expression, expected):
+    assert ExpressionService.evaluate(expression, {'amount': 1500, 'grade': 'A'}) == expected
+
+
+@pytest.mark.parametrize('expression', [
+    '().__class__',
+    'amount.__class__.__bases__',
+    '"".__class__.__mro__[1].__subclasses__()',
+    '(lambda: 1)()',
+    'lambda x: x',
+    '[x for x in range(3)]',
+    '{x: 1 for x in [1]}',
+    'sum(x for x in [1, 2])',
+    '__import__("os")',
+    'open("/etc/passwd")',
+    'getattr(amount, "real")',
+    'eval("1")',
+    'amount.real',
+    '(y := 1)',
+    'f"{amount}"',
+    '[1, 2][0:1]',
+])
+def test_rejects_unsafe_syntax(expression):
+    with pytest.raises(ExpressionError):
+        ExpressionService.compile(expression)
+
+
+@pytest.mark.parametrize('action', [
+    'import os',
+    'amount.value = 1',
+    'del amount',
+    'for i in [1]: pass',
+    'def f(): pass',
+])
+def test_rejects_unsafe_statements(action):
+    with pytest.raises(ExpressionError):
+        ExpressionService.compile_action(action)
+
+
+@pytest.mark.parametrize('expression', [
+    '9 ** 9 ** 9',
+    '2 ** 101',
+    '((10 ** 99) ** 99) ** 99',
+    '"a" * 10 ** 9',
+    '10 ** 9 * [0]',
+    '("a" * 100000) + "a"',
+    '(10 ** 90) ** 50 * (10 ** 90) ** 50',
+    '"%0999999999d" % 1',
+    'sum([[1] * 100000] * 300, [])',
+    'sum(["a" * 100000] * 300, "")',
+    'str([[1] * 100000] * 300)',
+    '[[1] * 100000] * 300',
+    '[["a" * 50000, "b" * 50000]] + [[1]]',
+])
+def test_rejects_oversized_results(expression):
+    with pytest.raises(ExpressionError):
+        ExpressionService.evaluate(expression, {})
+
+
+def test_rejects_doubling_in_actions():
+    action = 'text = "a" * 1000\n' + 'text += text\n' * 40
+    
+    with pytest.raises(ExpressionError):
+        ExpressionService.execute(action, {})
+
+
+def test_allows_results_within_limits():
+    assert len(ExpressionService.evaluate('"a" * limit', {'limit': MAX_SEQUENCE_LENGTH})) == MAX_SEQUENCE_LENGTH
+    assert ExpressionService.evaluate('7 % 3', {}) == 1
+    assert ExpressionService.evaluate('sum([1, 2, 3.5])', {}) == 6.5
+    assert ExpressionService.evaluate('str([1, [2, 3]])', {}) == '[1, [2, 3]]'
+    assert ExpressionService.evaluate('[[0] * 10] * 10', {}) == [[0] * 10] * 10
+
+
+def test_execute_assigns_without_touching_context():
+    context = {'score': 10}
+    assigned = ExpressionService.execute('score += 5\nbonus = score * 2', context)
+    
+    assert assigned == {'score': 15, 'bonus': 30}
+    assert context == {'score': 10}
+
+
+def test_names_are_not_leaked_from_builtins():
+    with pytest.raises(ExpressionError):
+        ExpressionService.evaluate('undefined_name + 1', {})
+
+
+def test_vectorized_matches_row_evaluation():
+    columns = {'amount': np.array([100, 2000, 7000]), 'grade': np.array(['A', 'C', 'B'])}
+    expression = 'amount > 1000 and grade in ["A", "B"]'
+    
+    vector = ExpressionService.evaluate_vectorized(expression, columns)
+    rows = [
+        ExpressionService.evaluate(expression, {'amount': int(amount), 'grade': str(grade)})
+        for amount, grade in zip(columns['amount'], columns['grade'])
+    ]
+    
+    assert vector.tolist() == rows
@@ -0,0 +1,125 @@
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.models.human_task import HumanTask
+from backend.models.task_candidate import TaskCandidate
+from backend.services.human_task_service import HumanTaskService, INBOX_STATUSES
+
+
+USERS = ['kim', 'lee', 'park', 'choi']
+GROUPS = ['underwriting', 'risk', 'audit']
+
+
+def add_task(db, task_id, candidate_users=(), candidate_groups=(), assignee=None, status='READY', priority=0, age=0):
+    task = HumanTask(
+        process_instance_id='PI-TASKS',
+        task_id=task_id,
+        name=task_id,
+        status=status,
+        priority=priority,
+        assignee=assignee,
+        candidate_users=json.dumps(list(candidate_users)),
+        candidate_groups=json.dumps(list(candidate_groups)),
+        created_at=datetime(2026, 1, 1) + timedelta(minutes=age)
+    )
+    db.session.add(task)
+    db.session.flush()
+    HumanTaskService.sync_candidates(task, db)
+    db.session.commit()
+    return task
+
+
+def naive_inbox(db, user_id, status=None, groups=()):
+    # direct scan over human_task, as the inbox worked before the candidate table
+    statuses = [status] if status else list(INBOX_STATUSES)
+    tasks = [
+        task for task in db.session.query(HumanTask)
+        if task.status in statuses and (
+            task.assignee == user_id
+            or user_id in json.loads(task.candidate_users or '[]')
+            or set(groups) & set(json.loads(task.candidate_groups or '[]'))
+        )
+    ]
+    return [task.task_id for task in sorted(tasks, key=lambda t: (-t.priority, t.created_at))]
+
+
+def inbox(db, user_id, status=None, groups=()):
+    return [task['task_id'] for task in HumanTaskService.get_tasks_for_user(user_id, status, db, groups=list(groups))]
+
+
+@pytest.fixture
+def random_tasks(db):
+    rng = random.Random(11)
+    # distinct creation times keep the inbox order fully determined
+    ages = rng.sample(range(1000), 120)
+    for index in range(120):
+        add_task(
+            db, f'TASK-{index}',
+            candidate_users=rng.sample(USERS, rng.randint(0, 2)),
+            candidate_groups=rng.sample(GROUPS, rng.randint(0, 2)),
+            assignee=rng.choice([None, None, *USERS]),
+            status=rng.choice(['READY', 'RESERVED', 'COMPLETED']),
+            priority=rng.randint(0, 3),
+            age=ages[index]
+        )
+
+
+@pytest.mark.parametrize('user_id, groups', [('kim', ()), ('lee', ('risk',)), ('park', ('underwriting', 'audit')), ('nobody', ('risk',))])
+@pytest.mark.parametrize('status', [None, 'READY', 'RESERVED'])
+def test_inbox_matches_direct_scan(db, random_tasks, user_id, groups, status):
+    assert inbox(db, user_id, status, groups) == naive_inbox(db, user_id, status, groups)
+
+
+def test_task_lifecycle_keeps_candidates_in_sync(db):
+    add_task(db, 'TASK-1', candidate_users=['kim', 'lee'], candidate_groups=['risk'])
+    
+    assert inbox(db, 'kim') == ['TASK-1']
+    assert inbox(db, 'choi', groups=['risk']) == ['TASK-1']
+    
+    assert HumanTaskService.claim_task('TASK-1', 'kim', db)['success'] is True
+    assert inbox(db, 'kim', 'RESERVED') == ['TASK-1']
+    assert inbox(db, 'lee', 'READY') == []
+    
+    assert HumanTaskService.delegate_task('TASK-1', 'kim', 'park', db)['success'] is True
+    assert inbox(db, 'park') == ['TASK-1']
+    assert inbox(db, 'kim') == ['TASK-1']  # still a candidate user
+    
+    assert HumanTaskService.release_task('TASK-1', 'park', db)['success'] is True
+    assert inbox(db, 'park') == []
+    assert inbox(db, 'lee', 'READY') == ['TASK-1']
+    
+    HumanTaskService.claim_task('TASK-1', 'lee', db)
+    assert HumanTaskService.complete_task('TASK-1', 'lee', {'approved': True}, db)['success'] is True
+    assert inbox(db, 'lee') == []
+    assert inbox(db, 'lee', 'COMPLETED') == ['TASK-1']
+
+
+def test_claim_by_group_member_not_in_candidate_users(db):
+    add_task(db, 'TASK-1', candidate_users=['kim'], candidate_groups=['risk'])
+    
+    assert HumanTaskService.claim_task('TASK-1', 'choi', db)['success'] is False
+    assert HumanTaskService.claim_task('TASK-1', 'choi', db, groups=['risk'])['success'] is True
+    assert inbox(db, 'choi', 'RESERVED') == ['TASK-1']
+
+
+def test_rebuild_restores_missing_candidate_rows(db, random_tasks):
+    expected = {user: inbox(db, user, groups=GROUPS[:1]) for user in USERS}
+    db.session.query(TaskCandidate).delete()
+    db.session.commit()
+    
+    assert all(inbox(db, user) == [] for user in USERS)
+    
+    result = HumanTaskService.rebuild_candidates(db, batch_size=7)
+    
+    assert result == {'success': True, 'tasks': 120}
+    assert {user: inbox(db, user, groups=GROUPS[:1]) for user in USERS} == expected
+
+
+def test_duplicate_candidates_are_stored_once(db):
+    task = add_task(db, 'TASK-1', candidate_users=['kim', 'kim', ' kim '], candidate_groups=['risk', 'risk'])
+    
+    rows = db.session.query(TaskCandidate.candidate_type, TaskCandidate.candidate_id).filter_by(task_id=task.id).all()
+    assert sorted(rows) == [('GROUP', 'risk'), ('USER', 'kim')]
@@ -0,0 +1,131 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import inspect
+
+from backend.app import create_app
+from backend.config import TestingConfig
+from backend.database import db
+from backend.models.human_task import HumanTask
+from backend.models.node_instance import NodeInstance
+from backend.models.process_instance import ProcessInstance
+from backend.services.storage_migration_service import StorageMigrationService
+
+
+LEGACY_SCHEMA = '''
+CREATE TABLE process_definition (
+    id INTEGER PRIMARY KEY,
+    process_id VARCHAR(255) NOT NULL UNIQUE,
+    name VARCHAR(255) NOT NULL,
+    status VARCHAR(50)
+);
+CREATE TABLE process_instance (
+    id INTEGER PRIMARY KEY,
+    process_definition_id INTEGER NOT NULL REFERENCES process_definition(id),
+    instance_id VARCHAR(255) NOT NULL UNIQUE,
+    status VARCHAR(50)
+);
+CREATE TABLE human_task (
+    id INTEGER PRIMARY KEY,
+    process_instance_id INTEGER NOT NULL REFERENCES process_instance(id),
+    task_id VARCHAR(255) NOT NULL UNIQUE,
+    name VARCHAR(255) NOT NULL,
+    status VARCHAR(50),
+    priority INTEGER,
+    assignee VARCHAR(100)
+);
+CREATE INDEX idx_human_task_status_assignee ON human_task(status, assignee);
+CREATE TABLE node_instance (
+    id INTEGER PRIMARY KEY,
+    process_instance_id INTEGER NOT NULL REFERENCES process_instance(id),
+    node_id VARCHAR(255) NOT NULL,
+    node_type VARCHAR(50) NOT NULL,
+    status VARCHAR(50)
+);
+CREATE TABLE task_candidate (
+    id INTEGER PRIMARY KEY,
+    task_id INTEGER NOT NULL REFERENCES human_task(id),
+    candidate_type VARCHAR(20) NOT NULL,
+    candidate_id VARCHAR(100) NOT NULL,
+    status VARCHAR(50),
+    priority INTEGER
+);
+INSERT INTO process_definition (id, process_id, name, status) VALUES (1, 'loan', 'Loan', 'deployed');
+INSERT INTO process_instance (id, process_definition_id, instance_id, status) VALUES (7, 1, 'PI-SEVEN', 'RUNNING');
+INSERT INTO human_task (id, process_instance_id, task_id, name, status, priority)
+VALUES (1, 7, 'TASK-1', 'Review', 'READY', 0), (2, 'PI-DIRECT', 'TASK-2', 'Approve', 'READY', 0);
+INSERT INTO node_instance (id, process_instance_id, node_id, node_type, status)
+VALUES (1, 7, 'start', 'start', 'COMPLETED'), (2, 'PI-DIRECT', 'start', 'start', 'COMPLETED');
+INSERT INTO task_candidate (id, task_id, candidate_type, candidate_id, status, priority)
+VALUES (1, 1, 'user', 'kim', 'READY', 0);
+'''
+
+
+@pytest.fixture
+def legacy_path(tmp_path):
+    path = tmp_path / 'legacy.db'
+    connection = sqlite3.connect(path)
+    connection.executescript(LEGACY_SCHEMA)
+    connection.close()
+    return path
+
+
+def open_app(path):
+    class LegacyConfig(TestingConfig):
+        DATABASE_PATH = str(path)
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+    
+    return create_app(LegacyConfig)
+
+
+def instance_references(model):
+    return dict(db.session.query(model.id, model.process_instance_id))
+
+
+def test_startup_converts_integer_instance_references(legacy_path):
+    app = open_app(legacy_path)
+    
+    with app.app_context():
+        inspector = inspect(db.engine)
+        for table in ('human_task', 'node_instance'):
+            column = next(c for c in inspector.get_columns(table) if c['name'] == 'process_instance_id')
+            assert 'CHAR' in str(column['type']).upper()
+            assert inspector.get_foreign_keys(table) == []
+        
+        assert instance_references(HumanTask) == {1: 'PI-SEVEN', 2: 'PI-DIRECT'}
+        assert instance_references(NodeInstance) == {1: 'PI-SEVEN', 2: 'PI-DIRECT'}
+        
+        instance = db.session.query(ProcessInstance).filter_by(instance_id='PI-SEVEN').one()
+        assert [task.task_id for task in instance.tasks] == ['TASK-1']
+        
+        # other tables keep pointing at the rebuilt table, not the renamed copy
+        candidate_fk = inspector.get_foreign_keys('task_candidate')[0]
+        assert candidate_fk['referred_table'] == 'human_task'
+        assert 'human_task__old' not in inspector.get_table_names()
+        assert 'idx_human_task_status_assignee' in {index['name'] for index in inspector.get_indexes('human_task')}
+        
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_second_startup_leaves_converted_tables_alone(legacy_path):
+    for _ in range(2):
+        app = open_app(legacy_path)
+        with app.app_context():
+            assert instance_references(HumanTask) == {1: 'PI-SEVEN', 2: 'PI-DIRECT'}
+            db.session.remove()
+            db.engine.dispose()
+
+
+def test_storage_migration_converts_integer_instance_references(legacy_path, tmp_path):
+    target = tmp_path / 'target.db'
+    
+    result = StorageMigrationService.migrate(db.metadata, str(legacy_path), str(target))
+    
+    assert result['success'] is True
+    connection = sqlite3.connect(target)
+    try:
+        assert dict(connection.execute('SELECT id, process_instance_id FROM human_task')) == {1: 'PI-SEVEN', 2: 'PI-DIRECT'}
+        assert dict(connection.execute('SELECT id, process_instance_id FROM node_instance')) == {1: 'PI-SEVEN', 2: 'PI-DIRECT'}
+    finally:
+        connection.close()
@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+import pytest
+
+from backend.models.node_instance import NodeInstance
+from backend.services.node_instance_recorder import (
+    NodeInstanceRecorder, write_behind_queue,
+    PERSISTENCE_IMMEDIATE, PERSISTENCE_BATCH, PERSISTENCE_ASYNC
+)
+from backend.services.process_instance_service import ProcessInstanceService
+
+
+def make_node(node_id, node_type='serviceTask'):
+    return SimpleNamespace(node_id=node_id, label=node_id, type=node_type)
+
+
+def stored(db, instance_id):
+    return (
+        db.session.query(NodeInstance)
+        .filter_by(process_instance_id=instance_id)
+        .order_by(NodeInstance.id)
+        .all()
+    )
+
+
+def test_batch_mode_writes_once_on_flush(db):
+    recorder = NodeInstanceRecorder('PI-BATCH', db, PERSISTENCE_BATCH)
+    
+    for node_id in ('a', 'b'):
+        record = recorder.start(make_node(node_id), {'amount': 1})
+        recorder.finish(record, 'COMPLETED')
+    
+    assert stored(db, 'PI-BATCH') == []
+    
+    recorder.flush()
+    recorder.flush()
+    
+    rows = stored(db, 'PI-BATCH')
+    assert [(row.node_id, row.status) for row in rows] == [('a', 'COMPLETED'), ('b', 'COMPLETED')]
+    assert rows[0].completion_time is not None
+    assert rows[0].to_dict()['variables'] == {'amount': 1}
+
+
+def test_immediate_mode_writes_each_transition(db):
+    recorder = NodeInstanceRecorder('PI-IMMEDIATE', db, PERSISTENCE_IMMEDIATE)
+    
+    record = recorder.start(make_node('a'), {})
+    assert [row.status for row in stored(db, 'PI-IMMEDIATE')] == ['ACTIVE']
+    
+    recorder.finish(record, 'FAILED', 'boom')
+    db.session.expire_all()
+    
+    row = stored(db, 'PI-IMMEDIATE')[0]
+    assert row.id == record['id']
+    assert (row.status, row.error_message) == ('FAILED', 'boom')
+
+
+def test_async_mode_writes_behind(db):
+    recorder = NodeInstanceRecorder('PI-ASYNC', db, PERSISTENCE_ASYNC)
+    
+    for node_id in ('a', 'b', 'c'):
+        recorder.finish(recorder.start(make_node(node_id), {}), 'COMPLETED')
+    recorder.flush()
+    
+    assert write_behind_queue.drain(timeout=5)
+    assert write_behind_queue.failed_batches == 0
+    assert [row.node_id for row in stored(db, 'PI-ASYNC')] == ['a', 'b', 'c']
+
+
+def test_unknown_mode_is_rejected(db):
+    with pytest.raises(ValueError):
+        NodeInstanceRecorder('PI-X', db, 'sometimes')
+
+
+@pytest.mark.parametrize('mode', [PERSISTENCE_IMMEDIATE, PERSISTENCE_BATCH, PERSISTENCE_ASYNC])
+def test_persistence_modes_record_the_same_path(db, make_workflow, mode):
+    workflow = make_workflow(
+        [('start', 'start', {}), ('task', 'serviceTask', {'service': 'x'}), ('end', 'end', {})],
+        [('start', 'task'), ('task', 'end')]
+    )
+    
+    result = ProcessInstanceService.execute_workflow_as_process(workflow.id, {}, db, persistence=mode)
+    write_behind_queue.drain(timeout=5)
+    
+    rows = stored(db, result['instance_id'])
+    assert [(row.node_id, row.status) for row in rows] == [
+        ('start', 'COMPLETED'), ('task', 'COMPLETED'), ('end', 'COMPLETED')
+    ]
@@ -0,0 +1,123 @@
+import pytest
+
+from backend.models.node_instance import NodeInstance
+from backend.services.execution_plan_service import ExecutionPlanService
+from backend.services.process_instance_service import ProcessInstanceService
+
+
+def executed_nodes(db, instance_id):
+    return sorted(
+        node_id for (node_id,) in
+        db.session.query(NodeInstance.node_id).filter_by(process_instance_id=instance_id)
+    )
+
+
+@pytest.fixture
+def labelled_gateway(make_workflow):
+    return make_workflow(
+        [
+            ('start', 'start', {}),
+            ('check', 'gateway', {'condition': 'credit_score >= 700'}),
+            ('approved', 'end', {}),
+            ('rejected', 'end', {})
+        ],
+        [
+            ('start', 'check'),
+            ('check', 'approved', {'label': 'Yes'}),
+            ('check', 'rejected', {'label': 'No'})
+        ]
+    )
+
+
+@pytest.mark.parametrize('score, expected', [(720, 'approved'), (650, 'rejected')])
+def test_exclusive_gateway_follows_gateway_result(db, labelled_gateway, score, expected):
+    result = ProcessInstanceService.execute_workflow_as_process(labelled_gateway.id, {'credit_score': score}, db)
+    
+    assert result['success'] is True
+    assert result['result']['gateway_result'] is (score >= 700)
+    assert executed_nodes(db, result['instance_id']) == sorted(['start', 'check', expected])
+
+
+def test_exclusive_gateway_takes_first_matching_condition(db, make_workflow):
+    workflow = make_workflow(
+        [
+            ('start', 'start', {}),
+            ('route', 'gateway', {}),
+            ('prime', 'serviceTask', {'service': 'prime'}),
+            ('near', 'serviceTask', {'service': 'near'}),
+            ('manual', 'serviceTask', {'service': 'manual'}),
+            ('end', 'end', {})
+        ],
+        [
+            ('start', 'route'),
+            ('route', 'prime', {'condition': 'credit_score >= 800'}),
+            ('route', 'near', {'condition': 'credit_score >= 700'}),
+            ('route', 'manual'),
+            ('prime', 'end'), ('near', 'end'), ('manual', 'end')
+        ]
+    )
+    
+    for score, expected in [(850, 'prime'), (750, 'near'), (600, 'manual')]:
+        result = ProcessInstanceService.execute_workflow_as_process(workflow.id, {'credit_score': score}, db)
+        
+        assert result['result']['service_executed'] == expected
+        assert executed_nodes(db, result['instance_id']) == sorted(['start', 'route', expected, 'end'])
+
+
+def test_exclusive_gateway_without_matching_flow_fails(db, make_workflow):
+    workflow = make_workflow(
+        [('start', 'start', {}), ('route', 'gateway', {}), ('end', 'end', {})],
+        [('start', 'route'), ('route', 'end', {'condition': 'amount > 100'})]
+    )
+    
+    result = ProcessInstanceService.execute_workflow_as_process(workflow.id, {'amount': 5}, db)
+    
+    assert result['success'] is False
+    assert 'route' in result['error']
+
+
+def test_parallel_gateway_runs_every_branch_and_joins_once(db, make_workflow):
+    workflow = make_workflow(
+        [
+            ('start', 'start', {}),
+            ('fork', 'gateway', {'gateway_type': 'parallel'}),
+            ('credit', 'serviceTask', {'service': 'credit'}),
+            ('fraud', 'serviceTask', {'service': 'fraud'}),
+            ('join', 'serviceTask', {'service': 'join'}),
+            ('end', 'end', {})
+        ],
+        [
+            ('start', 'fork'), ('fork', 'credit'), ('fork', 'fraud'),
+            ('credit', 'join'), ('fraud', 'join'), ('join', 'end')
+        ]
+    )
+    
+    result = ProcessInstanceService.execute_workflow_as_process(workflow.id, {}, db)
+    
+    assert result['success'] is True
+    assert result['result']['service_executed'] == 'join'
+    nodes = executed_nodes(db, result['instance_id'])
+    assert nodes == sorted(['start', 'fork', 'credit', 'fraud', 'join', 'end'])
+
+
+def test_only_parallel_gateways_fork(db, make_workflow):
+    workflow = make_workflow(
+        [
+            ('start', 'start', {}),
+            ('task', 'serviceTask', {'service': 'task'}),
+            ('exclusive', 'gateway', {'gateway_type': 'exclusive'}),
+            ('fork', 'parallelGateway', {}),
+            ('a', 'end', {}),
+            ('b', 'end', {})
+        ],
+        [('start', 'task'), ('task', 'a'), ('task', 'b'), ('exclusive', 'a'), ('exclusive', 'b'), ('fork', 'a'), ('fork', 'b')]
+    )
+    plan = ExecutionPlanService.get_plan(workflow.id, db)
+    
+    assert not plan.get_node('task').is_parallel_split
+    assert not plan.get_node('exclusive').is_parallel_split
+    assert plan.get_node('fork').is_parallel_split
+    
+    # a task with two unconditional flows continues on the first one instead of forking
+    result = ProcessInstanceService.execute_workflow_as_process(workflow.id, {}, db)
+    assert executed_nodes(db, result['instance_id']) == ['a', 'start', 'task']
@@ -0,0 +1,115 @@
+import json
+
+import numpy as np
+
+from backend.models.decision_table import DecisionTable, DecisionTableRule
+from backend.models.rule_set import RuleSet, Rule
+from backend.services.rule_cache_service import RuleArtifactCache, rule_artifact_cache
+from backend.services.rule_engine_service import RuleEngineService
+
+
+def test_version_change_is_a_miss():
+    cache = RuleArtifactCache()
+    cache.put('SCORECARD', 1, 'v1', {'compiled': 1})
+    
+    assert cache.get('SCORECARD', 1, 'v1') == {'compiled': 1}
+    assert cache.get('SCORECARD', 1, 'v2') is None
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 1)
+
+
+def test_get_or_compile_compiles_once_per_version():
+    cache = RuleArtifactCache()
+    calls = []
+    
+    def compile_artifact():
+        calls.append(1)
+        return {'artifact': len(calls)}
+    
+    first = cache.get_or_compile('RULE_SET', 1, 'v1', compile_artifact)
+    assert cache.get_or_compile('RULE_SET', 1, 'v1', compile_artifact) is first
+    assert cache.get_or_compile('RULE_SET', 1, 'v2', compile_artifact) == {'artifact': 2}
+    assert len(calls) == 2
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = RuleArtifactCache(max_entries=2)
+    cache.put('T', 1, 'v', [1])
+    cache.put('T', 2, 'v', [2])
+    cache.get('T', 1, 'v')
+    cache.put('T', 3, 'v', [3])
+    
+    assert cache.get('T', 2, 'v') is None
+    assert cache.get('T', 1, 'v') == [1]
+    assert cache.stats()['evictions'] == 1
+    
+    cache = RuleArtifactCache(max_bytes=200000)
+    cache.put('T', 1, 'v', np.zeros(15000))
+    cache.put('T', 2, 'v', np.zeros(15000))
+    
+    assert cache.get('T', 1, 'v') is None
+    assert cache.stats()['bytes'] <= 200000
+    
+    # an artifact larger than the whole budget is returned but never stored
+    assert cache.put('T', 3, 'v', np.zeros(50000)) is not None
+    assert cache.get('T', 3, 'v') is None
+
+
+def test_invalidate_by_type_and_id():
+    cache = RuleArtifactCache()
+    for rule_type, rule_id in [('A', 1), ('A', 2), ('B', 1)]:
+        cache.put(rule_type, rule_id, 'v', [rule_id])
+    
+    cache.invalidate('A', 1)
+    assert cache.get('A', 1, 'v') is None and cache.get('A', 2, 'v') == [2]
+    
+    cache.invalidate('A')
+    assert cache.get('A', 2, 'v') is None and cache.get('B', 1, 'v') == [1]
+    
+    cache.invalidate()
+    assert cache.stats()['entries'] == 0 and cache.stats()['bytes'] == 0
+
+
+def test_rule_set_recompiles_when_a_rule_changes(db):
+    rule_set = RuleSet(name='limits', rule_type='RULE_SET')
+    rule = Rule(name='base', condition='income > 3000', action='limit = income * 2', priority=1)
+    rule_set.rules.append(rule)
+    db.session.add(rule_set)
+    db.session.commit()
+    
+    result = RuleEngineService.execute_rule_set(rule_set.id, {'income': 4000}, db)
+    assert result['final_context']['limit'] == 8000
+    
+    _, compiled = RuleEngineService.load_compiled_rule('RULE_SET', rule_set.id, db)
+    assert RuleEngineService.load_compiled_rule('RULE_SET', rule_set.id, db)[1] is compiled
+    
+    rule.action = 'limit = income * 3'
+    db.session.commit()
+    
+    assert RuleEngineService.execute_rule_set(rule_set.id, {'income': 4000}, db)['final_context']['limit'] == 12000
+    
+    rule_set.rules.append(Rule(name='cap', condition='limit > 10000', action='limit = 10000', priority=0))
+    db.session.commit()
+    
+    assert RuleEngineService.execute_rule_set(rule_set.id, {'income': 4000}, db)['final_context']['limit'] == 10000
+    assert rule_artifact_cache.stats()['entries'] == 1
+
+
+def test_decision_table_recompiles_when_a_rule_changes(db):
+    table = DecisionTable(name='grades', hit_policy='FIRST', conditions=json.dumps([{'name': 'd'}]), actions=json.dumps([{'name': 'd'}]))
+    rule = DecisionTableRule(rule_number=1, conditions=json.dumps({}), actions=json.dumps({'d': 'A'}))
+    table.rules.append(rule)
+    db.session.add(table)
+    db.session.commit()
+    
+    assert RuleEngineService.execute_decision_table(table.id, {}, db)['output'] == {'d': 'A'}
+    
+    rule.actions = json.dumps({'d': 'B'})
+    db.session.commit()
+    
+    assert RuleEngineService.execute_decision_table(table.id, {}, db)['output'] == {'d': 'B'}
+    assert rule_artifact_cache.stats()['entries'] == 1
+
+
+def test_missing_rule_is_not_cached(db):
+    assert RuleEngineService.execute_rule('SCORECARD', 404, {}, db) == {'success': False, 'error': 'Scorecard not found'}
+    assert rule_artifact_cache.stats()['entries'] == 0
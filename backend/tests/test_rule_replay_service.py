@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+from backend.models.application import Application
+from backend.models.rule_set import RuleSet, Rule
+from backend.models.scorecard import Scorecard, ScorecardCharacteristic, ScorecardAttribute
+from backend.services.rule_replay_service import RuleReplayService, SOURCE_INLINE, SOURCE_APPLICATIONS
+
+
+INCOMES = [1000, 3000, 4999, 5000, 7000, 9000]
+
+
+def add_scorecard(db, name, bins):
+    scorecard = Scorecard(name=name, base_score=600, pdo=20, base_odds=50)
+    characteristic = ScorecardCharacteristic(name='income', weight=1.0, order=0)
+    characteristic.attributes = [
+        ScorecardAttribute(attribute=f'{low}-{high}', min_value=low, max_value=high, points=points, woe=0.1)
+        for low, high, points in bins
+    ]
+    scorecard.characteristics.append(characteristic)
+    db.session.add(scorecard)
+    db.session.commit()
+    return scorecard.id
+
+
+@pytest.fixture
+def scorecards(db):
+    baseline = add_scorecard(db, 'baseline', [(0, 5000, 10), (5000, 1e9, 40)])
+    # low incomes lose 10 points, high incomes gain 20
+    candidate = add_scorecard(db, 'candidate', [(0, 3000, 0), (3000, 5000, 10), (5000, 1e9, 60)])
+    return baseline, candidate
+
+
+def add_rule_set(db, name, threshold):
+    rule_set = RuleSet(name=name, rule_type='RULE_SET')
+    # higher priority runs first, so the approval rule overrides the default
+    rule_set.rules = [
+        Rule(name='default', condition='income >= 0', action='decision = "REJECT"', priority=2),
+        Rule(name='approve', condition=f'income > {threshold}', action='decision = "APPROVE"', priority=1)
+    ]
+    db.session.add(rule_set)
+    db.session.commit()
+    return rule_set.id
+
+
+def replay_inline(db, rule_type, baseline, candidate, **options):
+    return RuleReplayService.replay(
+        rule_type, baseline, candidate, db,
+        source=SOURCE_INLINE, filters={'inputs': [{'income': income} for income in INCOMES]}, options=options
+    )
+
+
+def test_scorecard_replay_counts_and_shift_histogram(db, scorecards):
+    result = replay_inline(db, 'SCORECARD', *scorecards, cutoff=650, shift_edges=[-5, 5], chunk_size=4)
+    
+    # scores include base_score 600; shifts are -10, 0, 0, +20, +20, +20
+    assert (result['evaluated'], result['changed'], result['flipped']) == (6, 4, 3)
+    assert result['transitions'] == [{'from': 'REJECTED', 'to': 'APPROVED', 'count': 3}]
+    assert result['decision_distribution']['baseline'] == [{'decision': 'REJECTED', 'count': 6}]
+    assert result['decision_distribution']['candidate'] == [
+        {'decision': 'REJECTED', 'count': 3}, {'decision': 'APPROVED', 'count': 3}
+    ]
+    
+    shift = result['score_shift']
+    assert (shift['count'], shift['unchanged'], shift['increased'], shift['decreased']) == (6, 2, 3, 1)
+    assert (shift['min'], shift['max'], shift['mean']) == (-10.0, 20.0, 8.3333)
+    assert shift['histogram'] == [
+        {'min': None, 'max': -5.0, 'count': 1},
+        {'min': -5.0, 'max': 5.0, 'count': 2},
+        {'min': 5.0, 'max': None, 'count': 3}
+    ]
+    
+    # flipped records are sampled first
+    assert [sample['input']['income'] for sample in result['samples']] == [5000, 7000, 9000, 1000]
+    assert result['samples'][0]['score_shift'] == 20.0
+
+
+def test_identical_rules_report_no_changes(db, scorecards):
+    result = replay_inline(db, 'SCORECARD', scorecards[0], scorecards[0], cutoff=630)
+    
+    assert (result['changed'], result['flipped'], result['transitions'], result['samples']) == (0, 0, [], [])
+    assert result['score_shift']['unchanged'] == 6
+
+
+def test_rule_set_replay_uses_the_decision_field(db):
+    baseline = add_rule_set(db, 'baseline', 4000)
+    candidate = add_rule_set(db, 'candidate', 6000)
+    
+    result = replay_inline(db, 'RULE_SET', baseline, candidate, decision_field='decision')
+    
+    # 4999 and 5000 are approved by the baseline only
+    assert (result['changed'], result['flipped']) == (2, 2)
+    assert result['transitions'] == [{'from': 'APPROVE', 'to': 'REJECT', 'count': 2}]
+    assert result['score_shift'] is None
+
+
+def test_application_source_pages_and_skips_invalid_records(db, make_workflow, scorecards):
+    workflow = make_workflow([('start', 'start', {}), ('end', 'end', {})], [('start', 'end')])
+    payloads = [json.dumps({'income': income}) for income in INCOMES] + ['not json', '[1, 2]']
+    db.session.add_all([Application(workflow_id=workflow.id, application_data=payload) for payload in payloads])
+    db.session.commit()
+    
+    events = list(RuleReplayService.iter_replay(
+        'SCORECARD', *scorecards, db, source=SOURCE_APPLICATIONS, options={'cutoff': 650, 'chunk_size': 3}
+    ))
+    
+    assert events[0]['total'] == 8
+    assert [event['processed'] for event in events if event['event'] == 'progress'] == [3, 6, 8]
+    assert (events[-1]['evaluated'], events[-1]['skipped'], events[-1]['flipped']) == (6, 2, 3)
+
+
+def test_replay_endpoint_errors(client, scorecards):
+    assert client.post('/api/rules/replay', json={'rule_type': 'SCORECARD'}).status_code == 400
+    
+    missing = client.post('/api/rules/replay', json={'rule_type': 'SCORECARD', 'baseline_id': scorecards[0], 'candidate_id': 404})
+    assert missing.status_code == 404
+    
+    response = client.post('/api/rules/replay', json={
+        'rule_type': 'SCORECARD', 'baseline_id': scorecards[0], 'candidate_id': scorecards[1],
+        'source': 'inline', 'inputs': [{'income': income} for income in INCOMES], 'cutoff': 650
+    })
+    assert response.status_code == 200
+    assert response.get_json()['flipped'] == 3
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from backend.models.scorecard import Scorecard, ScorecardCharacteristic, ScorecardAttribute
+from backend.services.scorecard_service import ScorecardService
+
+
+@pytest.fixture
+def scorecard(db):
+    scorecard = Scorecard(name='batch', base_score=600, pdo=20, base_odds=50)
+    characteristics = {
+        # non-overlapping bins take the searchsorted path
+        'age': [('<25', 0, 25, None, -10), ('25-40', 25, 40, None, 5), ('40+', 40, 200, None, 15)],
+        'grade': [('A', None, None, 'A', 20), ('B', None, None, 'B', 5), ('C', None, None, 'C', -15)],
+        # overlapping bins fall back to ordered masks where the first attribute wins
+        'income': [('low', 0, 3000, None, -5), ('wide', 1000, 9000, None, 8), ('high', 5000, 1e9, None, 12)],
+        # a category and an interval on the same characteristic
+        'months': [('unknown', None, None, 'unknown', -20), ('short', 0, 12, None, -3), ('long', 12, 600, None, 7)]
+    }
+    
+    for order, (name, attributes) in enumerate(characteristics.items()):
+        characteristic = ScorecardCharacteristic(name=name, weight=1.0, order=order)
+        characteristic.attributes = [
+            ScorecardAttribute(attribute=label, min_value=lo, max_value=hi, category=category, points=points, woe=0.1)
+            for label, lo, hi, category, points in attributes
+        ]
+        scorecard.characteristics.append(characteristic)
+    
+    db.session.add(scorecard)
+    db.session.commit()
+    return scorecard
+
+
+def random_rows(count, seed=7):
+    rng = random.Random(seed)
+    values = {
+        'age': [None, 'n/a', 24.999, 25, 39, 40, 120, -1, '33'],
+        'grade': ['A', 'B', 'C', 'D', None, 1],
+        'income': [0, 999, 1000, 2999, 3000, 5000, 8999, 9000, 1e10, None, '4500'],
+        'months': ['unknown', 0, 11.5, 12, 599, 600, None]
+    }
+    return [{name: rng.choice(options) for name, options in values.items()} for _ in range(count)]
+
+
+def test_batch_matches_row_scoring(scorecard):
+    rows = random_rows(500)
+    compiled = ScorecardService.compile_scorecard(scorecard)
+    
+    results = ScorecardService.calculate_score_batch(compiled, rows)
+    
+    for row, result in zip(rows, results):
+        expected = ScorecardService.calculate_score(scorecard, row)
+        probability = ScorecardService.calculate_probability(expected['total_score'], 600, 20, 50)
+        
+        assert result['score'] == expected['total_score']
+        assert result['probability'] == round(probability, 4)
+        assert result['breakdown'] == expected['breakdown']
+
+
+def test_batch_without_breakdown(scorecard):
+    compiled = ScorecardService.compile_scorecard(scorecard)
+    
+    results = ScorecardService.calculate_score_batch(compiled, random_rows(3), include_breakdown=False)
+    
+    assert [result['row'] for result in results] == [0, 1, 2]
+    assert all('breakdown' not in result for result in results)
+
+
+def test_batch_endpoint_accepts_json_and_csv(client, scorecard):
+    url = f'/api/scorecard/{scorecard.id}/calculate-batch'
+    
+    response = client.post(url, json={'rows': [{'age': 30, 'grade': 'A'}, {'age': 50}]})
+    assert response.status_code == 200
+    assert [result['score'] for result in response.json['results']] == [625, 615]
+    
+    response = client.post(url, data='age,grade\n30,A\n50,\n', content_type='text/csv')
+    assert [result['score'] for result in response.json['results']] == [625, 615]
+
+
+def test_batch_endpoint_rejects_bad_rows(client, scorecard):
+    response = client.post(f'/api/scorecard/{scorecard.id}/calculate-batch', json=[1, 2])
+    assert response.status_code == 400
+    
+    assert client.post('/api/scorecard/999/calculate-batch', json=[]).status_code == 404
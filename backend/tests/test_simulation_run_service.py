@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from backend.models.simulation_run import SimulationRun
+from backend.services import simulation_run_service
+from backend.services.simulation_run_service import SimulationRunService, RUN_COMPLETED, RUN_CANCELLED
+
+
+@pytest.fixture
+def loan_workflow(make_workflow):
+    return make_workflow(
+        [('start', 'start', {}), ('score', 'task', {}), ('approve', 'task', {}), ('review', 'task', {}), ('end', 'end', {})],
+        [
+            ('start', 'score'),
+            ('score', 'approve', {'condition': 'income > 5000'}),
+            ('score', 'review'),
+            ('approve', 'end'),
+            ('review', 'end')
+        ]
+    )
+
+
+def run_simulation(db, workflow, **options):
+    config = dict({
+        'num_instances': 2000,
+        'shard_size': 300,
+        'seed': 1234,
+        'input_generator': {'income': {'type': 'number', 'min': 1000, 'max': 9000}}
+    }, **options)
+    created = SimulationRunService.create_run(workflow.id, config, db)
+    assert created['success'] is True
+    
+    run_id = created['run'].id
+    SimulationRunService.execute(run_id, db)
+    db.session.expire_all()
+    return db.session.get(SimulationRun, run_id)
+
+
+def test_fixed_seed_gives_the_same_result_for_any_worker_count(db, loan_workflow):
+    serial = run_simulation(db, loan_workflow, workers=1)
+    parallel = run_simulation(db, loan_workflow, workers=3)
+    
+    assert serial.status == parallel.status == RUN_COMPLETED
+    assert (serial.num_shards, parallel.completed_shards) == (7, 7)
+    assert json.loads(serial.result) == json.loads(parallel.result)
+    
+    result = json.loads(serial.result)
+    assert result['total_instances'] == 2000
+    assert result['edge_statistics']['score->approve']['traversals'] + \
+        result['edge_statistics']['score->review']['traversals'] == 2000
+
+
+def test_different_seeds_differ(db, loan_workflow):
+    first = json.loads(run_simulation(db, loan_workflow, workers=1).result)
+    second = json.loads(run_simulation(db, loan_workflow, workers=1, seed=99).result)
+    
+    assert first['edge_statistics'] != second['edge_statistics']
+
+
+def test_cancelled_run_stops_after_the_current_shard(db, loan_workflow, monkeypatch):
+    simulate_shard = simulation_run_service._simulate_shard
+    
+    def cancel_after_first(*shard):
+        result = simulate_shard(*shard)
+        # the cancel request arrives while the first shard is running
+        db.session.query(SimulationRun).update({'status': RUN_CANCELLED})
+        db.session.commit()
+        return result
+    
+    monkeypatch.setattr(simulation_run_service, '_simulate_shard', cancel_after_first)
+    
+    run = run_simulation(db, loan_workflow, workers=1)
+    
+    assert run.status == RUN_CANCELLED
+    assert run.completed_shards == 1
+    assert json.loads(run.result)['total_instances'] == 300
+
+
+def test_cancel_endpoint_only_cancels_active_runs(client, db, loan_workflow):
+    run = SimulationRunService.create_run(loan_workflow.id, {'num_instances': 10}, db)['run']
+    
+    response = client.post(f'/api/simulation/run/{run.id}/cancel')
+    assert response.status_code == 200
+    assert response.get_json()['status'] == RUN_CANCELLED
+    
+    # a cancelled run is never started
+    SimulationRunService.execute(run.id, db)
+    assert db.session.get(SimulationRun, run.id).result is None
+    
+    assert client.post(f'/api/simulation/run/{run.id}/cancel').status_code == 409
+    assert client.post('/api/simulation/run/404/cancel').status_code == 404
@@ -0,0 +1,176 @@
+from collections import Counter
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.services.expression_service import ExpressionService
+from backend.services.simulation_service import SimulationService
+
+
+DURATIONS = {'start': 5, 'intake': 20, 'route': 1, 'approve': 30, 'review': 70, 'end': 2}
+
+
+def workflow(nodes, edges):
+    return SimpleNamespace(
+        nodes=[SimpleNamespace(node_id=node_id, node_type=node_type, config=None) for node_id, node_type in nodes],
+        edges=[SimpleNamespace(source_node_id=s, target_node_id=t, condition=c) for s, t, c in edges]
+    )
+
+
+def loan_workflow():
+    return workflow(
+        [('start', 'start'), ('intake', 'task'), ('route', 'task'), ('approve', 'task'), ('review', 'task'), ('end', 'end')],
+        [
+            ('start', 'intake', None),
+            ('intake', 'route', None),
+            ('route', 'approve', 'income > 6000 and grade != "C"'),
+            ('route', 'review', None),
+            ('approve', 'end', None),
+            ('review', 'end', None)
+        ]
+    )
+
+
+def loan_config(num_instances, seed):
+    return {
+        'num_instances': num_instances,
+        'seed': seed,
+        'node_durations': {node_id: {'min': d, 'max': d} for node_id, d in DURATIONS.items()},
+        'input_generator': {
+            'income': {'type': 'number', 'min': 1000, 'max': 10000},
+            'grade': {'type': 'string', 'options': ['A', 'B', 'C']}
+        }
+    }
+
+
+def walk_instances(wf, config):
+    # one instance at a time over the same input columns, as the simulation worked before cohorts
+    rng = np.random.default_rng(config['seed'])
+    columns = SimulationService.generate_inputs(config['input_generator'], config['num_instances'], rng)
+    rows = [dict(zip(columns, values)) for values in zip(*(column.tolist() for column in columns.values()))]
+    outgoing = {}
+    for edge in wf.edges:
+        outgoing.setdefault(edge.source_node_id, []).append(edge)
+    
+    totals, node_counts, edge_counts = [], Counter(), Counter()
+    for row in rows:
+        node_id, total = 'start', 0
+        while node_id is not None:
+            total += DURATIONS[node_id]
+            node_counts[node_id] += 1
+            edges = outgoing.get(node_id, [])
+            chosen = next((e for e in edges if e.condition and ExpressionService.evaluate(e.condition, row)), None)
+            chosen = chosen or next((e for e in edges if not e.condition), None)
+            if chosen:
+                edge_counts[f'{node_id}->{chosen.target_node_id}'] += 1
+            node_id = chosen.target_node_id if chosen else None
+        totals.append(total)
+    return totals, node_counts, edge_counts
+
+
+def test_cohort_totals_match_per_instance_walk():
+    wf, config = loan_workflow(), loan_config(5000, seed=21)
+    
+    result = SimulationService.simulate_process(wf, config)
+    totals, node_counts, edge_counts = walk_instances(wf, config)
+    
+    assert result['total_instances'] == 5000 and result['failed'] == 0
+    assert result['avg_duration_ms'] == pytest.approx(np.mean(totals))
+    assert (result['min_duration_ms'], result['max_duration_ms']) == (min(totals), max(totals))
+    assert {node_id: stats['executions'] for node_id, stats in result['node_statistics'].items()} == dict(node_counts)
+    assert {node_id: stats['total_duration_ms'] for node_id, stats in result['node_statistics'].items()} == \
+        {node_id: count * DURATIONS[node_id] for node_id, count in node_counts.items()}
+    assert {key: stats['traversals'] for key, stats in result['edge_statistics'].items()} == dict(edge_counts)
+
+
+def test_sampled_instances_follow_their_inputs():
+    result = SimulationService.simulate_process(loan_workflow(), dict(loan_config(200, seed=4), sample_size=25))
+    
+    assert len(result['instances']) == 25
+    for instance in result['instances']:
+        path = [stat['node_id'] for stat in instance['node_stats']]
+        approved = instance['output']['income'] > 6000 and instance['output']['grade'] != 'C'
+        assert path == ['start', 'intake', 'route', 'approve' if approved else 'review', 'end']
+        assert instance['duration_ms'] == sum(DURATIONS[node_id] for node_id in path)
+
+
+def test_unconditional_edges_split_uniformly():
+    wf = workflow(
+        [('start', 'start'), ('left', 'task'), ('right', 'task'), ('end', 'end')],
+        [('start', 'left', None), ('start', 'right', None), ('left', 'end', None), ('right', 'end', None)]
+    )
+    
+    edges = SimulationService.simulate_process(wf, {'num_instances': 20000, 'seed': 8})['edge_statistics']
+    
+    assert edges['start->left']['traversals'] + edges['start->right']['traversals'] == 20000
+    assert edges['start->left']['traversals'] == pytest.approx(10000, rel=0.03)
+
+
+def test_same_seed_repeats_and_missing_start_fails():
+    wf, config = loan_workflow(), loan_config(1000, seed=9)
+    
+    assert SimulationService.simulate_process(wf, config) == SimulationService.simulate_process(wf, config)
+    
+    no_start = workflow([('intake', 'task')], [])
+    result = SimulationService.simulate_process(no_start, {'num_instances': 5})
+    assert (result['failed'], result['success_rate']) == (5, 0)
+
+
+def single_server_config(low, high, **options):
+    return dict({
+        'mode': 'discrete_event',
+        'num_instances': 100000,
+        'seed': 2,
+        'arrival_rate': 6,
+        'resources': {'review': 1},
+        'node_durations': {'review': {'min': low, 'max': high}, 'start': {'min': 0, 'max': 0}, 'end': {'min': 0, 'max': 0}}
+    }, **options)
+
+
+def review_workflow():
+    return workflow(
+        [('start', 'start'), ('review', 'task'), ('end', 'end')],
+        [('start', 'review', None), ('review', 'end', None)]
+    )
+
+
+@pytest.mark.parametrize('low, high', [(50, 150), (100, 100)])
+def test_single_server_queue_matches_closed_form(low, high):
+    # Poisson arrivals with uniform service is M/G/1: Pollaczek-Khinchine gives Wq = lambda * E[S^2] / (2 * (1 - rho))
+    arrival_per_ms = 6 / 1000
+    mean_service = (low + high) / 2
+    second_moment = np.mean(np.arange(low, high + 1) ** 2)
+    rho = arrival_per_ms * mean_service
+    expected_wait = arrival_per_ms * second_moment / (2 * (1 - rho))
+    
+    result = SimulationService.simulate_process(review_workflow(), single_server_config(low, high))
+    review = result['resources']['review']
+    
+    assert review['served'] == 100000
+    assert review['utilization'] == pytest.approx(rho, rel=0.02)
+    assert review['wait']['avg_duration_ms'] == pytest.approx(expected_wait, rel=0.06)
+    # Little's law for the queue
+    assert review['avg_queue_depth'] == pytest.approx(arrival_per_ms * expected_wait, rel=0.06)
+    assert result['bottlenecks'][0]['resource'] == 'review'
+
+
+def test_more_servers_remove_the_queue():
+    config = single_server_config(100, 100, num_instances=5000, resources={'review': 50})
+    
+    result = SimulationService.simulate_process(review_workflow(), config)
+    
+    assert result['resources']['review']['queued'] == 0
+    assert result['resources']['review']['wait']['max_duration_ms'] == 0
+    assert (result['cycle_time']['min_duration_ms'], result['cycle_time']['max_duration_ms']) == (100, 100)
+
+
+def test_discrete_events_route_like_the_cohort_walk():
+    config = dict(loan_config(3000, seed=6), mode='discrete_event', arrival_rate=5, resources={'intake': 2, 'review': 3})
+    
+    result = SimulationService.simulate_process(loan_workflow(), config)
+    _, node_counts, _ = walk_instances(loan_workflow(), config)
+    
+    assert {node_id: stats['executions'] for node_id, stats in result['node_statistics'].items()} == dict(node_counts)
+    assert result['resources']['intake']['served'] == 3000
+    assert result['cycle_time']['min_duration_ms'] >= sum(DURATIONS[n] for n in ('start', 'intake', 'route', 'approve', 'end'))
@@ -0,0 +1,111 @@
+import threading
+
+import pytest
+
+from backend.models.deployed_api import DeployedAPI
+from backend.models.test_case import TestResult as StoredResult
+from backend.services.testing_service import TestingService, TEST_PASS, TEST_FAIL, TEST_ERROR, TEST_TIMEOUT
+
+
+@pytest.fixture
+def deployment(db, make_workflow):
+    workflow = make_workflow([('start', 'start', {}), ('end', 'end', {})], [('start', 'end')])
+    deployment = DeployedAPI(workflow_id=workflow.id, api_name='suite', api_path='/api/execute/suite', status='active')
+    db.session.add(deployment)
+    db.session.commit()
+    return deployment
+
+
+@pytest.fixture
+def release():
+    # lets a deliberately slow case finish once the test is done with it
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def add_cases(db, deployment, cases):
+    return [
+        TestingService.create_test_case(deployment.id, name, None, input_data, expected, db)['id']
+        for name, input_data, expected in cases
+    ]
+
+
+def fake_execution(release):
+    def execute(workflow_id, input_data):
+        if input_data.get('hang'):
+            release.wait(5)
+        if input_data.get('raise'):
+            raise RuntimeError('engine exploded')
+        return {'success': True, 'output': {'score': input_data['score'] * 2}}
+    return execute
+
+
+def stored_statuses(db):
+    return dict(db.session.query(StoredResult.test_case_id, StoredResult.status))
+
+
+def test_suite_statuses_and_bulk_saved_results(db, deployment, release):
+    ids = add_cases(db, deployment, [
+        ('pass', {'score': 10}, {'output': {'score': 20}}),
+        ('fail', {'score': 10}, {'output': {'score': 99}}),
+        ('error', {'score': 1, 'raise': True}, None),
+        ('no expectation', {'score': 3}, None)
+    ])
+    
+    summary = TestingService.execute_all_test_cases(deployment.id, fake_execution(release), db, workers=3)
+    
+    assert (summary['passed'], summary['failed'], summary['errors'], summary['skipped']) == (2, 1, 1, 0)
+    assert [result['test_case_id'] for result in summary['results']] == ids
+    assert stored_statuses(db) == dict(zip(ids, [TEST_PASS, TEST_FAIL, TEST_ERROR, TEST_PASS]))
+
+
+def test_slow_case_times_out_without_blocking_the_rest(db, deployment, release):
+    ids = add_cases(db, deployment, [('slow', {'score': 1, 'hang': True}, None)] + [
+        (f'fast-{i}', {'score': i}, None) for i in range(5)
+    ])
+    
+    summary = TestingService.execute_all_test_cases(deployment.id, fake_execution(release), db, workers=2, timeout=0.3)
+    
+    assert (summary['passed'], summary['timeouts'], summary['executed']) == (5, 1, 6)
+    timed_out = next(result for result in summary['results'] if result['test_case_id'] == ids[0])
+    assert timed_out['test_result']['status'] == TEST_TIMEOUT
+    assert 'timeout' in timed_out['test_result']['error_message']
+    assert stored_statuses(db)[ids[0]] == TEST_TIMEOUT
+
+
+def test_fail_fast_stops_after_first_failure(db, deployment, release):
+    ids = add_cases(db, deployment, [
+        ('pass', {'score': 1}, None),
+        ('fail', {'score': 1}, {'output': {'score': 0}}),
+        ('later-1', {'score': 2}, None),
+        ('later-2', {'score': 3}, None),
+        ('later-3', {'score': 4}, None)
+    ])
+    
+    summary = TestingService.execute_all_test_cases(deployment.id, fake_execution(release), db, workers=1, fail_fast=True)
+    
+    assert summary['stopped_early'] is True
+    assert summary['failed'] == 1
+    assert summary['executed'] + summary['skipped'] == 5
+    assert summary['executed'] < 5
+    assert set(stored_statuses(db)) == {result['test_case_id'] for result in summary['results']}
+    assert ids[4] not in stored_statuses(db)
+
+
+def test_rows_are_saved_when_the_stream_stops_early(db, deployment, release):
+    add_cases(db, deployment, [(f'case-{i}', {'score': i}, None) for i in range(6)])
+    
+    events = TestingService.iter_test_suite(deployment.id, fake_execution(release), db, workers=1)
+    assert next(events)['event'] == 'start'
+    first = next(events)
+    assert first['event'] == 'case'
+    
+    # a disconnecting client closes the generator
+    events.close()
+    
+    assert stored_statuses(db) == {first['result']['test_case_id']: TEST_PASS}
+
+
+def test_unknown_deployment(db):
+    assert TestingService.execute_all_test_cases(404, None, db) == {'success': False, 'error': 'Deployed API not found'}
@@ -0,0 +1,111 @@
+import io
+import sys
+import json
+
+import numpy as np
+import pytest
+
+from backend.models.decision_tree import DecisionTree, DecisionTreeNode
+from backend.services.training_data_service import TrainingDataService
+
+
+def numpy_chunks():
+    # the shape iter_parquet_chunks yields for int64 columns
+    yield {'income': np.array([100, 200, 300, 400]), 'default': np.array([0, 0, 1, 1], dtype=np.int64)}
+    yield {'income': np.array([500, 600]), 'default': np.array([1, 1], dtype=np.int64)}
+
+
+def test_numpy_labels_become_python_scalars():
+    training = TrainingDataService.load(numpy_chunks(), ['income'], 'default')
+    
+    assert {type(label) for label in training.y} == {int}
+    assert sorted(set(training.y)) == [0, 1]
+
+
+def test_categorical_scan_covers_every_chunk():
+    chunks = [
+        {'grade': ['1', '2', '3'], 'income': ['10', '20', '30']},
+        {'grade': ['2', 'A', ''], 'income': ['40', 'n/a', '50']}
+    ]
+    
+    assert TrainingDataService.scan_categorical_features(iter(chunks), ['grade', 'income']) == {'grade'}
+
+
+@pytest.fixture
+def tree(db):
+    tree = DecisionTree(name='default-risk', target_variable='default', max_depth=3)
+    db.session.add(tree)
+    db.session.commit()
+    return tree
+
+
+def test_train_with_int_labels_saves_nodes(client, db, tree):
+    rows = [{'income': income, 'default': int(income >= 300)} for income in range(100, 600, 50)]
+    
+    response = client.post(f'/api/decision-tree/{tree.id}/train', json={'features': ['income'], 'training_data': rows})
+    
+    assert response.status_code == 200
+    root = db.session.query(DecisionTreeNode).filter_by(tree_id=tree.id, parent_id=None).one()
+    assert json.loads(root.value) == {'0': 4, '1': 6}
+    assert response.get_json()['accuracy'] == 1.0
+
+
+def test_train_csv_detects_category_after_first_chunk(app, client, db, tree):
+    app.config['TRAINING_CHUNK_SIZE'] = 2
+    csv_data = 'grade,default\n1,no\n2,no\n1,no\n2,no\nB,yes\nB,yes\n'
+    
+    response = client.post(
+        f'/api/decision-tree/{tree.id}/train',
+        data={'features': 'grade', 'file': (io.BytesIO(csv_data.encode('utf-8')), 'train.csv')},
+        content_type='multipart/form-data'
+    )
+    
+    assert response.status_code == 200
+    summary = response.get_json()['data_summary']
+    assert summary['categorical_features'] == ['grade']
+    assert summary['invalid_values'] == {}
+    assert db.session.get(DecisionTree, tree.id).get_feature_encodings() == {'grade': ['1', '2', 'B']}
+
+
+def test_train_from_parquet_with_int_labels(client, db, tree):
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+    
+    table = pa.table({
+        'income': pa.array([100, 200, 300, 400, 500, 600], type=pa.int64()),
+        'default': pa.array([0, 0, 1, 1, 1, 1], type=pa.int64())
+    })
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+    buffer.seek(0)
+    
+    response = client.post(
+        f'/api/decision-tree/{tree.id}/train',
+        data={'features': 'income', 'file': (buffer, 'train.parquet')},
+        content_type='multipart/form-data'
+    )
+    
+    assert response.status_code == 200
+    root = db.session.query(DecisionTreeNode).filter_by(tree_id=tree.id, parent_id=None).one()
+    assert json.loads(root.value) == {'0': 2, '1': 4}
+
+
+def test_parquet_without_pyarrow_is_a_training_error(client, tree, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    
+    response = client.post(
+        f'/api/decision-tree/{tree.id}/train',
+        data={'features': 'income', 'file': (io.BytesIO(b'PAR1'), 'train.parquet')},
+        content_type='multipart/form-data'
+    )
+    
+    assert response.status_code == 400
+    assert 'pyarrow' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('source', ['data/train.csv', ['data/train.csv']])
+def test_source_must_be_an_object(client, tree, source):
+    response = client.post(f'/api/decision-tree/{tree.id}/train', json={'features': ['income'], 'source': source})
+    
+    assert response.status_code == 400
+    assert 'source must be an object' in response.get_json()['error']
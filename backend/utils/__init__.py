@@ -1,3 +1,11 @@
 from .validators import validate_workflow_data, validate_application_data
+from .trace_codec import encode_payload, decode_payload, diff_snapshot, apply_delta
 
-__all__ = ['validate_workflow_data', 'validate_application_data']
+__all__ = [
+    'validate_workflow_data',
+    'validate_application_data',
+    'encode_payload',
+    'decode_payload',
+    'diff_snapshot',
+    'apply_delta'
+]
@@ -0,0 +1,59 @@
+import json
+import zlib
+
+ENCODING_ZLIB_JSON = 'zlib+json'
+
+# zlib 압축 수준 (zlib 기본값)
+COMPRESSION_LEVEL = 6
+
+_MISSING = object()
+
+def encode_payload(data):
+    """JSON 직렬화 후 zlib 압축"""
+    raw = json.dumps(data, separators=(',', ':'), default=str).encode('utf-8')
+    return zlib.compress(raw, COMPRESSION_LEVEL)
+
+def decode_payload(blob, encoding=ENCODING_ZLIB_JSON):
+    """압축된 페이로드 복원"""
+    if blob is None:
+        return None
+    
+    if encoding != ENCODING_ZLIB_JSON:
+        raise ValueError(f'지원하지 않는 인코딩입니다: {encoding}')
+    
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+def diff_snapshot(base, current):
+    """기준 스냅샷 대비 변경분 계산 (최상위 키 단위)"""
+    if not isinstance(base, dict) or not isinstance(current, dict):
+        return None if base == current else {'replace': current}
+    
+    changed = {
+        key: value for key, value in current.items()
+        if base.get(key, _MISSING) != value
+    }
+    removed = [key for key in base if key not in current]
+    
+    if not changed and not removed:
+        return None
+    
+    delta = {}
+    if changed:
+        delta['set'] = changed
+    if removed:
+        delta['unset'] = removed
+    return delta
+
+def apply_delta(base, delta):
+    """기준 스냅샷에 변경분 적용"""
+    if not delta:
+        return base
+    
+    if 'replace' in delta:
+        return delta['replace']
+    
+    result = dict(base or {})
+    result.update(delta.get('set', {}))
+    for key in delta.get('unset', []):
+        result.pop(key, None)
+    return result
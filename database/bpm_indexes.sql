@@ -0,0 +1,16 @@
+-- BPM 엔진 테이블 인덱스 (기존 DB 수동 적용용)
+-- SQLite / PostgreSQL
+
+-- audit_log, node_instance, process_variable, human_task, deployed_api, task_candidate 테이블은
+-- schema.sql이 아니라 애플리케이션 시작 시 모델 정의로 생성되며, 누락된 인덱스도 자동 생성됨.
+-- 이 스크립트는 애플리케이션을 한 번 실행해 테이블이 생성된 DB에만 적용할 것
+
+CREATE INDEX IF NOT EXISTS idx_audit_log_process_timestamp ON audit_log(process_instance_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_audit_log_task_timestamp ON audit_log(task_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_node_instance_process_trigger ON node_instance(process_instance_id, trigger_time);
+CREATE INDEX IF NOT EXISTS idx_process_variable_process_name ON process_variable(process_instance_id, name);
+CREATE INDEX IF NOT EXISTS idx_human_task_status_assignee ON human_task(status, assignee);
+CREATE INDEX IF NOT EXISTS idx_human_task_process_created ON human_task(process_instance_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_deployed_api_path_status ON deployed_api(api_path, status);
+CREATE INDEX IF NOT EXISTS idx_task_candidate_inbox ON task_candidate(candidate_type, candidate_id, status, priority, created_at);
+CREATE INDEX IF NOT EXISTS idx_task_candidate_task ON task_candidate(task_id);
@@ -72,20 +72,74 @@ CREATE TABLE IF NOT EXISTS applications (
     FOREIGN KEY (workflow_id) REFERENCES workflows(id)
 );
 
+-- 신청서 실행 트레이스 테이블 (실행 1회당 압축된 입력 스냅샷)
+CREATE TABLE IF NOT EXISTS application_traces (
+    id VARCHAR(32) PRIMARY KEY,
+    application_id INTEGER NOT NULL,
+    encoding VARCHAR(20),
+    input_snapshot BLOB,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (application_id) REFERENCES applications(id) ON DELETE CASCADE
+);
+
 -- 신청서 실행 로그 테이블
+-- (trace_id/payload/encoding이 없는 기존 DB에는 애플리케이션 시작 시 NULL 허용 컬럼으로 자동 추가됨)
 CREATE TABLE IF NOT EXISTS application_logs (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     application_id INTEGER NOT NULL,
+    trace_id VARCHAR(32),
     node_id VARCHAR(100),
     node_type VARCHAR(50),
     action VARCHAR(100),
     input_data TEXT,
     output_data TEXT,
+    payload BLOB,
+    encoding VARCHAR(20),
     status VARCHAR(50),
     error_message TEXT,
     execution_time REAL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (application_id) REFERENCES applications(id) ON DELETE CASCADE
+    FOREIGN KEY (application_id) REFERENCES applications(id) ON DELETE CASCADE,
+    FOREIGN KEY (trace_id) REFERENCES application_traces(id)
+);
+
+-- 의사결정나무 테이블
+-- (feature_encodings가 없는 기존 DB에는 애플리케이션 시작 시 NULL 허용 컬럼으로 자동 추가됨)
+CREATE TABLE IF NOT EXISTS decision_tree (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(255) NOT NULL,
+    description TEXT,
+    target_variable VARCHAR(100) NOT NULL,
+    algorithm VARCHAR(50) DEFAULT 'gini',
+    max_depth INTEGER DEFAULT 5,
+    min_samples_split INTEGER DEFAULT 2,
+    min_samples_leaf INTEGER DEFAULT 1,
+    status VARCHAR(50) DEFAULT 'draft',
+    training_accuracy REAL,
+    feature_encodings TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 의사결정나무 노드 테이블
+CREATE TABLE IF NOT EXISTS decision_tree_node (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tree_id INTEGER NOT NULL,
+    node_id VARCHAR(50) NOT NULL,
+    parent_id VARCHAR(50),
+    feature VARCHAR(100),
+    threshold REAL,
+    operator VARCHAR(20),
+    is_leaf BOOLEAN DEFAULT 0,
+    class_label VARCHAR(100),
+    samples INTEGER,
+    gini REAL,
+    entropy REAL,
+    value TEXT,
+    position_x REAL,
+    position_y REAL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (tree_id) REFERENCES decision_tree(id)
 );
 
 -- 인덱스 생성
@@ -93,6 +147,10 @@ CREATE INDEX IF NOT EXISTS idx_workflow_nodes_workflow_id ON workflow_nodes(work
 CREATE INDEX IF NOT EXISTS idx_workflow_edges_workflow_id ON workflow_edges(workflow_id);
 CREATE INDEX IF NOT EXISTS idx_applications_workflow_id ON applications(workflow_id);
 CREATE INDEX IF NOT EXISTS idx_applications_status ON applications(status);
+CREATE INDEX IF NOT EXISTS idx_applications_status_created ON applications(status, created_at);
+CREATE INDEX IF NOT EXISTS idx_applications_created_at ON applications(created_at);
 CREATE INDEX IF NOT EXISTS idx_application_logs_application_id ON application_logs(application_id);
+CREATE INDEX IF NOT EXISTS idx_application_logs_application_created ON application_logs(application_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_application_traces_application_id ON application_traces(application_id);
 CREATE INDEX IF NOT EXISTS idx_rules_type ON rules(rule_type);
 CREATE INDEX IF NOT EXISTS idx_rules_active ON rules(is_active);